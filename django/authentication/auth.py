@@ -8,9 +8,20 @@ from django.utils.http import urlsafe_base64_decode
 
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .services.jwt import (
+    TOKEN_VERSION_CLAIM,
+    build_user_from_claims,
+    get_token_version,
+    has_user_claims,
+)
 
 if TYPE_CHECKING:
     from rest_framework.request import Request
+    from rest_framework_simplejwt.tokens import Token
 
 UserModel = get_user_model()
 
@@ -33,3 +44,31 @@ class UIDB64Authentication(BaseAuthentication):
             raise AuthenticationFailed("No such user") from e
 
         return user, None
+
+
+class UserClaimsJWTAuthentication(JWTAuthentication):
+    """A `JWTAuthentication` that builds the user from the claims of the access token (see
+    `services.jwt.UserClaimsRefreshToken`) instead of fetching it from the database.
+
+    A token is rejected if its `token_version` isn't the current one of the user (e.g. the
+    subscription changed) so the client refreshes it and gets the current claims.
+    """
+
+    def get_user(self, validated_token: Token) -> UserModel:
+        # tokens issued without the claims
+        if not has_user_claims(validated_token):
+            return super().get_user(validated_token)
+
+        version = get_token_version(
+            validated_token[api_settings.USER_ID_CLAIM],
+            min_version=validated_token[TOKEN_VERSION_CLAIM],
+        )
+        if version is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if validated_token[TOKEN_VERSION_CLAIM] != version:
+            raise InvalidToken("Token desatualizado")
+
+        user = build_user_from_claims(validated_token)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
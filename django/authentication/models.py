@@ -75,6 +75,8 @@ class CustomUser(AbstractUser):
     )
     planning_preferences = models.JSONField(default=dict, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
+    # bumped to reject the access tokens issued before a change of the claims embedded on them
+    token_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
@@ -5,9 +5,11 @@ from django.utils import timezone
 
 from dateutil.relativedelta import relativedelta
 from rest_framework import serializers, validators
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 
 from .choices import SubscriptionStatus
 from .models import IntegrationSecret
+from .services.jwt import UserClaimsRefreshToken
 from .services.token_generator import token_generator
 
 UserModel = get_user_model()
@@ -473,3 +475,11 @@ class ResetPasswordRequestSerializer(serializers.Serializer):
 
 class StripeCheckoutSessionSerializer(serializers.Serializer):
     price_id = serializers.CharField()
+
+
+class UserClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserClaimsRefreshToken
+
+
+class UserClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = UserClaimsRefreshToken
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.db import transaction as djtransaction
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from config.key_value_store import key_value_backend
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from rest_framework_simplejwt.tokens import Token
+
+UserModel = get_user_model()
+
+# the fields read by the permissions of (almost) every request, embedded in the access tokens
+USER_CLAIMS = (
+    "is_active",
+    "subscription_ends_at",
+    "is_personal_finances_module_enabled",
+    "is_investments_module_enabled",
+    "is_investments_integrations_module_enabled",
+)
+TOKEN_VERSION_CLAIM = "token_version"
+
+
+def _get_token_version_key(user_id: int) -> str:
+    return f"{settings.AUTH_TOKEN_VERSION_KEY_PREFIX}:{user_id}"
+
+
+def get_token_version(user_id: int, min_version: int = 0) -> int | None:
+    """The current `token_version` of `user_id`, `None` if the user doesn't exist.
+
+    It's cached for `settings.AUTH_TOKEN_VERSION_TIMEOUT_IN_SECONDS` so most of the requests
+    don't hit the database. As the versions only increase, a cached version lower than
+    `min_version` (e.g. the one of a token issued after a bump another process didn't see) is
+    stale and read again from the database.
+    """
+    key = _get_token_version_key(user_id)
+    version = key_value_backend.get(key=key)
+    if version is None or version < min_version:
+        version = (
+            UserModel.objects.filter(pk=user_id).values_list("token_version", flat=True).first()
+        )
+        if version is not None:
+            key_value_backend.set(
+                key=key, value=version, timeout=settings.AUTH_TOKEN_VERSION_TIMEOUT_IN_SECONDS
+            )
+    return version
+
+
+def cache_token_versions(users: QuerySet[UserModel]) -> None:
+    """Cache the current `token_version` of `users` once the current transaction is committed.
+
+    Called after bumping the versions so the access tokens issued before are rejected right
+    away instead of once the cached versions expire.
+    """
+
+    def cache() -> None:
+        key_value_backend.set_many(
+            mapping={
+                _get_token_version_key(pk): version
+                for pk, version in users.values_list("pk", "token_version")
+            },
+            timeout=settings.AUTH_TOKEN_VERSION_TIMEOUT_IN_SECONDS,
+        )
+
+    djtransaction.on_commit(cache)
+
+
+def set_user_claims(token: Token, user: UserModel) -> None:
+    for claim in USER_CLAIMS:
+        value = getattr(user, claim)
+        token[claim] = value.isoformat() if isinstance(value, datetime) else value
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+
+
+def has_user_claims(token: Token) -> bool:
+    return all(claim in token for claim in (*USER_CLAIMS, TOKEN_VERSION_CLAIM))
+
+
+def build_user_from_claims(token: Token) -> UserModel:
+    """A `UserModel` instance with only the primary key and `USER_CLAIMS` loaded.
+
+    The other fields are deferred, so they're fetched from the database if (and only if)
+    they're accessed.
+    """
+    claims: dict[str, Any] = {
+        "id": token[api_settings.USER_ID_CLAIM],
+        **{claim: token[claim] for claim in USER_CLAIMS},
+    }
+    if claims["subscription_ends_at"] is not None:
+        claims["subscription_ends_at"] = datetime.fromisoformat(claims["subscription_ends_at"])
+
+    # `from_db` expects the values in the order of the fields
+    field_names = [f.attname for f in UserModel._meta.concrete_fields if f.attname in claims]
+    return UserModel.from_db(
+        router.db_for_read(UserModel),
+        field_names,
+        [claims[field_name] for field_name in field_names],
+    )
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """A refresh token whose access tokens embed the `USER_CLAIMS` of the user.
+
+    The claims of a refreshed access token are read from the database, so they're always the
+    current ones.
+    """
+
+    _user: UserModel | None = None
+
+    @classmethod
+    def for_user(cls, user: UserModel) -> UserClaimsRefreshToken:
+        token = super().for_user(user)
+        token._user = user
+        return token
+
+    @property
+    def access_token(self) -> AccessToken:
+        access = super().access_token
+        user = self._user or UserModel.objects.only(*USER_CLAIMS, "token_version").get(
+            pk=self[api_settings.USER_ID_CLAIM]
+        )
+        set_user_claims(access, user)
+        return access
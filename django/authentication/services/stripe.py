@@ -7,11 +7,13 @@ from typing import TYPE_CHECKING, Any, Literal
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.utils import timezone
 
 import stripe
 
 from ..choices import SubscriptionStatus
+from .jwt import cache_token_versions
 from .mailing import dispatch_trial_will_end_email
 
 if TYPE_CHECKING:
@@ -95,7 +97,8 @@ process_event = StripeHandlersRegistry.run  # alias
 
 @StripeHandlersRegistry.register("customer.subscription.deleted")
 def handle_subscription_deleted(*, customer_id: str) -> None:
-    UserModel.objects.filter(stripe_customer_id=customer_id).update(
+    users = UserModel.objects.filter(stripe_customer_id=customer_id)
+    users.update(
         is_personal_finances_module_enabled=False,
         is_investments_module_enabled=False,
         is_investments_integrations_module_enabled=False,
@@ -103,7 +106,9 @@ def handle_subscription_deleted(*, customer_id: str) -> None:
         subscription_status=SubscriptionStatus.CANCELED,
         subscription_ends_at=timezone.localtime(),
         stripe_subscription_updated_at=timezone.localtime(),
+        token_version=F("token_version") + 1,
     )
+    cache_token_versions(users)
 
 
 @StripeHandlersRegistry.register("customer.subscription.updated")
@@ -119,7 +124,8 @@ def handle_subscription_updated(
 ) -> None:
     if not is_cancellation_details_update:
         # se decidir oferecer um desconto, olhar por event.data.object.cancel_at_period_end
-        UserModel.objects.filter(stripe_customer_id=customer_id).update(
+        users = UserModel.objects.filter(stripe_customer_id=customer_id)
+        users.update(
             stripe_subscription_id=subscription_id,
             subscription_ends_at=subscription_ends_at,
             subscription_status=status,
@@ -128,7 +134,9 @@ def handle_subscription_updated(
             is_personal_finances_module_enabled="personal_finances" in modules,
             is_investments_module_enabled="investments" in modules,
             is_investments_integrations_module_enabled="investments_integrations" in modules,
+            token_version=F("token_version") + 1,
         )
+        cache_token_versions(users)
 
 
 @StripeHandlersRegistry.register("customer.subscription.trial_will_end")
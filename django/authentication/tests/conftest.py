@@ -35,6 +35,13 @@ class IntegrationSecretFactory(DjangoModelFactory):
         model = IntegrationSecret
 
 
+@pytest.fixture(autouse=True)
+def _isolate_token_versions(settings, request):
+    # the key value store outlives the tests, so the versions cached by one of them mustn't be
+    # used by the others
+    settings.AUTH_TOKEN_VERSION_KEY_PREFIX = f"TOKEN_VERSION:{request.node.nodeid}"
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
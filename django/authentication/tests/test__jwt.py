@@ -0,0 +1,169 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+from freezegun import freeze_time
+from rest_framework.status import HTTP_200_OK, HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN
+from rest_framework.test import APIClient
+
+from config.settings.base import BASE_API_URL
+
+from ..services.jwt import UserClaimsRefreshToken
+
+pytestmark = pytest.mark.django_db
+
+UserModel = get_user_model()
+
+URL = f"/{BASE_API_URL}"
+
+
+def _get_client(access: str) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    return client
+
+
+def _get_user_queries(context: CaptureQueriesContext) -> list[str]:
+    return [q["sql"] for q in context.captured_queries if "authentication_customuser" in q["sql"]]
+
+
+def test__token__claims(api_client, user):
+    # GIVEN
+    data = {"email": user.email, "password": "1X<ISRUkw+tuK"}
+
+    # WHEN
+    response = api_client.post(f"{URL}token", data=data)
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+    access = UserClaimsRefreshToken(response.json()["refresh"]).access_token
+    assert access["is_active"] is True
+    assert access["subscription_ends_at"] == user.subscription_ends_at.isoformat()
+    assert access["is_personal_finances_module_enabled"] is True
+    assert access["is_investments_module_enabled"] is True
+    assert access["is_investments_integrations_module_enabled"] is True
+    assert access["token_version"] == 0
+
+
+def test__authenticate__do_not_fetch_user(user):
+    # GIVEN
+    client = _get_client(UserClaimsRefreshToken.for_user(user).access_token)
+    client.get(f"{URL}expenses/indicators")  # caches the version
+
+    # WHEN
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(f"{URL}expenses/indicators")
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+    assert not _get_user_queries(context)
+
+
+def test__authenticate__wo_claims(user):
+    # GIVEN
+    access = UserClaimsRefreshToken.for_user(user).access_token
+    del access["is_personal_finances_module_enabled"]
+    client = _get_client(access)
+
+    # WHEN
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(f"{URL}expenses/indicators")
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+    assert len(_get_user_queries(context)) == 1
+
+
+def test__authenticate__deferred_fields(user):
+    # GIVEN
+    client = _get_client(UserClaimsRefreshToken.for_user(user).access_token)
+
+    # WHEN
+    response = client.get(f"{URL}users/{user.pk}")
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["email"] == user.email
+
+
+def test__authenticate__outdated_token_version(user):
+    # GIVEN
+    client = _get_client(UserClaimsRefreshToken.for_user(user).access_token)
+    user.token_version += 1
+    user.save()
+
+    # WHEN
+    response = client.get(f"{URL}expenses/indicators")
+
+    # THEN
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+    assert response.json()["code"] == "token_not_valid"
+
+
+def test__authenticate__cached_token_version_expires(user):
+    # GIVEN
+    client = _get_client(UserClaimsRefreshToken.for_user(user).access_token)
+    with freeze_time() as frozen_time:
+        client.get(f"{URL}expenses/indicators")  # caches the version
+        # bumped without caching the new version (e.g. by another process w/o redis)
+        UserModel.objects.filter(pk=user.pk).update(token_version=F("token_version") + 1)
+
+        # WHEN
+        frozen_time.tick(settings.AUTH_TOKEN_VERSION_TIMEOUT_IN_SECONDS + 1)
+        response = client.get(f"{URL}expenses/indicators")
+
+    # THEN
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+    assert response.json()["code"] == "token_not_valid"
+
+
+def test__authenticate__stale_cached_token_version(user):
+    # GIVEN
+    _get_client(UserClaimsRefreshToken.for_user(user).access_token).get(
+        f"{URL}expenses/indicators"
+    )  # caches the version
+    # bumped without caching the new version (e.g. by another process w/o redis)
+    UserModel.objects.filter(pk=user.pk).update(token_version=F("token_version") + 1)
+    user.refresh_from_db()
+    client = _get_client(UserClaimsRefreshToken.for_user(user).access_token)
+
+    # WHEN
+    response = client.get(f"{URL}expenses/indicators")
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+
+def test__authenticate__inactive_user(user):
+    # GIVEN
+    user.is_active = False
+    user.save()
+    client = _get_client(UserClaimsRefreshToken.for_user(user).access_token)
+
+    # WHEN
+    response = client.get(f"{URL}expenses/indicators")
+
+    # THEN
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+    assert response.json() == {"detail": "User is inactive"}
+
+
+def test__refresh__current_claims(api_client, user):
+    # GIVEN
+    refresh = UserClaimsRefreshToken.for_user(user)
+    user.is_personal_finances_module_enabled = False
+    user.token_version += 1
+    user.save()
+
+    # WHEN
+    response = api_client.post(f"{URL}token/refresh", data={"refresh": str(refresh)})
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+    response = _get_client(response.json()["access"]).get(f"{URL}expenses/indicators")
+    assert response.status_code == HTTP_403_FORBIDDEN
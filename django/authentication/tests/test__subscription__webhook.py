@@ -5,11 +5,18 @@ from django.db.utils import IntegrityError
 from django.utils.timezone import now
 
 import pytest
-from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_405_METHOD_NOT_ALLOWED
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_403_FORBIDDEN,
+    HTTP_405_METHOD_NOT_ALLOWED,
+)
 
 from config.settings.base import BASE_API_URL
 
 from ..choices import SubscriptionStatus
+from ..services.jwt import UserClaimsRefreshToken
 
 pytestmark = pytest.mark.django_db
 URL = f"/{BASE_API_URL}" + "subscription/webhook"
@@ -183,6 +190,34 @@ def test__webhook__subscription_deleted(api_client, event_factory, stripe_user,
     assert stripe_user.stripe_subscription_updated_at == now()
 
 
+def test__webhook__subscription_deleted__reject_access_tokens(
+    api_client, event_factory, stripe_user, mocker, django_capture_on_commit_callbacks
+):
+    # GIVEN
+    refresh = UserClaimsRefreshToken.for_user(stripe_user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    # caches the token version
+    assert api_client.get(f"/{BASE_API_URL}expenses/indicators").status_code == HTTP_200_OK
+
+    mocker.patch(
+        "authentication.views.stripe.construct_event",
+        return_value=event_factory("customer.subscription.deleted"),
+    )
+
+    # WHEN
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(URL)
+
+    # THEN
+    response = api_client.get(f"/{BASE_API_URL}expenses/indicators")
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+
+    response = api_client.post(f"/{BASE_API_URL}token/refresh", data={"refresh": str(refresh)})
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+    response = api_client.get(f"/{BASE_API_URL}expenses/indicators")
+    assert response.status_code == HTTP_403_FORBIDDEN
+
+
 def test__webhook__subscription_trial_will_end(api_client, stripe_user, event_factory, mocker):
     # GIVEN
     mocker.patch(
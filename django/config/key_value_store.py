@@ -1,12 +1,22 @@
+import json
+import logging
+import os
 import pickle  # nosec
-from threading import Lock, RLock
-from time import monotonic
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from contextlib import suppress
+from decimal import Decimal
+from threading import Event, Lock
+from time import monotonic, sleep
 from typing import Any, TypedDict
+from uuid import uuid4
 
 from django.conf import settings
 
 from redis import Redis
 
+logger = logging.getLogger(__name__)
+
 # region: types
 
 
@@ -18,75 +28,370 @@ class _Cache(TypedDict):
 # endregion: types
 
 
+# region: serializers
+
+
+class PickleSerializer:
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)  # nosec
+
+
+class CompactSerializer(PickleSerializer):
+    """Store `Decimal`s, `int`s and `str`s as tagged plain text.
+
+    These are most of the values (e.g. conversion rates) and their text representation
+    is a fraction of the size of a pickle. Any other value is pickled. Values written by
+    `PickleSerializer` are still readable, so the serializer can be switched at any time.
+    """
+
+    _tags: dict[bytes, Callable[[str], Any]] = {b"d:": Decimal, b"i:": int, b"s:": str}
+
+    def dumps(self, value: Any) -> bytes:
+        if isinstance(value, Decimal):
+            return b"d:" + str(value).encode()
+        if type(value) is int:  # `bool` is an `int` as well
+            return b"i:" + str(value).encode()
+        if isinstance(value, str):
+            return b"s:" + value.encode()
+        return super().dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        cast = self._tags.get(data[:2])
+        return cast(data[2:].decode()) if cast is not None else super().loads(data)
+
+
+SERIALIZERS = {"pickle": PickleSerializer, "compact": CompactSerializer}
+
+
+# endregion: serializers
+
+
 # https://github.com/jazzband/django-constance/blob/master/constance/backends/redisd.py
 class RedisBackend:
-    def __init__(self, url: str = "", timeout: int | None = None) -> None:
-        self._client = Redis.from_url(url or settings.REDIS_CONNECTION_URL)
+    is_shared = True
+
+    def __init__(
+        self,
+        url: str = "",
+        timeout: int | None = None,
+        serializer: str = "",
+        client: Redis | None = None,
+    ) -> None:
+        self._client = client or Redis.from_url(url or settings.REDIS_CONNECTION_URL)
         self.timeout = timeout if timeout is not None else settings.REDIS_TIMEOUT_IN_SECONDS
+        self._serializer = SERIALIZERS[serializer or settings.REDIS_SERIALIZER]()
 
     def ping(self) -> bool:  # pragma: no cover
         return self._client.ping()
 
     def get(self, key: str) -> Any:
         value = self._client.get(key)
-        return pickle.loads(value) if value else value  # nosec
+        return self._serializer.loads(value) if value else value
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Fetch `keys` in a single round trip. Missing keys are not included."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        return {
+            key: self._serializer.loads(value)
+            for key, value in zip(keys, self._client.mget(keys), strict=True)
+            if value
+        }
+
+    def set(self, key: str, value: Any, timeout: int | None = None) -> None:
+        self._client.set(key, self._serializer.dumps(value), ex=timeout or self.timeout)
+
+    def set_many(self, mapping: dict[str, Any], timeout: int | None = None) -> None:
+        """Store every item of `mapping` in a single round trip."""
+        if not mapping:
+            return
+        # `MSET` doesn't support expiration
+        pipeline = self._client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipeline.set(key, self._serializer.dumps(value), ex=timeout or self.timeout)
+        pipeline.execute()
+
 
-    def set(self, key: str, value: Any) -> None:
-        self._client.set(key, pickle.dumps(value), ex=self.timeout)
+class _Flight:
+    def __init__(self) -> None:
+        self.done = Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        # a `set` happened while the value was being fetched
+        self.stale = False
 
 
 class RedisBackendWInMemoryCache(RedisBackend):
-    _default = object()
-    _lock = RLock()
+    """A `RedisBackend` with a bounded, least recently used, in-process cache.
 
-    def __init__(self, url: str = "", timeout: int | None = None) -> None:
-        super().__init__(url=url, timeout=timeout)
-        self._cache: dict[str, _Cache] = {}
+    Reads of cached values don't take any lock. When a key isn't cached only one thread
+    fetches it from redis while the others asking for the same key wait for its result
+    (single-flight), so concurrent misses of different keys don't block each other.
+    `hits` and `misses` count the reads served by (or not found in) the in-process cache.
+    Under concurrency they are approximations as they're not updated atomically.
 
-    def _set_memory_cache(self, key: str, value: Any) -> None:
-        self._cache[key] = {"expire": monotonic() + self.timeout, "value": value}
+    Every write is published to `invalidation_channel` and every process evicts the keys
+    written by the others from its in-process cache, so the in-process entries can live
+    much longer (`memory_timeout`) than it would be safe otherwise.
+    """
 
-    def get(self, key: str) -> Any:
-        cache: object | _Cache = self._cache.get(key, self._default)
-        if cache is self._default or cache["expire"] <= monotonic():
+    def __init__(
+        self,
+        url: str = "",
+        timeout: int | None = None,
+        serializer: str = "",
+        max_entries: int | None = None,
+        memory_timeout: int | None = None,
+        invalidation_channel: str | None = None,
+        client: Redis | None = None,
+    ) -> None:
+        super().__init__(url=url, timeout=timeout, serializer=serializer, client=client)
+        self.max_entries = (
+            max_entries if max_entries is not None else settings.REDIS_MEMORY_CACHE_MAX_ENTRIES
+        )
+        self.memory_timeout = memory_timeout
+        self.invalidation_channel = (
+            invalidation_channel
+            if invalidation_channel is not None
+            else settings.REDIS_INVALIDATION_CHANNEL
+        )
+        # identifies the writes of this instance so it doesn't evict its own entries
+        self._id = uuid4().hex
+        self._subscriber: Any = None
+        self._subscriber_pid: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[str, _Cache] = OrderedDict()
+        self._flights: dict[str, _Flight] = {}
+        # guards the in-process state only, it's never held while talking to redis
+        self._lock = Lock()
+        self._subscriber_lock = Lock()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+    def _subscribe(self) -> None:
+        if not self.invalidation_channel or self._subscriber_pid == os.getpid():
+            return
+
+        with self._subscriber_lock:
+            # the thread doesn't survive a `fork`
+            if self._subscriber_pid == os.getpid():
+                return
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.invalidation_channel: self._handle_invalidation})
+            self._subscriber = pubsub.run_in_thread(
+                sleep_time=1, daemon=True, exception_handler=self._handle_subscriber_error
+            )
+            self._subscriber_pid = os.getpid()
+            # the writes that happened before the subscription were missed
             with self._lock:
-                value = super().get(key)
-                # Ideally, this update would have been done by `set` method below
-                # but it may happen that the value is indeed the same between two
-                # updates (two `set` call). In this scenario, we'd like to still
-                # avoid calling redis so we update the memory cache to adjust the
-                # `expire` for this given `key`
-                if value is not None:
-                    self._set_memory_cache(key, value)
-                return value
+                self._cache.clear()
+
+    def _handle_invalidation(self, message: dict[str, Any]) -> None:
+        data = json.loads(message["data"])
+        if data["origin"] == self._id:
+            return
+        self._evict(data["keys"])
+
+    def _handle_subscriber_error(self, exc: Exception, pubsub: Any, thread: Any) -> None:
+        # the messages published while disconnected are lost. The subscription is restored
+        # by `redis` on the next read
+        logger.warning("Key value store invalidation subscriber failed: %s", exc)
+        with self._lock:
+            self._cache.clear()
+        sleep(1)
 
+    def _evict(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._cache.pop(key, None)
+                if (flight := self._flights.get(key)) is not None:
+                    flight.stale = True
+
+    def _publish(self, keys: Iterable[str]) -> None:
+        if self.invalidation_channel:
+            self._client.publish(
+                self.invalidation_channel, json.dumps({"origin": self._id, "keys": list(keys)})
+            )
+
+    def _set_memory_cache(self, key: str, value: Any, timeout: int | None = None) -> None:
+        memory_timeout = self.memory_timeout or self.timeout
+        timeout = min(timeout, memory_timeout) if timeout else memory_timeout
+        with self._lock:
+            self._cache[key] = {"expire": monotonic() + timeout, "value": value}
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _get_memory_cache(self, key: str) -> Any:
+        cache = self._cache.get(key)
+        if cache is None or cache["expire"] <= monotonic():
+            self.misses += 1
+            return None
+        with suppress(KeyError):  # evicted by another thread
+            self._cache.move_to_end(key)
+        self.hits += 1
         return cache["value"]
 
-    def set(self, key: str, value: Any) -> None:
+    def _fetch(
+        self, keys: list[str], fetch: Callable[[list[str]], dict[str, Any]]
+    ) -> dict[str, Any]:
+        leading: dict[str, _Flight] = {}
+        following: dict[str, _Flight] = {}
+        with self._lock:
+            for key in keys:
+                flight = self._flights.get(key)
+                if flight is None:
+                    leading[key] = self._flights[key] = _Flight()
+                else:
+                    following[key] = flight
+
+        result: dict[str, Any] = {}
+        if leading:
+            try:
+                values = fetch(list(leading))
+            except BaseException as e:
+                for flight in leading.values():
+                    flight.error = e
+                raise
+            else:
+                for key, flight in leading.items():
+                    flight.value = result[key] = values.get(key)
+                    # Ideally, this update would have been done by `set` method below
+                    # but it may happen that the value is indeed the same between two
+                    # updates (two `set` call). In this scenario, we'd like to still
+                    # avoid calling redis so we update the memory cache to adjust the
+                    # `expire` for this given `key`
+                    if flight.value is not None and not flight.stale:
+                        self._set_memory_cache(key, flight.value)
+            finally:
+                with self._lock:
+                    for key, flight in leading.items():
+                        del self._flights[key]
+                        flight.done.set()
+
+        for key, flight in following.items():
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            result[key] = flight.value
+        return result
+
+    def get(self, key: str) -> Any:
+        self._subscribe()
+        value = self._get_memory_cache(key)
+        if value is not None:
+            return value
+        return self._fetch([key], lambda keys: {keys[0]: RedisBackend.get(self, keys[0])})[key]
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        self._subscribe()
+        result: dict[str, Any] = {}
+        missing: list[str] = []
+        for key in dict.fromkeys(keys):
+            value = self._get_memory_cache(key)
+            if value is not None:
+                result[key] = value
+            else:
+                missing.append(key)
+
+        if missing:
+            fetched = self._fetch(missing, lambda keys: RedisBackend.get_many(self, keys))
+            result.update({k: v for k, v in fetched.items() if v is not None})
+        return result
+
+    def _invalidate_flights(self, keys: Iterable[str]) -> None:
         with self._lock:
-            super().set(key, value)
-            self._set_memory_cache(key, value)
+            for key in keys:
+                if (flight := self._flights.get(key)) is not None:
+                    flight.stale = True
+
+    def set(self, key: str, value: Any, timeout: int | None = None) -> None:
+        self._subscribe()
+        self._invalidate_flights([key])
+        super().set(key, value, timeout=timeout)
+        self._set_memory_cache(key, value, timeout=timeout)
+        self._publish([key])
+
+    def set_many(self, mapping: dict[str, Any], timeout: int | None = None) -> None:
+        self._subscribe()
+        self._invalidate_flights(mapping)
+        super().set_many(mapping, timeout=timeout)
+        for key, value in mapping.items():
+            self._set_memory_cache(key, value, timeout=timeout)
+        self._publish(mapping)
 
 
 # https://github.com/jazzband/django-constance/blob/master/constance/backends/memory.py
 class MemoryBackend:
-    _storage = {}
+    """An in-process, least recently used, key value store.
+
+    As opposed to the redis backends, the values aren't shared by the processes (`is_shared`)
+    so a value written by one of them is only seen by the others once their own copies
+    expire. `timeout` and `max_entries` bound for how long and how many values are kept.
+    """
+
+    is_shared = False
+
+    _storage: OrderedDict[str, _Cache] = OrderedDict()
     _lock = Lock()
 
+    def __init__(self, timeout: int | None = None, max_entries: int | None = None) -> None:
+        self.timeout = timeout if timeout is not None else settings.REDIS_TIMEOUT_IN_SECONDS
+        self.max_entries = (
+            max_entries if max_entries is not None else settings.REDIS_MEMORY_CACHE_MAX_ENTRIES
+        )
+
+    def _get(self, key: str, now: float) -> Any:
+        cache = self._storage.get(key)
+        if cache is None:
+            return None
+        if cache["expire"] <= now:
+            del self._storage[key]
+            return None
+        self._storage.move_to_end(key)
+        return cache["value"]
+
+    def _set(self, key: str, value: Any, expire: float) -> None:
+        self._storage[key] = {"expire": expire, "value": value}
+        self._storage.move_to_end(key)
+        while len(self._storage) > self.max_entries:
+            self._storage.popitem(last=False)
+
     def get(self, key: str) -> Any:
         with self._lock:
-            return self._storage.get(key)
+            return self._get(key, now=monotonic())
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        now = monotonic()
+        with self._lock:
+            values = {key: self._get(key, now=now) for key in keys}
+        return {key: value for key, value in values.items() if value is not None}
+
+    def set(self, key: str, value: Any, timeout: int | None = None) -> None:
+        expire = monotonic() + (timeout or self.timeout)
+        with self._lock:
+            self._set(key, value, expire=expire)
 
-    def set(self, key: str, value: Any) -> None:
+    def set_many(self, mapping: dict[str, Any], timeout: int | None = None) -> None:
+        expire = monotonic() + (timeout or self.timeout)
         with self._lock:
-            self._storage[key] = value
+            for key, value in mapping.items():
+                self._set(key, value, expire=expire)
 
 
 if settings.ENVIRONMENT == "pytest":
     key_value_backend = MemoryBackend()
 elif settings.USE_REDIS:  # pragma: no cover
     try:
-        key_value_backend = RedisBackendWInMemoryCache()
+        key_value_backend = RedisBackendWInMemoryCache(
+            memory_timeout=settings.REDIS_MEMORY_CACHE_TIMEOUT_IN_SECONDS
+        )
         key_value_backend.ping()
     except Exception as e:
         print(e)
@@ -56,6 +56,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "variable_income_assets.middleware.DollarConversionRateScopeMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -153,9 +154,7 @@ BREVO_TEMPLATE_IDS = {
 }
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("authentication.auth.UserClaimsJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_PAGINATION_CLASS": "shared.pagination.CustomPageNumberPagination",
     "DEFAULT_FILTER_BACKENDS": (
@@ -169,6 +168,11 @@ REST_FRAMEWORK = {
     "COERCE_DECIMAL_TO_STRING": False,
 }
 
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "authentication.serializers.UserClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "authentication.serializers.UserClaimsTokenRefreshSerializer",
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Multi Sources Financial Control API",
     "DESCRIPTION": "B3, USA stocks and cryptos crawler + expenses and revenues tracker",
@@ -185,8 +189,18 @@ FERNET_KEY = secret(
 )
 
 TWELVE_DATA_API_KEY = secret("TWELVE_DATA_API_KEY", default="")
+# the free plan allows 8 credits per minute and each priced symbol costs one credit
+TWELVE_DATA_CREDITS_PER_MINUTE = secret("TWELVE_DATA_CREDITS_PER_MINUTE", default=8, cast=int)
 
 BRAPI_API_KEY = secret("BRAPI_API_KEY", default="")
+# number of tickers per `quote` request (it depends on the BrAPI plan)
+BRAPI_QUOTE_BATCH_SIZE = secret("BRAPI_QUOTE_BATCH_SIZE", default=10, cast=int)
+# tickers may be renamed at B3, so how long the resolution of a code (`available` endpoint)
+# is kept in the key value store
+BRAPI_VALID_CODES_KEY = secret("BRAPI_VALID_CODES_KEY", default="BRAPI_VALID_CODES")
+BRAPI_VALID_CODES_TTL_IN_SECONDS = secret(
+    "BRAPI_VALID_CODES_TTL_IN_SECONDS", default=7 * 24 * 60 * 60, cast=int
+)
 
 COIN_MARKET_CAP_API_KEY = secret("COIN_MARKET_CAP_API_KEY", default="")
 
@@ -218,6 +232,16 @@ QSTASH_NEXT_SIGNING_KEY = secret("QSTASH_NEXT_SIGNING_KEY", default="")
 
 REDIS_CONNECTION_URL = secret("REDIS_CONNECTION_URL", default="redis://localhost:6379")
 REDIS_TIMEOUT_IN_SECONDS = secret("REDIS_TIMEOUT_IN_SECONDS", default=1 * 60 * 60, cast=int)
+# "pickle" or "compact" (see `config.key_value_store.CompactSerializer`)
+REDIS_SERIALIZER = secret("REDIS_SERIALIZER", default="pickle")
+REDIS_MEMORY_CACHE_MAX_ENTRIES = secret("REDIS_MEMORY_CACHE_MAX_ENTRIES", default=10_000, cast=int)
+# the in-process copies are evicted when another process writes the key (empty channel disables it)
+REDIS_INVALIDATION_CHANNEL = secret(
+    "REDIS_INVALIDATION_CHANNEL", default="key_value_store:invalidate"
+)
+REDIS_MEMORY_CACHE_TIMEOUT_IN_SECONDS = secret(
+    "REDIS_MEMORY_CACHE_TIMEOUT_IN_SECONDS", default=24 * 60 * 60, cast=int
+)
 
 FRONTEND_BASE_URL = secret("FRONTEND_URL", default="http://localhost:3000")
 
@@ -231,3 +255,61 @@ DEFAULT_TRIAL_PERIOD_IN_DAYS = secret("DEFAULT_TRIAL_PERIOD_IN_DAYS", default=7,
 DOLLAR_CONVERSION_RATE_KEY = secret("DOLLAR_CONVERSION_RATE_KEY", default="DOLLAR_CONVERSION_RATE")
 
 APY_HUB_API_KEY = secret("APY_HUB_API_KEY", default="")
+
+# Prices fetched from the third party APIs are cached in the key value store: a price newer
+# than `ASSET_QUOTES_MAX_AGE_IN_SECONDS` is used instead of calling the API and an older one
+# is the fallback when the API is unavailable
+ASSET_QUOTES_KEY_PREFIX = secret("ASSET_QUOTES_KEY_PREFIX", default="ASSET_QUOTE")
+ASSET_QUOTES_MAX_AGE_IN_SECONDS = secret(
+    "ASSET_QUOTES_MAX_AGE_IN_SECONDS", default=15 * 60, cast=int
+)
+ASSET_QUOTES_RETENTION_IN_SECONDS = secret(
+    "ASSET_QUOTES_RETENTION_IN_SECONDS", default=7 * 24 * 60 * 60, cast=int
+)
+# The portfolio summaries (e.g. the indicators) are cached per user and invalidated by bumping
+# a version of the user (read model upserts) or a global one (price and conversion rate updates).
+# They're only cached with redis, whose versions are shared by every process
+PORTFOLIO_SUMMARY_KEY_PREFIX = secret("PORTFOLIO_SUMMARY_KEY_PREFIX", default="PORTFOLIO_SUMMARY")
+PORTFOLIO_SUMMARY_TIMEOUT_IN_SECONDS = secret(
+    "PORTFOLIO_SUMMARY_TIMEOUT_IN_SECONDS", default=24 * 60 * 60, cast=int
+)
+# The access tokens embed the subscription and the modules of the user (see
+# `authentication.services.jwt`) and are rejected once its `token_version` changes. The
+# versions are cached for `AUTH_TOKEN_VERSION_TIMEOUT_IN_SECONDS`, the most a bump takes to
+# reject the older tokens on a process whose key value store isn't shared (i.e. without redis)
+AUTH_TOKEN_VERSION_KEY_PREFIX = secret("AUTH_TOKEN_VERSION_KEY_PREFIX", default="TOKEN_VERSION")
+AUTH_TOKEN_VERSION_TIMEOUT_IN_SECONDS = secret(
+    "AUTH_TOKEN_VERSION_TIMEOUT_IN_SECONDS", default=60, cast=int
+)
+# Create the metadata of new assets with the cached price and fetch it in background instead
+# of calling the third party API during the request
+ASSET_METADATA_FETCH_PRICE_IN_BACKGROUND = secret(
+    "ASSET_METADATA_FETCH_PRICE_IN_BACKGROUND", default=False, cast=bool
+)
+
+# How `AssetQuerySet.annotate_read_fields` and `annotate_for_simulation` aggregate the closed
+# operations: `join` (alongside the transactions) or `pre_aggregated` (a subquery per asset,
+# compared against `join` by the benchmarks in `shared.tests.benchmarks`)
+ASSETS_AGGREGATION = secret("ASSETS_AGGREGATION", default="join")
+
+# `inline` executes the async event handlers of the investments message bus in the same
+# process/request. `outbox` persists them to be executed by `manage.py run_event_worker`
+INVESTMENTS_EVENTS_BACKEND = secret("INVESTMENTS_EVENTS_BACKEND", default="inline")
+INVESTMENTS_EVENTS_MAX_ATTEMPTS = secret("INVESTMENTS_EVENTS_MAX_ATTEMPTS", default=5, cast=int)
+# hours the processed outbox events are kept before being deleted
+INVESTMENTS_EVENTS_RETENTION_IN_HOURS = secret(
+    "INVESTMENTS_EVENTS_RETENTION_IN_HOURS", default=24, cast=int
+)
+# seconds a coalescible outbox event waits for others of the same asset to be merged into it
+INVESTMENTS_EVENTS_COALESCE_WINDOW_IN_SECONDS = secret(
+    "INVESTMENTS_EVENTS_COALESCE_WINDOW_IN_SECONDS", default=0, cast=int
+)
+
+# Ceilings for the B3 workbooks (`xlsx`) imports: the size of the upload and the size of its
+# decompressed content, which bounds the memory used by the (streaming) parsers
+B3_IMPORT_MAX_UPLOAD_SIZE_IN_BYTES = secret(
+    "B3_IMPORT_MAX_UPLOAD_SIZE_IN_BYTES", default=10 * 1024 * 1024, cast=int
+)
+B3_IMPORT_MAX_UNCOMPRESSED_SIZE_IN_BYTES = secret(
+    "B3_IMPORT_MAX_UNCOMPRESSED_SIZE_IN_BYTES", default=200 * 1024 * 1024, cast=int
+)
@@ -0,0 +1,86 @@
+from collections import defaultdict
+from collections.abc import Callable
+from threading import Lock
+from typing import Any
+
+
+class FakeRedisServer:
+    """The state shared by every `FakeRedis` client, as if they were connected to the
+    same redis server (e.g. from different processes)."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.subscribers: defaultdict[str, list[Callable[[dict[str, Any]], None]]] = defaultdict(
+            list
+        )
+        self.lock = Lock()
+
+
+class _FakePipeline:
+    def __init__(self, client: "FakeRedis") -> None:
+        self._client = client
+        self._commands: list[tuple[str, bytes, int | None]] = []
+
+    def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self._commands.append((key, value, ex))
+
+    def execute(self) -> list[bool]:
+        return [self._client.set(key, value, ex=ex) for key, value, ex in self._commands]
+
+
+class _FakePubSubWorkerThread:
+    def stop(self) -> None:
+        pass
+
+
+class _FakePubSub:
+    def __init__(self, server: FakeRedisServer) -> None:
+        self._server = server
+
+    def subscribe(self, **handlers: Callable[[dict[str, Any]], None]) -> None:
+        with self._server.lock:
+            for channel, handler in handlers.items():
+                self._server.subscribers[channel].append(handler)
+
+    def run_in_thread(self, **_) -> _FakePubSubWorkerThread:
+        # messages are delivered synchronously by `FakeRedis.publish`
+        return _FakePubSubWorkerThread()
+
+
+class FakeRedis:
+    """An in-memory stand-in for the subset of the `redis.Redis` client used by
+    `config.key_value_store`. Expiration is ignored."""
+
+    def __init__(self, server: FakeRedisServer | None = None) -> None:
+        self.server = server or FakeRedisServer()
+        self.calls: defaultdict[str, int] = defaultdict(int)
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, key: str) -> bytes | None:
+        self.calls["get"] += 1
+        return self.server.data.get(key)
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        self.calls["mget"] += 1
+        return [self.server.data.get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ex: int | None = None) -> bool:
+        self.calls["set"] += 1
+        with self.server.lock:
+            self.server.data[key] = value
+        return True
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    def publish(self, channel: str, message: str) -> int:
+        self.calls["publish"] += 1
+        handlers = list(self.server.subscribers[channel])
+        for handler in handlers:
+            handler({"type": "message", "channel": channel.encode(), "data": message.encode()})
+        return len(handlers)
+
+    def pubsub(self, **_) -> _FakePubSub:
+        return _FakePubSub(self.server)
@@ -1,8 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
 from time import monotonic, sleep
 
 import pytest
+from freezegun import freeze_time
 
-from ..key_value_store import RedisBackendWInMemoryCache
+from ..key_value_store import (
+    CompactSerializer,
+    MemoryBackend,
+    PickleSerializer,
+    RedisBackendWInMemoryCache,
+)
+from .fakes import FakeRedis, FakeRedisServer
 
 
 @pytest.fixture
@@ -12,6 +22,18 @@ def redis_backend(redisdb):
     )
 
 
+@pytest.fixture
+def memory_backend():
+    MemoryBackend._storage.clear()
+    yield MemoryBackend(timeout=60, max_entries=2)
+    MemoryBackend._storage.clear()
+
+
+@pytest.fixture
+def offline_redis_backend():
+    return RedisBackendWInMemoryCache(client=FakeRedis(), timeout=60, max_entries=2)
+
+
 def test__redis_backend__do_not_set_memory_cache_if_value_not_in_db(redis_backend):
     # GIVEN
 
@@ -68,3 +90,161 @@ def test__redis_backend__renew_memory_cache(redis_backend, mocker):
     # THEN
     assert redis_get_mocked.call_count == 1
     assert redis_backend._cache["test"]["value"] == result == 2
+
+
+def test__redis_backend__get_many_and_set_many(redis_backend):
+    # GIVEN
+    redis_backend.set_many({"a": 1, "b": Decimal("2.5")})
+    redis_backend._cache.clear()
+    redis_backend.set("c", "3")
+
+    # WHEN
+    result = redis_backend.get_many(["a", "b", "c", "d"])
+
+    # THEN
+    assert result == {"a": 1, "b": Decimal("2.5"), "c": "3"}
+    assert redis_backend.stats() == {"hits": 1, "misses": 3, "size": 3}
+
+
+def test__redis_backend__lru_eviction(offline_redis_backend, mocker):
+    # GIVEN
+    mocker.patch("config.key_value_store.RedisBackend.set")
+    redis_get_mocked = mocker.patch("config.key_value_store.RedisBackend.get", return_value=0)
+    offline_redis_backend.set("a", 1)
+    offline_redis_backend.set("b", 2)
+
+    # WHEN
+    offline_redis_backend.get("a")  # `b` becomes the least recently used
+    offline_redis_backend.set("c", 3)
+
+    # THEN
+    assert list(offline_redis_backend._cache) == ["a", "c"]
+    assert offline_redis_backend.get("b") == 0
+    assert redis_get_mocked.call_count == 1
+    assert offline_redis_backend.stats() == {"hits": 1, "misses": 1, "size": 2}
+
+
+def test__redis_backend__single_flight(offline_redis_backend, mocker):
+    # GIVEN
+    def slow_get(self, key):
+        sleep(0.2)
+        return key.upper()
+
+    redis_get_mocked = mocker.patch(
+        "config.key_value_store.RedisBackend.get", autospec=True, side_effect=slow_get
+    )
+
+    # WHEN
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(offline_redis_backend.get, ["a"] * 5))
+
+    # THEN
+    assert results == ["A"] * 5
+    assert redis_get_mocked.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "value", [Decimal("5.4321"), 10, "PETR4", True, 1.5, (Decimal("1"), datetime(2024, 1, 1))]
+)
+def test__compact_serializer(value):
+    # GIVEN
+    serializer = CompactSerializer()
+
+    # WHEN
+    result = serializer.loads(serializer.dumps(value))
+
+    # THEN
+    assert result == value
+    assert type(result) is type(value)
+
+
+def test__compact_serializer__read_pickled_values():
+    # GIVEN
+    data = PickleSerializer().dumps(Decimal("5.4321"))
+
+    # WHEN
+    result = CompactSerializer().loads(data)
+
+    # THEN
+    assert result == Decimal("5.4321")
+    assert len(CompactSerializer().dumps(Decimal("5.4321"))) < len(data)
+
+
+def test__redis_backend__evict_keys_written_by_other_processes():
+    # GIVEN
+    server = FakeRedisServer()
+    worker1, worker2 = (
+        RedisBackendWInMemoryCache(client=FakeRedis(server), timeout=60, memory_timeout=3600)
+        for _ in range(2)
+    )
+    worker1.set("rate", Decimal("5.0"))
+    worker2.get("rate")
+
+    # WHEN
+    worker1.set("rate", Decimal("5.5"))
+
+    # THEN
+    assert "rate" not in worker2._cache
+    assert worker2.get("rate") == Decimal("5.5")
+    assert worker1._cache["rate"]["value"] == Decimal("5.5")  # not evicted by its own write
+
+
+def test__redis_backend__set_many_publishes_once():
+    # GIVEN
+    server = FakeRedisServer()
+    worker1, worker2 = (
+        RedisBackendWInMemoryCache(client=FakeRedis(server), timeout=60) for _ in range(2)
+    )
+    worker2.set_many({"a": 1, "b": 2})
+
+    # WHEN
+    worker1.set_many({"a": 10, "b": 20})
+
+    # THEN
+    assert worker1._client.calls["publish"] == 1
+    assert worker2._cache == {}
+    assert worker2.get_many(["a", "b"]) == {"a": 10, "b": 20}
+    assert worker2._client.calls["mget"] == 1
+
+
+def test__redis_backend__memory_timeout(offline_redis_backend):
+    # GIVEN
+    offline_redis_backend.memory_timeout = 3600
+
+    # WHEN
+    with freeze_time() as frozen_time:
+        offline_redis_backend.set("a", 1)
+        frozen_time.tick(offline_redis_backend.timeout + 1)
+
+        # THEN
+        assert offline_redis_backend.get("a") == 1
+        assert offline_redis_backend._client.calls["get"] == 0
+
+
+def test__memory_backend__timeout(memory_backend):
+    # GIVEN
+    with freeze_time() as frozen_time:
+        memory_backend.set("a", 1)
+        memory_backend.set_many({"b": 2}, timeout=3600)
+
+        # WHEN
+        frozen_time.tick(memory_backend.timeout + 1)
+
+        # THEN
+        assert memory_backend.get("a") is None
+        assert memory_backend.get_many(["a", "b"]) == {"b": 2}
+        assert list(MemoryBackend._storage) == ["b"]
+
+
+def test__memory_backend__lru_eviction(memory_backend):
+    # GIVEN
+    memory_backend.set("a", 1)
+    memory_backend.set("b", 2)
+
+    # WHEN
+    memory_backend.get("a")  # `b` becomes the least recently used
+    memory_backend.set("c", 3)
+
+    # THEN
+    assert list(MemoryBackend._storage) == ["a", "c"]
+    assert memory_backend.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
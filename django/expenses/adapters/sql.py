@@ -3,24 +3,122 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
 from dataclasses import asdict
+from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from django.db.models import F
+from django.db import connections, router
+from django.db.models import DateField, F, Q, Value
+from django.utils import timezone
 
 from dateutil.relativedelta import relativedelta
 
+from shared.managers_utils import AddMonths, ReplaceDay
+
 from ..domain.models import Expense as ExpenseDTO
 from ..domain.models import Revenue as RevenueDTO
+from ..managers import FIXED_OCCURRENCES_HORIZON_IN_MONTHS
 
 if TYPE_CHECKING:
     from ..domain.models import Expense as ExpenseDomainModel
-    from ..models import Expense, ExpenseTag, Revenue
+    from ..managers import ExpenseRecurrenceQuerySet, RevenueRecurrenceQuerySet
+    from ..models import Expense, ExpenseRecurrence, Revenue, RevenueRecurrence
 
     Entity = Expense | Revenue
     EntityDTO = ExpenseDTO | RevenueDTO
     ExpenseTagThrough = Expense.tags.through
+    Recurrence = ExpenseRecurrence | RevenueRecurrence
+    RecurrenceQuerySet = ExpenseRecurrenceQuerySet | RevenueRecurrenceQuerySet
+
+
+# region: recurrences
+
+
+def _get_recurrence_period(dto: EntityDTO) -> tuple[date, date | None]:
+    # the month of `dto` is covered by its entity. As when the occurrences were persisted ahead,
+    # a series whose first `FIXED_OCCURRENCES_HORIZON_IN_MONTHS` months are already past is over
+    month = dto.created_at.replace(day=1)
+    ends_at = month + relativedelta(months=FIXED_OCCURRENCES_HORIZON_IN_MONTHS)
+    return (
+        month + relativedelta(months=1),
+        None if ends_at >= timezone.localdate().replace(day=1) else ends_at,
+    )
+
+
+def _materialize_past_occurrences(recurrences: RecurrenceQuerySet, recurrence: Recurrence) -> None:
+    # only the future occurrences are generated at read time
+    current_month = timezone.localdate().replace(day=1)
+    if recurrence.starts_at <= current_month:
+        recurrences.filter(pk=recurrence.pk).materialize(
+            start=recurrence.starts_at,
+            end=current_month if recurrence.ends_at is None else recurrence.ends_at,
+        )
+
+
+def _get_recurrence_covering(recurrences: RecurrenceQuerySet, month: date) -> Recurrence | None:
+    return recurrences.covering(start=month, end=month).first()
+
+
+def _split_recurrences(recurrences: RecurrenceQuerySet, month: date, **changes) -> list[Recurrence]:
+    """Apply `changes` to the months after `month` of the series. The recurrence covering
+    `month` is split so its previous months remain unchanged.
+
+    Returns the changed recurrences."""
+    recurrences.filter(starts_at__gt=month).update(**changes)
+    changed = list(recurrences.filter(starts_at__gt=month))
+
+    recurrence = _get_recurrence_covering(recurrences, month)
+    if recurrence is not None and (recurrence.ends_at is None or recurrence.ends_at > month):
+        changed.append(
+            recurrence.copy(
+                starts_at=month + relativedelta(months=1), ends_at=recurrence.ends_at, **changes
+            )
+        )
+        recurrence.ends_at = month
+        recurrence.save(update_fields=("ends_at",))
+    return changed
+
+
+def _skip_recurrences_month(recurrences: RecurrenceQuerySet, month: date) -> None:
+    """Stop generating the occurrence of `month` of the series, e.g. as it was deleted."""
+    recurrence = _get_recurrence_covering(recurrences, month)
+    if recurrence is None:
+        return
+
+    if recurrence.ends_at is None or recurrence.ends_at > month:
+        recurrence.copy(starts_at=month + relativedelta(months=1))
+    if recurrence.starts_at < month:
+        recurrence.ends_at = month - relativedelta(months=1)
+        recurrence.save(update_fields=("ends_at",))
+    else:
+        recurrence.delete()
+
+
+def _end_recurrences(recurrences: RecurrenceQuerySet, month: date) -> None:
+    """Stop generating the occurrences of the series from `month` on."""
+    recurrences.filter(starts_at__gte=month).delete()
+    recurrences.filter(Q(ends_at__isnull=True) | Q(ends_at__gte=month)).update(
+        ends_at=month - relativedelta(months=1)
+    )
+
+
+# endregion: recurrences
+
+
+# the tags that already exist are read from the snapshot taken before the `INSERT`, so they
+# aren't returned twice
+_POSTGRES_GET_OR_CREATE_TAGS_SQL = """
+WITH inserted AS (
+    INSERT INTO {table} (name, user_id)
+    SELECT UNNEST(%s::varchar[]), %s
+    ON CONFLICT (name, user_id) DO NOTHING
+    RETURNING id
+)
+SELECT id FROM inserted
+UNION ALL
+SELECT id FROM {table} WHERE user_id = %s AND name = ANY(%s)
+"""
 
 
 class AbstractEntityRepository(ABC):
@@ -91,6 +189,10 @@ class AbstractExpenseRepository(AbstractEntityRepository):
     def delete_future_fixed_expenses(self, dto: ExpenseDTO) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def skip_fixed_expense(self, dto: ExpenseDTO) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     def change_all_categories(self, *, prev_name: str, name: str, new_id: int) -> int:
         raise NotImplementedError
@@ -103,25 +205,36 @@ class AbstractExpenseRepository(AbstractEntityRepository):
 class ExpenseRepository(AbstractExpenseRepository):
     seen: set[ExpenseDTO]
 
-    def _get_tags_references(self, tags: Iterable[str]) -> list[ExpenseTag | int]:
+    def _get_tag_ids(self, tags: Iterable[str]) -> list[int]:
+        """The ids of the tags named `tags`, creating the ones that don't exist yet."""
         if not tags:
             return []
 
         from ..models import ExpenseTag
 
-        existing_tag_ids, existing_tag_names = [], set()
-        for existing_tag in ExpenseTag.objects.only("pk", "name").filter(
-            user_id=self.user_id, name__in=tags
-        ):
-            existing_tag_ids.append(existing_tag.pk)
-            existing_tag_names.add(existing_tag.name)
-
-        tag_objs = ExpenseTag.objects.bulk_create(
-            [ExpenseTag(user_id=self.user_id, name=tag) for tag in tags - existing_tag_names],
-            # ideally we'd set `ignore_conflicts=True` to mimic a bulk `get_or_create`
-            # but unfortunately Django does not return the PKs when setting such flag
+        names = list(set(tags))
+        connection = connections[router.db_for_write(ExpenseTag)]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    _POSTGRES_GET_OR_CREATE_TAGS_SQL.format(table=ExpenseTag._meta.db_table),
+                    (names, self.user_id, self.user_id, names),
+                )
+                tag_ids = [pk for (pk,) in cursor.fetchall()]
+            # some are missing if a concurrent transaction has created them after the snapshot
+            # of the statement was taken
+            if len(tag_ids) == len(names):
+                return tag_ids
+        else:
+            ExpenseTag.objects.bulk_create(
+                [ExpenseTag(user_id=self.user_id, name=name) for name in names],
+                ignore_conflicts=True,
+            )
+        return list(
+            ExpenseTag.objects.filter(user_id=self.user_id, name__in=names).values_list(
+                "pk", flat=True
+            )
         )
-        return tag_objs + existing_tag_ids
 
     def _add(self, dto: ExpenseDTO) -> None:
         from ..models import Expense
@@ -133,44 +246,41 @@ class ExpenseRepository(AbstractExpenseRepository):
         extra_data = data.pop("extra_data")
         tags = data.pop("tags")
         expense = Expense.objects.create(user_id=self.user_id, **data, **extra_data)
+        dto.id = expense.pk
 
-        expense.tags.set(self._get_tags_references(tags))
+        self._persist_tags_to_expenses([expense.pk], tags)
 
     def _persist_tags_to_expenses(
-        self, expenses: list[Expense | int], tags: Iterable[str], clear: bool = False
+        self, expenses: Iterable[Expense | int], tags: Iterable[str], clear: bool = False
     ) -> None:
+        """Tag `expenses` with `tags`. If `clear` their other tags are removed.
+
+        Only the pairs that changed are written: the removed ones with a single `DELETE` and
+        the missing ones with a single `INSERT`.
+        """
         from ..models import Expense
 
-        tags_references = self._get_tags_references(tags)
-        if not tags_references:
-            if clear:
-                for expense in expenses:
-                    expense_kwarg = (
-                        {"expense_id": expense}
-                        if isinstance(expense, int)
-                        else {"expense": expense}
-                    )
-                    Expense.tags.through.objects.filter(**expense_kwarg).delete()
+        expense_ids = [e if isinstance(e, int) else e.pk for e in expenses]
+        if not expense_ids:
             return
 
-        through_objs: list[ExpenseTagThrough] = []
-        for expense in expenses:
-            expense_kwarg = (
-                {"expense_id": expense} if isinstance(expense, int) else {"expense": expense}
-            )
-
-            if clear:
-                Expense.tags.through.objects.filter(**expense_kwarg).delete()
+        through_model: type[ExpenseTagThrough] = Expense.tags.through
+        tag_ids = self._get_tag_ids(tags)
+        existing: set[tuple[int, int]] = set()
+        if clear:
+            qs = through_model.objects.filter(expense_id__in=expense_ids)
+            qs.exclude(expensetag_id__in=tag_ids).delete()
+            if tag_ids:
+                existing = set(qs.values_list("expense_id", "expensetag_id"))
 
-            through_objs.extend(
-                Expense.tags.through(
-                    **expense_kwarg,
-                    **({"expensetag_id": tag} if isinstance(tag, int) else {"expensetag": tag}),
-                )
-                for tag in tags_references
-            )
-
-        Expense.tags.through.objects.bulk_create(through_objs)
+        through_model.objects.bulk_create(
+            [
+                through_model(expense_id=expense_id, expensetag_id=tag_id)
+                for expense_id in expense_ids
+                for tag_id in tag_ids
+                if (expense_id, tag_id) not in existing
+            ]
+        )
 
     def _add_installments(self, dto: ExpenseDTO) -> list[Expense]:
         from ..models import Expense
@@ -200,34 +310,28 @@ class ExpenseRepository(AbstractExpenseRepository):
 
         return expenses
 
-    def add_future_fixed_expenses(self, dto: ExpenseDTO) -> list[Expense]:
-        from ..models import Expense
-
-        data = asdict(dto)
-        data.pop("id")
-        data.pop("installments")
-        data.pop("installments_qty")
-        data.pop("installments_id")
-
-        created_at = data.pop("created_at")
-        extra_data = data.pop("extra_data")
-        tags = data.pop("tags")
-
-        expenses = Expense.objects.bulk_create(
-            objs=(
-                Expense(
-                    user_id=self.user_id,
-                    created_at=created_at + relativedelta(months=i),
-                    **data,
-                    **extra_data,
-                )
-                for i in range(1, 12)
-            )
+    def add_future_fixed_expenses(self, dto: ExpenseDTO) -> ExpenseRecurrence:
+        from ..models import Expense, ExpenseRecurrence
+
+        expense = Expense.objects.get(pk=dto.id)
+        starts_at, ends_at = _get_recurrence_period(dto)
+        recurrence = ExpenseRecurrence.objects.create(
+            recurring_id=dto.recurring_id,
+            starts_at=starts_at,
+            ends_at=ends_at,
+            day=expense.created_at.day,
+            value=expense.value,
+            description=expense.description,
+            category=expense.category,
+            source=expense.source,
+            user_id=self.user_id,
+            bank_account_id=expense.bank_account_id,
+            expanded_category_id=expense.expanded_category_id,
+            expanded_source_id=expense.expanded_source_id,
         )
-
-        self._persist_tags_to_expenses(expenses, tags)
-
-        return expenses
+        recurrence.tags.set(expense.tags.all())
+        _materialize_past_occurrences(ExpenseRecurrence.objects, recurrence)
+        return recurrence
 
     def _update(self, dto: ExpenseDTO) -> None:
         from ..models import Expense
@@ -245,31 +349,24 @@ class ExpenseRepository(AbstractExpenseRepository):
             setattr(expense, key, value)
         expense.save()
 
-        expense.tags.set(self._get_tags_references(tags), clear=True)
+        self._persist_tags_to_expenses([expense.pk], tags, clear=True)
 
     def _update_installments(self, dto: ExpenseDTO, created_at_changed: bool) -> None:
         from ..models import Expense
 
         data = asdict(dto)
         installments_qs = Expense.objects.filter(installments_id=data.pop("installments_id"))
-        if created_at_changed:
-            expenses: list[Expense] = []
-            for i, expense in enumerate(installments_qs.order_by("created_at")):
-                # `releativedelta` doesn't work with django's `F` object so this doesn't work:
-                # date_fiff = instance.created_at - validated_data["created_at"]
-                # F("created_at") - relativedelta(seconds=int(date_diff.total_seconds()))
-                expense.created_at = dto.created_at + relativedelta(months=i)
-                expenses.append(expense)
-
-            # TODO try to remove this intermediary query
-            Expense.objects.bulk_update(objs=expenses, fields=("created_at",))
-
         data.pop("installments")
         data.pop("installments_qty")
         data.pop("created_at")
         data.pop("id")
         extra_data = data.pop("extra_data")
         tags = data.pop("tags")
+        if created_at_changed:
+            # the installments are one month apart, starting at `created_at`
+            extra_data["created_at"] = AddMonths(
+                Value(dto.created_at, output_field=DateField()), F("installment_number") - 1
+            )
         installments_qs.update(**data, **extra_data)
 
         self._persist_tags_to_expenses(
@@ -282,7 +379,7 @@ class ExpenseRepository(AbstractExpenseRepository):
         Expense.objects.filter(id=dto.id).delete()
 
     def update_future_fixed_expenses(self, dto: ExpenseDTO, created_at_changed: bool) -> None:
-        from ..models import Expense
+        from ..models import Expense, ExpenseRecurrence
 
         data = asdict(dto)
         created_at = data.pop("created_at")
@@ -291,38 +388,58 @@ class ExpenseRepository(AbstractExpenseRepository):
             recurring_id=recurring_id, created_at__gt=created_at
         ).exclude(id=data.pop("id"))
 
-        if created_at_changed:
-            expenses: list[Expense] = []
-            for expense in future_qs.order_by("created_at"):
-                # `releativedelta` doesn't work with django's `F` object so this doesn't work:
-                # date_fiff = instance.created_at - validated_data["created_at"]
-                # F("created_at") - relativedelta(seconds=int(date_diff.total_seconds()))
-                expense.created_at = expense.created_at.replace(day=created_at.day)
-                expenses.append(expense)
-
-            # TODO try to remove this intermediary query
-            Expense.objects.bulk_update(objs=expenses, fields=("created_at",))
-
         data.pop("installments")
         data.pop("installments_id")
         data.pop("installments_qty")
         extra_data = data.pop("extra_data")
         tags = data.pop("tags")
-        future_qs.update(**data, **extra_data)
+        future_qs.update(
+            **data,
+            **extra_data,
+            **(
+                {"created_at": ReplaceDay(F("created_at"), created_at.day)}
+                if created_at_changed
+                else {}
+            ),
+        )
 
         self._persist_tags_to_expenses(future_qs.values_list("id", flat=True), tags, clear=True)
 
+        data.pop("is_fixed")
+        if created_at_changed:
+            data["day"] = created_at.day
+        tag_ids = self._get_tag_ids(tags)
+        for recurrence in _split_recurrences(
+            ExpenseRecurrence.objects.filter(recurring_id=recurring_id),
+            month=created_at.replace(day=1),
+            **data,
+            **extra_data,
+        ):
+            recurrence.tags.set(tag_ids)
+
     def _delete_installments(self, dto: ExpenseDTO) -> None:
         from ..models import Expense
 
         Expense.objects.filter(installments_id=dto.installments_id).delete()
 
     def delete_future_fixed_expenses(self, dto: ExpenseDTO) -> None:
-        from ..models import Expense
+        from ..models import Expense, ExpenseRecurrence
 
         Expense.objects.filter(
             recurring_id=dto.recurring_id, created_at__gt=dto.created_at
         ).delete()
+        _end_recurrences(
+            ExpenseRecurrence.objects.filter(recurring_id=dto.recurring_id),
+            month=dto.created_at.replace(day=1),
+        )
+
+    def skip_fixed_expense(self, dto: ExpenseDTO) -> None:
+        from ..models import ExpenseRecurrence
+
+        _skip_recurrences_month(
+            ExpenseRecurrence.objects.filter(recurring_id=dto.recurring_id),
+            month=dto.created_at.replace(day=1),
+        )
 
     def get_installments(self, id: int, installments_id: UUID | None) -> list[ExpenseDomainModel]:
         from ..models import Expense
@@ -337,15 +454,22 @@ class ExpenseRepository(AbstractExpenseRepository):
         )
 
     def change_all_categories(self, *, prev_name: str, name: str, new_id: int) -> int:
-        from ..models import Expense
+        from ..models import Expense, ExpenseRecurrence
 
+        # the recurrences as well, otherwise their future occurrences would keep the old name
+        ExpenseRecurrence.objects.filter(user_id=self.user_id, category=prev_name).update(
+            category=name, expanded_category_id=new_id
+        )
         return Expense.objects.filter(user_id=self.user_id, category=prev_name).update(
             category=name, expanded_category_id=new_id
         )
 
     def change_all_sources(self, *, prev_name: str, name: str, new_id: int) -> int:
-        from ..models import Expense
+        from ..models import Expense, ExpenseRecurrence
 
+        ExpenseRecurrence.objects.filter(user_id=self.user_id, source=prev_name).update(
+            source=name, expanded_source_id=new_id
+        )
         return Expense.objects.filter(user_id=self.user_id, source=prev_name).update(
             source=name, expanded_source_id=new_id
         )
@@ -394,7 +518,7 @@ class AbstractRevenueRepository(AbstractEntityRepository):
 
     def _delete(self, *_, **__) -> None: ...
 
-    def add_fixed_future_revenues(self, dto: RevenueDTO) -> list[Revenue]:
+    def add_fixed_future_revenues(self, dto: RevenueDTO) -> RevenueRecurrence:
         raise NotImplementedError
 
     def update_future_fixed_revenues(self, dto: RevenueDTO, created_at_changed: bool) -> None:
@@ -403,28 +527,32 @@ class AbstractRevenueRepository(AbstractEntityRepository):
     def delete_future_fixed_revenues(self, dto: RevenueDTO) -> None:
         raise NotImplementedError
 
+    def skip_fixed_revenue(self, dto: RevenueDTO) -> None:
+        raise NotImplementedError
 
-class RevenueRepository(AbstractRevenueRepository):
-    def add_fixed_future_revenues(self, dto: RevenueDTO) -> list[Revenue]:
-        from ..models import Revenue
-
-        data = asdict(dto)
-        data.pop("id")
 
-        created_at = data.pop("created_at")
-        return Revenue.objects.bulk_create(
-            objs=(
-                Revenue(
-                    user_id=self.user_id,
-                    created_at=created_at + relativedelta(months=i),
-                    **data,
-                )
-                for i in range(1, 12)
-            )
+class RevenueRepository(AbstractRevenueRepository):
+    def add_fixed_future_revenues(self, dto: RevenueDTO) -> RevenueRecurrence:
+        from ..models import RevenueRecurrence
+
+        starts_at, ends_at = _get_recurrence_period(dto)
+        recurrence = RevenueRecurrence.objects.create(
+            recurring_id=dto.recurring_id,
+            starts_at=starts_at,
+            ends_at=ends_at,
+            day=dto.created_at.day,
+            value=dto.value,
+            description=dto.description,
+            category=dto.category,
+            user_id=self.user_id,
+            bank_account_id=dto.bank_account_id,
+            expanded_category_id=dto.expanded_category_id,
         )
+        _materialize_past_occurrences(RevenueRecurrence.objects, recurrence)
+        return recurrence
 
     def update_future_fixed_revenues(self, dto: RevenueDTO, created_at_changed: bool) -> None:
-        from ..models import Revenue
+        from ..models import Revenue, RevenueRecurrence
 
         data = asdict(dto)
         created_at = data.pop("created_at")
@@ -433,30 +561,50 @@ class RevenueRepository(AbstractRevenueRepository):
             recurring_id=recurring_id, created_at__gt=created_at
         ).exclude(id=data.pop("id"))
 
-        if created_at_changed:
-            revenues: list[Revenue] = []
-            for revenue in future_qs.order_by("created_at"):
-                # `releativedelta` doesn't work with django's `F` object so this doesn't work:
-                # date_fiff = instance.created_at - validated_data["created_at"]
-                # F("created_at") - relativedelta(seconds=int(date_diff.total_seconds()))
-                revenue.created_at = revenue.created_at.replace(day=created_at.day)
-                revenues.append(revenue)
-
-            # TODO try to remove this intermediary query
-            Revenue.objects.bulk_update(objs=revenues, fields=("created_at",))
+        future_qs.update(
+            **data,
+            **(
+                {"created_at": ReplaceDay(F("created_at"), created_at.day)}
+                if created_at_changed
+                else {}
+            ),
+        )
 
-        future_qs.update(**data)
+        data.pop("is_fixed")
+        if created_at_changed:
+            data["day"] = created_at.day
+        _split_recurrences(
+            RevenueRecurrence.objects.filter(recurring_id=recurring_id),
+            month=created_at.replace(day=1),
+            **data,
+        )
 
     def delete_future_fixed_revenues(self, dto: RevenueDTO) -> None:
-        from ..models import Revenue
+        from ..models import Revenue, RevenueRecurrence
 
         Revenue.objects.filter(
             recurring_id=dto.recurring_id, created_at__gt=dto.created_at
         ).delete()
+        _end_recurrences(
+            RevenueRecurrence.objects.filter(recurring_id=dto.recurring_id),
+            month=dto.created_at.replace(day=1),
+        )
+
+    def skip_fixed_revenue(self, dto: RevenueDTO) -> None:
+        from ..models import RevenueRecurrence
+
+        _skip_recurrences_month(
+            RevenueRecurrence.objects.filter(recurring_id=dto.recurring_id),
+            month=dto.created_at.replace(day=1),
+        )
 
     def change_all_categories(self, *, prev_name: str, name: str, new_id: int = 0) -> int:
-        from ..models import Revenue
+        from ..models import Revenue, RevenueRecurrence
 
+        # the recurrences as well, otherwise their future occurrences would keep the old name
+        RevenueRecurrence.objects.filter(user_id=self.user_id, category=prev_name).update(
+            category=name, expanded_category_id=new_id
+        )
         return Revenue.objects.filter(user_id=self.user_id, category=prev_name).update(
             category=name, expanded_category_id=new_id
         )
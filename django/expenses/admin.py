@@ -5,17 +5,21 @@ from .choices import Colors
 from .models import (
     BankAccount,
     BankAccountSnapshot,
+    CreditCardBill,
     Expense,
     ExpenseCategory,
+    ExpenseRecurrence,
     ExpenseSource,
     ExpenseTag,
     Revenue,
     RevenueCategory,
+    RevenueRecurrence,
     RevenueTag,
 )
 
 admin.site.register(BankAccount)
 admin.site.register(BankAccountSnapshot)
+admin.site.register(CreditCardBill)
 admin.site.register(ExpenseTag)
 admin.site.register(RevenueTag)
 
@@ -55,3 +59,14 @@ class RevenueAdmin(admin.ModelAdmin):
 @admin.register(RevenueCategory)
 class RevenueCategoryAdmin(admin.ModelAdmin):
     search_fields = ("name",)
+
+
+@admin.register(ExpenseRecurrence)
+class ExpenseRecurrenceAdmin(admin.ModelAdmin):
+    search_fields = ("description", "recurring_id")
+    list_filter = ("category",)
+
+
+@admin.register(RevenueRecurrence)
+class RevenueRecurrenceAdmin(admin.ModelAdmin):
+    search_fields = ("description", "recurring_id")
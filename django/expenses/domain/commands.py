@@ -42,3 +42,7 @@ class UpdateFutureFixedRevenues(RevenueCommand):
 
 @dataclass
 class DeleteFutureFixedRevenues(RevenueCommand): ...
+
+
+@dataclass
+class SkipFixedRevenue(RevenueCommand): ...
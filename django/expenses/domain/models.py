@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, ClassVar, Literal
 from uuid import UUID
 
 from django.utils import timezone
@@ -53,6 +53,8 @@ class Revenue(IsPastOrFutureMixin):
     is_fixed: bool = False
     recurring_id: UUID | None = None
     bank_account_id: int | None = None
+    category: str = ""
+    expanded_category_id: int | None = None
 
 
 @dataclass
@@ -150,6 +152,49 @@ class Expense(IsPastOrFutureMixin):
         return value
 
 
+def build_occurrence_id(recurring_id: UUID, month: date) -> str:
+    return f"{recurring_id}_{month:%Y-%m}"
+
+
+def parse_occurrence_id(value: str) -> tuple[UUID, date] | None:
+    """The `recurring_id` and the first day of the month of a `FixedOccurrence.id`, `None` if
+    `value` isn't one (e.g. it's the primary key of an entity)."""
+    recurring_id, _, month = value.partition("_")
+    try:
+        return UUID(recurring_id), datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        return None
+
+
+@dataclass
+class FixedOccurrence:
+    """A future occurrence of a fixed expense/revenue, generated from its recurrence when read.
+
+    It's only persisted once it becomes current or is edited, so it has no primary key: its
+    `id` identifies the recurrence and the month instead.
+    """
+
+    recurring_id: UUID
+    created_at: date
+    value: Decimal
+    description: str
+    category: str
+    bank_account_description: str
+    source: str | None = None
+    tags: set[str] = field(default_factory=set)
+
+    is_fixed: ClassVar[bool] = True
+    pk: ClassVar[None] = None
+
+    @property
+    def id(self) -> str:
+        return build_occurrence_id(recurring_id=self.recurring_id, month=self.created_at)
+
+    @property
+    def full_description(self) -> str:
+        return f"{self.description} ({self.created_at.month:02}/{str(self.created_at.year)[2:]})"
+
+
 # class BankAccount:
 #     def __init__(self, amount: Decimal) -> None:
 #         self.amount = amount
@@ -12,7 +12,7 @@ from rest_framework.filters import OrderingFilter
 from shared.filters_utils import PeriodFilter
 
 from .choices import ExpenseReportType
-from .models import Expense, Revenue
+from .models import Expense, ExpenseRecurrence, Revenue, RevenueRecurrence
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -20,7 +20,13 @@ if TYPE_CHECKING:
     from rest_framework.request import Request
     from rest_framework.viewsets import GenericViewSet
 
-    from .managers import ExpenseQueryset, RevenueQueryset
+    from .domain.models import FixedOccurrence
+    from .managers import (
+        ExpenseQueryset,
+        ExpenseRecurrenceQuerySet,
+        RevenueQueryset,
+        RevenueRecurrenceQuerySet,
+    )
 
 
 class MostCommonOrderingFilterBackend(OrderingFilter):
@@ -92,6 +98,52 @@ class RevenueFilterSet(_PersonalFinanceFilterSet):
         model = Revenue
 
 
+class _RecurrenceFilterSet(django_filters.FilterSet):
+    """Filters the recurrences by the same parameters of the entities. The dates are applied
+    when the occurrences are generated."""
+
+    start_date = django_filters.DateFilter(
+        method="filter_date", input_formats=["%d/%m/%Y", "%Y-%m-%d"]
+    )
+    end_date = django_filters.DateFilter(
+        method="filter_date", input_formats=["%d/%m/%Y", "%Y-%m-%d"]
+    )
+    is_fixed = django_filters.BooleanFilter(method="filter_is_fixed")
+
+    def filter_date(self, queryset: QuerySet, *_, **__) -> QuerySet:
+        return queryset
+
+    def filter_is_fixed(self, queryset: QuerySet, _: str, value: bool) -> QuerySet:
+        return queryset if value else queryset.none()
+
+    @property
+    def qs(self) -> QuerySet:
+        # skips the ordering of `_PersonalFinanceFilterSet`, the occurrences are sorted when
+        # generated
+        return django_filters.FilterSet.qs.fget(self)
+
+    def expand(self) -> list[FixedOccurrence]:
+        return self.qs.expand(
+            start_date=self.form.cleaned_data["start_date"],
+            end_date=self.form.cleaned_data["end_date"],
+        )
+
+
+class ExpenseRecurrenceFilterSet(_RecurrenceFilterSet, ExpenseFilterSet):
+    class Meta(ExpenseFilterSet.Meta):
+        model = ExpenseRecurrence
+
+    def filter_with_installments(
+        self, queryset: ExpenseRecurrenceQuerySet, _: str, value: bool
+    ) -> ExpenseRecurrenceQuerySet:
+        return queryset.none() if value else queryset
+
+
+class RevenueRecurrenceFilterSet(_RecurrenceFilterSet, RevenueFilterSet):
+    class Meta(RevenueFilterSet.Meta):
+        model = RevenueRecurrence
+
+
 class ExpenseAvgComparasionReportFilterSet(django_filters.FilterSet):
     group_by = django_filters.ChoiceFilter(
         choices=ExpenseReportType.choices, required=True, method="reports"
@@ -146,14 +198,9 @@ class ExpenseHistoricV2FilterSet(django_filters.FilterSet):
         method="filter_aggregate_period",
     )
 
-    def filter_aggregate_period(
-        self, queryset: ExpenseQueryset, _: str, value: str
-    ) -> ExpenseQueryset:
-        return (
-            queryset.trunc_months().order_by("month")
-            if value == "month"
-            else queryset.trunc_years().order_by("year")
-        )
+    def filter_aggregate_period(self, queryset: ExpenseQueryset, *_, **__) -> ExpenseQueryset:
+        # only sets the boundaries of the date filters, the totals are aggregated by `historic`
+        return queryset
 
     @property
     def qs(self):
@@ -231,7 +278,40 @@ class OperationDateRangeFilterSet(django_filters.FilterSet):
         raise django_filters.utils.translate_validation(error_dict=self.errors)
 
 
-class ExpensePercentageReportFilterSet(DateRangeFilterSet):
+def _add_occurrences_totals(
+    results: list[dict], occurrences: list[FixedOccurrence], field_name: str
+) -> list[dict]:
+    totals: dict = {r[field_name]: r["total"] for r in results}
+    for occurrence in occurrences:
+        value = getattr(occurrence, field_name)
+        totals[value] = totals.get(value, Decimal()) + occurrence.value
+    return sorted(
+        ({field_name: value, "total": total} for value, total in totals.items()),
+        key=lambda r: r["total"],
+        reverse=True,
+    )
+
+
+class _PercentageReportFilterSet(DateRangeFilterSet):
+    def __init__(
+        self,
+        *args,
+        recurrences: ExpenseRecurrenceQuerySet | RevenueRecurrenceQuerySet | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.recurrences = recurrences
+
+    def get_occurrences(self) -> list[FixedOccurrence]:
+        if self.recurrences is None:
+            return []
+        return self.recurrences.expand(
+            start_date=self.form.cleaned_data["start_date"],
+            end_date=self.form.cleaned_data["end_date"],
+        )
+
+
+class ExpensePercentageReportFilterSet(_PercentageReportFilterSet):
     group_by = django_filters.ChoiceFilter(choices=ExpenseReportType.choices, required=True)
 
     queryset: ExpenseQueryset
@@ -239,12 +319,18 @@ class ExpensePercentageReportFilterSet(DateRangeFilterSet):
     @property
     def qs(self):
         if self.is_valid():
-            _qs = list(
-                self.queryset.percentage_report(
-                    group_by=self.form.cleaned_data["group_by"],
-                    start_date=self.form.cleaned_data["start_date"],
-                    end_date=self.form.cleaned_data["end_date"],
-                )
+            _qs = _add_occurrences_totals(
+                list(
+                    self.queryset.percentage_report(
+                        group_by=self.form.cleaned_data["group_by"],
+                        start_date=self.form.cleaned_data["start_date"],
+                        end_date=self.form.cleaned_data["end_date"],
+                    )
+                ),
+                occurrences=self.get_occurrences(),
+                field_name=ExpenseReportType.get_choice(
+                    value=self.form.cleaned_data["group_by"]
+                ).field_name,
             )
 
             total_agg = sum(r["total"] for r in _qs)
@@ -266,17 +352,21 @@ class RevenueHistoricFilterSet(django_filters.FilterSet):
         return super().qs.since_a_year_ago()
 
 
-class RevenuesPercentageReportFilterSet(DateRangeFilterSet):
+class RevenuesPercentageReportFilterSet(_PercentageReportFilterSet):
     queryset: RevenueQueryset
 
     @property
     def qs(self):
         if self.is_valid():
-            _qs = list(
-                self.queryset.percentage_report(
-                    start_date=self.form.cleaned_data["start_date"],
-                    end_date=self.form.cleaned_data["end_date"],
-                )
+            _qs = _add_occurrences_totals(
+                list(
+                    self.queryset.percentage_report(
+                        start_date=self.form.cleaned_data["start_date"],
+                        end_date=self.form.cleaned_data["end_date"],
+                    )
+                ),
+                occurrences=self.get_occurrences(),
+                field_name="category",
             )
 
             total_agg = sum(r["total"] for r in _qs)
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING, Literal, Self
 
+from django.db import transaction as djtransaction
 from django.db.models import CharField, Count, F, Q, QuerySet, Sum, Value
-from django.db.models.functions import Coalesce, Concat, Greatest, TruncMonth, TruncYear
+from django.db.models.functions import Coalesce, Concat, Greatest, NullIf
+from django.utils import timezone
 
-from shared.managers_utils import GenericDateFilters, LatestBeforeQuerySet
+from dateutil.relativedelta import relativedelta
+
+from shared.managers_utils import GenericDateFilters, LatestBeforeQuerySet, historic_series
 
 from .choices import ExpenseReportType
 
 if TYPE_CHECKING:
+    from uuid import UUID
+
     from django.db.models.expressions import CombinedExpression
 
+    from .domain.models import FixedOccurrence
+    from .models import Expense, ExpenseRecurrence, Revenue, RevenueRecurrence
+
+    Recurrence = ExpenseRecurrence | RevenueRecurrence
+
+# the virtual occurrences of the fixed expenses and revenues are generated up to this number of
+# months after the current one
+FIXED_OCCURRENCES_HORIZON_IN_MONTHS = 11
+
 
 class _PersonalFinancialDateFilters(GenericDateFilters):
     def __init__(self) -> None:
@@ -21,7 +37,7 @@ class _PersonalFinancialDateFilters(GenericDateFilters):
 
     @property
     def current_month_and_past(self) -> Q:
-        return Q(created_at__year__lt=self.base_date.year) | self._current_year
+        return self._range(end=self._next_month_start)
 
 
 class _PersonalFinancialQuerySet(QuerySet):
@@ -44,6 +60,13 @@ class _PersonalFinancialQuerySet(QuerySet):
             * Value(Decimal("1.0"))
         )
 
+    @staticmethod
+    def _diff_expression(total: Sum, avg: CombinedExpression) -> Coalesce:
+        # percentage of the current total over the average, zero if there's no average
+        return Coalesce(
+            ((total / NullIf(avg, Decimal())) - Decimal("1.0")) * Decimal("100.0"), Decimal()
+        )
+
     def since_a_year_ago(self) -> Self:
         return self.filter(self.filters.since_a_year_ago)
 
@@ -87,20 +110,16 @@ class _PersonalFinancialQuerySet(QuerySet):
             avg=Coalesce(self._monthly_avg_expression(exclude_fire_categories), Decimal())
         )
 
-    def trunc_months(self) -> Self:
-        return (
-            self.annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(total=Sum("value"))
-            .order_by("-total")
-        )
-
-    def trunc_years(self) -> Self:
-        return (
-            self.annotate(year=TruncYear("created_at"))
-            .values("year")
-            .annotate(total=Sum("value"))
-            .order_by("-total")
+    def historic(
+        self, period: Literal["month", "year"], start_date: date, end_date: date
+    ) -> list[dict[str, date | Decimal]]:
+        return historic_series(
+            self,
+            date_field_name="created_at",
+            value_field_name="value",
+            period=period,
+            start_date=start_date,
+            end_date=end_date,
         )
 
     def sum(self) -> dict[str, Decimal]:
@@ -174,10 +193,13 @@ class ExpenseQueryset(_PersonalFinancialQuerySet):
         )
 
     def indicators(self, include_fire_avg: bool = False) -> dict[str, Decimal]:
+        total = Sum("value", filter=self.filters.current, default=Decimal())
+        avg = Coalesce(self._monthly_avg_expression(), Decimal())
         aggregations = {
-            "total": Sum("value", filter=self.filters.current, default=Decimal()),
+            "total": total,
             "future": Sum("value", filter=self.filters.future, default=Decimal()),
-            "avg": Coalesce(self._monthly_avg_expression(), Decimal()),
+            "avg": avg,
+            "diff": self._diff_expression(total, avg),
         }
         if include_fire_avg:
             aggregations["fire_avg"] = Coalesce(
@@ -198,10 +220,13 @@ class ExpenseQueryset(_PersonalFinancialQuerySet):
 class RevenueQueryset(_PersonalFinancialQuerySet):
     def indicators(self, include_fire_avg: bool = False) -> dict[str, Decimal]:
         # include_fire_avg is accepted for API compatibility but not used for revenues
+        total = Sum("value", filter=self.filters.current, default=Decimal())
+        avg = Coalesce(self._monthly_avg_expression(), Decimal())
         return self.aggregate(
-            total=Sum("value", filter=self.filters.current, default=Decimal()),
+            total=total,
             future=Sum("value", filter=self.filters.future, default=Decimal()),
-            avg=Coalesce(self._monthly_avg_expression(), Decimal()),
+            avg=avg,
+            diff=self._diff_expression(total, avg),
         )
 
     def annotate_num_of_appearances(self, _: str = "") -> Self:
@@ -228,6 +253,124 @@ class RevenueQueryset(_PersonalFinancialQuerySet):
         )
 
 
+class _RecurrenceQuerySet(QuerySet):
+    def covering(self, start: date, end: date) -> Self:
+        """The recurrences covering any of the months between `start` and `end` (first days of
+        the months)."""
+        return self.filter(Q(ends_at__isnull=True) | Q(ends_at__gte=start), starts_at__lte=end)
+
+    def _iter_virtual_months(self, start: date, end: date) -> Iterator[tuple[Recurrence, date]]:
+        recurrences = list(self.covering(start, end))
+        if not recurrences:
+            return
+
+        materialized = {
+            (recurring_id, created_at.replace(day=1))
+            for recurring_id, created_at in self.model.entity_model.objects.filter(
+                recurring_id__in={r.recurring_id for r in recurrences},
+                created_at__gte=start,
+                created_at__lt=end + relativedelta(months=1),
+            ).values_list("recurring_id", "created_at")
+        }
+        for recurrence in recurrences:
+            month = max(start, recurrence.starts_at)
+            last_month = end if recurrence.ends_at is None else min(end, recurrence.ends_at)
+            while month <= last_month:
+                if (recurrence.recurring_id, month) not in materialized:
+                    yield recurrence, month
+                month += relativedelta(months=1)
+
+    def _for_occurrences(self) -> Self:
+        return self.select_related("bank_account")
+
+    def expand(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> list[FixedOccurrence]:
+        """The virtual occurrences between `start_date` and `end_date`, sorted by date.
+
+        They're only generated for the months after the current one, up to
+        `FIXED_OCCURRENCES_HORIZON_IN_MONTHS`, as the occurrences are persisted once they
+        become current.
+        """
+        current_month = timezone.localdate().replace(day=1)
+        start = current_month + relativedelta(months=1)
+        end = current_month + relativedelta(months=FIXED_OCCURRENCES_HORIZON_IN_MONTHS)
+        if start_date is not None:
+            start = max(start, start_date.replace(day=1))
+        if end_date is not None:
+            end = min(end, end_date.replace(day=1))
+        if start > end:
+            return []
+
+        occurrences = [
+            recurrence.build_occurrence(month)
+            for recurrence, month in self._for_occurrences()._iter_virtual_months(start, end)
+            if (start_date is None or recurrence.get_occurrence_date(month) >= start_date)
+            and (end_date is None or recurrence.get_occurrence_date(month) <= end_date)
+        ]
+        return sorted(occurrences, key=lambda o: o.created_at)
+
+    def _iter_months_to_materialize(
+        self, start: date, end: date
+    ) -> Iterator[tuple[Recurrence, date]]:
+        # locking the recurrences serializes the concurrent materializations of their
+        # occurrences (e.g. two requests editing the same virtual occurrence, or one racing the
+        # monthly task) so the later ones see the rows persisted by the first one instead of
+        # persisting them again
+        return self.select_for_update().order_by("pk")._iter_virtual_months(start, end)
+
+    def materialize(self, start: date, end: date | None = None) -> list[Expense | Revenue]:
+        """Persist the occurrences between the months of `start` and `end` (first days of the
+        months, `end` defaults to `start`) not persisted yet."""
+        with djtransaction.atomic():
+            return self.model.entity_model.objects.bulk_create(
+                [
+                    recurrence.build_entity(month)
+                    for recurrence, month in self._iter_months_to_materialize(start, end or start)
+                ]
+            )
+
+    def get_or_materialize(self, recurring_id: UUID, month: date) -> Expense | Revenue | None:
+        """The entity of the series of `recurring_id` in `month`, persisted first if the
+        occurrence is still virtual. `None` if the series has no occurrence in `month`."""
+        entities = self.filter(recurring_id=recurring_id).materialize(month)
+        if entities:
+            return entities[0]
+        return self.model.entity_model.objects.filter(
+            recurring_id=recurring_id,
+            created_at__gte=month,
+            created_at__lt=month + relativedelta(months=1),
+        ).first()
+
+
+class ExpenseRecurrenceQuerySet(_RecurrenceQuerySet):
+    def _for_occurrences(self) -> Self:
+        return super()._for_occurrences().prefetch_related("tags")
+
+    def materialize(self, start: date, end: date | None = None) -> list[Expense]:
+        with djtransaction.atomic():
+            pairs = [
+                (recurrence, recurrence.build_entity(month))
+                for recurrence, month in self.prefetch_related("tags")._iter_months_to_materialize(
+                    start, end or start
+                )
+            ]
+            if not pairs:
+                return []
+
+            expenses = self.model.entity_model.objects.bulk_create([e for _, e in pairs])
+            through_model = self.model.entity_model.tags.through
+            through_model.objects.bulk_create(
+                through_model(expense_id=expense.pk, expensetag_id=tag.pk)
+                for recurrence, expense in pairs
+                for tag in recurrence.tags.all()
+            )
+            return expenses
+
+
+class RevenueRecurrenceQuerySet(_RecurrenceQuerySet): ...
+
+
 class BankAccountSnapshotQuerySet(LatestBeforeQuerySet): ...
 
 
@@ -0,0 +1,147 @@
+# Generated by Django 5.2.3 on 2026-10-17 05:14
+
+from itertools import groupby
+from operator import attrgetter
+
+from django.db import migrations
+from django.utils import timezone
+
+from dateutil.relativedelta import relativedelta
+
+# `expenses.managers.FIXED_OCCURRENCES_HORIZON_IN_MONTHS` when this migration was written
+HORIZON_IN_MONTHS = 11
+
+TEMPLATE_FIELDS = {
+    "Expense": (
+        "value",
+        "description",
+        "category",
+        "source",
+        "user_id",
+        "bank_account_id",
+        "expanded_category_id",
+        "expanded_source_id",
+    ),
+    "Revenue": (
+        "value",
+        "description",
+        "category",
+        "user_id",
+        "bank_account_id",
+        "expanded_category_id",
+    ),
+}
+
+
+def _get_window():
+    current_month = timezone.localdate().replace(day=1)
+    return (
+        current_month + relativedelta(months=1),
+        current_month + relativedelta(months=HORIZON_IN_MONTHS),
+    )
+
+
+def _get_tag_ids(entity):
+    return {t.pk for t in entity.tags.all()} if entity._meta.model_name == "expense" else set()
+
+
+def _get_segments(months, horizon):
+    # the months without an entity were deleted, so they split the recurrences
+    segments, start, month = [], min(months), min(months)
+    last_month = max(months)
+    while month <= last_month:
+        following = month + relativedelta(months=1)
+        if month in months and following not in months:
+            segments.append([start, month])
+        elif month not in months and following in months:
+            start = following
+        month = following
+
+    if last_month >= horizon - relativedelta(months=1):
+        # the series was still extended by the monthly cron (which may not have run yet this
+        # month)
+        segments[-1][1] = None
+    return segments
+
+
+def move_future_fixed_entities_to_recurrences(apps, schema_editor):
+    start, horizon = _get_window()
+    for model_name, fields in TEMPLATE_FIELDS.items():
+        Entity = apps.get_model("expenses", model_name)
+        Recurrence = apps.get_model("expenses", f"{model_name}Recurrence")
+
+        qs = Entity.objects.filter(
+            is_fixed=True, recurring_id__isnull=False, created_at__gte=start
+        ).order_by("recurring_id", "created_at")
+        if model_name == "Expense":
+            qs = qs.prefetch_related("tags")
+
+        for recurring_id, entities in groupby(qs, key=attrgetter("recurring_id")):
+            entities = list(entities)
+            template = entities[0]
+            template_data = {f: getattr(template, f) for f in fields}
+            template_tag_ids = _get_tag_ids(template)
+            # the days after the 28th are clamped to the end of the shorter months
+            day = max(e.created_at.day for e in entities)
+
+            for starts_at, ends_at in _get_segments(
+                {e.created_at.replace(day=1) for e in entities}, horizon
+            ):
+                recurrence = Recurrence.objects.create(
+                    recurring_id=recurring_id,
+                    starts_at=starts_at,
+                    ends_at=ends_at,
+                    day=day,
+                    **template_data,
+                )
+                if template_tag_ids:
+                    recurrence.tags.set(template_tag_ids)
+
+            # the occurrences that were edited individually remain persisted
+            Entity.objects.filter(
+                pk__in=[
+                    e.pk
+                    for e in entities
+                    if e.created_at == e.created_at + relativedelta(day=day)
+                    and all(getattr(e, f) == v for f, v in template_data.items())
+                    and _get_tag_ids(e) == template_tag_ids
+                ]
+            ).delete()
+
+
+def materialize_recurrences(apps, schema_editor):
+    start, horizon = _get_window()
+    for model_name, fields in TEMPLATE_FIELDS.items():
+        Entity = apps.get_model("expenses", model_name)
+        Recurrence = apps.get_model("expenses", f"{model_name}Recurrence")
+
+        for recurrence in Recurrence.objects.all():
+            month = max(start, recurrence.starts_at)
+            last_month = horizon if recurrence.ends_at is None else min(horizon, recurrence.ends_at)
+            while month <= last_month:
+                following = month + relativedelta(months=1)
+                if not Entity.objects.filter(
+                    recurring_id=recurrence.recurring_id,
+                    created_at__gte=month,
+                    created_at__lt=following,
+                ).exists():
+                    entity = Entity.objects.create(
+                        created_at=month + relativedelta(day=recurrence.day),
+                        is_fixed=True,
+                        recurring_id=recurrence.recurring_id,
+                        **{f: getattr(recurrence, f) for f in fields},
+                    )
+                    if model_name == "Expense":
+                        entity.tags.set(recurrence.tags.all())
+                month = following
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("expenses", "0022_expenserecurrence_revenuerecurrence"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_future_fixed_entities_to_recurrences, materialize_recurrences),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-17 05:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("expenses", "0023_move_future_fixed_entities_to_recurrences"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CreditCardBill",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("bill_date", models.DateField()),
+                ("total", models.DecimalField(decimal_places=2, max_digits=18)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "bank_account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="credit_card_bills",
+                        to="expenses.bankaccount",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("bank_account", "bill_date"),
+                        name="unique_credit_card_bill_per_date",
+                    )
+                ],
+            },
+        ),
+    ]
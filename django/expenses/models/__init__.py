@@ -1,3 +1,3 @@
-from .bank_account import BankAccount, BankAccountSnapshot
-from .expenses import Expense, ExpenseCategory, ExpenseSource, ExpenseTag
-from .revenues import Revenue, RevenueCategory, RevenueTag
+from .bank_account import BankAccount, BankAccountSnapshot, CreditCardBill
+from .expenses import Expense, ExpenseCategory, ExpenseRecurrence, ExpenseSource, ExpenseTag
+from .revenues import Revenue, RevenueCategory, RevenueRecurrence, RevenueTag
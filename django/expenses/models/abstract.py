@@ -1,5 +1,13 @@
+from copy import copy
+from datetime import date
+from decimal import Decimal
+from typing import Self
+
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+from dateutil.relativedelta import relativedelta
+
 from ..choices import Colors
 
 
@@ -39,3 +47,49 @@ class RelatedTag(models.Model):
         return f"<{self.__class__.__name__} ({self.name} | {self.user_id})>"
 
     __repr__ = __str__
+
+
+class Recurrence(models.Model):
+    """The rule of a series of fixed expenses/revenues.
+
+    The months between `starts_at` and `ends_at` (open ended if `null`) without a persisted
+    entity of the series have a virtual occurrence, generated when read. An occurrence is only
+    persisted once it becomes current or is edited. Editing or deleting a single occurrence
+    splits the recurrence, so the months of a series are covered by at most one of them.
+    """
+
+    recurring_id = models.UUIDField(db_index=True)
+    # the first day of the first and last months
+    starts_at = models.DateField()
+    ends_at = models.DateField(null=True, blank=True)
+    # clamped to the last day of the shorter months
+    day = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(31)])
+    value = models.DecimalField(
+        decimal_places=2, max_digits=18, validators=[MinValueValidator(Decimal("0.01"))]
+    )
+    description = models.CharField(max_length=300)
+    category = models.CharField(max_length=100)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<{self.__class__.__name__} ({self.description} | {self.recurring_id})>"
+
+    __repr__ = __str__
+
+    def covers(self, month: date) -> bool:
+        return self.starts_at <= month and (self.ends_at is None or month <= self.ends_at)
+
+    def get_occurrence_date(self, month: date) -> date:
+        return month + relativedelta(day=self.day)
+
+    def copy(self, **fields) -> Self:
+        """Persist a copy of the recurrence with `fields` changed."""
+        recurrence = copy(self)
+        recurrence.pk = None
+        recurrence._state.adding = True
+        for name, value in fields.items():
+            setattr(recurrence, name, value)
+        recurrence.save()
+        return recurrence
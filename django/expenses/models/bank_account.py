@@ -68,3 +68,27 @@ class BankAccountSnapshot(models.Model):
         return f"<BankAccountSnapshot ({self.user_id} | {self.operation_date} | {self.total})>"
 
     __repr__ = __str__
+
+
+class CreditCardBill(models.Model):
+    """The credit card bills already decremented from the bank accounts, so a bill is never
+    charged twice."""
+
+    bank_account = models.ForeignKey(
+        to=BankAccount, on_delete=models.CASCADE, related_name="credit_card_bills"
+    )
+    bill_date = models.DateField()
+    total = models.DecimalField(decimal_places=2, max_digits=18)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("bank_account", "bill_date"), name="unique_credit_card_bill_per_date"
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<CreditCardBill ({self.bank_account_id} | {self.bill_date} | {self.total})>"
+
+    __repr__ = __str__
@@ -1,3 +1,4 @@
+from datetime import date
 from decimal import Decimal
 
 from django.conf import settings
@@ -7,8 +8,9 @@ from django.db import models
 from shared.models_utils import serializable_today_function
 
 from ..domain.models import Expense as ExpenseDomainModel
-from ..managers import ExpenseQueryset
-from .abstract import RelatedEntity, RelatedTag
+from ..domain.models import FixedOccurrence
+from ..managers import ExpenseQueryset, ExpenseRecurrenceQuerySet
+from .abstract import Recurrence, RelatedEntity, RelatedTag
 
 
 class ExpenseCategory(RelatedEntity):
@@ -157,3 +159,66 @@ class Expense(models.Model):
                 "bank_account_id": self.bank_account_id,
             },
         )
+
+
+class ExpenseRecurrence(Recurrence):
+    source = models.CharField(max_length=100)
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="expense_recurrences"
+    )
+    bank_account = models.ForeignKey(
+        "BankAccount",
+        on_delete=models.PROTECT,
+        related_name="expense_recurrences",
+    )
+    expanded_category = models.ForeignKey(
+        to=ExpenseCategory,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="recurrences",
+    )
+    expanded_source = models.ForeignKey(
+        to=ExpenseSource,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="recurrences",
+    )
+    tags = models.ManyToManyField(to=ExpenseTag, blank=True, related_name="recurrences")
+
+    objects = ExpenseRecurrenceQuerySet.as_manager()
+
+    entity_model = Expense
+
+    def copy(self, **fields) -> "ExpenseRecurrence":
+        recurrence = super().copy(**fields)
+        recurrence.tags.set(self.tags.all())
+        return recurrence
+
+    def build_entity(self, month: date) -> Expense:
+        return Expense(
+            user_id=self.user_id,
+            value=self.value,
+            description=self.description,
+            category=self.category,
+            created_at=self.get_occurrence_date(month),
+            source=self.source,
+            is_fixed=True,
+            recurring_id=self.recurring_id,
+            bank_account_id=self.bank_account_id,
+            expanded_category_id=self.expanded_category_id,
+            expanded_source_id=self.expanded_source_id,
+        )
+
+    def build_occurrence(self, month: date) -> FixedOccurrence:
+        return FixedOccurrence(
+            recurring_id=self.recurring_id,
+            created_at=self.get_occurrence_date(month),
+            value=self.value,
+            description=self.description,
+            category=self.category,
+            bank_account_description=self.bank_account.description,
+            source=self.source,
+            tags={tag.name for tag in self.tags.all()},
+        )
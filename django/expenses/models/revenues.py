@@ -1,3 +1,4 @@
+from datetime import date
 from decimal import Decimal
 
 from django.conf import settings
@@ -6,9 +7,10 @@ from django.db import models
 
 from shared.models_utils import serializable_today_function
 
+from ..domain.models import FixedOccurrence
 from ..domain.models import Revenue as RevenueDomainModel
-from ..managers import RevenueQueryset
-from .abstract import RelatedEntity, RelatedTag
+from ..managers import RevenueQueryset, RevenueRecurrenceQuerySet
+from .abstract import Recurrence, RelatedEntity, RelatedTag
 
 
 class RevenueCategory(RelatedEntity):
@@ -86,4 +88,51 @@ class Revenue(models.Model):
             is_fixed=self.is_fixed,
             recurring_id=self.recurring_id,
             bank_account_id=self.bank_account_id,
+            category=self.category,
+            expanded_category_id=self.expanded_category_id,
+        )
+
+
+class RevenueRecurrence(Recurrence):
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="revenue_recurrences"
+    )
+    bank_account = models.ForeignKey(
+        "BankAccount",
+        on_delete=models.PROTECT,
+        related_name="revenue_recurrences",
+    )
+    expanded_category = models.ForeignKey(
+        to=RevenueCategory,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="recurrences",
+    )
+
+    objects = RevenueRecurrenceQuerySet.as_manager()
+
+    entity_model = Revenue
+
+    def build_entity(self, month: date) -> Revenue:
+        return Revenue(
+            user_id=self.user_id,
+            value=self.value,
+            description=self.description,
+            category=self.category,
+            created_at=self.get_occurrence_date(month),
+            is_fixed=True,
+            recurring_id=self.recurring_id,
+            bank_account_id=self.bank_account_id,
+            expanded_category_id=self.expanded_category_id,
+        )
+
+    def build_occurrence(self, month: date) -> FixedOccurrence:
+        return FixedOccurrence(
+            recurring_id=self.recurring_id,
+            created_at=self.get_occurrence_date(month),
+            value=self.value,
+            description=self.description,
+            category=self.category,
+            bank_account_description=self.bank_account.description,
         )
@@ -3,8 +3,6 @@ import calendar
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
-from shared.exceptions import NotFirstDayOfMonthException
-
 from .service_layer.tasks import (
     create_fixed_expenses_from_last_month,
     create_fixed_revenues_from_last_month,
@@ -15,9 +13,8 @@ UserModel = get_user_model()
 
 
 def create_all_fixed_entities_from_last_month():
-    if timezone.localdate().day != 1:
-        raise NotFirstDayOfMonthException
-
+    # the occurrences not persisted yet of the previous months are persisted as well, so it can
+    # be executed (again) on any day
     for user_id in UserModel.objects.filter_personal_finances_active().values_list("pk", flat=True):
         create_fixed_expenses_from_last_month(user_id=user_id)
         create_fixed_revenues_from_last_month(user_id=user_id)
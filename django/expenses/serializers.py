@@ -43,6 +43,8 @@ class FlatManyToManySerializer(serializers.ListSerializer):
 
 
 class ExpenseSerializer(serializers.ModelSerializer):
+    # the future occurrences of the fixed expenses aren't persisted, so their id is a string
+    id = serializers.ReadOnlyField()
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     installments = serializers.IntegerField(default=1, write_only=True, allow_null=True)
     tags = FlatManyToManySerializer(required=False)
@@ -64,7 +66,7 @@ class ExpenseSerializer(serializers.ModelSerializer):
             "tags",
             "bank_account_description",
         )
-        extra_kwargs = {"id": {"read_only": True}, "full_description": {"read_only": True}}
+        extra_kwargs = {"full_description": {"read_only": True}}
 
     def create(self, validated_data: dict[str, Any]) -> Expense:
         try:
@@ -175,6 +177,8 @@ class ExpenseSerializer(serializers.ModelSerializer):
 
 
 class RevenueSerializer(serializers.ModelSerializer):
+    # the future occurrences of the fixed revenues aren't persisted, so their id is a string
+    id = serializers.ReadOnlyField()
     user = serializers.HiddenField(
         default=serializers.CurrentUserDefault(),
     )
@@ -194,7 +198,6 @@ class RevenueSerializer(serializers.ModelSerializer):
             "bank_account_description",
         )
         extra_kwargs = {
-            "id": {"read_only": True},
             "full_description": {"read_only": True},
             "category": {"required": True},
         }
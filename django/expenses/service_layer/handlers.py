@@ -46,11 +46,14 @@ def update_expense(cmd: commands.UpdateExpense, uow: ExpenseUnitOfWork) -> None:
                 # `is_fixed=True` updated to `is_fixed=False`
                 cmd.expense.recurring_id = None
                 uow.expenses.update(cmd.expense)
-                if cmd.perform_actions_on_future_fixed_entities and not cmd.expense.is_past_month:
+                if not cmd.expense.is_past_month:
                     # as we have removed the `recurring_id` we need to set it back so we can find
                     # the related expenses
                     cmd.expense.recurring_id = cmd.data_instance.recurring_id
-                    uow.expenses.delete_future_fixed_expenses(cmd.expense)
+                    if cmd.perform_actions_on_future_fixed_entities:
+                        uow.expenses.delete_future_fixed_expenses(cmd.expense)
+                    else:
+                        uow.expenses.skip_fixed_expense(cmd.expense)
             else:
                 uow.expenses.update(cmd.expense)
 
@@ -68,8 +71,11 @@ def delete_expense(cmd: commands.DeleteExpense, uow: ExpenseUnitOfWork) -> None:
     with uow:
         if cmd.expense.recurring_id is not None:
             uow.expenses.delete(cmd.expense)
-            if cmd.perform_actions_on_future_fixed_entities and not cmd.expense.is_past_month:
-                uow.expenses.delete_future_fixed_expenses(cmd.expense)
+            if not cmd.expense.is_past_month:
+                if cmd.perform_actions_on_future_fixed_entities:
+                    uow.expenses.delete_future_fixed_expenses(cmd.expense)
+                else:
+                    uow.expenses.skip_fixed_expense(cmd.expense)
         elif cmd.expense.installments_id is not None:
             uow.expenses.delete_installments(cmd.expense)
         else:
@@ -148,6 +154,12 @@ def delete_future_fixed_revenues(
         uow.commit()
 
 
+def skip_fixed_revenue(cmd: commands.SkipFixedRevenue, uow: RevenueUnitOfWork) -> None:
+    with uow:
+        uow.revenues.skip_fixed_revenue(cmd.revenue)
+        uow.commit()
+
+
 def change_all_expenses_categories(event: events.ExpenseCategoryUpdated, uow: ExpenseUnitOfWork):
     with uow:
         uow.expenses.change_all_categories(**event.as_dict())
@@ -35,6 +35,7 @@ COMMAND_HANDLERS: dict[type[commands.Command], MessageCallable] = {
     commands.CreateFutureFixedRevenues: handlers.create_future_fixed_revenues,
     commands.UpdateFutureFixedRevenues: handlers.update_future_fixed_revenues,
     commands.DeleteFutureFixedRevenues: handlers.delete_future_fixed_revenues,
+    commands.SkipFixedRevenue: handlers.skip_fixed_revenue,
 }
 
 
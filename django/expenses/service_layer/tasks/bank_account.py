@@ -2,29 +2,65 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.db import transaction as djtransaction
+from django.db.models import F, OuterRef, Subquery, Sum
+
 from dateutil.relativedelta import relativedelta
 
 from ...choices import CREDIT_CARD_SOURCE
-from ...models import Expense
-from ...service_layer.unit_of_work import ExpenseUnitOfWork
+from ...models import BankAccount, CreditCardBill, Expense
 
 if TYPE_CHECKING:
     from datetime import date
 
-    from ...models import BankAccount
+    from django.db.models import QuerySet
 
 
-def decrement_credit_card_bill_for_account(bank_account: BankAccount, base_date: date) -> None:
-    """Sum credit card expenses for this account and decrement."""
+def decrement_credit_card_bills(bank_accounts: QuerySet[BankAccount], base_date: date) -> None:
+    """Sum the credit card expenses of each of `bank_accounts` and decrement them.
+
+    The whole batch takes a fixed number of queries. The bills are recorded as
+    `CreditCardBill`s in the same transaction, so running it again for `base_date` doesn't
+    decrement them twice.
+    """
     yesterday = base_date - relativedelta(days=1)
     last_month_date = base_date - relativedelta(months=1)
 
-    qs = Expense.objects.filter(
-        bank_account=bank_account,
-        source=CREDIT_CARD_SOURCE,
-        created_at__range=(last_month_date, yesterday),
-    )
+    with djtransaction.atomic():
+        totals = (
+            Expense.objects.filter(
+                bank_account__in=bank_accounts.exclude(credit_card_bills__bill_date=base_date),
+                source=CREDIT_CARD_SOURCE,
+                created_at__range=(last_month_date, yesterday),
+            )
+            .order_by()
+            .values("bank_account_id")
+            .annotate(total=Sum("value"))
+            .values_list("bank_account_id", "total")
+        )
+        # a concurrent run violates the unique constraint and rolls back this one
+        bills = CreditCardBill.objects.bulk_create(
+            [
+                CreditCardBill(bank_account_id=bank_account_id, bill_date=base_date, total=total)
+                for bank_account_id, total in totals
+                if total
+            ]
+        )
+        if not bills:
+            return
 
-    with ExpenseUnitOfWork(user_id=bank_account.user_id, bank_account_id=bank_account.pk) as uow:
-        uow.bank_account.decrement(value=qs.sum()["total"])
-        uow.commit()
+        BankAccount.objects.filter(pk__in=[bill.bank_account_id for bill in bills]).update(
+            amount=F("amount")
+            - Subquery(
+                CreditCardBill.objects.filter(
+                    bank_account_id=OuterRef("pk"), bill_date=base_date
+                ).values("total")
+            )
+        )
+
+
+def decrement_credit_card_bill_for_account(bank_account: BankAccount, base_date: date) -> None:
+    """Sum credit card expenses for this account and decrement."""
+    decrement_credit_card_bills(
+        bank_accounts=BankAccount.objects.filter(pk=bank_account.pk), base_date=base_date
+    )
@@ -1,14 +1,16 @@
 from django.utils import timezone
 
 from ...domain.events import RevenueCreated
-from ...models import Revenue
+from ...models import Revenue, RevenueRecurrence
 from ...service_layer import messagebus
 from ...service_layer.unit_of_work import RevenueUnitOfWork
-from .shared import create_fixed_entities_from_last_month
+from .shared import materialize_current_month_fixed_entities
 
 
-def create_fixed_revenues_from_last_month(user_id: int):
-    revenues: list[Revenue] = create_fixed_entities_from_last_month(user_id=user_id, model=Revenue)
+def create_fixed_revenues_from_last_month(user_id: int, catch_up: bool = True):
+    revenues: list[Revenue] = materialize_current_month_fixed_entities(
+        user_id=user_id, recurrence_model=RevenueRecurrence, catch_up=catch_up
+    )
     today = timezone.localdate()
     for revenue in revenues:
         if revenue.created_at != today:
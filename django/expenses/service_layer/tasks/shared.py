@@ -2,28 +2,30 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.db.models import Min
 from django.utils import timezone
 
-from dateutil.relativedelta import relativedelta
-
 if TYPE_CHECKING:
-    from ...models import Expense, Revenue
+    from ...models import Expense, ExpenseRecurrence, Revenue, RevenueRecurrence
 
 
-def create_fixed_entities_from_last_month(
-    user_id: int, model: type[Expense] | type[Revenue]
+def materialize_current_month_fixed_entities(
+    user_id: int,
+    recurrence_model: type[ExpenseRecurrence] | type[RevenueRecurrence],
+    catch_up: bool = True,
 ) -> list[Expense | Revenue]:
-    last_fixed_date = timezone.localdate() + relativedelta(months=11)
-    qs = model.objects.filter(
-        user_id=user_id,
-        created_at__month=last_fixed_date.month,
-        created_at__year=last_fixed_date.year,
-        is_fixed=True,
-    ).values()
-
-    entities: list[model] = []  # type: ignore
-    for e in qs:
-        del e["id"]
-        entities.append(model(created_at=e.pop("created_at") + relativedelta(months=1), **e))
-
-    return model.objects.bulk_create(objs=entities)
+    """Persist the occurrences of the current month of the fixed entities, generated from their
+    recurrences until then.
+
+    With `catch_up`, the occurrences of the previous months not persisted yet (e.g. the task
+    didn't run on their first day) are persisted as well, as only the future ones are generated
+    when read.
+    """
+    current_month = timezone.localdate().replace(day=1)
+    recurrences = recurrence_model.objects.filter(user_id=user_id)
+    start = current_month
+    if catch_up:
+        first_month = recurrences.aggregate(first_month=Min("starts_at"))["first_month"]
+        if first_month is not None:
+            start = min(start, first_month)
+    return recurrences.materialize(start, current_month)
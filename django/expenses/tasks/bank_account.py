@@ -10,7 +10,7 @@ from authentication.choices import SubscriptionStatus
 from shared.exceptions import NotFirstDayOfMonthException
 
 from ..models import BankAccount, BankAccountSnapshot
-from ..service_layer.tasks import decrement_credit_card_bill_for_account
+from ..service_layer.tasks import decrement_credit_card_bills
 
 if TYPE_CHECKING:
     from datetime import date
@@ -20,7 +20,7 @@ UserModel = get_user_model()
 
 
 def decrement_credit_card_bill_today() -> None:
-    """Runs daily. Processes each bank account with billing_day matching today."""
+    """Runs daily. Processes the bank accounts with billing_day matching today at once."""
     today = timezone.localdate()
     last_day_of_month = calendar.monthrange(year=today.year, month=today.month)[1]
 
@@ -39,8 +39,7 @@ def decrement_credit_card_bill_today() -> None:
         user__subscription_status=SubscriptionStatus.ACTIVE,
     )
 
-    for account in accounts:
-        decrement_credit_card_bill_for_account(bank_account=account, base_date=today)
+    decrement_credit_card_bills(bank_accounts=accounts, base_date=today)
 
 
 def create_bank_account_snapshot_for_all_users() -> None:
@@ -22,10 +22,12 @@ from expenses.models import (
     BankAccountSnapshot,
     Expense,
     ExpenseCategory,
+    ExpenseRecurrence,
     ExpenseSource,
     ExpenseTag,
     Revenue,
     RevenueCategory,
+    RevenueRecurrence,
 )
 
 
@@ -47,6 +49,19 @@ class ExpenseFactory(DjangoModelFactory):
             self.tags.set([ExpenseTagFactory(name=tag, user=self.user) for tag in tags])
 
 
+class ExpenseRecurrenceFactory(DjangoModelFactory):
+    class Meta:
+        model = ExpenseRecurrence
+
+    @post_generation
+    def _tags(self, create: bool, tags: list[str]):
+        if not create:
+            return
+
+        if tags:
+            self.tags.set([ExpenseTagFactory(name=tag, user=self.user) for tag in tags])
+
+
 class ExpenseCategoryFactory(DjangoModelFactory):
     class Meta:
         model = ExpenseCategory
@@ -67,6 +82,11 @@ class RevenueFactory(DjangoModelFactory):
         model = Revenue
 
 
+class RevenueRecurrenceFactory(DjangoModelFactory):
+    class Meta:
+        model = RevenueRecurrence
+
+
 class BankAccountFactory(DjangoModelFactory):
     class Meta:
         model = BankAccount
@@ -213,6 +233,24 @@ def fixed_expenses_wo_delta(expense):
     return expenses
 
 
+@pytest.fixture
+def expense_recurrence(expense) -> ExpenseRecurrence:
+    # the recurrence of `expense`, whose next occurrences aren't persisted
+    return ExpenseRecurrenceFactory(
+        recurring_id=expense.recurring_id,
+        starts_at=expense.created_at.replace(day=1) + relativedelta(months=1),
+        day=expense.created_at.day,
+        value=expense.value,
+        description=expense.description,
+        category=expense.category,
+        expanded_category_id=expense.expanded_category_id,
+        source=expense.source,
+        expanded_source_id=expense.expanded_source_id,
+        user=expense.user,
+        bank_account=expense.bank_account,
+    )
+
+
 @pytest.fixture
 def another_expense(user, default_categories_map, default_sources_map, bank_account) -> Expense:
     return ExpenseFactory(
@@ -392,6 +430,22 @@ def revenue(user, default_revenue_categories_map, bank_account) -> Revenue:
     )
 
 
+@pytest.fixture
+def revenue_recurrence(revenue) -> RevenueRecurrence:
+    # the recurrence of `revenue`, whose next occurrences aren't persisted
+    return RevenueRecurrenceFactory(
+        recurring_id=revenue.recurring_id,
+        starts_at=revenue.created_at.replace(day=1) + relativedelta(months=1),
+        day=revenue.created_at.day,
+        value=revenue.value,
+        description=revenue.description,
+        category=revenue.category,
+        expanded_category_id=revenue.expanded_category_id,
+        user=revenue.user,
+        bank_account=revenue.bank_account,
+    )
+
+
 @pytest.fixture
 def another_revenue(user, default_revenue_categories_map, bank_account) -> Revenue:
     return RevenueFactory(
@@ -1,5 +1,6 @@
 import operator
 from datetime import date
+from uuid import uuid4
 
 from django.db.models import Q
 from django.utils import timezone
@@ -11,12 +12,15 @@ from rest_framework.status import (
     HTTP_201_CREATED,
     HTTP_204_NO_CONTENT,
     HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
 )
 
 from config.settings.base import BASE_API_URL
 
 from ...choices import CREDIT_CARD_SOURCE
-from ...models import Expense, ExpenseTag
+from ...domain.models import build_occurrence_id
+from ...managers import ExpenseRecurrenceQuerySet
+from ...models import Expense, ExpenseRecurrence, ExpenseTag
 
 pytestmark = pytest.mark.django_db
 
@@ -610,11 +614,13 @@ def test__update__is_fixed__false_to_true(client, expense, bank_account, perform
 
     expense.refresh_from_db()
     assert expense.recurring_id is not None
-    assert Expense.objects.filter(
-        recurring_id__isnull=False,
+    assert Expense.objects.filter(recurring_id=expense.recurring_id).count() == 1
+    assert ExpenseRecurrence.objects.filter(
         recurring_id=expense.recurring_id,
         description=expense.description,
-    ).values("created_at__month", "created_at__year").distinct().count() == (12 if perform else 1)
+        starts_at=expense.created_at.replace(day=1) + relativedelta(months=1),
+        ends_at__isnull=True,
+    ).count() == (1 if perform else 0)
 
 
 @pytest.mark.parametrize("perform", (True, False))
@@ -1501,3 +1507,277 @@ def test__delete__is_fixed__future(client, fixed_expenses, bank_account):
         .order_by("id")
         .values_list("id", flat=True)
     ) == [e.id for idx, e in enumerate(fixed_expenses) if idx < 7]
+
+
+def test__list__fixed_occurrences(client, expense, expense_recurrence):
+    # GIVEN
+    today = timezone.localdate()
+
+    # WHEN
+    response = client.get(f"{URL}?page_size=100")
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+    results = response.json()["results"]
+    assert [r["id"] for r in results] == [
+        *(
+            build_occurrence_id(expense.recurring_id, today + relativedelta(months=i))
+            for i in range(11, 0, -1)
+        ),
+        expense.pk,
+    ]
+    for result in results:
+        assert result["value"] == expense.value
+        assert result["description"] == expense.description
+        assert result["is_fixed"] is True
+        assert result["bank_account_description"] == expense.bank_account.description
+
+    assert Expense.objects.filter(recurring_id=expense.recurring_id).count() == 1
+
+
+def test__list__fixed_occurrences__current_month_not_persisted(client, expense, expense_recurrence):
+    # GIVEN
+    # e.g. the daily task hasn't run yet
+    today = timezone.localdate()
+    expense.created_at = expense.created_at - relativedelta(months=1)
+    expense.save()
+    expense_recurrence.starts_at = today.replace(day=1)
+    expense_recurrence.save()
+
+    # WHEN
+    response = client.get(f"{URL}?page_size=100")
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+    current = Expense.objects.get(
+        recurring_id=expense.recurring_id,
+        created_at__month=today.month,
+        created_at__year=today.year,
+    )
+    assert current.pk in [r["id"] for r in response.json()["results"]]
+
+
+def test__list__fixed_occurrences__paginated(client, user, expense, expense_recurrence):
+    # GIVEN
+    today = timezone.localdate()
+    for months in (-2, 3, 7):
+        Expense.objects.create(
+            created_at=today + relativedelta(months=months, day=1),
+            value=10,
+            description="Not fixed",
+            category="Casa",
+            source=CREDIT_CARD_SOURCE,
+            user=user,
+            bank_account=expense.bank_account,
+        )
+    results = client.get(f"{URL}?page_size=100").json()["results"]
+
+    # WHEN
+    pages = [client.get(f"{URL}?page_size=5&page={page}").json() for page in (1, 2, 3)]
+
+    # THEN
+    assert all(page["count"] == 15 for page in pages)
+    assert [r["id"] for page in pages for r in page["results"]] == [r["id"] for r in results]
+    assert [r["created_at"] for r in results] == sorted(
+        (r["created_at"] for r in results),
+        key=lambda d: d.split("/")[::-1],
+        reverse=True,
+    )
+
+
+def test__list__fixed_occurrences__filters(client, expense, expense_recurrence):
+    # GIVEN
+    today = timezone.localdate()
+    start_date = today + relativedelta(months=2, day=1)
+    end_date = today + relativedelta(months=4, day=31)
+
+    # WHEN
+    response = client.get(
+        f"{URL}?start_date={start_date.strftime('%d/%m/%Y')}"
+        f"&end_date={end_date.strftime('%d/%m/%Y')}"
+    )
+    not_fixed_response = client.get(f"{URL}?is_fixed=false")
+
+    # THEN
+    assert [r["id"] for r in response.json()["results"]] == [
+        build_occurrence_id(expense.recurring_id, today + relativedelta(months=i))
+        for i in (2, 3, 4)
+    ]
+    assert not_fixed_response.json()["results"] == []
+
+
+def test__update__fixed_occurrence(client, expense, expense_recurrence, bank_account):
+    # GIVEN
+    month = (timezone.localdate() + relativedelta(months=3)).replace(day=1)
+    data = {
+        "value": 100,
+        "description": expense.description,
+        "category": expense.category,
+        "created_at": expense_recurrence.get_occurrence_date(month).strftime("%d/%m/%Y"),
+        "source": expense.source,
+        "is_fixed": True,
+        "bank_account_description": bank_account.description,
+    }
+
+    # WHEN
+    response = client.put(
+        f"{URL}/{build_occurrence_id(expense.recurring_id, month)}"
+        + "?perform_actions_on_future_fixed_entities=false",
+        data=data,
+    )
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+    occurrence = Expense.objects.get(
+        recurring_id=expense.recurring_id, created_at__gte=month, is_fixed=True
+    )
+    assert response.json()["id"] == occurrence.pk
+    assert occurrence.value == 100
+
+    results = client.get(f"{URL}?page_size=100").json()["results"]
+    assert len(results) == 12
+    assert [r["value"] for r in results].count(100) == 1
+
+
+def test__update__fixed_occurrence__perform_on_future(
+    client, expense, expense_recurrence, bank_account
+):
+    # GIVEN
+    month = (timezone.localdate() + relativedelta(months=3)).replace(day=1)
+    data = {
+        "value": 100,
+        "description": expense.description,
+        "category": expense.category,
+        "created_at": expense_recurrence.get_occurrence_date(month).strftime("%d/%m/%Y"),
+        "source": expense.source,
+        "is_fixed": True,
+        "bank_account_description": bank_account.description,
+    }
+
+    # WHEN
+    response = client.put(
+        f"{URL}/{build_occurrence_id(expense.recurring_id, month)}"
+        + "?perform_actions_on_future_fixed_entities=true",
+        data=data,
+    )
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+    results = client.get(f"{URL}?page_size=100").json()["results"]
+    assert [r["value"] for r in results] == [100] * 9 + [expense.value] * 3
+    assert Expense.objects.filter(recurring_id=expense.recurring_id).count() == 2
+    assert list(
+        ExpenseRecurrence.objects.filter(recurring_id=expense.recurring_id)
+        .order_by("starts_at")
+        .values_list("starts_at", "ends_at", "value")
+    ) == [
+        (expense_recurrence.starts_at, month, expense.value),
+        (month + relativedelta(months=1), None, 100),
+    ]
+
+
+def test__delete__fixed_occurrence(client, expense, expense_recurrence, bank_account):
+    # GIVEN
+    month = (timezone.localdate() + relativedelta(months=3)).replace(day=1)
+    previous_bank_account_amount = bank_account.amount
+
+    # WHEN
+    response = client.delete(
+        f"{URL}/{build_occurrence_id(expense.recurring_id, month)}"
+        + "?perform_actions_on_future_fixed_entities=false"
+    )
+
+    # THEN
+    assert response.status_code == HTTP_204_NO_CONTENT
+
+    bank_account.refresh_from_db()
+    assert previous_bank_account_amount == bank_account.amount
+
+    ids = [r["id"] for r in client.get(f"{URL}?page_size=100").json()["results"]]
+    assert len(ids) == 11
+    assert build_occurrence_id(expense.recurring_id, month) not in ids
+    assert Expense.objects.filter(recurring_id=expense.recurring_id).count() == 1
+
+
+def test__delete__fixed_occurrence__locks_recurrences(client, expense, expense_recurrence, mocker):
+    # GIVEN
+    month = (timezone.localdate() + relativedelta(months=3)).replace(day=1)
+    select_for_update_spy = mocker.spy(ExpenseRecurrenceQuerySet, "select_for_update")
+
+    # WHEN
+    response = client.delete(
+        f"{URL}/{build_occurrence_id(expense.recurring_id, month)}"
+        + "?perform_actions_on_future_fixed_entities=false"
+    )
+
+    # THEN
+    assert response.status_code == HTTP_204_NO_CONTENT
+    # so concurrent requests don't persist the occurrence twice
+    assert select_for_update_spy.called
+
+
+def test__delete__fixed_occurrence__perform_on_future(
+    client, expense, expense_recurrence, bank_account
+):
+    # GIVEN
+    today = timezone.localdate()
+    month = (today + relativedelta(months=3)).replace(day=1)
+
+    # WHEN
+    response = client.delete(
+        f"{URL}/{build_occurrence_id(expense.recurring_id, month)}"
+        + "?perform_actions_on_future_fixed_entities=true"
+    )
+
+    # THEN
+    assert response.status_code == HTTP_204_NO_CONTENT
+
+    assert [r["id"] for r in client.get(f"{URL}?page_size=100").json()["results"]] == [
+        build_occurrence_id(expense.recurring_id, today + relativedelta(months=2)),
+        build_occurrence_id(expense.recurring_id, today + relativedelta(months=1)),
+        expense.pk,
+    ]
+
+
+@pytest.mark.parametrize("months", (0, -1))
+def test__delete__fixed_occurrence__not_found(client, expense, expense_recurrence, months):
+    # GIVEN
+    month = timezone.localdate() + relativedelta(months=months)
+
+    # WHEN
+    response = client.delete(f"{URL}/{build_occurrence_id(uuid4(), month)}")
+    response_recurrence_month = client.delete(
+        f"{URL}/{build_occurrence_id(expense.recurring_id, month)}"
+    )
+
+    # THEN
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert response_recurrence_month.status_code == (
+        HTTP_204_NO_CONTENT if months == 0 else HTTP_404_NOT_FOUND
+    )
+
+
+def test__reports__fixed_occurrences(client, expense, expense_recurrence):
+    # GIVEN
+    today = timezone.localdate()
+    start_date, end_date = today + relativedelta(months=1), today + relativedelta(months=3)
+    date_range = (
+        f"start_date={start_date.strftime('%d/%m/%Y')}&end_date={end_date.strftime('%d/%m/%Y')}"
+    )
+
+    # WHEN
+    indicators_response = client.get(f"{URL}/indicators")
+    historic_response = client.get(f"{URL}/historic_report?{date_range}&aggregate_period=month")
+    sum_response = client.get(f"{URL}/sum?{date_range}")
+    percentage_response = client.get(f"{URL}/percentage_report?{date_range}&group_by=category")
+
+    # THEN
+    assert indicators_response.json()["future"] == expense.value * 11
+    assert [h["total"] for h in historic_response.json()["historic"]] == [expense.value] * 3
+    assert historic_response.json()["avg"] == expense.value
+    assert sum_response.json()["total"] == expense.value * 3
+    assert percentage_response.json() == [{"category": expense.category, "total": 100}]
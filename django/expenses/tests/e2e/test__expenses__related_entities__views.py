@@ -15,7 +15,7 @@ from ...choices import (
     MONEY_SOURCE,
     Colors,
 )
-from ...models import Expense, ExpenseCategory, ExpenseSource
+from ...models import Expense, ExpenseCategory, ExpenseRecurrence, ExpenseSource
 
 pytestmark = pytest.mark.django_db
 
@@ -166,6 +166,25 @@ def test__update__categories(client):
     assert Expense.objects.filter(category=data["name"], expanded_category=category).exists()
 
 
+def test__update__categories__recurrences(client, expense_recurrence):
+    # GIVEN
+    category = ExpenseCategory.objects.get(name="Casa")
+    data = {"name": "name", "hex_color": Colors.orange1}
+
+    # WHEN
+    response = client.put(f"{URL}/categories/{category.id}", data=data)
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+    assert not ExpenseRecurrence.objects.filter(category="Casa").exists()
+    assert ExpenseRecurrence.objects.filter(
+        pk=expense_recurrence.pk, category=data["name"], expanded_category=category
+    ).exists()
+
+    response = client.get(f"{URL}?is_fixed=true&page_size=100")
+    assert {e["category"] for e in response.json()["results"]} == {data["name"]}
+
+
 @pytest.mark.usefixtures("fixed_expenses", "yet_another_expense")
 def test__update__categories__undo_soft_delete(client, user, default_categories):
     # GIVEN
@@ -420,6 +439,22 @@ def test__update__sources(client):
     assert Expense.objects.filter(source=data["name"], expanded_source=source).exists()
 
 
+def test__update__sources__recurrences(client, expense_recurrence):
+    # GIVEN
+    source = ExpenseSource.objects.get(name=CREDIT_CARD_SOURCE)
+    data = {"name": "name", "hex_color": Colors.orange1}
+
+    # WHEN
+    response = client.put(f"{URL}/sources/{source.id}", data=data)
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+    assert not ExpenseRecurrence.objects.filter(source=CREDIT_CARD_SOURCE).exists()
+    assert ExpenseRecurrence.objects.filter(
+        pk=expense_recurrence.pk, source=data["name"], expanded_source=source
+    ).exists()
+
+
 @pytest.mark.usefixtures("fixed_expenses", "yet_another_expense")
 def test__update__sources__undo_soft_delete(client, user, default_sources):
     # GIVEN
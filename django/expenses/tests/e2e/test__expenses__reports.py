@@ -331,3 +331,48 @@ def test__historic_report__year(client, user, bank_account):
     assert convert_and_quantitize(response_json["avg"]) == convert_and_quantitize(
         fmean([h["total"] for h in response_json["historic"]])
     )
+
+
+@pytest.mark.parametrize(
+    ("aggregate_period", "step", "periods"),
+    (("month", relativedelta(months=1), 6), ("year", relativedelta(years=1), 3)),
+)
+def test__historic_report__fill_periods_wo_data(
+    client, user, bank_account, aggregate_period, step, periods
+):
+    # GIVEN
+    end_date = timezone.localdate().replace(month=6, day=12)
+    start_date = end_date - step * (periods - 1)
+    first_period = (
+        start_date.replace(day=1)
+        if aggregate_period == "month"
+        else start_date.replace(month=1, day=1)
+    )
+    Expense.objects.create(
+        created_at=start_date,
+        value=120,
+        description="first",
+        category="Alimentação",
+        source=CREDIT_CARD_SOURCE,
+        is_fixed=False,
+        user=user,
+        bank_account=bank_account,
+    )
+
+    # WHEN
+    response = client.get(
+        f"{URL}/historic_report?start_date={start_date.strftime('%d/%m/%Y')}"
+        + f"&end_date={end_date.strftime('%d/%m/%Y')}&aggregate_period={aggregate_period}"
+    )
+    response_json = response.json()
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+    assert response_json["historic"] == [
+        {
+            aggregate_period: (first_period + step * i).strftime("%d/%m/%Y"),
+            "total": 120.0 if i == 0 else 0.0,
+        }
+        for i in range(periods)
+    ]
+    assert convert_and_quantitize(response_json["avg"]) == convert_and_quantitize(120 / periods)
@@ -1,6 +1,6 @@
 import operator
 import re
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Literal
 
@@ -1058,6 +1058,46 @@ def test__update__installments__tags__reuse__replace(
     assert list(expense_w_tags.tags.all()) == other_tags
 
 
+def test__update__installments__tags__only_changed_pairs(
+    client, expenses_w_installments, bank_account
+):
+    # GIVEN
+    e = expenses_w_installments[0]
+    kept, removed = (ExpenseTag.objects.create(name=name, user=e.user) for name in ("a", "b"))
+    for expense in expenses_w_installments:
+        expense.tags.add(kept, removed)
+
+    through_model = Expense.tags.through
+    kept_through_ids = set(
+        through_model.objects.filter(expensetag=kept).values_list("pk", flat=True)
+    )
+    data = {
+        "value": e.value,
+        "description": e.description,
+        "category": e.category,
+        "created_at": e.created_at.strftime("%d/%m/%Y"),
+        "source": e.source,
+        "tags": ["a", "c"],
+        "bank_account_description": bank_account.description,
+    }
+
+    # WHEN
+    response = client.put(f"{URL}/{e.pk}", data=data)
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+    for expense in Expense.objects.filter(installments_id=e.installments_id):
+        assert list(expense.tags.values_list("name", flat=True).order_by("name")) == data["tags"]
+
+    # the pairs that were kept aren't re-created
+    assert (
+        set(through_model.objects.filter(expensetag=kept).values_list("pk", flat=True))
+        == kept_through_ids
+    )
+    assert not through_model.objects.filter(expensetag=removed).exists()
+
+
 @pytest.mark.parametrize(
     ("value", "operation"), ((10, operator.lt), (-10, operator.gt), (0, operator.eq))
 )
@@ -1133,6 +1173,39 @@ def test__update__installments__created_at_and_value(client, expenses_w_installm
         assert expense.installment_number == i + 1
 
 
+def test__update__installments__created_at__end_of_month(
+    client, expenses_w_installments, bank_account
+):
+    # GIVEN
+    e = expenses_w_installments[0]
+    created_at = datetime(year=2024, month=1, day=31)
+    data = {
+        "value": e.value,
+        "description": e.description,
+        "category": e.category,
+        "created_at": created_at.strftime("%d/%m/%Y"),
+        "source": e.source,
+        "bank_account_description": bank_account.description,
+    }
+
+    # WHEN
+    response = client.put(f"{URL}/{e.pk}", data=data)
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+    assert list(
+        Expense.objects.filter(installments_id=e.installments_id)
+        .order_by("installment_number")
+        .values_list("created_at", flat=True)
+    ) == [
+        date(2024, 1, 31),
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+        date(2024, 4, 30),
+        date(2024, 5, 31),
+    ]
+
+
 def test__update__installments__created_at__not_1st_installment(
     client, expenses_w_installments, bank_account
 ):
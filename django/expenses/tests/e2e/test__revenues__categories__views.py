@@ -12,7 +12,7 @@ from ...choices import (
     DEFAULT_REVENUE_CATEGORIES_MAP,
     Colors,
 )
-from ...models import Revenue, RevenueCategory
+from ...models import Revenue, RevenueCategory, RevenueRecurrence
 
 pytestmark = pytest.mark.django_db
 
@@ -162,6 +162,22 @@ def test__update(client):
     assert Revenue.objects.filter(category=data["name"], expanded_category=category).exists()
 
 
+def test__update__recurrences(client, revenue_recurrence):
+    # GIVEN
+    category = RevenueCategory.objects.get(name="Salário")
+    data = {"name": "name", "hex_color": Colors.orange1}
+
+    # WHEN
+    response = client.put(f"{URL}/{category.id}", data=data)
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+    assert not RevenueRecurrence.objects.filter(category="Salário").exists()
+    assert RevenueRecurrence.objects.filter(
+        pk=revenue_recurrence.pk, category=data["name"], expanded_category=category
+    ).exists()
+
+
 @pytest.mark.usefixtures("fixed_revenues", "yet_another_revenue")
 def test__update__categories__undo_soft_delete(client, user, default_revenue_categories):
     # GIVEN
@@ -17,7 +17,8 @@ from rest_framework.status import (
 from config.settings.base import BASE_API_URL
 from shared.tests import convert_and_quantitize
 
-from ...models import Revenue
+from ...domain.models import build_occurrence_id
+from ...models import Revenue, RevenueRecurrence
 
 pytestmark = pytest.mark.django_db
 
@@ -469,11 +470,13 @@ def test__update__is_fixed__false_to_true(client, revenue, bank_account, perform
 
     revenue.refresh_from_db()
     assert revenue.recurring_id is not None
-    assert Revenue.objects.filter(
-        recurring_id__isnull=False,
+    assert Revenue.objects.filter(recurring_id=revenue.recurring_id).count() == 1
+    assert RevenueRecurrence.objects.filter(
         recurring_id=revenue.recurring_id,
         description=revenue.description,
-    ).values("created_at__month", "created_at__year").distinct().count() == (12 if perform else 1)
+        starts_at=revenue.created_at.replace(day=1) + relativedelta(months=1),
+        ends_at__isnull=True,
+    ).count() == (1 if perform else 0)
 
 
 @pytest.mark.parametrize("perform", (True, False))
@@ -742,3 +745,89 @@ def test__delete__is_fixed__future(client, fixed_revenues, bank_account):
         .order_by("id")
         .values_list("id", flat=True)
     ) == [r.id for idx, r in enumerate(fixed_revenues) if idx < 7]
+
+
+def test__list__fixed_occurrences(client, revenue, revenue_recurrence):
+    # GIVEN
+    today = timezone.localdate()
+
+    # WHEN
+    response = client.get(f"{URL}?page_size=100")
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+    results = response.json()["results"]
+    assert [r["id"] for r in results] == [
+        *(
+            build_occurrence_id(revenue.recurring_id, today + relativedelta(months=i))
+            for i in range(11, 0, -1)
+        ),
+        revenue.pk,
+    ]
+    for result in results:
+        assert result["value"] == revenue.value
+        assert result["category"] == revenue.category
+        assert result["is_fixed"] is True
+
+
+@pytest.mark.parametrize("perform", (True, False))
+def test__delete__fixed_occurrence(client, revenue, revenue_recurrence, bank_account, perform):
+    # GIVEN
+    today = timezone.localdate()
+    month = (today + relativedelta(months=3)).replace(day=1)
+    previous_bank_account_amount = bank_account.amount
+
+    # WHEN
+    response = client.delete(
+        f"{URL}/{build_occurrence_id(revenue.recurring_id, month)}"
+        + f"?perform_actions_on_future_fixed_entities={perform}"
+    )
+
+    # THEN
+    assert response.status_code == HTTP_204_NO_CONTENT
+
+    bank_account.refresh_from_db()
+    assert previous_bank_account_amount == bank_account.amount
+
+    ids = [r["id"] for r in client.get(f"{URL}?page_size=100").json()["results"]]
+    assert len(ids) == (3 if perform else 11)
+    assert build_occurrence_id(revenue.recurring_id, month) not in ids
+    assert Revenue.objects.filter(recurring_id=revenue.recurring_id).count() == 1
+
+
+def test__update__fixed_occurrence__perform_on_future(
+    client, revenue, revenue_recurrence, bank_account
+):
+    # GIVEN
+    month = (timezone.localdate() + relativedelta(months=3)).replace(day=1)
+    data = {
+        "value": 100,
+        "description": revenue.description,
+        "created_at": revenue_recurrence.get_occurrence_date(month).strftime("%d/%m/%Y"),
+        "is_fixed": True,
+        "category": revenue.category,
+        "bank_account_description": bank_account.description,
+    }
+
+    # WHEN
+    response = client.put(
+        f"{URL}/{build_occurrence_id(revenue.recurring_id, month)}"
+        + "?perform_actions_on_future_fixed_entities=true",
+        data=data,
+    )
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+
+    results = client.get(f"{URL}?page_size=100").json()["results"]
+    assert [r["value"] for r in results] == [100] * 9 + [revenue.value] * 3
+
+
+def test__indicators__fixed_occurrences(client, revenue, revenue_recurrence):
+    # WHEN
+    response = client.get(f"{URL}/indicators")
+
+    # THEN
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["future"] == revenue.value * 11
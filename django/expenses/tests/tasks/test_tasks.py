@@ -7,7 +7,7 @@ from dateutil.relativedelta import relativedelta
 
 from authentication.choices import SubscriptionStatus
 
-from ...models import Expense, Revenue
+from ...models import CreditCardBill, Expense, Revenue
 from ...service_layer.tasks import (
     create_fixed_expenses_from_last_month,
     create_fixed_revenues_from_last_month,
@@ -18,10 +18,15 @@ from ...tasks.bank_account import decrement_credit_card_bill_today
 pytestmark = pytest.mark.django_db
 
 
-@pytest.mark.usefixtures("expenses_w_installments", "fixed_expenses_wo_delta")
-def test__create_fixed_expenses_from_last_month(user):
+@pytest.mark.usefixtures("expenses_w_installments")
+def test__create_fixed_expenses_from_last_month(user, expense, expense_recurrence):
     # GIVEN
     today = timezone.localdate()
+    expense.created_at = expense.created_at - relativedelta(months=1)
+    expense.save()
+    expense_recurrence.starts_at = today.replace(day=1)
+    expense_recurrence.save()
+
     fixed_qs = Expense.objects.filter(is_fixed=True)
     fixed_count = fixed_qs.count()
     non_fixed_qs = Expense.objects.filter(is_fixed=False)
@@ -29,17 +34,43 @@ def test__create_fixed_expenses_from_last_month(user):
 
     # WHEN
     create_fixed_expenses_from_last_month(user_id=user.pk)
+    create_fixed_expenses_from_last_month(user_id=user.pk)
 
     # THEN
-    latest_created_at = Expense.objects.only("created_at").latest("created_at").created_at
-    assert latest_created_at.replace(day=1) == (today + relativedelta(years=1)).replace(day=1)
-
     assert fixed_qs.count() == fixed_count + 1
+    current = fixed_qs.get(
+        recurring_id=expense.recurring_id,
+        created_at__month=today.month,
+        created_at__year=today.year,
+    )
+    assert current.value == expense.value
+    assert current.bank_account_id == expense.bank_account_id
 
     assert non_fixed_count > 0
     assert non_fixed_count == non_fixed_qs.count()
 
 
+def test__create_fixed_expenses_from_last_month__catch_up(user, expense, expense_recurrence):
+    # GIVEN
+    # e.g. the task didn't run on the first day of the last two months
+    current_month = timezone.localdate().replace(day=1)
+    expense.created_at = expense.created_at - relativedelta(months=3)
+    expense.save()
+    expense_recurrence.starts_at = current_month - relativedelta(months=2)
+    expense_recurrence.save()
+
+    # WHEN
+    create_fixed_expenses_from_last_month(user_id=user.pk)
+
+    # THEN
+    assert sorted(
+        created_at.replace(day=1)
+        for created_at in Expense.objects.filter(recurring_id=expense.recurring_id).values_list(
+            "created_at", flat=True
+        )
+    ) == [current_month - relativedelta(months=i) for i in range(3, -1, -1)]
+
+
 @pytest.mark.skip("Skip while we don't have properly fixed revenues flow")
 def test__create_fixed_revenues_from_last_month(user, revenue):
     # GIVEN
@@ -354,3 +385,53 @@ class TestDecrementCreditCardBillToday:
         second_bank_account.refresh_from_db()
         assert previous_amount1 - expense1.value == bank_account.amount
         assert previous_amount2 - expense2.value == second_bank_account.amount
+
+    def test__does_not_decrement_twice_if_rerun(self, user, bank_account, expenses_w_installments):
+        # GIVEN
+        today = timezone.localdate()
+        bank_account.credit_card_bill_day = today.day
+        bank_account.save()
+        previous_amount = bank_account.amount
+
+        expense = expenses_w_installments[0]
+        expense.bank_account = bank_account
+        expense.created_at = today - relativedelta(days=1)
+        expense.save()
+
+        # WHEN
+        decrement_credit_card_bill_today()
+        decrement_credit_card_bill_today()
+
+        # THEN
+        bank_account.refresh_from_db()
+        assert previous_amount - expense.value == bank_account.amount
+        assert CreditCardBill.objects.filter(
+            bank_account=bank_account, bill_date=today, total=expense.value
+        ).exists()
+
+    def test__number_of_queries_does_not_depend_on_accounts(
+        self,
+        user,
+        bank_account,
+        second_bank_account,
+        expenses_w_installments,
+        django_assert_max_num_queries,
+    ):
+        # GIVEN
+        today = timezone.localdate()
+        for i, account in enumerate((bank_account, second_bank_account)):
+            account.credit_card_bill_day = today.day
+            account.save()
+
+            expense = expenses_w_installments[i]
+            expense.bank_account = account
+            expense.created_at = today - relativedelta(days=1)
+            expense.save()
+
+        # WHEN
+        # savepoint + aggregate + insert of the bills + update of the accounts + release
+        with django_assert_max_num_queries(5):
+            decrement_credit_card_bill_today()
+
+        # THEN
+        assert CreditCardBill.objects.filter(bill_date=today).count() == 2
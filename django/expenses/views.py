@@ -1,16 +1,16 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from statistics import fmean
 from typing import TYPE_CHECKING, ClassVar, Literal
 from uuid import uuid4
 
 from django.db.models import F
 from django.db.transaction import atomic
 
+from dateutil.relativedelta import relativedelta
 from djchoices.choices import ChoiceItem
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
@@ -22,33 +22,47 @@ from rest_framework.status import HTTP_200_OK, HTTP_204_NO_CONTENT
 from rest_framework.utils.serializer_helpers import ReturnList
 from rest_framework.viewsets import GenericViewSet
 
+from shared.pagination import MergedQuerySetSequence
 from shared.permissions import SubscriptionEndedPermission
-from shared.utils import (
-    insert_zeros_if_no_data_in_monthly_historic_data,
-    insert_zeros_if_no_data_in_yearly_historic_data,
-)
+from shared.utils import insert_zeros_if_no_data_in_monthly_historic_data
 
 from . import filters, serializers
 from .choices import ExpenseReportType
 from .domain import commands, events
 from .domain.exceptions import OnlyUpdateFixedRevenueDateWithinMonthException
 from .domain.models import Revenue as RevenueDomainModel
-from .managers import ExpenseQueryset, RevenueQueryset
+from .domain.models import parse_occurrence_id
+from .managers import (
+    ExpenseQueryset,
+    ExpenseRecurrenceQuerySet,
+    RevenueQueryset,
+    RevenueRecurrenceQuerySet,
+)
 from .models import (
     BankAccount,
     BankAccountSnapshot,
     Expense,
     ExpenseCategory,
+    ExpenseRecurrence,
     ExpenseSource,
     ExpenseTag,
     Revenue,
     RevenueCategory,
+    RevenueRecurrence,
 )
 from .permissions import PersonalFinancesModulePermission
 from .service_layer import messagebus
+from .service_layer.tasks import (
+    create_fixed_expenses_from_last_month,
+    create_fixed_revenues_from_last_month,
+)
 from .service_layer.unit_of_work import ExpenseUnitOfWork, RevenueUnitOfWork
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.db.models import Model
+
     from django_filters.filterset import FilterSet
     from rest_framework.request import Request
     from rest_framework.serializers import Serializer
@@ -58,60 +72,109 @@ class _PersonalFinanceViewSet(
     CreateModelMixin, UpdateModelMixin, DestroyModelMixin, ListModelMixin, GenericViewSet
 ):
     historic_filterset_class: ClassVar[FilterSet]
+    recurrence_filterset_class: ClassVar[type[filters._RecurrenceFilterSet]]
+    recurrence_model: ClassVar[type[ExpenseRecurrence] | type[RevenueRecurrence]]
+    materialize_current_month_fixed_entities: ClassVar[Callable[..., list]]
     permission_classes = (SubscriptionEndedPermission, PersonalFinancesModulePermission)
     ordering_fields = ("created_at", "value")
     indicators_serializer_class = serializers.PersonalFinancesIndicatorsSerializer
 
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        # only the future occurrences are generated when read, so the ones of the current month
+        # are persisted here as well in case the daily task hasn't done it yet
+        self.materialize_current_month_fixed_entities(user_id=request.user.id, catch_up=False)
+
+    def get_recurrence_queryset(self) -> ExpenseRecurrenceQuerySet | RevenueRecurrenceQuerySet:
+        return self.recurrence_model.objects.filter(user_id=self.request.user.id)
+
+    def get_object(self) -> Model:
+        # the future occurrences of the fixed entities are persisted once accessed by their id
+        if (parsed := parse_occurrence_id(self.kwargs[self.lookup_field])) is None:
+            return super().get_object()
+
+        entity = self.get_recurrence_queryset().get_or_materialize(*parsed)
+        if entity is None:
+            raise NotFound
+        self.kwargs[self.lookup_field] = entity.pk
+        return super().get_object()
+
     def get_serializer_context(self):
         filterset = filters.PersonalFinanceContextFilterSet(
             data=self.request.GET, queryset=self.get_queryset()
         )
         return {**super().get_serializer_context(), **filterset.get_cleaned_data()}
 
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        recurrences_filterset = self.recurrence_filterset_class(
+            data=request.GET, queryset=self.get_recurrence_queryset(), request=request
+        )
+        page = self.paginate_queryset(
+            MergedQuerySetSequence(
+                queryset=self.filter_queryset(self.get_queryset()),
+                rows=recurrences_filterset.expand(),
+            )
+        )
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(methods=("GET",), detail=False)
     def historic_report(self, request: Request) -> Response:
         filterset = filters.ExpenseHistoricV2FilterSet(
             data=request.GET, queryset=self.get_queryset()
         )
-        historic = list(filterset.qs)
-        if filterset.form.cleaned_data["aggregate_period"] == "month":
-            historic = insert_zeros_if_no_data_in_monthly_historic_data(
-                historic=historic,
-                start_date=filterset.form.cleaned_data["start_date"],
-                end_date=filterset.form.cleaned_data["end_date"],
-            )
-            serializer = serializers.MonthlyHistoricResponseSerializer(
-                {"historic": historic, "avg": fmean([h["total"] for h in historic])}
-            )
-        else:
-            historic = insert_zeros_if_no_data_in_yearly_historic_data(
-                historic=historic,
-                start_date=filterset.form.cleaned_data["start_date"],
-                end_date=filterset.form.cleaned_data["end_date"],
-            )
-            serializer = serializers.YearlyHistoricResponseSerializer(
-                {"historic": historic, "avg": fmean([h["total"] for h in historic])}
+        qs = filterset.qs
+        period = filterset.form.cleaned_data["aggregate_period"]
+        start_date = filterset.form.cleaned_data["start_date"]
+        end_date = filterset.form.cleaned_data["end_date"]
+        historic = qs.historic(period=period, start_date=start_date, end_date=end_date)
+
+        if historic:
+            totals = {row[period]: row for row in historic}
+            occurrences = self.get_recurrence_queryset().expand(
+                start_date=historic[0][period],
+                end_date=historic[-1][period] + relativedelta(**{f"{period}s": 1, "days": -1}),
             )
+            for occurrence in occurrences:
+                key = occurrence.created_at.replace(day=1)
+                if period == "year":
+                    key = key.replace(month=1)
+                totals[key]["total"] += occurrence.value
+            if occurrences:
+                avg = sum(row["total"] for row in historic) / len(historic)
+                for row in historic:
+                    row["avg"] = avg
+
+        serializer_class = (
+            serializers.MonthlyHistoricResponseSerializer
+            if period == "month"
+            else serializers.YearlyHistoricResponseSerializer
+        )
+        serializer = serializer_class(
+            {"historic": historic, "avg": historic[0]["avg"] if historic else Decimal()}
+        )
         return Response(serializer.data, status=HTTP_200_OK)
 
     @action(methods=("GET",), detail=False)
     def indicators(self, request: Request) -> Response:
         filterset = filters.IndicatorsFilterSet(data=request.GET, queryset=self.get_queryset())
         qs = self.get_queryset().indicators(include_fire_avg=filterset.get_include_fire_avg())
-        # TODO: do this via SQL
-        percentage = (
-            (((qs["total"] / qs["avg"]) - Decimal("1.0")) * Decimal("100.0"))
-            if qs["avg"]
-            else Decimal()
-        )
-
-        serializer = self.indicators_serializer_class({**qs, "diff": percentage})
+        qs["future"] += sum(o.value for o in self.get_recurrence_queryset().expand())
+        serializer = self.indicators_serializer_class(qs)
         return Response(serializer.data, status=HTTP_200_OK)
 
     @action(methods=("GET",), detail=False)
     def sum(self, request: Request) -> Response:
         filterset = filters.DateRangeFilterSet(data=request.GET, queryset=self.get_queryset())
-        return Response(serializers.TotalSerializer(filterset.qs.sum()).data, status=HTTP_200_OK)
+        result = filterset.qs.sum()
+        result["total"] += sum(
+            o.value
+            for o in self.get_recurrence_queryset().expand(
+                start_date=filterset.form.cleaned_data["start_date"],
+                end_date=filterset.form.cleaned_data["end_date"],
+            )
+        )
+        return Response(serializers.TotalSerializer(result).data, status=HTTP_200_OK)
 
     @action(methods=("GET",), detail=False)
     def avg(self, _: Request) -> Response:
@@ -123,13 +186,25 @@ class _PersonalFinanceViewSet(
     @action(methods=("GET",), detail=False)
     def higher_value(self, request: Request) -> Response:
         filterset = filters.DateRangeFilterSet(data=request.GET, queryset=self.get_queryset())
-        entity = filterset.qs.order_by("-value").first()
+        entity = max(
+            (
+                filterset.qs.order_by("-value").first(),
+                *self.get_recurrence_queryset().expand(
+                    start_date=filterset.form.cleaned_data["start_date"],
+                    end_date=filterset.form.cleaned_data["end_date"],
+                ),
+            ),
+            key=lambda e: e.value if e is not None else Decimal("-inf"),
+        )
         return Response(self.serializer_class(entity).data, status=HTTP_200_OK)
 
 
 class ExpenseViewSet(_PersonalFinanceViewSet):
     filterset_class = filters.ExpenseFilterSet
     historic_filterset_class = filters.ExpenseHistoricFilterSet
+    recurrence_filterset_class = filters.ExpenseRecurrenceFilterSet
+    recurrence_model = ExpenseRecurrence
+    materialize_current_month_fixed_entities = staticmethod(create_fixed_expenses_from_last_month)
     serializer_class = serializers.ExpenseSerializer
 
     def get_queryset(self) -> ExpenseQueryset[Expense]:
@@ -182,7 +257,9 @@ class ExpenseViewSet(_PersonalFinanceViewSet):
     @action(methods=("GET",), detail=False)
     def percentage_report(self, request: Request) -> Response:
         filterset = filters.ExpensePercentageReportFilterSet(
-            data=request.GET, queryset=self.get_queryset()
+            data=request.GET,
+            queryset=self.get_queryset(),
+            recurrences=self.get_recurrence_queryset(),
         )
         return Response(self._get_report_data(filterset=filterset, avg=False), status=HTTP_200_OK)
 
@@ -195,6 +272,9 @@ class ExpenseViewSet(_PersonalFinanceViewSet):
 class RevenueViewSet(_PersonalFinanceViewSet):
     filterset_class = filters.RevenueFilterSet
     historic_filterset_class = filters.RevenueHistoricFilterSet
+    recurrence_filterset_class = filters.RevenueRecurrenceFilterSet
+    recurrence_model = RevenueRecurrence
+    materialize_current_month_fixed_entities = staticmethod(create_fixed_revenues_from_last_month)
     serializer_class = serializers.RevenueSerializer
 
     def get_queryset(self) -> RevenueQueryset[Revenue]:
@@ -296,11 +376,18 @@ class RevenueViewSet(_PersonalFinanceViewSet):
         if from_not_fixed_to_fixed and perform_on_future and not revenue.is_past_month:
             messagebus.handle(message=commands.CreateFutureFixedRevenues(revenue=revenue), uow=uow)
 
-        if from_fixed_to_not_fixed and perform_on_future and not revenue.is_past_month:
+        if from_fixed_to_not_fixed and not revenue.is_past_month:
             # as we have removed the `recurring_id` we need to set it back so we can find
             # the related revenues
             revenue.recurring_id = prev_recurring_id
-            messagebus.handle(message=commands.DeleteFutureFixedRevenues(revenue=revenue), uow=uow)
+            messagebus.handle(
+                message=(
+                    commands.DeleteFutureFixedRevenues(revenue=revenue)
+                    if perform_on_future
+                    else commands.SkipFixedRevenue(revenue=revenue)
+                ),
+                uow=uow,
+            )
 
         if revenue.is_current_month:
             messagebus.handle(
@@ -318,12 +405,15 @@ class RevenueViewSet(_PersonalFinanceViewSet):
         bank_account_id = instance.bank_account_id
         instance.delete()
 
-        if (
-            self.get_serializer_context().get("perform_actions_on_future_fixed_entities", False)
-            and not revenue.is_past_month
-        ):
+        if revenue.recurring_id is not None and not revenue.is_past_month:
             messagebus.handle(
-                message=commands.DeleteFutureFixedRevenues(revenue=revenue),
+                message=(
+                    commands.DeleteFutureFixedRevenues(revenue=revenue)
+                    if self.get_serializer_context().get(
+                        "perform_actions_on_future_fixed_entities", False
+                    )
+                    else commands.SkipFixedRevenue(revenue=revenue)
+                ),
                 uow=RevenueUnitOfWork(
                     user_id=self.request.user.id, bank_account_id=bank_account_id
                 ),
@@ -343,7 +433,9 @@ class RevenueViewSet(_PersonalFinanceViewSet):
     @action(methods=("GET",), detail=False)
     def percentage_report(self, request: Request) -> Response:
         filterset = filters.RevenuesPercentageReportFilterSet(
-            data=request.GET, queryset=self.get_queryset()
+            data=request.GET,
+            queryset=self.get_queryset(),
+            recurrences=self.get_recurrence_queryset(),
         )
         serializer = serializers.ExpenseReportCategorySerializer(filterset.qs, many=True)
         return Response(serializer.data, status=HTTP_200_OK)
@@ -458,8 +550,7 @@ class _ExpenseRelatedEntityViewSet(
             data=request.GET, queryset=self.get_related_queryset()
         )
         entity = (
-            filterset.qs
-            .most_common(self.expense_field)
+            filterset.qs.most_common(self.expense_field)
             .as_related_entities(self.expense_field)
             .first()
         )
@@ -1,23 +1,195 @@
-from locust import HttpUser, events, task
+"""Load test scenarios mirroring the usage of the dashboard.
+
+The weights of the tasks of `DashboardUser` approximate the production traffic mix: most
+sessions only open the home page, some open the report pages and a few create/delete
+expenses and transactions or preview a B3 import.
+
+Headless run (e.g. CI) against the local dev server, with the latency percentiles of each
+endpoint exported to `loadtest/results_stats.csv`:
+
+    make loadtest LOCUST_EMAIL=... LOCUST_PASSWORD=...
+"""
+
+import random
+from datetime import date, timedelta
+from io import BytesIO
+from uuid import uuid4
+
+from locust import HttpUser, between, events, task
+from openpyxl import Workbook
+
+NEGOCIACAO_HEADER = [
+    "Data do Negócio",
+    "Tipo de Movimentação",
+    "Mercado",
+    "Prazo/Vencimento",
+    "Instituição",
+    "Código de Negociação",
+    "Quantidade",
+    "Preço",
+    "Valor",
+]
 
 
 @events.init_command_line_parser.add_listener
 def _(parser):
-    parser.add_argument("--username", type=str, env_var="LOCUST_USERNAME")
+    parser.add_argument("--email", type=str, env_var="LOCUST_EMAIL")
     parser.add_argument("--password", type=str, env_var="LOCUST_PASSWORD")
+    parser.add_argument(
+        "--b3-rows",
+        type=int,
+        env_var="LOCUST_B3_ROWS",
+        default=50,
+        help="Rows of the B3 negotiations workbook uploaded by the import previews",
+    )
+
+
+def _date_range(days: int) -> str:
+    today = date.today()
+    return (
+        f"start_date={(today - timedelta(days=days)).strftime('%d/%m/%Y')}"
+        f"&end_date={today.strftime('%d/%m/%Y')}"
+    )
+
 
+def _build_negociacao(codes: list[str], rows: int) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Negociação"
+    ws.append(NEGOCIACAO_HEADER)
+    for i in range(rows):
+        operation_date = (date.today() - timedelta(days=i % 365 + 1)).strftime("%d/%m/%Y")
+        code = codes[i % len(codes)]
+        ws.append([operation_date, "Compra", "Mercado à Vista", "-", "INTER DTVM", code, 1, 10, 10])
+    file = BytesIO()
+    wb.save(file)
+    return file.getvalue()
 
-class QuickstartUser(HttpUser):
-    @task
-    def full_assets_list(self):
-        self.client.get("/assets?page_size=100")
+
+class DashboardUser(HttpUser):
+    wait_time = between(1, 5)
 
     def on_start(self):
+        options = self.environment.parsed_options
+        r = self.client.post(
+            "/token", json={"email": options.email, "password": options.password}, name="/token"
+        )
+        self.client.headers = {"Authorization": f"Bearer {r.json()['access']}"}
+
+        assets = self._get("/assets/minimal_data").json()
+        # the transactions of the assets held in self custody are handled differently
+        self.asset_pks = [
+            a["pk"] for a in assets if a["currency"] == "BRL" and not a["is_held_in_self_custody"]
+        ]
+        bank_accounts = self._get("/bank_accounts").json()["results"]
+        self.bank_account_description = bank_accounts[0]["description"] if bank_accounts else None
+        codes = [a["code"] for a in assets if not a["is_held_in_self_custody"]]
+        self.negociacao = _build_negociacao(codes, options.b3_rows) if codes else None
+
+    def _get(self, path: str, name: str | None = None):
+        # the stats are grouped by endpoint, regardless of the query string
+        return self.client.get(path, name=name or path.split("?")[0])
+
+    # region: home page
+    @task(10)
+    def home_page(self):
+        # the browser fires these requests at once when the home page is opened
+        self._get("/assets/indicators")
+        self._get("/expenses/indicators")
+        self._get("/revenues/indicators")
+        self._get("/patrimony/growth?months=6")
+        self._get("/bank_accounts/summary")
+        self._get("/tasks/count?notified=false")
+
+    @task(4)
+    def assets_page(self):
+        self._get("/assets?page_size=100")
+        self._get("/assets/minimal_data")
+
+    # endregion: home page
+
+    # region: report pages
+    @task(2)
+    def assets_reports_page(self):
+        self._get("/assets/reports?kind=total_invested&percentage=true&current=true&group_by=type")
+        self._get("/assets/reports?kind=roi&opened=true&closed=true&group_by=type")
+        self._get("/assets/growth?months=12")
+        self._get(f"/assets/total_invested_history?{_date_range(365)}")
+
+    @task(2)
+    def transactions_reports_page(self):
+        self._get(f"/transactions/historic_report?{_date_range(5 * 365)}&aggregate_period=month")
+        self._get(f"/incomes/historic_report?{_date_range(5 * 365)}&aggregate_period=month")
+        self._get(f"/incomes/assets_aggregation_report?{_date_range(365)}")
+
+    @task(2)
+    def expenses_reports_page(self):
+        self._get(f"/expenses/historic_report?{_date_range(365)}&aggregate_period=month")
+        self._get(f"/expenses/percentage_report?group_by=category&{_date_range(30)}")
+        self._get("/expenses/avg_comparasion_report?group_by=category&period=since_a_year_ago")
+
+    # endregion: report pages
+
+    # region: CRUD
+    @task(3)
+    def expenses_crud(self):
+        self._get(f"/expenses?{_date_range(30)}&page_size=50")
+        if self.bank_account_description is None:
+            return
+
+        description = f"Load test {uuid4().hex}"
         r = self.client.post(
-            "/token",
+            "/expenses",
+            name="/expenses",
             json={
-                "username": self.environment.parsed_options.username,
-                "password": self.environment.parsed_options.password,
+                "value": round(random.uniform(10, 500), 2),
+                "description": description,
+                "category": "Casa",
+                "created_at": date.today().strftime("%d/%m/%Y"),
+                "source": "Pix",
+                "bank_account_description": self.bank_account_description,
             },
         )
-        self.client.headers = {"Authorization": f"Bearer {r.json()['access']}"}
+        if r.status_code != 201:
+            return
+
+        # the `id` isn't returned by the creation. The expense is deleted to keep the data set
+        # (and so the measurements) stable
+        for expense in self._get(f"/expenses?description={description}").json()["results"]:
+            self.client.delete(f"/expenses/{expense['id']}", name="/expenses/[id]")
+
+    @task(2)
+    def transactions_crud(self):
+        self._get("/transactions?page_size=50")
+        if not self.asset_pks:
+            return
+
+        asset_pk = random.choice(self.asset_pks)
+        self._get(f"/assets/{asset_pk}/transactions", name="/assets/[id]/transactions")
+        r = self.client.post(
+            "/transactions",
+            name="/transactions",
+            json={
+                "action": "BUY",
+                "price": round(random.uniform(10, 50), 2),
+                "quantity": random.randint(1, 10),
+                "asset_pk": asset_pk,
+                "operation_date": (date.today() - timedelta(days=1)).strftime("%d/%m/%Y"),
+            },
+        )
+        if r.status_code == 201:
+            self.client.delete(f"/transactions/{r.json()['id']}", name="/transactions/[id]")
+
+    # endregion: CRUD
+
+    @task(1)
+    def b3_import_preview(self):
+        if self.negociacao is None:
+            return
+
+        self.client.post(
+            "/assets/b3_import",
+            name="/assets/b3_import",
+            data={"operations": ["negociacoes"], "dry_run": "true"},
+            files={"negociacao": ("negociacao.xlsx", self.negociacao)},
+        )
@@ -1,52 +1,55 @@
 from datetime import date
+from decimal import Decimal
+from typing import Literal
 
-from django.db.models import Q, QuerySet
+from django.db import NotSupportedError, connections
+from django.db.models import DateField, Func, Q, QuerySet, Sum
+from django.db.models.functions import Trunc
 from django.utils import timezone
 
+from dateutil.relativedelta import relativedelta
+
 
 class GenericDateFilters:
+    # The predicates are half-open date ranges (instead of `__month`/`__year` extractions) so
+    # the indexes on `date_field_name` can be used
     def __init__(self, date_field_name: str, base_date: date | None = None) -> None:
         self.date_field_name = date_field_name
         self.base_date = base_date if base_date is not None else timezone.localdate()
 
+    @property
+    def _month_start(self) -> date:
+        return self.base_date.replace(day=1)
+
+    @property
+    def _next_month_start(self) -> date:
+        return self._month_start + relativedelta(months=1)
+
+    def _range(self, start: date | None = None, end: date | None = None) -> Q:
+        lookups = {}
+        if start is not None:
+            lookups[f"{self.date_field_name}__gte"] = start
+        if end is not None:
+            lookups[f"{self.date_field_name}__lt"] = end
+        return Q(**lookups)
+
     @property
     def _current_year(self) -> Q:
-        return Q(
-            **{
-                f"{self.date_field_name}__month__lte": self.base_date.month,
-                f"{self.date_field_name}__year": self.base_date.year,
-            }
-        )
+        return self._range(start=self.base_date.replace(month=1, day=1), end=self._next_month_start)
 
     @property
     def since_a_year_ago(self) -> Q:
-        return (
-            Q(
-                **{
-                    f"{self.date_field_name}__month__gte": self.base_date.month,
-                    f"{self.date_field_name}__year": self.base_date.year - 1,
-                }
-            )
-            | self._current_year
+        return self._range(
+            start=self._month_start - relativedelta(years=1), end=self._next_month_start
         )
 
     @property
     def current(self) -> Q:
-        return Q(
-            **{
-                f"{self.date_field_name}__month": self.base_date.month,
-                f"{self.date_field_name}__year": self.base_date.year,
-            }
-        )
+        return self._range(start=self._month_start, end=self._next_month_start)
 
     @property
     def future(self) -> Q:
-        return Q(
-            **{
-                f"{self.date_field_name}__month__gt": self.base_date.month,
-                f"{self.date_field_name}__year": self.base_date.year,
-            }
-        ) | Q(**{f"{self.date_field_name}__year__gt": self.base_date.year})
+        return self._range(start=self._next_month_start)
 
     def filter_range(self, start: date, end: date) -> Q:
         return Q(**{f"{self.date_field_name}__range": (start, end)})
@@ -71,3 +74,147 @@ class LatestBeforeQuerySet(QuerySet):
 
     def latest_before_or_earliest(self, user_id: int, target_date: date) -> dict | None:
         return self.latest_before(user_id, target_date) or self.earliest(user_id)
+
+
+# The series of periods is generated by the database and left joined to the totals so the
+# periods without data are returned with zeros
+_POSTGRES_HISTORIC_SQL = """
+WITH totals AS ({totals_sql})
+SELECT
+    series.period::date,
+    COALESCE(totals.total, 0) AS total,
+    AVG(COALESCE(totals.total, 0)) OVER () AS avg
+FROM generate_series(%s::date, %s::date, %s::interval) AS series(period)
+LEFT JOIN totals ON totals.period::date = series.period::date
+ORDER BY series.period
+"""
+
+_SQLITE_HISTORIC_SQL = """
+WITH RECURSIVE series(period) AS (
+    SELECT %s
+    UNION ALL
+    SELECT date(period, %s) FROM series WHERE period < %s
+),
+totals AS ({totals_sql})
+SELECT
+    series.period,
+    COALESCE(totals.total, 0) AS total,
+    AVG(COALESCE(totals.total, 0)) OVER () AS avg
+FROM series
+LEFT JOIN totals ON totals.period = series.period
+ORDER BY series.period
+"""
+
+
+def historic_series(
+    queryset: QuerySet,
+    date_field_name: str,
+    value_field_name: str,
+    period: Literal["month", "year"],
+    start_date: date,
+    end_date: date,
+) -> list[dict[str, date | Decimal]]:
+    """Sum `value_field_name` per `period` between `start_date` and `end_date`, including the
+    periods without data, in a single query. Every row has the average of the totals in `avg`.
+    """
+    if period == "month":
+        start, end = start_date.replace(day=1), end_date.replace(day=1)
+    else:
+        start, end = start_date.replace(month=1, day=1), end_date.replace(month=1, day=1)
+
+    totals = (
+        queryset.annotate(
+            period=Trunc(date_field_name, period, output_field=DateField()),
+        )
+        .values("period")
+        .annotate(total=Sum(value_field_name))
+        .order_by()
+    )
+    totals_sql, totals_params = totals.query.sql_with_params()
+
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql = _POSTGRES_HISTORIC_SQL.format(totals_sql=totals_sql)
+        params = (*totals_params, start, end, f"1 {period}")
+    else:
+        sql = _SQLITE_HISTORIC_SQL.format(totals_sql=totals_sql)
+        params = (start.isoformat(), f"+1 {period}", end.isoformat(), *totals_params)
+
+    # the raw rows skip the converters of the fields (e.g. the dates are strings on SQLite)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {
+                period: DateField().to_python(p),
+                "total": Decimal(str(total)),
+                "avg": Decimal(str(avg)),
+            }
+            for p, total, avg in cursor.fetchall()
+        ]
+
+
+class _DateFunc(Func):
+    """A date arithmetic with the day clamped to the end of the month, as `relativedelta`.
+    Implemented for Postgres and SQLite."""
+
+    arity = 2
+    output_field = DateField()
+
+    def as_sql(self, compiler, connection, **_):
+        raise NotSupportedError(f"{self.__class__.__name__} isn't supported on {connection.vendor}")
+
+    def _compile(self, compiler) -> tuple[tuple[str, list], tuple[str, list]]:
+        date_expression, value_expression = self.get_source_expressions()
+        return compiler.compile(date_expression), compiler.compile(value_expression)
+
+
+class AddMonths(_DateFunc):
+    """`expression + relativedelta(months=months)`, e.g. 31/01 + 1 month is 28/02 (or 29/02)."""
+
+    def __init__(self, expression, months, **extra) -> None:
+        super().__init__(expression, months, **extra)
+
+    def as_postgresql(self, compiler, connection, **_):
+        (date_sql, date_params), (months_sql, months_params) = self._compile(compiler)
+        # adding an interval of months to a date already clamps the day
+        return (
+            f"CAST({date_sql} + make_interval(months => CAST({months_sql} AS integer)) AS date)",
+            (*date_params, *months_params),
+        )
+
+    def as_sqlite(self, compiler, connection, **_):
+        (date_sql, date_params), (months_sql, months_params) = self._compile(compiler)
+        # SQLite's `+N months` overflows to the next month instead of clamping the day, so the
+        # day is added to the start of the month and capped by its last day
+        sql = (
+            f"MIN("
+            f"date({date_sql}, 'start of month', printf('%%+d months', {months_sql}), "
+            f"printf('+%%d days', CAST(strftime('%%d', {date_sql}) AS integer) - 1)), "
+            f"date({date_sql}, 'start of month', printf('%%+d months', ({months_sql}) + 1), "
+            f"'-1 day'))"
+        )
+        return sql, (*date_params, *months_params, *date_params, *date_params, *months_params)
+
+
+class ReplaceDay(_DateFunc):
+    """`expression + relativedelta(day=day)`, e.g. the day 31 of February is 28/02 (or 29/02)."""
+
+    def __init__(self, expression, day, **extra) -> None:
+        super().__init__(expression, day, **extra)
+
+    def as_postgresql(self, compiler, connection, **_):
+        (date_sql, date_params), (day_sql, day_params) = self._compile(compiler)
+        month_start = f"CAST(date_trunc('month', {date_sql}) AS date)"
+        return (
+            f"LEAST({month_start} + (CAST({day_sql} AS integer) - 1), "
+            f"CAST({month_start} + interval '1 month' - interval '1 day' AS date))",
+            (*date_params, *day_params, *date_params),
+        )
+
+    def as_sqlite(self, compiler, connection, **_):
+        (date_sql, date_params), (day_sql, day_params) = self._compile(compiler)
+        return (
+            f"MIN(date({date_sql}, 'start of month', printf('+%%d days', ({day_sql}) - 1)), "
+            f"date({date_sql}, 'start of month', '+1 month', '-1 day'))",
+            (*date_params, *day_params, *date_params),
+        )
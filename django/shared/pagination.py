@@ -1,6 +1,71 @@
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable
+from functools import cmp_to_key
+from typing import TYPE_CHECKING, Any
+
 from rest_framework.pagination import PageNumberPagination
 
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
 
 class CustomPageNumberPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class MergedQuerySetSequence:
+    """A paginable sequence of an ordered `queryset` merged with some `rows` not persisted
+    (e.g. generated at read time).
+
+    The `rows` are sorted in memory by the ordering of `queryset` and, when paginated, only
+    the slice of the `queryset` that might be in a page is fetched. The persisted objects come
+    first in ties.
+    """
+
+    def __init__(self, queryset: QuerySet, rows: Iterable[Any]) -> None:
+        self.queryset = queryset
+        self.ordering: list[str] = [
+            *(queryset.query.order_by or queryset.model._meta.ordering),
+            "pk",
+        ]
+        self.key = cmp_to_key(self._compare)
+        self.rows = sorted(((obj, 1) for obj in rows), key=self.key)
+
+    def _compare(self, a: tuple[Any, int], b: tuple[Any, int]) -> int:
+        for field in self.ordering:
+            descending = field.startswith("-")
+            name = field.removeprefix("-")
+            x, y = getattr(a[0], name), getattr(b[0], name)
+            if x == y or x is None or y is None:
+                continue
+            result = -1 if x < y else 1
+            return -result if descending else result
+        return a[1] - b[1]
+
+    def count(self) -> int:
+        return self.queryset.count() + len(self.rows)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, index: slice) -> list[Any]:
+        start, stop = index.start or 0, index.stop
+        # every row sorted before the `n`-th object of the queryset shifts it by one position,
+        # so the objects before `start - len(self.rows)` can't be in the slice
+        skip = max(0, start - len(self.rows))
+        objs = [(obj, 0) for obj in self.queryset[skip:stop]]
+        if not skip:
+            offset, rows = 0, self.rows
+        elif not objs:
+            # there are fewer objects and rows than `start`
+            return []
+        else:
+            # the slice starts after the rows sorted before the first fetched object
+            before = sum(1 for row in self.rows if self.key(row) < self.key(objs[0]))
+            offset, rows = skip + before, self.rows[before:]
+
+        merged = [obj for obj, _ in heapq.merge(objs, rows, key=self.key)]
+        return merged[start - offset : None if stop is None else stop - offset]
@@ -3,6 +3,7 @@ from functools import singledispatch
 from typing import TYPE_CHECKING
 
 from django.conf import settings
+from django.db import connection
 
 import pytest
 
@@ -16,6 +17,20 @@ skip_if_sqlite = pytest.mark.skipif(
 )
 
 
+def assert_index_condition(queryset: "QuerySet", field_name: str) -> None:
+    """Assert that the plan of `queryset` uses an index to evaluate the predicate on
+    `field_name`. PostgreSQL only."""
+    with connection.cursor() as cursor:
+        # the test tables are too small for the planner to prefer an index otherwise
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        cursor.execute("RESET enable_seqscan")
+
+    assert any(
+        "Index Cond" in line and field_name in line for line in plan.splitlines()
+    ), f"{field_name} is not part of any index condition:\n{plan}"
+
+
 @singledispatch
 def convert_and_quantitize(
     value: Decimal, decimal_places: int = 2, rounding: str = ROUND_HALF_UP
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Budget:
+    # most of the endpoints issue the same number of queries regardless of the data, a number
+    # growing with it is an N+1
+    queries: int
+    # wall time (in seconds) per scale (transactions per user). Scales in between use the
+    # budget of the next one
+    seconds: dict[int, float]
+
+    def get_seconds(self, scale: int) -> float:
+        for s, seconds in sorted(self.seconds.items()):
+            if scale <= s:
+                return seconds
+        return max(self.seconds.values())
+
+
+def _budget(queries: int, *seconds: float) -> Budget:
+    return Budget(
+        queries=queries, seconds=dict(zip((1_000, 10_000, 100_000), seconds, strict=True))
+    )
+
+
+# measured with SQLite on a laptop, with some headroom
+BUDGETS = {
+    "assets:list": _budget(6, 0.2, 0.3, 0.5),
+    "assets:indicators": _budget(5, 0.1, 0.2, 0.3),
+    "assets:reports:total_invested": _budget(4, 0.1, 0.2, 0.3),
+    "assets:reports:roi": _budget(4, 0.1, 0.2, 0.3),
+    "assets:read_fields:join": _budget(2, 0.2, 1, 5),
+    "assets:read_fields:pre_aggregated": _budget(2, 0.2, 1, 5),
+    "transactions:historic_report": _budget(4, 0.2, 0.5, 3),
+    "expenses:historic_report": _budget(4, 0.1, 0.2, 0.3),
+    "expenses:indicators": _budget(4, 0.2, 0.3, 0.5),
+    # the B3 import issues a few queries per imported asset
+    "assets:b3_import": _budget(60, 1, 2, 3),
+}
@@ -0,0 +1,138 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import pytest
+from rest_framework.test import APIClient
+
+from authentication.models import CustomUser
+from authentication.services.jwt import UserClaimsRefreshToken
+
+from .budgets import BUDGETS
+
+# The benchmarks are slow (the data is generated at several scales) so they only run on demand:
+#   BENCHMARKS=1 pytest shared/tests/benchmarks -p no:xdist
+# `BENCHMARK_SCALES` (transactions per user, comma separated), `BENCHMARK_ROUNDS`,
+# `BENCHMARK_TIME_FACTOR` (multiplies the time budgets, e.g. for slow machines) and
+# `BENCHMARK_JSON` (path where the measurements are written) tune the run.
+collect_ignore_glob = [] if os.environ.get("BENCHMARKS") else ["test_*.py"]
+
+SCALES = [int(s) for s in os.environ.get("BENCHMARK_SCALES", "1000").split(",")]
+ROUNDS = int(os.environ.get("BENCHMARK_ROUNDS", 3))
+TIME_FACTOR = float(os.environ.get("BENCHMARK_TIME_FACTOR", 1))
+
+
+@dataclass
+class Measurement:
+    name: str
+    scale: int
+    vendor: str
+    queries: int
+    sql_time: float
+    wall_time: float
+
+
+_measurements: list[Measurement] = []
+
+
+@dataclass
+class Dataset:
+    scale: int
+    user: CustomUser
+
+
+@pytest.fixture(scope="session", params=SCALES, ids=lambda scale: f"{scale}tx")
+def dataset(request, django_db_setup, django_db_blocker) -> Dataset:
+    email = f"benchmark-{request.param}@example.com"
+    with django_db_blocker.unblock():
+        call_command(
+            "generate_dummy_data",
+            from_date=str(timezone.localdate() - timedelta(days=5 * 365)),
+            total="500000",
+            email=email,
+            password="benchmark",
+            transactions=request.param,
+            clear=True,
+            stdout=StringIO(),
+        )
+        return Dataset(scale=request.param, user=CustomUser.objects.get(email=email))
+
+
+@pytest.fixture
+def client(dataset: Dataset) -> APIClient:
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {UserClaimsRefreshToken.for_user(dataset.user).access_token}"
+    )
+    return client
+
+
+@pytest.fixture
+def benchmark(dataset: Dataset):
+    """Measure `func` over `BENCHMARK_ROUNDS` rounds (after a warm up one) and fail if the
+    budget of `name` is exceeded. `setup` runs before every round and isn't measured."""
+
+    def _benchmark(name: str, func, setup=None):
+        budget = BUDGETS[name]
+        queries, sql_times, wall_times = [], [], []
+        for i in range(ROUNDS + 1):
+            if setup is not None:
+                setup()
+            with CaptureQueriesContext(connection) as context:
+                start = perf_counter()
+                result = func()
+                wall_time = perf_counter() - start
+            if i == 0:  # warm up
+                continue
+            queries.append(len(context.captured_queries))
+            sql_times.append(sum(float(q["time"]) for q in context.captured_queries))
+            wall_times.append(wall_time)
+
+        measurement = Measurement(
+            name=name,
+            scale=dataset.scale,
+            vendor=connection.vendor,
+            queries=max(queries),
+            sql_time=median(sql_times),
+            wall_time=median(wall_times),
+        )
+        _measurements.append(measurement)
+
+        seconds = budget.get_seconds(dataset.scale) * TIME_FACTOR
+        assert (
+            measurement.queries <= budget.queries
+        ), f"{name}: {measurement.queries} queries (budget: {budget.queries})"
+        assert (
+            measurement.wall_time <= seconds
+        ), f"{name}: {measurement.wall_time:.3f}s (budget: {seconds:.3f}s)"
+        return result
+
+    return _benchmark
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _measurements:
+        return
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(
+        f"{'name':<40} {'scale':>8} {'vendor':>10} {'queries':>8} {'sql (s)':>9} {'wall (s)':>9}"
+    )
+    for m in _measurements:
+        terminalreporter.write_line(
+            f"{m.name:<40} {m.scale:>8} {m.vendor:>10} {m.queries:>8} "
+            f"{m.sql_time:>9.4f} {m.wall_time:>9.4f}"
+        )
+
+    if path := os.environ.get("BENCHMARK_JSON"):
+        Path(path).write_text(json.dumps([asdict(m) for m in _measurements], indent=2))
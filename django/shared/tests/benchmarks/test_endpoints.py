@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+import pytest
+from openpyxl import Workbook
+
+from config.settings.base import BASE_API_URL
+from variable_income_assets.adapters.key_value_store import bump_portfolio_summary_version
+from variable_income_assets.choices import AssetTypes
+from variable_income_assets.models import Asset
+
+pytestmark = pytest.mark.django_db
+
+URL = f"/{BASE_API_URL}"
+
+READ_FIELDS = (
+    "quantity_balance",
+    "avg_price",
+    "normalized_avg_price",
+    "normalized_total_bought",
+    "current_total_bought",
+    "normalized_total_sold",
+    "normalized_closed_roi",
+    "normalized_credited_incomes",
+)
+
+
+def _get(client, path: str):
+    def func():
+        response = client.get(URL + path)
+        assert response.status_code == 200, response.data
+        return response
+
+    return func
+
+
+def _date_range(days: int) -> str:
+    today = timezone.localdate()
+    return (
+        f"start_date={(today - timedelta(days=days)).strftime('%d/%m/%Y')}"
+        f"&end_date={today.strftime('%d/%m/%Y')}"
+    )
+
+
+@pytest.mark.parametrize(
+    ("name", "path"),
+    (
+        ("assets:list", "assets?page_size=100"),
+        (
+            "assets:reports:total_invested",
+            "assets/reports?kind=total_invested&percentage=false&current=true&group_by=type",
+        ),
+        ("assets:reports:roi", "assets/reports?kind=roi&opened=true&closed=true&group_by=type"),
+        (
+            "transactions:historic_report",
+            f"transactions/historic_report?{_date_range(5 * 365)}&aggregate_period=month",
+        ),
+        (
+            "expenses:historic_report",
+            f"expenses/historic_report?{_date_range(365)}&aggregate_period=month",
+        ),
+        ("expenses:indicators", "expenses/indicators"),
+    ),
+)
+def test__endpoint(benchmark, client, name, path):
+    benchmark(name, _get(client, path))
+
+
+def test__assets__indicators(benchmark, client, dataset):
+    # the cached summary would be measured otherwise
+    benchmark(
+        "assets:indicators",
+        _get(client, "assets/indicators"),
+        setup=lambda: bump_portfolio_summary_version(dataset.user.pk),
+    )
+
+
+@pytest.mark.parametrize("aggregation", ("join", "pre_aggregated"))
+def test__assets__read_fields(benchmark, dataset, aggregation):
+    qs = Asset.objects.filter(user_id=dataset.user.pk)
+
+    benchmark(
+        f"assets:read_fields:{aggregation}",
+        lambda: list(qs.annotate_read_fields(aggregation=aggregation).values(*READ_FIELDS)),
+    )
+
+
+def test__assets__b3_import(benchmark, client, dataset, tmp_path):
+    codes = list(
+        Asset.objects.filter(user_id=dataset.user.pk, type=AssetTypes.stock).values_list(
+            "code", flat=True
+        )
+    )
+    if not codes:  # pragma: no cover
+        pytest.skip("The generated portfolio has no stocks")
+
+    path = tmp_path / "negociacao.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Negociação"
+    ws.append(
+        [
+            "Data do Negócio",
+            "Tipo de Movimentação",
+            "Mercado",
+            "Prazo/Vencimento",
+            "Instituição",
+            "Código de Negociação",
+            "Quantidade",
+            "Preço",
+            "Valor",
+        ]
+    )
+    start = datetime.now() - timedelta(days=365)
+    for i in range(min(dataset.scale // 10, 1_000)):
+        operation_date = (start + timedelta(days=i % 365)).strftime("%d/%m/%Y")
+        code = codes[i % len(codes)]
+        ws.append([operation_date, "Compra", "Mercado à Vista", "-", "INTER DTVM", code, 1, 10, 10])
+    wb.save(path)
+
+    def func():
+        # every round imports the same rows
+        with transaction.atomic(), open(path, "rb") as negociacao:
+            response = client.post(
+                f"{URL}assets/b3_import",
+                data={"operations": ["negociacoes"], "dry_run": False, "negociacao": negociacao},
+                format="multipart",
+            )
+            transaction.set_rollback(True)
+        assert response.status_code == 200, response.data
+        return response
+
+    benchmark("assets:b3_import", func)
@@ -1,10 +1,17 @@
+from datetime import date, timedelta
 from decimal import Decimal
 
+from django.conf import settings
+from django.db.models import DateField, F, Q, Value
 from django.utils import timezone
 
 import pytest
 from dateutil.relativedelta import relativedelta
 
+from expenses.managers import _PersonalFinancialDateFilters
+from expenses.models import Expense
+from shared.managers_utils import AddMonths, GenericDateFilters, ReplaceDay
+from shared.tests import assert_index_condition
 from variable_income_assets.models import AssetsTotalInvestedSnapshot
 
 pytestmark = pytest.mark.django_db
@@ -102,3 +109,157 @@ class TestLatestBeforeQuerySet:
 
         # THEN
         assert result is None
+
+
+def _extraction_filters(base_date: date) -> dict[str, Q]:
+    # the former `__month`/`__year` predicates, the reference of the date range ones
+    current_year = Q(
+        operation_date__month__lte=base_date.month, operation_date__year=base_date.year
+    )
+    return {
+        "current": Q(operation_date__month=base_date.month, operation_date__year=base_date.year),
+        "since_a_year_ago": (
+            Q(operation_date__month__gte=base_date.month, operation_date__year=base_date.year - 1)
+            | current_year
+        ),
+        "future": (
+            Q(operation_date__month__gt=base_date.month, operation_date__year=base_date.year)
+            | Q(operation_date__year__gt=base_date.year)
+        ),
+        "current_month_and_past": Q(operation_date__year__lt=base_date.year) | current_year,
+    }
+
+
+class _OperationDateFilters(_PersonalFinancialDateFilters):
+    def __init__(self, base_date: date) -> None:
+        GenericDateFilters.__init__(self, date_field_name="operation_date", base_date=base_date)
+
+
+class TestGenericDateFilters:
+    @pytest.fixture
+    def snapshots(self, user):
+        # every day of the years around the base dates
+        start = date(2022, 1, 1)
+        AssetsTotalInvestedSnapshot.objects.bulk_create(
+            AssetsTotalInvestedSnapshot(
+                user=user, operation_date=start + timedelta(days=i), total=Decimal(i)
+            )
+            for i in range((date(2026, 12, 31) - start).days + 1)
+        )
+        return AssetsTotalInvestedSnapshot.objects.filter(user=user)
+
+    @pytest.mark.parametrize(
+        "base_date",
+        (
+            date(2024, 1, 1),
+            date(2024, 1, 31),
+            date(2024, 2, 29),
+            date(2024, 6, 15),
+            date(2024, 12, 1),
+            date(2024, 12, 31),
+            date(2025, 3, 31),
+        ),
+    )
+    @pytest.mark.parametrize(
+        "name", ("current", "since_a_year_ago", "future", "current_month_and_past")
+    )
+    def test__date_ranges__same_as_extractions(self, snapshots, base_date, name):
+        # GIVEN
+        filters = _OperationDateFilters(base_date=base_date)
+        expected = _extraction_filters(base_date)[name]
+
+        # WHEN
+        result = set(snapshots.filter(getattr(filters, name)).values_list("pk", flat=True))
+
+        # THEN
+        assert result == set(snapshots.filter(expected).values_list("pk", flat=True))
+        assert set(snapshots.exclude(getattr(filters, name)).values_list("pk", flat=True)) == set(
+            snapshots.exclude(expected).values_list("pk", flat=True)
+        )
+
+    @pytest.mark.skipif(
+        "postgresql" not in settings.DATABASES["default"]["ENGINE"],
+        reason="The query plans are PostgreSQL specific",
+    )
+    @pytest.mark.parametrize("name", ("current", "since_a_year_ago", "future"))
+    def test__date_ranges__use_index(self, user, name):
+        # GIVEN
+        filters = GenericDateFilters(date_field_name="operation_date")
+
+        # WHEN
+        qs = AssetsTotalInvestedSnapshot.objects.filter(getattr(filters, name), user=user)
+
+        # THEN
+        assert_index_condition(qs, "operation_date")
+
+    @pytest.mark.skipif(
+        "postgresql" not in settings.DATABASES["default"]["ENGINE"],
+        reason="The query plans are PostgreSQL specific",
+    )
+    @pytest.mark.parametrize(
+        "name", ("current", "since_a_year_ago", "future", "current_month_and_past")
+    )
+    def test__personal_financial_date_ranges__use_index(self, user, name):
+        # GIVEN
+        filters = Expense.objects.all().filters
+
+        # WHEN
+        qs = Expense.objects.filter(getattr(filters, name), user=user)
+
+        # THEN
+        assert_index_condition(qs, "created_at")
+
+
+DATES = (
+    date(2024, 1, 31),
+    date(2024, 2, 29),
+    date(2023, 3, 31),
+    date(2024, 12, 15),
+    date(2024, 5, 1),
+)
+
+
+class TestDateFuncs:
+    @pytest.fixture
+    def snapshots(self, user):
+        return AssetsTotalInvestedSnapshot.objects.filter(
+            pk=AssetsTotalInvestedSnapshot.objects.create(
+                user=user, operation_date=date(2024, 1, 1), total=Decimal("1000")
+            ).pk
+        )
+
+    @pytest.mark.parametrize("months", (-13, -1, 0, 1, 2, 11, 12, 25))
+    @pytest.mark.parametrize("d", DATES)
+    def test__add_months__is_equivalent_to_relativedelta(self, snapshots, d, months):
+        # GIVEN
+        expression = AddMonths(Value(d, output_field=DateField()), Value(months))
+
+        # WHEN
+        result = snapshots.annotate(result=expression).values_list("result", flat=True).get()
+
+        # THEN
+        assert result == d + relativedelta(months=months)
+
+    @pytest.mark.parametrize("day", (1, 15, 28, 29, 30, 31))
+    @pytest.mark.parametrize("d", DATES)
+    def test__replace_day__is_equivalent_to_relativedelta(self, snapshots, d, day):
+        # GIVEN
+        expression = ReplaceDay(Value(d, output_field=DateField()), Value(day))
+
+        # WHEN
+        result = snapshots.annotate(result=expression).values_list("result", flat=True).get()
+
+        # THEN
+        assert result == d + relativedelta(day=day)
+
+    def test__update__column_expressions(self, snapshots):
+        # GIVEN
+        snapshots.update(operation_date=date(2024, 1, 31))
+
+        # WHEN
+        snapshots.update(
+            operation_date=ReplaceDay(AddMonths(F("operation_date"), Value(1)), Value(30))
+        )
+
+        # THEN
+        assert snapshots.get().operation_date == date(2024, 2, 29)
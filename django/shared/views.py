@@ -14,6 +14,7 @@ from rest_framework.viewsets import GenericViewSet
 from expenses.models import BankAccount, BankAccountSnapshot
 from expenses.permissions import PersonalFinancesModulePermission
 from shared.permissions import SubscriptionEndedPermission
+from variable_income_assets.adapters.key_value_store import get_or_set_portfolio_summary
 from variable_income_assets.models import AssetReadModel, AssetsTotalInvestedSnapshot
 from variable_income_assets.permissions import InvestmentsModulePermission
 
@@ -49,11 +50,13 @@ class PatrimonyViewSet(GenericViewSet):
         target_date = today - relativedelta(months=int(months or 0), years=int(years or 0))
 
         # Current patrimony: assets + bank account
-        current_assets_total = (
-            AssetReadModel.objects.filter(
+        current_assets_total = get_or_set_portfolio_summary(
+            user_id=request.user.id,
+            name="current_total",
+            compute=lambda: AssetReadModel.objects.filter(
                 user_id=request.user.id
-            ).aggregate_normalized_current_total()
-        )["total"]
+            ).aggregate_normalized_current_total()["total"],
+        )
 
         current_bank_amount = BankAccount.objects.get_total(user_id=request.user.id)
 
@@ -1,13 +1,56 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
 from decimal import Decimal
+from typing import Any
+from uuid import uuid4
 
 from django.conf import settings
+from django.db import transaction as djtransaction
+from django.utils import timezone
 
 from config.key_value_store import key_value_backend
 
 from ..choices import Currencies
 
+_scope = threading.local()
+
+
+@contextmanager
+def dollar_conversion_rate_scope() -> Iterator[None]:
+    """Snapshot the dollar conversion rate for the duration of the block.
+
+    The first `get_dollar_conversion_rate` call inside the block looks the rate up and the
+    following ones reuse it, so the numbers of a request (or task) are computed with the
+    same rate and the key-value backend is hit only once. Nested blocks share the snapshot
+    of the outermost one.
+    """
+    if getattr(_scope, "snapshot", None) is not None:
+        yield
+        return
+
+    _scope.snapshot = {}
+    try:
+        yield
+    finally:
+        _scope.snapshot = None
+
 
 def get_dollar_conversion_rate() -> Decimal:
+    snapshot: dict[str, Decimal] | None = getattr(_scope, "snapshot", None)
+    if snapshot is not None and "value" in snapshot:
+        return snapshot["value"]
+
+    value = _get_dollar_conversion_rate()
+    if snapshot is not None:
+        snapshot["value"] = value
+    return value
+
+
+def _get_dollar_conversion_rate() -> Decimal:
     value = key_value_backend.get(key=settings.DOLLAR_CONVERSION_RATE_KEY)
     if value is not None:
         return value
@@ -24,6 +67,7 @@ def get_dollar_conversion_rate() -> Decimal:
 
 def update_dollar_conversion_rate(value: Decimal | None = None) -> Decimal:
     from ..integrations.helpers import fetch_dollar_to_real_conversion_value
+    from ..models import AssetReadModel
     from ..models.write import ConversionRate
 
     if value is None:
@@ -35,5 +79,99 @@ def update_dollar_conversion_rate(value: Decimal | None = None) -> Decimal:
         defaults={"value": value},
     )
     key_value_backend.set(key=settings.DOLLAR_CONVERSION_RATE_KEY, value=value)
+    if getattr(_scope, "snapshot", None) is not None:
+        _scope.snapshot["value"] = value
+    AssetReadModel.objects.filter(currency=Currencies.dollar).update_current_totals()
+    bump_portfolio_summary_version()
+
+    return value
+
+
+def _get_quote_key(code: str, asset_type: str, currency: str) -> str:
+    return f"{settings.ASSET_QUOTES_KEY_PREFIX}:{asset_type}:{currency}:{code}"
+
+
+def get_cached_quote(code: str, asset_type: str, currency: str) -> tuple[Decimal, datetime] | None:
+    """The last known price of an asset and when it was fetched, regardless of its age."""
+    return key_value_backend.get(key=_get_quote_key(code, asset_type, currency))
+
 
+def cache_quotes(
+    quotes: dict[tuple[str, str, str], Decimal], updated_at: datetime | None = None
+) -> None:
+    """Store the prices of the assets identified by (code, type, currency).
+
+    The prices are kept for `settings.ASSET_QUOTES_RETENTION_IN_SECONDS`, so they can still
+    be used as the last known price after `settings.ASSET_QUOTES_MAX_AGE_IN_SECONDS`.
+    """
+    updated_at = updated_at or timezone.now()
+    key_value_backend.set_many(
+        mapping={
+            _get_quote_key(code, asset_type, currency): (Decimal(str(price)), updated_at)
+            for (code, asset_type, currency), price in quotes.items()
+        },
+        timeout=settings.ASSET_QUOTES_RETENTION_IN_SECONDS,
+    )
+
+
+def _get_portfolio_summary_version_key(user_id: int | None) -> str:
+    return f"{settings.PORTFOLIO_SUMMARY_KEY_PREFIX}:version:{user_id or 'global'}"
+
+
+def bump_portfolio_summary_version(user_id: int | None = None) -> None:
+    """Invalidate the cached portfolio summaries of `user_id` or, if `None`, of every user.
+
+    The version is bumped right away, so the current transaction doesn't read a summary
+    computed before its changes, and again once it's committed, so a summary computed by a
+    concurrent request before the changes were visible isn't kept.
+    """
+
+    def bump() -> None:
+        key_value_backend.set(
+            key=_get_portfolio_summary_version_key(user_id),
+            value=uuid4().hex,
+            timeout=settings.PORTFOLIO_SUMMARY_TIMEOUT_IN_SECONDS,
+        )
+
+    bump()
+    djtransaction.on_commit(bump)
+
+
+def get_or_set_portfolio_summary(user_id: int, name: str, compute: Callable[[], Any]) -> Any:
+    """Get the summary `name` of the portfolio of `user_id`, computing and caching it on a miss.
+
+    The cache key includes the user and global versions (see `bump_portfolio_summary_version`)
+    so the invalidation is exact: a summary is recomputed only when something it depends on
+    changed. The summaries aren't cached if the key value store isn't shared by the processes
+    as the versions bumped by the others (e.g. the price updates) wouldn't be seen.
+    """
+    if not key_value_backend.is_shared:
+        return compute()
+
+    version_keys = [
+        _get_portfolio_summary_version_key(user_id),
+        _get_portfolio_summary_version_key(None),
+    ]
+    versions = key_value_backend.get_many(version_keys)
+    # an expired version can't be restored otherwise an older summary could be reused
+    if missing := {key: uuid4().hex for key in version_keys if key not in versions}:
+        key_value_backend.set_many(
+            mapping=missing, timeout=settings.PORTFOLIO_SUMMARY_TIMEOUT_IN_SECONDS
+        )
+        versions.update(missing)
+
+    key = ":".join(
+        (
+            settings.PORTFOLIO_SUMMARY_KEY_PREFIX,
+            str(user_id),
+            *(versions[version_key] for version_key in version_keys),
+            name,
+        )
+    )
+    value = key_value_backend.get(key=key)
+    if value is None:
+        value = compute()
+        key_value_backend.set(
+            key=key, value=value, timeout=settings.PORTFOLIO_SUMMARY_TIMEOUT_IN_SECONDS
+        )
     return value
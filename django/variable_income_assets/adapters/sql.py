@@ -105,6 +105,15 @@ class TransactionRepository(DjangoEntityRepository):
 
         return Transaction.objects.create(**asdict(dto), asset_id=self.asset_pk)
 
+    def add_many(self, dtos: Iterable[TransactionDTO]) -> None:
+        from ..models import Transaction
+
+        self.seen.update(
+            Transaction.objects.bulk_create(
+                [Transaction(**asdict(dto), asset_id=self.asset_pk) for dto in dtos]
+            )
+        )
+
 
 class PassiveIncomeRepository(DjangoEntityRepository):  # pragma: no cover
     seen: set[PassiveIncome]
@@ -272,13 +281,24 @@ class DjangoSQLAssetMetaDataRepository(AbstractAssetMetaDataRepository):
 
     @staticmethod
     def get_current_price_annotation(
-        source: Literal["write", "read", "transactions"],
+        source: Literal["write", "read", "read_update", "transactions"],
     ) -> F | Coalesce:
         if source == "read":
             return F("metadata__current_price")
 
         from ..models import AssetMetaData
 
+        if source == "read_update":
+            # `UPDATE` statements can't reference the fields of a related model
+            return Coalesce(
+                Subquery(
+                    AssetMetaData.objects.filter(pk=OuterRef("metadata_id")).values(
+                        "current_price"
+                    )[:1]
+                ),
+                Decimal(),
+            )
+
         prefix = "asset__" if source == "transactions" else ""
         return Coalesce(
             Subquery(
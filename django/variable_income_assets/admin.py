@@ -17,6 +17,7 @@ from .models import (
     AssetReadModel,
     AssetsTotalInvestedSnapshot,
     ConversionRate,
+    EventOutboxMessage,
     PassiveIncome,
     Transaction,
 )
@@ -110,3 +111,11 @@ class AssetsTotalInvestedSnapshotAdmin(admin.ModelAdmin):
 class ConversionRateAdmin(admin.ModelAdmin):
     list_filter = ("from_currency", "to_currency")
     search_fields = ("from_currency", "to_currency")
+
+
+@admin.register(EventOutboxMessage)
+class EventOutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ("event_type", "handler", "asset_pk", "state", "attempts", "created_at")
+    list_filter = ("state", "event_type", "handler")
+    search_fields = ("asset_pk",)
+    exclude = ("payload",)
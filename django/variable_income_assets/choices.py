@@ -115,3 +115,10 @@ class AssetStatus(DjangoChoices):
 class LiquidityTypes(DjangoChoices):
     daily = ChoiceItem("DAILY", label="Liquidez Diária")
     at_maturity = ChoiceItem("AT_MATURITY", label="Somente no Vencimento")
+
+
+class EventOutboxStates(DjangoChoices):
+    pending = ChoiceItem("PENDING", label="Pendente")
+    processing = ChoiceItem("PROCESSING", label="Processando")
+    done = ChoiceItem("DONE", label="Processado")
+    dead = ChoiceItem("DEAD", label="Descartado")
@@ -14,6 +14,12 @@ class CreateTransactions(Command):
     dispatch_event: bool = True
 
 
+@dataclass
+class BulkCreateTransactions(Command):
+    # the transactions must have been added via `AssetDomainModel.add_transactions`
+    asset: AssetDomainModel
+
+
 @dataclass
 class UpdateTransaction(Command):
     transaction: Transaction
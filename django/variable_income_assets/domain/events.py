@@ -3,6 +3,7 @@ from datetime import date
 from decimal import Decimal
 
 from ..domain.models import Asset as AssetDomainModel
+from ..domain.models import AssetReadModelDelta
 
 
 class Event: ...
@@ -25,6 +26,10 @@ class TransactionEvent(RelatedAssetEvent):
     operation_date: date | None = None
     is_held_in_self_custody: bool = False
 
+    # the change on the aggregated read model fields. If `None` the read model
+    # is fully re-aggregated
+    read_model_delta: AssetReadModelDelta | None = None
+
 
 @dataclass
 class TransactionsCreated(TransactionEvent):
@@ -39,14 +44,24 @@ class TransactionDeleted(TransactionEvent): ...
 
 
 @dataclass
-class PassiveIncomeCreated(RelatedAssetEvent):
+class PassiveIncomeEvent(RelatedAssetEvent):
+    # carried over from the transaction events merged into this one
+    is_held_in_self_custody: bool = False
+
+    # the change on the aggregated read model fields. If `None` the read model
+    # is fully re-aggregated
+    read_model_delta: AssetReadModelDelta | None = None
+
+
+@dataclass
+class PassiveIncomeCreated(PassiveIncomeEvent):
     new_asset: bool = False
 
 
-class PassiveIncomeUpdated(RelatedAssetEvent): ...
+class PassiveIncomeUpdated(PassiveIncomeEvent): ...
 
 
-class PassiveIncomeDeleted(RelatedAssetEvent): ...
+class PassiveIncomeDeleted(PassiveIncomeEvent): ...
 
 
 class AssetOperationClosed(RelatedAssetEvent): ...
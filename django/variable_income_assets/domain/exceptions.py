@@ -109,3 +109,13 @@ class AssetHeldInSelfCustodyTransactionUpdateFromBuyToSellException(ValidationEr
 
     def __init__(self) -> None:
         super().__init__(field="action")
+
+
+class AssetHeldInSelfCustodyBulkTransactionsException(ValidationError):
+    default_message = (
+        "As transações de ativos de renda fixa custodiados fora da b3 não podem ser "
+        "importadas em lote. Por favor, insira uma transação de cada vez."
+    )
+
+    def __init__(self) -> None:
+        super().__init__(field="asset")
@@ -20,6 +20,7 @@ from ..choices import (
     TransactionActions,
 )
 from .exceptions import (
+    AssetHeldInSelfCustodyBulkTransactionsException,
     AssetHeldInSelfCustodyButNotFixedException,
     AssetHeldInSelfCustodyTransactionUpdateFromBuyToSellException,
     AssetHeldInSelfCustodyWithQuantityException,
@@ -29,10 +30,13 @@ from .exceptions import (
     InvalidAssetCurrentException,
     NegativeQuantityNotAllowedException,
     SpaceNotAllowedInB3AssetCode,
+    ValidationError,
 )
 
 if TYPE_CHECKING:
-    from ..models import Transaction
+    from collections.abc import Iterable
+
+    from ..models import PassiveIncome, Transaction
     from .events import Event
 
 
@@ -68,6 +72,61 @@ class PassiveIncomeDTO:  # TODO?
     current_currency_conversion_rate: Decimal | None = None
 
 
+@dataclass(frozen=True)
+class AssetReadModelDelta:
+    """The change a write operation causes on the aggregated `AssetReadModel` fields.
+
+    Mirrors the expressions used by `AssetQuerySet.annotate_read_fields` so that applying
+    a delta is equivalent to re-aggregating every `Transaction` and `PassiveIncome`
+    of the asset, as long as no `AssetClosedOperation` is created in the meantime.
+    """
+
+    quantity_balance: Decimal = Decimal()
+    quantity_bought: Decimal = Decimal()
+    total_bought: Decimal = Decimal()
+    normalized_total_bought: Decimal = Decimal()
+    normalized_total_sold: Decimal = Decimal()
+    credited_incomes: Decimal = Decimal()
+    normalized_credited_incomes: Decimal = Decimal()
+
+    def __add__(self, other: AssetReadModelDelta) -> AssetReadModelDelta:
+        return AssetReadModelDelta(
+            **{f: getattr(self, f) + getattr(other, f) for f in self.__dataclass_fields__}
+        )
+
+    def __neg__(self) -> AssetReadModelDelta:
+        return AssetReadModelDelta(**{f: -getattr(self, f) for f in self.__dataclass_fields__})
+
+    def __sub__(self, other: AssetReadModelDelta) -> AssetReadModelDelta:
+        return self + (-other)
+
+    @classmethod
+    def from_transaction(cls, transaction: TransactionDTO | Transaction) -> AssetReadModelDelta:
+        quantity = Decimal(transaction.quantity if transaction.quantity is not None else "1.0")
+        total = Decimal(transaction.price) * quantity
+        normalized_total = total * Decimal(transaction.current_currency_conversion_rate)
+        if transaction.action == TransactionActions.sell:
+            return cls(quantity_balance=-quantity, normalized_total_sold=normalized_total)
+
+        # BONIFICACAO rows have `price=0`: they only add to the quantities
+        return cls(
+            quantity_balance=quantity,
+            quantity_bought=quantity,
+            total_bought=total,
+            normalized_total_bought=normalized_total,
+        )
+
+    @classmethod
+    def from_income(cls, income: PassiveIncomeDTO | PassiveIncome) -> AssetReadModelDelta:
+        if income.event_type != PassiveIncomeEventTypes.credited:
+            return cls()
+        amount = Decimal(income.amount)
+        return cls(
+            credited_incomes=amount,
+            normalized_credited_incomes=amount * Decimal(income.current_currency_conversion_rate),
+        )
+
+
 @dataclass(unsafe_hash=True)
 class Asset:
     type: choices_to_enum(AssetTypes)
@@ -91,6 +150,8 @@ class Asset:
 
     def __post_init__(self) -> None:
         self._transactions: list[TransactionDTO] = []
+        # indexes of `_transactions` that close an operation (see `add_transactions`)
+        self._closing_transactions_indexes: list[int] = []
         self.events: list[Event] = []
 
         if self.is_held_in_self_custody:
@@ -155,6 +216,42 @@ class Asset:
 
         self._transactions.append(transaction_dto)
 
+    def add_transactions(
+        self, dtos: Iterable[TransactionDTO]
+    ) -> list[tuple[TransactionDTO, ValidationError]]:
+        """Validate a batch of transactions against the running balance of the asset.
+
+        The `dtos` must be sorted chronologically. As opposed to calling `add_transaction`
+        several times, `quantity_balance` is updated after every valid transaction so a
+        sell is validated against the quantity bought earlier in the same batch.
+        Invalid transactions are not added.
+
+        Args:
+            dtos (Iterable[TransactionDTO]): The chronologically sorted transactions.
+
+        Returns:
+            list[tuple[TransactionDTO, ValidationError]]: The rejected transactions and why.
+        """
+        if self.is_held_in_self_custody:
+            # the running balance of these assets is based on `avg_price` and `total_sold`
+            raise AssetHeldInSelfCustodyBulkTransactionsException
+
+        errors: list[tuple[TransactionDTO, ValidationError]] = []
+        for dto in dtos:
+            events_count = len(self.events)
+            try:
+                self.add_transaction(dto)
+            except ValidationError as e:
+                errors.append((dto, e))
+                continue
+
+            self.quantity_balance = (self.quantity_balance or Decimal()) + (
+                -dto.quantity if dto.is_sale else dto.quantity
+            )
+            if len(self.events) > events_count:
+                self._closing_transactions_indexes.append(len(self._transactions) - 1)
+        return errors
+
     def update_transaction(self, dto: TransactionDTO, transaction: Transaction) -> TransactionDTO:
         from .events import AssetOperationClosed
 
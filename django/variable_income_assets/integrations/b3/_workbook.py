@@ -1,18 +1,164 @@
 from __future__ import annotations
 
+import hashlib
+import zipfile
+from collections.abc import Iterable, Iterator
 from io import BytesIO
 from pathlib import Path
 from typing import IO
 
+from django.conf import settings
+
 from openpyxl import Workbook, load_workbook
 
 # A workbook can be referenced by a filesystem path or carried in memory as raw
 # bytes (an uploaded file read into memory). Bytes are wrapped in a fresh BytesIO
-# on every call, so the same payload can be parsed more than once.
-WorkbookSource = str | Path | bytes | IO[bytes]
+# on every call, so the same payload can be parsed more than once. A `ParsedWorkbook`
+# shares a workbook that was already opened.
+WorkbookSource = str | Path | bytes | IO[bytes] | "ParsedWorkbook"
+
+
+# The sheets read by several parsers of the same import, whose rows are kept in memory
+# instead of being streamed (and parsed) again: `Movimentação` is read by both the renda
+# fixa and the tesouro pipelines
+SHARED_SHEETS = frozenset({"Movimentação"})
+
+
+class B3ParserError(Exception):
+    pass
+
+
+def _check_uncompressed_size(source: str | Path | IO[bytes]) -> None:
+    # `xlsx` files are zip archives that can be extremely compressed: cap the size of the
+    # content to be parsed, not only the size of the file
+    max_size = settings.B3_IMPORT_MAX_UNCOMPRESSED_SIZE_IN_BYTES
+    try:
+        with zipfile.ZipFile(source) as archive:
+            size = sum(info.file_size for info in archive.infolist())
+    except zipfile.BadZipFile:
+        return  # reported by `openpyxl`
+    finally:
+        if hasattr(source, "seek"):
+            source.seek(0)
+
+    if size > max_size:
+        raise B3ParserError(
+            f"workbook too large: {size} bytes uncompressed (max. {max_size} bytes)"
+        )
 
 
 def open_workbook(source: WorkbookSource) -> Workbook:
     if isinstance(source, bytes):
         source = BytesIO(source)
-    return load_workbook(source, data_only=True)
+    _check_uncompressed_size(source)
+    # `read_only` streams the cells from the underlying XML as the rows are iterated
+    # instead of materializing the whole workbook in memory
+    return load_workbook(source, read_only=True, data_only=True)
+
+
+def _iter_rows(workbook: Workbook, sheet_name: str) -> Iterator[tuple]:
+    if sheet_name not in workbook.sheetnames:
+        raise B3ParserError(f"sheet {sheet_name!r} not found")
+
+    rows = workbook[sheet_name].iter_rows(values_only=True)
+    try:
+        header_row = next(rows)
+    except StopIteration as exc:
+        raise B3ParserError(f"empty sheet {sheet_name!r}") from exc
+
+    yield header_row
+    width = len(header_row)
+    for row in rows:
+        yield row if len(row) >= width else row + (None,) * (width - len(row))
+
+
+class ParsedWorkbook:
+    """A workbook that is opened once and shared by the parsers reading its sheets.
+
+    Most sheets are read by a single parser so they're streamed from the read-only
+    workbook every time they're read. Only the rows of `cached_sheets` (e.g. `movimentacao`,
+    read by both the renda fixa and tesouro pipelines) are kept in memory after they're
+    first read, so every parser consuming them shares the same parse.
+    """
+
+    def __init__(
+        self,
+        source: str | Path | bytes | IO[bytes],
+        cached_sheets: Iterable[str] = SHARED_SHEETS,
+    ) -> None:
+        self._source = source
+        self._cached_sheets = frozenset(cached_sheets)
+        self._workbook: Workbook | None = None
+        self._sheets: dict[str, list[tuple]] = {}
+
+    def rows(self, sheet_name: str) -> Iterator[tuple]:
+        if sheet_name in self._sheets:
+            return iter(self._sheets[sheet_name])
+
+        if self._workbook is None:
+            self._workbook = open_workbook(self._source)
+        rows = _iter_rows(self._workbook, sheet_name)
+        if sheet_name not in self._cached_sheets:
+            return rows
+
+        self._sheets[sheet_name] = list(rows)
+        return iter(self._sheets[sheet_name])
+
+    def close(self) -> None:
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+        self._sheets.clear()
+
+
+class WorkbookCache:
+    """Maps the content hash of an uploaded workbook to its `ParsedWorkbook`.
+
+    Meant to live for a single import request: identical payloads (e.g. the same
+    file uploaded for two operations) are opened only once. Use it as a context
+    manager to close the underlying workbooks.
+    """
+
+    def __init__(self) -> None:
+        self._workbooks: dict[str, ParsedWorkbook] = {}
+
+    def __enter__(self) -> WorkbookCache:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._workbooks)
+
+    def get(self, content: bytes | None) -> ParsedWorkbook | None:
+        if content is None:
+            return None
+        key = hashlib.sha256(content).hexdigest()
+        if key not in self._workbooks:
+            self._workbooks[key] = ParsedWorkbook(content)
+        return self._workbooks[key]
+
+    def close(self) -> None:
+        for workbook in self._workbooks.values():
+            workbook.close()
+        self._workbooks.clear()
+
+
+def iter_sheet_rows(source: WorkbookSource, sheet_name: str) -> Iterator[tuple]:
+    """Lazily yield the values of every row of `sheet_name`, the header included.
+
+    The workbook is closed once the rows are exhausted (or the generator is discarded),
+    unless it's a `ParsedWorkbook`, which stays open (and may yield cached rows).
+    Rows are padded to the header width as read-only worksheets don't yield trailing
+    empty cells when the sheet dimensions are missing.
+    """
+    if isinstance(source, ParsedWorkbook):
+        yield from source.rows(sheet_name)
+        return
+
+    workbook = open_workbook(source)
+    try:
+        yield from _iter_rows(workbook, sheet_name)
+    finally:
+        workbook.close()
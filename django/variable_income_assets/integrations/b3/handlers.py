@@ -10,9 +10,10 @@ from django.contrib.auth import get_user_model
 from django.db import transaction as djtransaction
 from django.utils import timezone
 
-from rest_framework.exceptions import ValidationError as DRFValidationError
-
-from ...adapters.key_value_store import get_dollar_conversion_rate
+from ...adapters.key_value_store import (
+    bump_portfolio_summary_version,
+    get_dollar_conversion_rate,
+)
 from ...choices import (
     AssetObjectives,
     AssetTypes,
@@ -21,16 +22,18 @@ from ...choices import (
     PassiveIncomeEventTypes,
     PassiveIncomeTypes,
 )
-from ...domain import events
-from ...models import Asset, AssetMetaData, PassiveIncome, Transaction
+from ...domain import commands, events
+from ...domain.exceptions import ValidationError as DomainValidationError
+from ...domain.models import AssetReadModelDelta, TransactionDTO
+from ...models import Asset, AssetMetaData, AssetReadModel, PassiveIncome, Transaction
 from ...serializers import AssetSerializer, TransactionListSerializer
 from ...service_layer import messagebus
 from ...service_layer.unit_of_work import DjangoUnitOfWork
-from ._workbook import WorkbookSource
+from ._workbook import ParsedWorkbook, WorkbookSource
 from .movimentacao import parse_movements
 from .negociacao import (
+    iter_negotiations,
     parse_fii_positions,
-    parse_negotiations,
     parse_stock_positions,
     resolve_negociacao_path,
 )
@@ -88,25 +91,11 @@ def _resolve_movimentacao_path(path: WorkbookSource | None) -> WorkbookSource:
 
 def _source_label(source: WorkbookSource | None) -> str | None:
     """Path strings help in CLI reports; an in-memory upload has no path."""
-    if isinstance(source, bytes):
+    if isinstance(source, bytes | ParsedWorkbook):
         return None
     return str(source) if source is not None else None
 
 
-def _validation_message(exc: DRFValidationError) -> str:
-    # Flatten a serializer/domain ValidationError to a single readable message,
-    # dropping internal field names (e.g. "action" for a sell-exceeds-holdings).
-    detail = exc.detail
-    if isinstance(detail, dict):
-        messages: list = []
-        for value in detail.values():
-            messages.extend(value if isinstance(value, list | tuple) else [value])
-        return "; ".join(str(m) for m in messages)
-    if isinstance(detail, list | tuple):
-        return "; ".join(str(m) for m in detail)
-    return str(detail)
-
-
 def _build_description(position: B3FixedIncomePosition) -> str:
     base = _S_A_PATTERN.sub("", position.description).strip()
     if position.maturity_date is None:
@@ -416,13 +405,22 @@ def _renda_fixa_actions(
             )
         )
 
-    if price_updates:
-        AssetMetaData.objects.bulk_update(
-            price_updates, ["current_price", "current_price_updated_at"]
-        )
+    _bulk_update_prices(price_updates)
     return actions
 
 
+def _bulk_update_prices(price_updates: list[AssetMetaData]) -> None:
+    if not price_updates:
+        return
+
+    AssetMetaData.objects.bulk_update(price_updates, ["current_price", "current_price_updated_at"])
+    AssetReadModel.objects.filter(
+        metadata_id__in=[m.pk for m in price_updates]
+    ).update_current_totals()
+    # the B3 metadata are shared by the assets of every user
+    bump_portfolio_summary_version()
+
+
 def _create_missing_transactions(
     *, user, asset, movements: list[B3TesouroMovement], existing: set
 ) -> list[dict]:
@@ -536,10 +534,7 @@ def _tesouro_actions(
             )
         )
 
-    if price_updates:
-        AssetMetaData.objects.bulk_update(
-            price_updates, ["current_price", "current_price_updated_at"]
-        )
+    _bulk_update_prices(price_updates)
     return actions
 
 
@@ -597,21 +592,31 @@ def _create_negociacao_asset(*, user, position: B3StockPosition) -> int:
     return asset_serializer.save().id
 
 
-def _create_transaction(
-    *, user, asset_pk: int, negotiation: B3StockNegotiation
-) -> None:
-    tx_serializer = TransactionListSerializer(
-        data={
-            "asset_pk": asset_pk,
-            "action": negotiation.action.value,
-            "price": str(negotiation.price),
-            "quantity": str(negotiation.quantity),
-            "operation_date": negotiation.operation_date.strftime("%d/%m/%Y"),
-        },
-        context={"request": _RequestContext(user)},
+def _bulk_create_transactions(
+    *, asset_pk: int, negotiations: list[B3StockNegotiation]
+) -> dict[int, DomainValidationError]:
+    # Validate the whole (chronologically sorted) batch against a single loaded aggregate
+    # and insert it with one `bulk_create`, instead of one serializer + message bus run per
+    # trade. Returns the rejected negotiations (by index) and why.
+    asset_domain = Asset.objects.annotate_for_domain().get(pk=asset_pk).to_domain()
+    dtos = [
+        TransactionDTO(
+            action=negotiation.action.value,
+            price=negotiation.price,
+            quantity=negotiation.quantity,
+            operation_date=negotiation.operation_date,
+        )
+        for negotiation in negotiations
+    ]
+    try:
+        errors = {id(dto): exc for dto, exc in asset_domain.add_transactions(dtos)}
+    except DomainValidationError as e:
+        return dict.fromkeys(range(len(dtos)), e)
+    messagebus.handle(
+        message=commands.BulkCreateTransactions(asset=asset_domain),
+        uow=DjangoUnitOfWork(asset_pk=asset_pk),
     )
-    tx_serializer.is_valid(raise_exception=True)
-    tx_serializer.save()
+    return {i: errors[id(dto)] for i, dto in enumerate(dtos) if id(dto) in errors}
 
 
 def _negociacao_actions(
@@ -621,9 +626,8 @@ def _negociacao_actions(
     negociacao_path_resolved: Path,
     posicao_path_resolved: Path | None,
 ) -> list[dict]:
-    negotiations = parse_negotiations(negociacao_path_resolved)
     by_code: dict[str, list[B3StockNegotiation]] = defaultdict(list)
-    for negotiation in negotiations:
+    for negotiation in iter_negotiations(negociacao_path_resolved):
         by_code[negotiation.code].append(negotiation)
 
     position_by_code: dict[str, B3StockPosition] = {}
@@ -650,85 +654,91 @@ def _negociacao_actions(
 
     actions: list[dict] = []
 
-    for code, code_negotiations in by_code.items():
-        asset = assets_by_code.get(code)
-        asset_action: dict | None = None
-
-        if asset is None:
-            position = position_by_code.get(code)
-            if position is None:
-                reason = (
-                    "ativo não cadastrado e sem linha correspondente na posição"
-                    if posicao_path_resolved is not None
-                    else (
-                        "ativo não cadastrado; marque 'Criar ativos ausentes' "
-                        "e envie a posição para criá-lo"
+    # every transaction is created by its own message bus run: coalesce their read model
+    # upserts so each asset is upserted only once
+    with messagebus.coalesce():
+        for code, code_negotiations in by_code.items():
+            asset = assets_by_code.get(code)
+            asset_action: dict | None = None
+
+            if asset is None:
+                position = position_by_code.get(code)
+                if position is None:
+                    reason = (
+                        "ativo não cadastrado e sem linha correspondente na posição"
+                        if posicao_path_resolved is not None
+                        else (
+                            "ativo não cadastrado; marque 'Criar ativos ausentes' "
+                            "e envie a posição para criá-lo"
+                        )
                     )
+                    actions.append({"code": code, "action": "skipped", "reason": reason})
+                    continue
+
+                new_asset_pk = _create_negociacao_asset(user=user, position=position)
+                asset_action = {
+                    "code": code,
+                    "type": position.type,
+                    "action": "asset_created",
+                    "asset_pk": new_asset_pk,
+                    "description": position.description.strip(),
+                }
+                actions.append(asset_action)
+                asset_pk = new_asset_pk
+                existing: set = set()
+                description = position.description.strip()
+            else:
+                asset_pk = asset.id
+                description = asset.description
+                existing = existing_tx_by_asset[asset.id]
+
+            # Apply chronologically: B3 reports list trades most-recent-first, but the
+            # domain enforces a running balance (no selling more than held).
+            to_create = [
+                negotiation
+                for negotiation in sorted(code_negotiations, key=lambda n: n.operation_date)
+                if (
+                    negotiation.action.value,
+                    negotiation.operation_date,
+                    negotiation.quantity,
+                    negotiation.price,
                 )
-                actions.append({"code": code, "action": "skipped", "reason": reason})
+                not in existing
+            ]
+            if not to_create:
                 continue
 
-            new_asset_pk = _create_negociacao_asset(user=user, position=position)
-            asset_action = {
-                "code": code,
-                "type": position.type,
-                "action": "asset_created",
-                "asset_pk": new_asset_pk,
-                "description": position.description.strip(),
-            }
-            actions.append(asset_action)
-            asset_pk = new_asset_pk
-            existing: set = set()
-            description = position.description.strip()
-        else:
-            asset_pk = asset.id
-            description = asset.description
-            existing = existing_tx_by_asset[asset.id]
-
-        # Apply chronologically: B3 reports list trades most-recent-first, but the
-        # domain enforces a running balance (no selling more than held).
-        for negotiation in sorted(code_negotiations, key=lambda n: n.operation_date):
-            key = (
-                negotiation.action.value,
-                negotiation.operation_date,
-                negotiation.quantity,
-                negotiation.price,
-            )
-            if key in existing:
-                continue
+            errors = _bulk_create_transactions(asset_pk=asset_pk, negotiations=to_create)
+            for i, negotiation in enumerate(to_create):
+                tx_payload = {
+                    "action": negotiation.action.value,
+                    "price": str(negotiation.price),
+                    "quantity": str(negotiation.quantity),
+                    "operation_date": negotiation.operation_date.isoformat(),
+                }
+                if (exc := errors.get(i)) is not None:
+                    # e.g. a sell that exceeds holdings (partial history). Skip it and
+                    # report it instead of aborting the whole import.
+                    actions.append(
+                        {
+                            "code": code,
+                            "description": description,
+                            "action": "error",
+                            "reason": exc.message,
+                            "transaction": tx_payload,
+                        }
+                    )
+                    continue
 
-            tx_payload = {
-                "action": negotiation.action.value,
-                "price": str(negotiation.price),
-                "quantity": str(negotiation.quantity),
-                "operation_date": negotiation.operation_date.isoformat(),
-            }
-            try:
-                with djtransaction.atomic():
-                    _create_transaction(user=user, asset_pk=asset_pk, negotiation=negotiation)
-            except DRFValidationError as exc:
-                # e.g. a sell that exceeds holdings (partial history). Skip it and
-                # report it instead of aborting the whole import.
                 actions.append(
                     {
                         "code": code,
                         "description": description,
-                        "action": "error",
-                        "reason": _validation_message(exc),
+                        "action": "transaction_created",
+                        "asset_pk": asset_pk,
                         "transaction": tx_payload,
                     }
                 )
-                continue
-
-            actions.append(
-                {
-                    "code": code,
-                    "description": description,
-                    "action": "transaction_created",
-                    "asset_pk": asset_pk,
-                    "transaction": tx_payload,
-                }
-            )
 
     return actions
 
@@ -965,15 +975,22 @@ def _proventos_actions(*, user_id: int, proventos_path_resolved) -> list[dict]:
         actions.append({**base, "action": "income_created", "asset_pk": asset.id})
 
     if to_create:
-        PassiveIncome.objects.bulk_create(to_create)
-        # bulk_create skips the messagebus, so upsert each affected asset's read
-        # model once (PassiveIncomeCreated -> upsert_read_model, aggregate fields).
-        for affected_asset_id in {income.asset_id for income in to_create}:
-            with DjangoUnitOfWork(asset_pk=affected_asset_id) as uow:
-                messagebus.handle(
-                    message=events.PassiveIncomeCreated(asset_pk=affected_asset_id),
-                    uow=uow,
-                )
+        deltas: dict[int, AssetReadModelDelta] = defaultdict(AssetReadModelDelta)
+        for income in to_create:
+            deltas[income.asset_id] += AssetReadModelDelta.from_income(income)
+        # the incomes and the events they emit (e.g. persisted in the outbox) are saved together
+        with djtransaction.atomic():
+            PassiveIncome.objects.bulk_create(to_create)
+            # bulk_create skips the messagebus, so upsert each affected asset's read
+            # model once (PassiveIncomeCreated -> upsert_read_model, aggregate fields).
+            for affected_asset_id, delta in deltas.items():
+                with DjangoUnitOfWork(asset_pk=affected_asset_id) as uow:
+                    messagebus.handle(
+                        message=events.PassiveIncomeCreated(
+                            asset_pk=affected_asset_id, read_model_delta=delta
+                        ),
+                        uow=uow,
+                    )
 
     return actions
 
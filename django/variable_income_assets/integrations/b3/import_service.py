@@ -9,6 +9,7 @@ from django.db import transaction as djtransaction
 from openpyxl.utils.exceptions import InvalidFileException
 from rest_framework.exceptions import ValidationError as DRFValidationError
 
+from ._workbook import ParsedWorkbook, WorkbookCache
 from .handlers import (
     B3ImportError,
     import_b3_negociacoes,
@@ -41,7 +42,12 @@ class B3ImportOperationError(Exception):
 
 
 def _read(uploaded_file: UploadedFile | None) -> bytes | None:
-    return uploaded_file.read() if uploaded_file is not None else None
+    if uploaded_file is None:
+        return None
+    # the same upload may be read by several import requests (e.g. a dry run and then
+    # the actual import) when `workbook_cache` is shared between them
+    uploaded_file.seek(0)
+    return uploaded_file.read()
 
 
 def _format_drf_error(exc: DRFValidationError) -> str:
@@ -65,10 +71,10 @@ def _run_operation(
     dry_run: bool,
     workbook_dt: datetime | None,
     create_missing_assets: bool,
-    negociacao: bytes | None,
-    posicao: bytes | None,
-    movimentacao: bytes | None,
-    proventos: bytes | None,
+    negociacao: ParsedWorkbook | None,
+    posicao: ParsedWorkbook | None,
+    movimentacao: ParsedWorkbook | None,
+    proventos: ParsedWorkbook | None,
 ) -> dict:
     if operation == "negociacoes":
         return import_b3_negociacoes(
@@ -110,12 +116,40 @@ def run_b3_import(
     posicao_file: UploadedFile | None,
     movimentacao_file: UploadedFile | None,
     proventos_file: UploadedFile | None = None,
+    workbook_cache: WorkbookCache | None = None,
 ) -> dict:
+    """Run the requested B3 `operations` in a single transaction.
+
+    Every uploaded workbook is opened once and its sheets are shared by all the
+    operations reading them (e.g. `posicao` is read by `renda_fixa`, `tesouro` and
+    `negociacoes`).
+
+    Args:
+        workbook_cache (Optional[WorkbookCache]): Pass the same cache to several calls
+            to reuse the workbooks parsed by a previous one (e.g. a dry run followed by
+            the actual import of the same files). When omitted, a cache scoped to this
+            call is used.
+    """
+    if workbook_cache is None:
+        with WorkbookCache() as cache:
+            return run_b3_import(
+                user_id=user_id,
+                operations=operations,
+                dry_run=dry_run,
+                workbook_dt=workbook_dt,
+                create_missing_assets=create_missing_assets,
+                negociacao_file=negociacao_file,
+                posicao_file=posicao_file,
+                movimentacao_file=movimentacao_file,
+                proventos_file=proventos_file,
+                workbook_cache=cache,
+            )
+
     files = {
-        "negociacao": _read(negociacao_file),
-        "posicao": _read(posicao_file),
-        "movimentacao": _read(movimentacao_file),
-        "proventos": _read(proventos_file),
+        "negociacao": workbook_cache.get(_read(negociacao_file)),
+        "posicao": workbook_cache.get(_read(posicao_file)),
+        "movimentacao": workbook_cache.get(_read(movimentacao_file)),
+        "proventos": workbook_cache.get(_read(proventos_file)),
     }
 
     # proventos must run after the asset-creating ops so it can match assets created
@@ -1,8 +1,9 @@
+from collections.abc import Iterator
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
-from ._workbook import WorkbookSource, open_workbook
+from ._workbook import ParsedWorkbook, WorkbookSource, iter_sheet_rows
 from .parser import PROJECT_ROOT, B3ParserError
 from .schemas import B3FixedIncomeAction, B3FixedIncomeKind, B3FixedIncomeMovement
 
@@ -23,7 +24,7 @@ REQUIRED_HEADERS = (
 
 
 def _resolve_path(source: WorkbookSource | None) -> WorkbookSource:
-    if isinstance(source, bytes):
+    if isinstance(source, bytes | ParsedWorkbook):
         return source
     if source is not None:
         return Path(source)
@@ -102,61 +103,48 @@ def _build_header_index(header_row: tuple) -> dict[str, int]:
     return index
 
 
-def parse_movements(path: WorkbookSource | None = None) -> list[B3FixedIncomeMovement]:
-    workbook = open_workbook(_resolve_path(path))
-    try:
-        if SHEET_NAME not in workbook.sheetnames:
-            raise B3ParserError(f"sheet {SHEET_NAME!r} not found")
-
-        sheet = workbook[SHEET_NAME]
-        rows = sheet.iter_rows(values_only=True)
-
-        try:
-            header_row = next(rows)
-        except StopIteration as exc:
-            raise B3ParserError(f"empty sheet {SHEET_NAME!r}") from exc
-
-        h = _build_header_index(header_row)
-        movements: list[B3FixedIncomeMovement] = []
-
-        for row_index, row in enumerate(rows, start=2):
-            produto_raw = row[h["Produto"]] if h["Produto"] < len(row) else None
-            if _is_blank(produto_raw):
-                continue
-
-            movement_label = row[h["Movimentação"]] if h["Movimentação"] < len(row) else None
-            if str(movement_label or "").strip() != BUY_SELL_LABEL:
-                continue
-
-            split = _split_produto(str(produto_raw).strip())
-            if split is None:
-                continue
-            kind, code = split
-
-            flow = _to_required_str(row[h["Entrada/Saída"]], column="Entrada/Saída", row_index=row_index)
-            action = ACTION_BY_FLOW.get(flow)
-            if action is None:
-                raise B3ParserError(
-                    f"row {row_index}: unexpected Entrada/Saída value {flow!r}"
-                )
-
-            movements.append(
-                B3FixedIncomeMovement(
-                    kind=kind,
-                    code=code,
-                    action=action,
-                    operation_date=_to_required_date(
-                        row[h["Data"]], column="Data", row_index=row_index
-                    ),
-                    quantity=_to_required_decimal(
-                        row[h["Quantidade"]], column="Quantidade", row_index=row_index
-                    ),
-                    unit_price=_to_required_decimal(
-                        row[h["Preço unitário"]], column="Preço unitário", row_index=row_index
-                    ),
-                )
+def iter_movements(path: WorkbookSource | None = None) -> Iterator[B3FixedIncomeMovement]:
+    rows = iter_sheet_rows(_resolve_path(path), SHEET_NAME)
+    h = _build_header_index(next(rows))
+
+    for row_index, row in enumerate(rows, start=2):
+        produto_raw = row[h["Produto"]] if h["Produto"] < len(row) else None
+        if _is_blank(produto_raw):
+            continue
+
+        movement_label = row[h["Movimentação"]] if h["Movimentação"] < len(row) else None
+        if str(movement_label or "").strip() != BUY_SELL_LABEL:
+            continue
+
+        split = _split_produto(str(produto_raw).strip())
+        if split is None:
+            continue
+        kind, code = split
+
+        flow = _to_required_str(
+            row[h["Entrada/Saída"]], column="Entrada/Saída", row_index=row_index
+        )
+        action = ACTION_BY_FLOW.get(flow)
+        if action is None:
+            raise B3ParserError(
+                f"row {row_index}: unexpected Entrada/Saída value {flow!r}"
             )
 
-        return movements
-    finally:
-        workbook.close()
+        yield B3FixedIncomeMovement(
+            kind=kind,
+            code=code,
+            action=action,
+            operation_date=_to_required_date(
+                row[h["Data"]], column="Data", row_index=row_index
+            ),
+            quantity=_to_required_decimal(
+                row[h["Quantidade"]], column="Quantidade", row_index=row_index
+            ),
+            unit_price=_to_required_decimal(
+                row[h["Preço unitário"]], column="Preço unitário", row_index=row_index
+            ),
+        )
+
+
+def parse_movements(path: WorkbookSource | None = None) -> list[B3FixedIncomeMovement]:
+    return list(iter_movements(path))
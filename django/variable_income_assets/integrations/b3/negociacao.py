@@ -1,8 +1,9 @@
+from collections.abc import Iterator
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
-from ._workbook import WorkbookSource, open_workbook
+from ._workbook import ParsedWorkbook, WorkbookSource, iter_sheet_rows
 from .parser import PROJECT_ROOT, B3ParserError
 from .schemas import B3FixedIncomeAction, B3StockNegotiation, B3StockPosition
 
@@ -44,7 +45,7 @@ NEGOCIACAO_REQUIRED_HEADERS = (
 
 
 def resolve_negociacao_path(source: WorkbookSource | None) -> WorkbookSource:
-    if isinstance(source, bytes):
+    if isinstance(source, bytes | ParsedWorkbook):
         return source
     if source is not None:
         return Path(source)
@@ -125,111 +126,79 @@ def _build_header_index(header_row: tuple, *, required: tuple[str, ...]) -> dict
     return index
 
 
-def _parse_positions_sheet(
+def _iter_positions_sheet(
     path: WorkbookSource, *, sheet_name: str, asset_type: str
-) -> list[B3StockPosition]:
-    workbook = open_workbook(path)
-    try:
-        if sheet_name not in workbook.sheetnames:
-            raise B3ParserError(f"sheet {sheet_name!r} not found")
-
-        sheet = workbook[sheet_name]
-        rows = sheet.iter_rows(values_only=True)
-        try:
-            header_row = next(rows)
-        except StopIteration as exc:
-            raise B3ParserError(f"empty sheet {sheet_name!r}") from exc
-
-        h = _build_header_index(header_row, required=POSICAO_REQUIRED_HEADERS)
-        positions: list[B3StockPosition] = []
-        for row_index, row in enumerate(rows, start=2):
-            produto = row[h["Produto"]] if h["Produto"] < len(row) else None
-            if _is_blank(produto):
-                continue
-
-            positions.append(
-                B3StockPosition(
-                    type=asset_type,
-                    code=_to_required_str(
-                        row[h["Código de Negociação"]],
-                        column="Código de Negociação",
-                        row_index=row_index,
-                    ),
-                    description=_to_required_str(
-                        produto, column="Produto", row_index=row_index
-                    ),
-                    tipo=_to_optional_str(row[h["Tipo"]]),
-                    quantity=_to_required_decimal(
-                        row[h["Quantidade"]], column="Quantidade", row_index=row_index
-                    ),
-                    closing_price=_to_optional_decimal(row[h["Preço de Fechamento"]]),
-                    current_value=_to_optional_decimal(row[h["Valor Atualizado"]]),
-                )
-            )
-        return positions
-    finally:
-        workbook.close()
+) -> Iterator[B3StockPosition]:
+    rows = iter_sheet_rows(path, sheet_name)
+    h = _build_header_index(next(rows), required=POSICAO_REQUIRED_HEADERS)
+    for row_index, row in enumerate(rows, start=2):
+        produto = row[h["Produto"]] if h["Produto"] < len(row) else None
+        if _is_blank(produto):
+            continue
+
+        yield B3StockPosition(
+            type=asset_type,
+            code=_to_required_str(
+                row[h["Código de Negociação"]],
+                column="Código de Negociação",
+                row_index=row_index,
+            ),
+            description=_to_required_str(
+                produto, column="Produto", row_index=row_index
+            ),
+            tipo=_to_optional_str(row[h["Tipo"]]),
+            quantity=_to_required_decimal(
+                row[h["Quantidade"]], column="Quantidade", row_index=row_index
+            ),
+            closing_price=_to_optional_decimal(row[h["Preço de Fechamento"]]),
+            current_value=_to_optional_decimal(row[h["Valor Atualizado"]]),
+        )
 
 
 def parse_stock_positions(path: WorkbookSource, *, asset_type: str) -> list[B3StockPosition]:
-    return _parse_positions_sheet(path, sheet_name=ACOES_SHEET, asset_type=asset_type)
+    return list(_iter_positions_sheet(path, sheet_name=ACOES_SHEET, asset_type=asset_type))
 
 
 def parse_fii_positions(path: WorkbookSource, *, asset_type: str) -> list[B3StockPosition]:
-    return _parse_positions_sheet(path, sheet_name=FII_SHEET, asset_type=asset_type)
+    return list(_iter_positions_sheet(path, sheet_name=FII_SHEET, asset_type=asset_type))
 
 
-def parse_negotiations(path: WorkbookSource) -> list[B3StockNegotiation]:
-    workbook = open_workbook(path)
-    try:
-        if NEGOCIACAO_SHEET not in workbook.sheetnames:
-            raise B3ParserError(f"sheet {NEGOCIACAO_SHEET!r} not found")
-
-        sheet = workbook[NEGOCIACAO_SHEET]
-        rows = sheet.iter_rows(values_only=True)
-
-        try:
-            header_row = next(rows)
-        except StopIteration as exc:
-            raise B3ParserError(f"empty sheet {NEGOCIACAO_SHEET!r}") from exc
-
-        h = _build_header_index(header_row, required=NEGOCIACAO_REQUIRED_HEADERS)
-        negotiations: list[B3StockNegotiation] = []
-
-        for row_index, row in enumerate(rows, start=2):
-            code_raw = (
-                row[h["Código de Negociação"]] if h["Código de Negociação"] < len(row) else None
-            )
-            if _is_blank(code_raw):
-                continue
-
-            label = str(row[h["Tipo de Movimentação"]] or "").strip()
-            action = COMPRA_VENDA_LABELS.get(label)
-            if action is None:
-                continue
-
-            negotiations.append(
-                B3StockNegotiation(
-                    code=_normalize_negotiation_code(
-                        _to_required_str(
-                            code_raw, column="Código de Negociação", row_index=row_index
-                        )
-                    ),
-                    action=action,
-                    operation_date=_to_required_date(
-                        row[h["Data do Negócio"]],
-                        column="Data do Negócio",
-                        row_index=row_index,
-                    ),
-                    quantity=_to_required_decimal(
-                        row[h["Quantidade"]], column="Quantidade", row_index=row_index
-                    ),
-                    price=_to_required_decimal(
-                        row[h["Preço"]], column="Preço", row_index=row_index
-                    ),
+def iter_negotiations(path: WorkbookSource) -> Iterator[B3StockNegotiation]:
+    rows = iter_sheet_rows(path, NEGOCIACAO_SHEET)
+    h = _build_header_index(next(rows), required=NEGOCIACAO_REQUIRED_HEADERS)
+
+    for row_index, row in enumerate(rows, start=2):
+        code_raw = (
+            row[h["Código de Negociação"]] if h["Código de Negociação"] < len(row) else None
+        )
+        if _is_blank(code_raw):
+            continue
+
+        label = str(row[h["Tipo de Movimentação"]] or "").strip()
+        action = COMPRA_VENDA_LABELS.get(label)
+        if action is None:
+            continue
+
+        yield B3StockNegotiation(
+            code=_normalize_negotiation_code(
+                _to_required_str(
+                    code_raw, column="Código de Negociação", row_index=row_index
                 )
-            )
+            ),
+            action=action,
+            operation_date=_to_required_date(
+                row[h["Data do Negócio"]],
+                column="Data do Negócio",
+                row_index=row_index,
+            ),
+            quantity=_to_required_decimal(
+                row[h["Quantidade"]], column="Quantidade", row_index=row_index
+            ),
+            price=_to_required_decimal(
+                row[h["Preço"]], column="Preço", row_index=row_index
+            ),
+        )
+
 
-        return negotiations
-    finally:
-        workbook.close()
+def parse_negotiations(path: WorkbookSource) -> list[B3StockNegotiation]:
+    return list(iter_negotiations(path))
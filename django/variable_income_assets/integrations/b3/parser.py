@@ -1,9 +1,10 @@
 import logging
+from collections.abc import Iterator
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
-from ._workbook import WorkbookSource, open_workbook
+from ._workbook import B3ParserError, ParsedWorkbook, WorkbookSource, iter_sheet_rows
 from .schemas import B3FixedIncomeKind, B3FixedIncomePosition
 
 logger = logging.getLogger(__name__)
@@ -24,12 +25,8 @@ REQUIRED_HEADERS = (
 )
 
 
-class B3ParserError(Exception):
-    pass
-
-
 def _resolve_path(path: WorkbookSource | None) -> WorkbookSource:
-    if isinstance(path, bytes):
+    if isinstance(path, bytes | ParsedWorkbook):
         return path
     if path is not None:
         return Path(path)
@@ -117,61 +114,46 @@ def _build_header_index(header_row: tuple) -> dict[str, int]:
     return index
 
 
-def parse_positions(path: WorkbookSource | None = None) -> list[B3FixedIncomePosition]:
-    workbook = open_workbook(_resolve_path(path))
-    try:
-        if SHEET_NAME not in workbook.sheetnames:
-            raise B3ParserError(f"sheet {SHEET_NAME!r} not found")
-
-        sheet = workbook[SHEET_NAME]
-        rows = sheet.iter_rows(values_only=True)
+def iter_positions(path: WorkbookSource | None = None) -> Iterator[B3FixedIncomePosition]:
+    rows = iter_sheet_rows(_resolve_path(path), SHEET_NAME)
+    header_index = _build_header_index(next(rows))
 
-        try:
-            header_row = next(rows)
-        except StopIteration as exc:
-            raise B3ParserError(f"empty sheet {SHEET_NAME!r}") from exc
+    for row_index, row in enumerate(rows, start=2):
+        produto = row[header_index["Produto"]] if header_index["Produto"] < len(row) else None
+        if _is_blank(produto):
+            continue
 
-        header_index = _build_header_index(header_row)
-        positions: list[B3FixedIncomePosition] = []
+        description = _to_required_str(produto, column="Produto", row_index=row_index)
+        quantity = _to_required_decimal(
+            row[header_index["Quantidade"]],
+            column="Quantidade",
+            row_index=row_index,
+        )
+
+        yield B3FixedIncomePosition(
+            kind=_derive_kind(description),
+            description=description,
+            issuer=_to_optional_str(row[header_index["Emissor"]]),
+            code=_to_optional_str(row[header_index["Código"]]),
+            indexer=_to_optional_str(row[header_index["Indexador"]]),
+            issue_date=_to_optional_date(
+                row[header_index["Data de Emissão"]],
+                column="Data de Emissão",
+                row_index=row_index,
+            ),
+            maturity_date=_to_optional_date(
+                row[header_index["Vencimento"]],
+                column="Vencimento",
+                row_index=row_index,
+            ),
+            quantity=quantity,
+            current_price=_to_optional_decimal(
+                row[header_index["Preço Atualizado CURVA"]],
+                column="Preço Atualizado CURVA",
+                row_index=row_index,
+            ),
+        )
 
-        for row_index, row in enumerate(rows, start=2):
-            produto = row[header_index["Produto"]] if header_index["Produto"] < len(row) else None
-            if _is_blank(produto):
-                continue
 
-            description = _to_required_str(produto, column="Produto", row_index=row_index)
-            quantity = _to_required_decimal(
-                row[header_index["Quantidade"]],
-                column="Quantidade",
-                row_index=row_index,
-            )
-
-            positions.append(
-                B3FixedIncomePosition(
-                    kind=_derive_kind(description),
-                    description=description,
-                    issuer=_to_optional_str(row[header_index["Emissor"]]),
-                    code=_to_optional_str(row[header_index["Código"]]),
-                    indexer=_to_optional_str(row[header_index["Indexador"]]),
-                    issue_date=_to_optional_date(
-                        row[header_index["Data de Emissão"]],
-                        column="Data de Emissão",
-                        row_index=row_index,
-                    ),
-                    maturity_date=_to_optional_date(
-                        row[header_index["Vencimento"]],
-                        column="Vencimento",
-                        row_index=row_index,
-                    ),
-                    quantity=quantity,
-                    current_price=_to_optional_decimal(
-                        row[header_index["Preço Atualizado CURVA"]],
-                        column="Preço Atualizado CURVA",
-                        row_index=row_index,
-                    ),
-                )
-            )
-
-        return positions
-    finally:
-        workbook.close()
+def parse_positions(path: WorkbookSource | None = None) -> list[B3FixedIncomePosition]:
+    return list(iter_positions(path))
@@ -1,8 +1,9 @@
+from collections.abc import Iterator
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
-from ._workbook import WorkbookSource, open_workbook
+from ._workbook import ParsedWorkbook, WorkbookSource, iter_sheet_rows
 from .parser import PROJECT_ROOT, B3ParserError
 from .schemas import B3Provento, B3ProventoSkip, B3ProventoType
 
@@ -26,7 +27,7 @@ EVENT_LABELS = {
 
 
 def resolve_proventos_path(source: WorkbookSource | None) -> WorkbookSource:
-    if isinstance(source, bytes):
+    if isinstance(source, bytes | ParsedWorkbook):
         return source
     if source is not None:
         return Path(source)
@@ -97,55 +98,41 @@ def _code_from_produto(produto: str) -> str:
     return produto.split(" - ", 1)[0].strip()
 
 
+def iter_proventos(path: WorkbookSource) -> Iterator[B3Provento | B3ProventoSkip]:
+    rows = iter_sheet_rows(path, PROVENTOS_SHEET)
+    h = _build_header_index(next(rows), required=REQUIRED_HEADERS)
+
+    for row_index, row in enumerate(rows, start=2):
+        produto = row[h["Produto"]] if h["Produto"] < len(row) else None
+        if _is_blank(produto):
+            continue  # blank separator + the trailing "Total" row
+
+        code = _code_from_produto(_to_required_str(produto, column="Produto", row_index=row_index))
+        label = str(row[h["Tipo de Evento"]] or "").strip()
+        kind = EVENT_LABELS.get(label)
+        if kind is None:
+            # Unmapped event type (e.g. fixed-income "PAGAMENTO DE JUROS"):
+            # skip the row and report it instead of aborting the import.
+            yield B3ProventoSkip(code=code, label=label)
+            continue
+
+        yield B3Provento(
+            code=code,
+            kind=kind,
+            payment_date=_to_required_date(
+                row[h["Pagamento"]], column="Pagamento", row_index=row_index
+            ),
+            amount=_to_required_decimal(
+                row[h["Valor líquido"]], column="Valor líquido", row_index=row_index
+            ),
+        )
+
+
 def parse_proventos(
     path: WorkbookSource,
 ) -> tuple[list[B3Provento], list[B3ProventoSkip]]:
-    workbook = open_workbook(path)
-    try:
-        if PROVENTOS_SHEET not in workbook.sheetnames:
-            raise B3ParserError(f"sheet {PROVENTOS_SHEET!r} not found")
-
-        sheet = workbook[PROVENTOS_SHEET]
-        rows = sheet.iter_rows(values_only=True)
-
-        try:
-            header_row = next(rows)
-        except StopIteration as exc:
-            raise B3ParserError(f"empty sheet {PROVENTOS_SHEET!r}") from exc
-
-        h = _build_header_index(header_row, required=REQUIRED_HEADERS)
-        proventos: list[B3Provento] = []
-        skipped: list[B3ProventoSkip] = []
-
-        for row_index, row in enumerate(rows, start=2):
-            produto = row[h["Produto"]] if h["Produto"] < len(row) else None
-            if _is_blank(produto):
-                continue  # blank separator + the trailing "Total" row
-
-            code = _code_from_produto(
-                _to_required_str(produto, column="Produto", row_index=row_index)
-            )
-            label = str(row[h["Tipo de Evento"]] or "").strip()
-            kind = EVENT_LABELS.get(label)
-            if kind is None:
-                # Unmapped event type (e.g. fixed-income "PAGAMENTO DE JUROS"):
-                # skip the row and report it instead of aborting the import.
-                skipped.append(B3ProventoSkip(code=code, label=label))
-                continue
-
-            proventos.append(
-                B3Provento(
-                    code=code,
-                    kind=kind,
-                    payment_date=_to_required_date(
-                        row[h["Pagamento"]], column="Pagamento", row_index=row_index
-                    ),
-                    amount=_to_required_decimal(
-                        row[h["Valor líquido"]], column="Valor líquido", row_index=row_index
-                    ),
-                )
-            )
-
-        return proventos, skipped
-    finally:
-        workbook.close()
+    proventos: list[B3Provento] = []
+    skipped: list[B3ProventoSkip] = []
+    for item in iter_proventos(path):
+        (skipped if isinstance(item, B3ProventoSkip) else proventos).append(item)
+    return proventos, skipped
@@ -1,7 +1,8 @@
+from collections.abc import Iterator
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 
-from ._workbook import WorkbookSource, open_workbook
+from ._workbook import WorkbookSource, iter_sheet_rows
 from .parser import B3ParserError
 from .schemas import B3FixedIncomeAction, B3TesouroMovement, B3TesouroPosition
 
@@ -113,110 +114,76 @@ def _build_header_index(header_row: tuple, *, required: tuple[str, ...]) -> dict
     return index
 
 
-def parse_tesouro_positions(source: WorkbookSource) -> list[B3TesouroPosition]:
-    workbook = open_workbook(source)
-    try:
-        if POSICAO_SHEET not in workbook.sheetnames:
-            raise B3ParserError(f"sheet {POSICAO_SHEET!r} not found")
-
-        sheet = workbook[POSICAO_SHEET]
-        rows = sheet.iter_rows(values_only=True)
-
-        try:
-            header_row = next(rows)
-        except StopIteration as exc:
-            raise B3ParserError(f"empty sheet {POSICAO_SHEET!r}") from exc
-
-        h = _build_header_index(header_row, required=POSICAO_REQUIRED_HEADERS)
-        positions: list[B3TesouroPosition] = []
-
-        for row_index, row in enumerate(rows, start=2):
-            produto = row[h["Produto"]] if h["Produto"] < len(row) else None
-            if _is_blank(produto):
-                continue
-
-            name = _to_required_str(produto, column="Produto", row_index=row_index)
-            positions.append(
-                B3TesouroPosition(
-                    name=name,
-                    isin=_to_required_str(
-                        row[h["Código ISIN"]], column="Código ISIN", row_index=row_index
-                    ),
-                    indexer=_to_optional_str(row[h["Indexador"]]),
-                    maturity_date=_to_optional_date(
-                        row[h["Vencimento"]], column="Vencimento", row_index=row_index
-                    ),
-                    quantity=_to_required_decimal(
-                        row[h["Quantidade"]], column="Quantidade", row_index=row_index
-                    ),
-                    current_value=_to_optional_decimal(
-                        row[h["Valor Atualizado"]],
-                        column="Valor Atualizado",
-                        row_index=row_index,
-                    ),
-                )
-            )
+def iter_tesouro_positions(source: WorkbookSource) -> Iterator[B3TesouroPosition]:
+    rows = iter_sheet_rows(source, POSICAO_SHEET)
+    h = _build_header_index(next(rows), required=POSICAO_REQUIRED_HEADERS)
 
-        return positions
-    finally:
-        workbook.close()
+    for row_index, row in enumerate(rows, start=2):
+        produto = row[h["Produto"]] if h["Produto"] < len(row) else None
+        if _is_blank(produto):
+            continue
 
+        name = _to_required_str(produto, column="Produto", row_index=row_index)
+        yield B3TesouroPosition(
+            name=name,
+            isin=_to_required_str(row[h["Código ISIN"]], column="Código ISIN", row_index=row_index),
+            indexer=_to_optional_str(row[h["Indexador"]]),
+            maturity_date=_to_optional_date(
+                row[h["Vencimento"]], column="Vencimento", row_index=row_index
+            ),
+            quantity=_to_required_decimal(
+                row[h["Quantidade"]], column="Quantidade", row_index=row_index
+            ),
+            current_value=_to_optional_decimal(
+                row[h["Valor Atualizado"]],
+                column="Valor Atualizado",
+                row_index=row_index,
+            ),
+        )
 
-def parse_tesouro_movements(source: WorkbookSource) -> list[B3TesouroMovement]:
-    workbook = open_workbook(source)
-    try:
-        if MOVIMENTACAO_SHEET not in workbook.sheetnames:
-            raise B3ParserError(f"sheet {MOVIMENTACAO_SHEET!r} not found")
 
-        sheet = workbook[MOVIMENTACAO_SHEET]
-        rows = sheet.iter_rows(values_only=True)
+def parse_tesouro_positions(source: WorkbookSource) -> list[B3TesouroPosition]:
+    return list(iter_tesouro_positions(source))
 
-        try:
-            header_row = next(rows)
-        except StopIteration as exc:
-            raise B3ParserError(f"empty sheet {MOVIMENTACAO_SHEET!r}") from exc
 
-        h = _build_header_index(header_row, required=MOVIMENTACAO_REQUIRED_HEADERS)
-        movements: list[B3TesouroMovement] = []
+def iter_tesouro_movements(source: WorkbookSource) -> Iterator[B3TesouroMovement]:
+    rows = iter_sheet_rows(source, MOVIMENTACAO_SHEET)
+    h = _build_header_index(next(rows), required=MOVIMENTACAO_REQUIRED_HEADERS)
 
-        for row_index, row in enumerate(rows, start=2):
-            produto_raw = row[h["Produto"]] if h["Produto"] < len(row) else None
-            if _is_blank(produto_raw):
-                continue
+    for row_index, row in enumerate(rows, start=2):
+        produto_raw = row[h["Produto"]] if h["Produto"] < len(row) else None
+        if _is_blank(produto_raw):
+            continue
 
-            produto = str(produto_raw).strip()
-            if not produto.startswith(TESOURO_PRODUTO_PREFIX):
-                continue
+        produto = str(produto_raw).strip()
+        if not produto.startswith(TESOURO_PRODUTO_PREFIX):
+            continue
 
-            label = str(row[h["Movimentação"]] or "").strip()
-            action = COMPRA_VENDA_LABELS.get(label)
-            if action is None:
-                continue
+        label = str(row[h["Movimentação"]] or "").strip()
+        action = COMPRA_VENDA_LABELS.get(label)
+        if action is None:
+            continue
 
-            flow = _to_required_str(
-                row[h["Entrada/Saída"]], column="Entrada/Saída", row_index=row_index
-            )
-            if ACTION_BY_FLOW.get(flow) != action:
-                raise B3ParserError(
-                    f"row {row_index}: flow {flow!r} disagrees with movimentação {label!r}"
-                )
-
-            movements.append(
-                B3TesouroMovement(
-                    name=produto,
-                    action=action,
-                    operation_date=_to_required_date(
-                        row[h["Data"]], column="Data", row_index=row_index
-                    ),
-                    quantity=_to_required_decimal(
-                        row[h["Quantidade"]], column="Quantidade", row_index=row_index
-                    ),
-                    unit_price=_to_required_decimal(
-                        row[h["Preço unitário"]], column="Preço unitário", row_index=row_index
-                    ),
-                )
+        flow = _to_required_str(
+            row[h["Entrada/Saída"]], column="Entrada/Saída", row_index=row_index
+        )
+        if ACTION_BY_FLOW.get(flow) != action:
+            raise B3ParserError(
+                f"row {row_index}: flow {flow!r} disagrees with movimentação {label!r}"
             )
 
-        return movements
-    finally:
-        workbook.close()
+        yield B3TesouroMovement(
+            name=produto,
+            action=action,
+            operation_date=_to_required_date(row[h["Data"]], column="Data", row_index=row_index),
+            quantity=_to_required_decimal(
+                row[h["Quantidade"]], column="Quantidade", row_index=row_index
+            ),
+            unit_price=_to_required_decimal(
+                row[h["Preço unitário"]], column="Preço unitário", row_index=row_index
+            ),
+        )
+
+
+def parse_tesouro_movements(source: WorkbookSource) -> list[B3TesouroMovement]:
+    return list(iter_tesouro_movements(source))
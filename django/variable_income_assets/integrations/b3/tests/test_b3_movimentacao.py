@@ -163,3 +163,19 @@ def test_lci_row_parses(tmp_path):
     assert movements[0].kind == B3FixedIncomeKind.LCI
     assert movements[0].code == "24L03571458"
     assert movements[0].unit_price == Decimal("0.01")
+
+
+def test_parsed_workbook_only_keeps_the_shared_sheets_in_memory(tmp_path, mocker):
+    from .. import _workbook
+
+    path = build_xlsx(tmp_path / "movimentacao.xlsx", [CDB_BUY_ROW])
+    iter_rows_spy = mocker.spy(_workbook, "_iter_rows")
+
+    shared = _workbook.ParsedWorkbook(path.read_bytes())
+    assert parse_movements(shared) == parse_movements(shared)
+    assert iter_rows_spy.call_count == 1
+
+    streamed = _workbook.ParsedWorkbook(path.read_bytes(), cached_sheets=())
+    assert parse_movements(streamed) == parse_movements(streamed)
+    assert iter_rows_spy.call_count == 3
+    assert streamed._sheets == {}
@@ -5,7 +5,7 @@ from pathlib import Path
 import pytest
 from openpyxl import Workbook
 
-from ..negociacao import parse_negotiations
+from ..negociacao import iter_negotiations, parse_negotiations
 from ..parser import B3ParserError
 from ..schemas import B3FixedIncomeAction
 
@@ -115,3 +115,23 @@ def test_missing_sheet_raises(tmp_path):
 
     with pytest.raises(B3ParserError):
         parse_negotiations(str(path))
+
+
+def test_iter_negotiations_streams_rows_shorter_than_header(tmp_path):
+    # "Valor" (the last column) is missing
+    path = _build(tmp_path, [BBAS3_BUY[:-1], ITSA4_SELL])
+
+    negotiations = iter_negotiations(path)
+
+    assert next(negotiations).code == "BBAS3"
+    assert next(negotiations).code == "ITSA4"
+    with pytest.raises(StopIteration):
+        next(negotiations)
+
+
+def test_workbook_above_uncompressed_size_ceiling_raises(tmp_path, settings):
+    settings.B3_IMPORT_MAX_UNCOMPRESSED_SIZE_IN_BYTES = 1024
+    path = _build(tmp_path, [BBAS3_BUY] * 100)
+
+    with pytest.raises(B3ParserError, match="workbook too large"):
+        parse_negotiations(path)
@@ -1,6 +1,7 @@
 from .apy_hub import ApyHubClient
 from .brapi import BrApiClient
 from .coin_market_cap import CoinMarketCapClient
+from .pool import HttpClientPool, RateLimits, http_pool
 from .qstash import QStashClient
 from .twelve_data import TwelveDataClient
 
@@ -8,6 +9,9 @@ __all__ = [
     "BrApiClient",
     "ApyHubClient",
     "CoinMarketCapClient",
+    "HttpClientPool",
     "QStashClient",
+    "RateLimits",
     "TwelveDataClient",
+    "http_pool",
 ]
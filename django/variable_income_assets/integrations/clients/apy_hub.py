@@ -1,28 +1,32 @@
 from django.conf import settings
 
-from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from .pool import RateLimits, http_pool
 
 
 class ApyHubClient:
     API_URL = "https://api.apyhub.com"
+    LIMITS = RateLimits(requests=5, per_seconds=1, max_concurrency=2)
 
     def __init__(self, timeout: int = 300, api_key: str = "") -> None:
-        self._session = ClientSession(
-            timeout=ClientTimeout(total=timeout),
-            connector=TCPConnector(ssl=False, force_close=True),
-            base_url="https://api.apyhub.com",
-            headers={"apy-token": api_key or settings.APY_HUB_API_KEY},
-        )
+        self._timeout = timeout
+        self._headers = {"apy-token": api_key or settings.APY_HUB_API_KEY}
 
     async def __aenter__(self) -> "ApyHubClient":
         return self
 
     async def __aexit__(self, *_, **__) -> None:
-        await self._session.close()
+        # the connections are kept alive by `http_pool`
+        pass
 
     async def convert_currencies(self, source: str, target: str) -> str:
-        response = await self._session.post(
-            url="/data/convert/currency", json={"source": source, "target": target}
+        response = await http_pool.request(
+            "apy_hub",
+            self.LIMITS,
+            "POST",
+            f"{self.API_URL}/data/convert/currency",
+            total_timeout=self._timeout,
+            headers=self._headers,
+            json={"source": source, "target": target},
         )
         response.raise_for_status()
         result = await response.json()
@@ -1,26 +1,33 @@
 import asyncio
+import logging
+import time
 
 from django.conf import settings
 
-from aiohttp import ClientResponse, ClientSession, ClientTimeout, TCPConnector
-from aiohttp.client_exceptions import ClientError
+from aiohttp import ClientResponse
+
+from config.key_value_store import key_value_backend
+
+from .pool import RateLimits, http_pool
+
+logger = logging.getLogger(__name__)
 
 
 class BrApiClient:
     API_URL = "https://brapi.dev"
+    LIMITS = RateLimits(requests=10, per_seconds=1, max_concurrency=10)
+    FIXED_PRICES = {"BBSE3": 35.17, "CPLE6": 10.09}
 
     def __init__(self, timeout: int = 300, api_key: str = "") -> None:
-        self._session = ClientSession(
-            timeout=ClientTimeout(total=timeout),
-            connector=TCPConnector(ssl=False, force_close=True),
-        )
+        self._timeout = timeout
         self._api_key = api_key or settings.BRAPI_API_KEY
 
     async def __aenter__(self) -> "BrApiClient":
         return self
 
     async def __aexit__(self, *_, **__) -> None:
-        await self._session.close()
+        # the connections are kept alive by `http_pool`
+        pass
 
     async def _create_path(self, path: str, v2: bool) -> str:
         api = "api/v2" if v2 else "api"
@@ -32,8 +39,12 @@ class BrApiClient:
     async def _request(
         self, path: str, params: dict[str, str] | None = None, v2: bool = False
     ) -> ClientResponse:
-        response = await self._session.get(
-            url=await self._create_url(path=path, v2=v2),
+        response = await http_pool.request(
+            "brapi",
+            self.LIMITS,
+            "GET",
+            await self._create_url(path=path, v2=v2),
+            total_timeout=self._timeout,
             params=(
                 {"token": self._api_key} if params is None else {**params, "token": self._api_key}
             ),
@@ -45,43 +56,91 @@ class BrApiClient:
         response = await self._request(path="available", params={"search": code})
         return await response.json()
 
-    async def get_valid_codes(self, codes: list[str]) -> list[str]:
+    async def resolve_codes(self, codes: list[str]) -> dict[str, str]:
         """
         The code may exist in the DB, but its name may have changed at B3. For example:
         https://www.moneytimes.com.br/codigo-da-acao-da-via-antiga-via-varejo-mudara-de-vvar3-para-viia3/
+
+        The resolutions (including the codes that couldn't be resolved) are kept in the key
+        value store for `settings.BRAPI_VALID_CODES_TTL_IN_SECONDS`, so only new or expired
+        codes are searched.
+
+        Returns:
+            dict[str, str]: The valid code at B3 of each one of `codes` that could be resolved.
         """
-        tasks = [self._get_valid_codes(code=code) for code in codes]
-        return [
-            result["stocks"][0]
-            for result in await asyncio.gather(*tasks, return_exceptions=True)
-            if not isinstance(result, ClientError) and result.get("stocks")
-        ]
+        now = time.time()
+        # code -> (resolved code or `None`, expires at)
+        cache: dict[str, tuple[str | None, float]] = (
+            key_value_backend.get(key=settings.BRAPI_VALID_CODES_KEY) or {}
+        )
+        missing = [code for code in dict.fromkeys(codes) if cache.get(code, (None, 0))[1] <= now]
+        if missing:
+            expires_at = now + settings.BRAPI_VALID_CODES_TTL_IN_SECONDS
+            results = await asyncio.gather(
+                *(self._get_valid_codes(code=code) for code in missing), return_exceptions=True
+            )
+            for code, result in zip(missing, results, strict=True):
+                if isinstance(result, Exception):
+                    # transient errors are not cached
+                    continue
+                cache[code] = (result["stocks"][0] if result.get("stocks") else None, expires_at)
+            key_value_backend.set(
+                key=settings.BRAPI_VALID_CODES_KEY,
+                value={code: v for code, v in cache.items() if v[1] > now},
+                timeout=settings.BRAPI_VALID_CODES_TTL_IN_SECONDS,
+            )
+        return {code: cache[code][0] for code in codes if cache.get(code, (None,))[0]}
+
+    async def get_valid_codes(self, codes: list[str]) -> list[str]:
+        return list(dict.fromkeys((await self.resolve_codes(codes=codes)).values()))
 
     async def get_b3_price(self, code: str) -> float:
-        if code == "BBSE3":
-            return 35.17
-        if code == "CPLE6":
-            return 10.09
+        if code in self.FIXED_PRICES:
+            return self.FIXED_PRICES[code]
         response = await self._request(path=f"quote/{code}")
         result = await response.json()
         for r in result["results"]:
             return r["regularMarketPrice"]
 
+    async def _get_b3_prices(self, codes: list[str]) -> dict[str, float]:
+        response = await self._request(path=f"quote/{','.join(codes)}")
+        result = await response.json()
+        return {r["symbol"]: r["regularMarketPrice"] for r in result["results"]}
+
     async def get_b3_prices(self, codes: list[str]) -> dict[str, float]:
+        """Fetch the prices of `codes` with multi-ticker `quote` requests of up to
+        `settings.BRAPI_QUOTE_BATCH_SIZE` tickers.
+
+        Returns:
+            dict[str, float]: The prices by the requested codes, even if a code was renamed.
+        """
         if not codes:
             return {}
 
-        result = {}
-        valid_codes = await self.get_valid_codes(codes=codes)
-        coroutines = [self.get_b3_price(code=code) for code in valid_codes]
-        for code, price in zip(
-            valid_codes, await asyncio.gather(*coroutines, return_exceptions=True), strict=True
+        resolved = await self.resolve_codes(codes=codes)
+        result = {code: self.FIXED_PRICES[code] for code in resolved if code in self.FIXED_PRICES}
+
+        valid_codes = list(
+            dict.fromkeys(valid for code, valid in resolved.items() if code not in result)
+        )
+        size = settings.BRAPI_QUOTE_BATCH_SIZE
+        batches = [valid_codes[i : i + size] for i in range(0, len(valid_codes), size)]
+        prices: dict[str, float] = {}
+        for batch, batch_prices in zip(
+            batches,
+            await asyncio.gather(
+                *(self._get_b3_prices(b) for b in batches), return_exceptions=True
+            ),
+            strict=True,
         ):
-            if isinstance(price, Exception):
-                # TODO: log error
-                print(code, repr(price))
+            if isinstance(batch_prices, Exception):
+                logger.error("Failed to fetch the prices of %s: %r", batch, batch_prices)
                 continue
-            result[code] = price
+            prices.update(batch_prices)
+
+        for code, valid in resolved.items():
+            if code not in result and valid in prices:
+                result[code] = prices[valid]
         return result
 
     async def get_crypto_prices(self, codes: list[str], currency: str) -> dict[str, float]:
@@ -4,33 +4,39 @@ from typing import TYPE_CHECKING
 
 from django.conf import settings
 
-from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from .pool import RateLimits, http_pool
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
 
 class CoinMarketCapClient:
+    API_URL = "https://pro-api.coinmarketcap.com"
+    # basic plan
+    LIMITS = RateLimits(requests=30, per_seconds=60, max_concurrency=5)
+
     def __init__(self, timeout: int = 300, api_key: str = "") -> None:
-        self._session = ClientSession(
-            timeout=ClientTimeout(total=timeout),
-            connector=TCPConnector(ssl=False, force_close=True),
-            base_url="https://pro-api.coinmarketcap.com",
-            headers={"X-CMC_PRO_API_KEY": api_key or settings.COIN_MARKET_CAP_API_KEY},
-        )
+        self._timeout = timeout
+        self._headers = {"X-CMC_PRO_API_KEY": api_key or settings.COIN_MARKET_CAP_API_KEY}
 
     async def __aenter__(self) -> CoinMarketCapClient:
         return self
 
     async def __aexit__(self, *_, **__) -> None:
-        await self._session.close()
+        # the connections are kept alive by `http_pool`
+        pass
 
     async def get_prices(self, symbols: Iterable[str], currency: str) -> dict[str, float]:
         if not symbols:
             return {}
-        response = await self._session.get(
-            f"/v2/cryptocurrency/quotes/latest?symbol={','.join(symbols)}",
-            params={"convert": currency},
+        response = await http_pool.request(
+            "coin_market_cap",
+            self.LIMITS,
+            "GET",
+            f"{self.API_URL}/v2/cryptocurrency/quotes/latest",
+            total_timeout=self._timeout,
+            headers=self._headers,
+            params={"symbol": ",".join(symbols), "convert": currency},
         )
         response.raise_for_status()
         response_json = await response.json()
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeVar
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+
+    from aiohttp import ClientResponse
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    """How a provider's API can be called.
+
+    Args:
+        requests (int): Number of requests (or credits) allowed every `per_seconds`;
+        per_seconds (float): The window of `requests`;
+        max_concurrency (int): Max number of in-flight requests;
+        max_retries (int): Number of retries of a request that failed with a connection
+            error, a timeout or one of `RETRYABLE_STATUSES`;
+        backoff_in_seconds (float): Base of the exponential backoff between retries.
+    """
+
+    requests: int
+    per_seconds: float
+    max_concurrency: int = 10
+    max_retries: int = 3
+    backoff_in_seconds: float = 0.5
+
+
+class _EventLoop(asyncio.SelectorEventLoop):
+    def time(self) -> float:
+        # resolved in this module so the clock can be excluded from time mocking in the tests
+        # (`freezegun.configure(extend_ignore_list=...)`), otherwise `asyncio.sleep` (e.g. the
+        # backoff between retries) would never return when the time is frozen
+        return time.monotonic()
+
+
+class TokenBucket:
+    def __init__(self, capacity: int, per_seconds: float) -> None:
+        self.capacity = capacity
+        self._refill_rate = capacity / per_seconds
+        self._tokens = float(capacity)
+        self._updated_at: float | None = None
+        # waiters are served in FIFO order
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        # same clock as `asyncio.sleep`
+        now = asyncio.get_running_loop().time()
+        if self._updated_at is not None:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self._refill_rate
+            )
+        self._updated_at = now
+
+    async def acquire(self, tokens: int = 1) -> None:
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self._refill_rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+class _Provider:
+    def __init__(self, limits: RateLimits) -> None:
+        self.limits = limits
+        self.session = ClientSession(
+            connector=TCPConnector(ssl=False, limit=limits.max_concurrency, keepalive_timeout=60)
+        )
+        self.semaphore = asyncio.Semaphore(limits.max_concurrency)
+        self.bucket = TokenBucket(capacity=limits.requests, per_seconds=limits.per_seconds)
+
+
+def _get_retry_after(response: ClientResponse) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class HttpClientPool:
+    """Long-lived HTTP sessions shared by the price clients, one per provider.
+
+    `aiohttp` sessions are bound to the event loop they were created on but `async_to_sync`
+    creates a new loop for every call, so the sessions live on a dedicated loop running in
+    a daemon thread and every request is executed there. This way the connections are
+    kept alive and the rate limits are enforced across calls.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pid: int | None = None
+        self._providers: dict[str, _Provider] = {}
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # the thread doesn't survive a `fork`
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = _EventLoop()
+                self._pid = os.getpid()
+                self._providers = {}
+                threading.Thread(
+                    target=self._loop.run_forever, name="http-client-pool", daemon=True
+                ).start()
+            return self._loop
+
+    async def run(self, coro: Coroutine[None, None, T]) -> T:
+        loop = self._get_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def _get_provider(self, name: str, limits: RateLimits) -> _Provider:
+        provider = self._providers.get(name)
+        if provider is None:
+            provider = self._providers[name] = _Provider(limits)
+        return provider
+
+    async def request(
+        self,
+        provider: str,
+        limits: RateLimits,
+        method: str,
+        url: str,
+        *,
+        cost: int = 1,
+        total_timeout: int = 300,
+        **kwargs,
+    ) -> ClientResponse:
+        """Execute a request respecting the `limits` of `provider`.
+
+        The body of the response is read before it's returned, so the connection is
+        released back to the pool.
+
+        Args:
+            provider (str): Identifies the session, rate limiter and concurrency cap shared
+                by every request to the same API;
+            limits (RateLimits): The limits of `provider`. Only used on the first request;
+            method (str): The HTTP method;
+            url (str): The URL;
+            cost (int): Number of tokens of the rate limiter consumed by the request
+                (e.g. some APIs charge one credit per requested symbol). Defaults to 1;
+            total_timeout (int): Total timeout of each attempt, in seconds. Defaults to 300;
+            kwargs: Passed through to `aiohttp.ClientSession.request`.
+
+        Returns:
+            ClientResponse: The response of the last attempt.
+        """
+        return await self.run(
+            self._request(
+                provider, limits, method, url, cost=cost, total_timeout=total_timeout, **kwargs
+            )
+        )
+
+    async def _request(
+        self,
+        provider_name: str,
+        limits: RateLimits,
+        method: str,
+        url: str,
+        *,
+        cost: int,
+        total_timeout: int,
+        **kwargs,
+    ) -> ClientResponse:
+        provider = self._get_provider(provider_name, limits)
+        for attempt in range(limits.max_retries + 1):
+            delay = limits.backoff_in_seconds * 2**attempt
+            await provider.bucket.acquire(cost)
+            try:
+                async with provider.semaphore:
+                    response = await provider.session.request(
+                        method, url, timeout=ClientTimeout(total=total_timeout), **kwargs
+                    )
+                    await response.read()
+            except (ClientError, TimeoutError):
+                if attempt == limits.max_retries:
+                    raise
+                logger.warning("Retrying %s %s (%s attempt)", method, url, attempt + 1)
+            else:
+                if response.status not in RETRYABLE_STATUSES or attempt == limits.max_retries:
+                    return response
+                delay = _get_retry_after(response) or delay
+                logger.warning("Retrying %s %s after a %s response", method, url, response.status)
+            await asyncio.sleep(delay)
+
+    async def _close(self) -> None:
+        for provider in self._providers.values():
+            await provider.session.close()
+        self._providers = {}
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+
+http_pool = HttpClientPool()
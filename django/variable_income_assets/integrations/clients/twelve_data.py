@@ -1,60 +1,90 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from django.conf import settings
 
-from aiohttp import ClientResponse, ClientSession, ClientTimeout, TCPConnector
+from .pool import RateLimits, http_pool
 
 if TYPE_CHECKING:
     from datetime import date
 
+    from aiohttp import ClientResponse
+
+
+logger = logging.getLogger(__name__)
+
 
 class TwelveDataClient:
     API_URL = "https://api.twelvedata.com/{path}?apikey={api_key}"
+    # each requested symbol costs one API credit
+    MAX_SYMBOLS_PER_REQUEST = 8
 
     def __init__(self, timeout: int = 300) -> None:
-        self._session = ClientSession(
-            timeout=ClientTimeout(total=timeout),
-            connector=TCPConnector(ssl=False, force_close=True),
+        self._timeout = timeout
+        self._limits = RateLimits(
+            requests=settings.TWELVE_DATA_CREDITS_PER_MINUTE, per_seconds=60, max_concurrency=4
         )
 
     async def __aenter__(self) -> TwelveDataClient:
         return self
 
     async def __aexit__(self, *_, **__) -> None:
-        await self._session.close()
+        # the connections are kept alive by `http_pool`
+        pass
 
     async def _create_url(self, path: str, api_key: str | None = None) -> str:
         return self.API_URL.format(
             path=path, api_key=api_key if api_key is not None else settings.TWELVE_DATA_API_KEY
         )
 
-    async def _get(self, path: str, params: dict[str, str] | None = None) -> ClientResponse:
-        response = await self._session.get(
-            url=await self._create_url(path=path), params=params if params is not None else {}
+    async def _get(
+        self, path: str, params: dict[str, str] | None = None, cost: int = 1
+    ) -> ClientResponse:
+        response = await http_pool.request(
+            "twelve_data",
+            self._limits,
+            "GET",
+            await self._create_url(path=path),
+            cost=cost,
+            total_timeout=self._timeout,
+            params=params if params is not None else {},
         )
         response.raise_for_status()
         return response
 
+    async def _get_prices(self, codes: list[str]) -> dict[str, str]:
+        response = await self._get(
+            path="price", params={"symbol": ",".join(codes)}, cost=len(codes)
+        )
+        result = await response.json()
+        if len(codes) == 1:
+            return {codes[0]: result["price"]} if "price" in result else {}
+        # symbols that couldn't be priced are returned as an error object
+        return {k: v["price"] for k, v in result.items() if "price" in v}
+
     async def get_prices(self, codes: list[str]) -> dict[str, str]:
         if not codes:
             return {}
 
-        # TwelveData API has a limit of 8 symbols per minute
-        # TODO: handle this by splitting the list into chunks of 8 symbols and
-        # making requests with a one minute delay between chunks
-        if len(codes) > 8:
-            codes = codes[:8]
-        response = await self._get(path="price", params={"symbol": ",".join(codes)})
-        result = await response.json()
-        return (
-            {codes[0]: result["price"]}
-            if len(result) == 1
-            else {k: v["price"] for k, v in result.items()}
-        )
+        # the API credits are consumed per symbol, so the chunks are scheduled by the
+        # rate limiter of `http_pool` as the credits are replenished (every minute)
+        size = min(self.MAX_SYMBOLS_PER_REQUEST, self._limits.requests)
+        chunks = [list(codes[i : i + size]) for i in range(0, len(codes), size)]
+        prices: dict[str, str] = {}
+        for chunk, result in zip(
+            chunks,
+            await asyncio.gather(*(self._get_prices(c) for c in chunks), return_exceptions=True),
+            strict=True,
+        ):
+            if isinstance(result, Exception):
+                logger.error("Failed to fetch the prices of %s: %r", chunk, result)
+                continue
+            prices.update(result)
+        return prices
 
     async def get_close_prices(
         self, symbols: list[str], operation_date: date
@@ -77,13 +107,12 @@ class TwelveDataClient:
                 path="eod",
                 params={"symbol": symbol, "date": operation_date.isoformat()},
             )
-            response.raise_for_status()
             return await response.json()
 
         tasks = asyncio.gather(*(_get(symbol) for symbol in symbols), return_exceptions=True)
 
         return {
             symbols[idx]: Decimal(result["close"])  # order is guaranteed
-            for idx, result in await enumerate(tasks)
+            for idx, result in enumerate(await tasks)
             if not isinstance(result, Exception)
         }
@@ -5,8 +5,12 @@ from typing import TYPE_CHECKING
 
 from django.utils import timezone
 
+from asgiref.sync import sync_to_async
+
 from ..adapters import DjangoSQLAssetMetaDataRepository
+from ..adapters.key_value_store import bump_portfolio_summary_version, cache_quotes
 from ..choices import AssetTypes, Currencies
+from ..models import AssetReadModel
 from .helpers import get_b3_prices, get_crypto_prices, get_stocks_usa_prices
 
 if TYPE_CHECKING:
@@ -71,6 +75,8 @@ async def update_prices() -> Exception | None:
             qs=DjangoSQLAssetMetaDataRepository.filter_assets_eligible_for_update()
         )
         print("update_prices result: ", result)
+        now = timezone.now()
+        quotes = {}
         for data in result:
             for code, price in data["prices"].items():
                 if price is None:
@@ -80,11 +86,20 @@ async def update_prices() -> Exception | None:
                     "-".join((code, data["type"], data["currency"]))
                 ]
                 asset_metadata.current_price = str(price)
-                asset_metadata.current_price_updated_at = timezone.now()
+                asset_metadata.current_price_updated_at = now
+                quotes[(code, data["type"], data["currency"])] = price
 
         await DjangoSQLAssetMetaDataRepository.abulk_update(
             objs=assets_metadata_map.values(), fields=("current_price", "current_price_updated_at")
         )
+        # warm up the cache used by `fetch_asset_current_price` (e.g. when an asset is created)
+        cache_quotes(quotes, updated_at=now)
+        await sync_to_async(
+            AssetReadModel.objects.filter(
+                metadata_id__in=[m.pk for m in assets_metadata_map.values()]
+            ).update_current_totals
+        )()
+        bump_portfolio_summary_version()
 
     except Exception as e:
         # TODO: log error
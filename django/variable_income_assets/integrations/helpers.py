@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from collections.abc import Iterator
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any
 
+from django.conf import settings
 from django.db.transaction import atomic
 from django.utils import timezone
 
@@ -15,7 +16,7 @@ from asgiref.sync import async_to_sync, sync_to_async
 
 from authentication.models import IntegrationSecret
 
-from ..adapters.key_value_store import get_dollar_conversion_rate
+from ..adapters.key_value_store import cache_quotes, get_cached_quote, get_dollar_conversion_rate
 from ..choices import AssetObjectives, AssetSectors, AssetTypes, Currencies
 from ..domain.events import TransactionsCreated
 from ..integrations.clients.abc import AbstractTransactionsClient
@@ -57,7 +58,30 @@ def fetch_asset_sector(code: str, asset_type: AssetTypes) -> AssetSectors:
     return sector
 
 
-def fetch_asset_current_price(code: str, asset_type: AssetTypes, currency: Currencies) -> Decimal:
+def fetch_asset_current_price(
+    code: str,
+    asset_type: AssetTypes,
+    currency: Currencies,
+    max_age_in_seconds: int | None = None,
+) -> Decimal:
+    """Fetch the price of an asset, unless it was cached less than `max_age_in_seconds` ago.
+
+    Args:
+        code (str): The asset code;
+        asset_type (AssetTypes): The asset type;
+        currency (Currencies): The asset currency;
+        max_age_in_seconds (Optional[int]): Defaults to `settings.ASSET_QUOTES_MAX_AGE_IN_SECONDS`.
+
+    Returns:
+        Decimal: The price. The last known (cached) price if the API call fails or 0 if there
+            isn't one.
+    """
+    if max_age_in_seconds is None:
+        max_age_in_seconds = settings.ASSET_QUOTES_MAX_AGE_IN_SECONDS
+    cached = get_cached_quote(code=code, asset_type=asset_type, currency=currency)
+    if cached is not None and cached[1] > timezone.now() - timedelta(seconds=max_age_in_seconds):
+        return cached[0]
+
     kwargs = {"codes": (code,)}
     if asset_type in (AssetTypes.stock, AssetTypes.fii):
         coro = get_b3_prices
@@ -71,10 +95,13 @@ def fetch_asset_current_price(code: str, asset_type: AssetTypes, currency: Curre
 
     try:
         result = async_to_sync(coro)(**kwargs)
-        return Decimal(result[code])
+        price = Decimal(result[code])
     except Exception:
         # TODO: log error
-        return Decimal()
+        return cached[0] if cached is not None else Decimal()
+
+    cache_quotes({(code, asset_type, currency): price})
+    return price
 
 
 async def get_b3_close_prices(codes: list[str], operation_date: date) -> dict[str, float]:
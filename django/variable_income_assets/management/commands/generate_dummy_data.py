@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import itertools
 import random
 import uuid
 from datetime import date, timedelta
-from decimal import Decimal
+from decimal import ROUND_DOWN, Decimal
 from typing import TYPE_CHECKING
 
 from django.contrib.auth import get_user_model
@@ -23,9 +24,11 @@ from expenses.models import (
     BankAccountSnapshot,
     Expense,
     ExpenseCategory,
+    ExpenseRecurrence,
     ExpenseSource,
     Revenue,
     RevenueCategory,
+    RevenueRecurrence,
 )
 from variable_income_assets.choices import (
     AssetObjectives,
@@ -286,6 +289,15 @@ class Command(BaseCommand):
             action="store_true",
             help="Show what would be created without actually saving to database",
         )
+        parser.add_argument(
+            "--transactions",
+            type=int,
+            default=0,
+            help=(
+                "Add small buy transactions to the open positions until the user has this many "
+                "transactions (e.g. for load tests and benchmarks)"
+            ),
+        )
 
     def handle(self, **options) -> None:
         from_date = self._parse_date(options["from_date"])
@@ -295,6 +307,7 @@ class Command(BaseCommand):
         password = options["password"]
         clear = options.get("clear", False)
         dry_run = options.get("dry_run", False)
+        transactions_total = int(options.get("transactions") or 0)
 
         if dry_run:
             self.stdout.write(self.style.WARNING("DRY RUN MODE - No data will be saved"))
@@ -351,6 +364,10 @@ class Command(BaseCommand):
                     self.style.SUCCESS(f"Created {len(asset_ids)} assets with transactions")
                 )
 
+                if transactions_total:
+                    padded = self._pad_transactions(user, transactions_total, months)
+                    self.stdout.write(self.style.SUCCESS(f"Created {padded} extra transactions"))
+
                 # Generate passive incomes
                 self._generate_passive_incomes(user, months)
                 self.stdout.write(self.style.SUCCESS("Created passive incomes"))
@@ -389,6 +406,8 @@ class Command(BaseCommand):
         # Delete expenses and revenues first (they reference BankAccount with PROTECT)
         Expense.objects.filter(user=user).delete()
         Revenue.objects.filter(user=user).delete()
+        ExpenseRecurrence.objects.filter(user=user).delete()
+        RevenueRecurrence.objects.filter(user=user).delete()
 
         # Delete related entities (categories, sources)
         ExpenseCategory.objects.filter(user=user).delete()
@@ -619,45 +638,41 @@ class Command(BaseCommand):
                             )
                         )
 
-        # Create future fixed revenues (11 months)
+        # The future occurrences of the fixed revenues and expenses are generated from their
+        # recurrences
         if last_salary_date:
-            for i in range(1, 12):
-                future_date = last_salary_date + relativedelta(months=i)
-                revenues_to_create.append(
-                    Revenue(
-                        user=user,
-                        bank_account=bank_account,
-                        value=monthly_salary,
-                        description="Salário",
-                        category="Salário",
-                        expanded_category=revenue_categories.get("Salário"),
-                        created_at=future_date,
-                        is_fixed=True,
-                        recurring_id=salary_recurring_id,
-                    )
-                )
+            RevenueRecurrence.objects.create(
+                user=user,
+                bank_account=bank_account,
+                recurring_id=salary_recurring_id,
+                starts_at=last_salary_date.replace(day=1) + relativedelta(months=1),
+                day=last_salary_date.day,
+                value=monthly_salary,
+                description="Salário",
+                category="Salário",
+                expanded_category=revenue_categories.get("Salário"),
+            )
 
-        # Create future fixed expenses (11 months)
+        expense_recurrences = []
         for desc, category, source, _, _ in FIXED_EXPENSES:
             if desc in last_fixed_expense_dates:
                 last_date = last_fixed_expense_dates[desc]
-                for i in range(1, 12):
-                    future_date = last_date + relativedelta(months=i)
-                    expenses_to_create.append(
-                        Expense(
-                            user=user,
-                            bank_account=bank_account,
-                            value=fixed_expense_values[desc],
-                            description=desc,
-                            category=category,
-                            expanded_category=expense_categories.get(category),
-                            source=source,
-                            expanded_source=expense_sources.get(source),
-                            created_at=future_date,
-                            is_fixed=True,
-                            recurring_id=fixed_expense_recurring_ids[desc],
-                        )
+                expense_recurrences.append(
+                    ExpenseRecurrence(
+                        user=user,
+                        bank_account=bank_account,
+                        recurring_id=fixed_expense_recurring_ids[desc],
+                        starts_at=last_date.replace(day=1) + relativedelta(months=1),
+                        day=last_date.day,
+                        value=fixed_expense_values[desc],
+                        description=desc,
+                        category=category,
+                        expanded_category=expense_categories.get(category),
+                        source=source,
+                        expanded_source=expense_sources.get(source),
                     )
+                )
+        ExpenseRecurrence.objects.bulk_create(expense_recurrences)
 
         # Bulk create
         Revenue.objects.bulk_create(revenues_to_create)
@@ -760,6 +775,39 @@ class Command(BaseCommand):
 
         return asset_ids
 
+    def _pad_transactions(self, user: CustomUser, total: int, months: list[date]) -> int:
+        """Add small buy transactions to the assets that were never closed until the user has
+        `total` transactions. Returns the number of transactions created."""
+        missing = total - Transaction.objects.filter(asset__user=user).count()
+        templates: dict[int, Transaction] = {}
+        for t in Transaction.objects.filter(
+            asset__user=user, asset__closed_operations__isnull=True, action=TransactionActions.buy
+        ).order_by("operation_date"):
+            templates.setdefault(t.asset_id, t)
+        if missing <= 0 or not templates:
+            return 0
+
+        today = date.today()
+        transactions = []
+        for template in itertools.islice(itertools.cycle(templates.values()), missing):
+            operation_date = self._random_date_in_month(random.choice(months))
+            transactions.append(
+                Transaction(
+                    asset_id=template.asset_id,
+                    action=TransactionActions.buy,
+                    price=template.price,
+                    irpf_price=template.irpf_price,
+                    quantity=max(
+                        (template.quantity / 100).quantize(Decimal("0.00000001")),
+                        Decimal("0.00000001"),
+                    ),
+                    operation_date=min(operation_date, today - timedelta(days=1)),
+                    current_currency_conversion_rate=template.current_currency_conversion_rate,
+                )
+            )
+        Transaction.objects.bulk_create(transactions, batch_size=5_000)
+        return missing
+
     def _create_fixed_income_asset(
         self,
         user: CustomUser,
@@ -872,7 +920,11 @@ class Command(BaseCommand):
             if j == num_purchases - 1:
                 qty = remaining_qty
             else:
-                qty = remaining_qty * Decimal(str(random.uniform(0.1, 0.4)))
+                # quantized up front so the buys add up to exactly `buy_quantity` and the
+                # full sell of closed positions never leaves a negative balance
+                qty = (remaining_qty * Decimal(str(random.uniform(0.1, 0.4)))).quantize(
+                    Decimal("0.00000001"), rounding=ROUND_DOWN
+                )
                 remaining_qty -= qty
 
             price_variance = Decimal(str(random.uniform(0.85, 1.15)))
@@ -887,7 +939,7 @@ class Command(BaseCommand):
                 action=TransactionActions.buy,
                 price=purchase_price,
                 irpf_price=purchase_price,  # mirrors price for non-bonifica rows
-                quantity=qty.quantize(Decimal("0.00000001")),
+                quantity=qty,
                 operation_date=purchase_date,
                 current_currency_conversion_rate=conversion_rate,
             )
@@ -985,9 +1037,7 @@ class Command(BaseCommand):
         )
 
         # Create AssetClosedOperation record
-        normalized_total_bought = (total_bought_value * conversion_rate).quantize(
-            Decimal("0.0001")
-        )
+        normalized_total_bought = (total_bought_value * conversion_rate).quantize(Decimal("0.0001"))
         total_bought = total_bought_value.quantize(Decimal("0.0001"))
         AssetClosedOperation.objects.create(
             asset=asset,
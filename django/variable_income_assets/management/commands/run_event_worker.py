@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+
+from variable_income_assets.service_layer.outbox import process_pending
+
+if TYPE_CHECKING:  # pragma: no cover
+    from django.core.management.base import CommandParser
+
+
+class Command(BaseCommand):  # pragma: no cover
+    help = "Process the investments message bus events persisted in the outbox"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--max-attempts", type=int, required=False)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1,
+            help="Seconds to wait when there are no pending events",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit when there are no pending events"
+        )
+
+    def handle(self, **options):
+        try:
+            while True:
+                processed = process_pending(
+                    batch_size=options["batch_size"],
+                    concurrency=options["concurrency"],
+                    max_attempts=options["max_attempts"],
+                )
+                if processed and options["verbosity"] > 1:
+                    self.stdout.write(f"{processed} events processed")
+                if not processed:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
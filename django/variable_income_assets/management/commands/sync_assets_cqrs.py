@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import TYPE_CHECKING
 
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
+from django.db import connections
 
-from variable_income_assets.models import Asset
-from variable_income_assets.service_layer.tasks import upsert_asset_read_model
+from variable_income_assets.service_layer.tasks import bulk_upsert_assets_read_model
 
 if TYPE_CHECKING:  # pragma: no cover
     from django.core.management.base import CommandParser
@@ -15,13 +17,70 @@ if TYPE_CHECKING:  # pragma: no cover
 UserModel = get_user_model()
 
 
+def _close_inherited_connections() -> None:
+    # os processos filhos herdam as conexoes do pai (fork) e nao podem compartilha-las,
+    # entao cada worker abre a sua propria conexao sob demanda
+    connections.close_all()
+
+
 class Command(BaseCommand):  # pragma: no cover
+    help = "Rebuild the `AssetReadModel`s from their write models"
+
     def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument("--user-ids", nargs="+", type=int, required=False)
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=50,
+            help="Number of users whose assets are aggregated in the same query",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Max number of read models per INSERT statement",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes (each one with its own DB connection)",
+        )
 
     def handle(self, **options):
-        for asset_pk in Asset.objects.filter(
-            user_id__in=options["user_ids"]
-            or UserModel.objects.filter_investments_module_active().values_list("pk", flat=True)
-        ).values_list("pk", flat=True):
-            upsert_asset_read_model(asset_id=asset_pk)
+        user_ids = options.get("user_ids") or list(
+            UserModel.objects.filter_investments_module_active().values_list("pk", flat=True)
+        )
+        chunk_size = options.get("chunk_size", 50)
+        chunks = [user_ids[i : i + chunk_size] for i in range(0, len(user_ids), chunk_size)]
+        batch_size = options.get("batch_size", 500)
+        workers = options.get("workers", 1)
+        verbosity = options.get("verbosity", 1)
+
+        start, total = time.perf_counter(), 0
+        if workers > 1:
+            _close_inherited_connections()
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_close_inherited_connections
+            ) as executor:
+                futures = [
+                    executor.submit(bulk_upsert_assets_read_model, chunk, batch_size)
+                    for chunk in chunks
+                ]
+                for i, future in enumerate(as_completed(futures), start=1):
+                    total += future.result()
+                    self._report_progress(i, len(chunks), total, start, verbosity)
+        else:
+            for i, chunk in enumerate(chunks, start=1):
+                total += bulk_upsert_assets_read_model(chunk, batch_size=batch_size)
+                self._report_progress(i, len(chunks), total, start, verbosity)
+
+    def _report_progress(
+        self, done: int, chunks: int, total: int, start: float, verbosity: int
+    ) -> None:
+        if verbosity < 1:
+            return
+        self.stdout.write(
+            f"[{done}/{chunks}] {total} read models upserted "
+            f"({time.perf_counter() - start:.1f}s)"
+        )
@@ -0,0 +1,19 @@
+from collections.abc import Callable
+
+from django.http import HttpRequest, HttpResponse
+
+from .adapters.key_value_store import dollar_conversion_rate_scope
+
+
+class DollarConversionRateScopeMiddleware:
+    """Look the dollar conversion rate up at most once per request.
+
+    See `adapters.key_value_store.dollar_conversion_rate_scope`.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with dollar_conversion_rate_scope():
+            return self.get_response(request)
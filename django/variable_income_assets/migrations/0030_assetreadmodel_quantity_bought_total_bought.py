@@ -0,0 +1,68 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:37
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def _sum_subquery(qs, expression):
+    return Coalesce(
+        Subquery(
+            qs.filter(asset_id=OuterRef("write_model_pk"))
+            .values("asset_id")
+            .annotate(_total=Sum(expression, output_field=DecimalField()))
+            .values("_total")
+        ),
+        Value(Decimal()),
+        output_field=DecimalField(),
+    )
+
+
+def backfill_totals_bought(apps, schema_editor):
+    # Same semantics as `GenericQuerySetExpressions.get_current_quantity_bought`
+    # and `GenericQuerySetExpressions.get_current_total_bought`
+    AssetReadModel = apps.get_model("variable_income_assets", "AssetReadModel")
+    Transaction = apps.get_model("variable_income_assets", "Transaction")
+    AssetClosedOperation = apps.get_model("variable_income_assets", "AssetClosedOperation")
+
+    bought = Transaction.objects.filter(action__in=("BUY", "BONIFICACAO"))
+    quantity = Coalesce(F("quantity"), Value(Decimal("1.0")), output_field=DecimalField())
+    AssetReadModel.objects.update(
+        quantity_bought=(
+            _sum_subquery(bought, quantity)
+            - _sum_subquery(AssetClosedOperation.objects.all(), F("quantity_bought"))
+        ),
+        total_bought=(
+            _sum_subquery(bought, F("price") * quantity)
+            - _sum_subquery(AssetClosedOperation.objects.all(), F("total_bought"))
+        ),
+    )
+
+
+def reverse_noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "variable_income_assets",
+            "0029_assetclosedoperation_irpf_normalized_total_bought_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assetreadmodel",
+            name="quantity_bought",
+            field=models.DecimalField(decimal_places=8, default=Decimal("0"), max_digits=15),
+        ),
+        migrations.AddField(
+            model_name="assetreadmodel",
+            name="total_bought",
+            field=models.DecimalField(decimal_places=8, default=Decimal("0"), max_digits=20),
+        ),
+        migrations.RunPython(backfill_totals_bought, reverse_noop),
+    ]
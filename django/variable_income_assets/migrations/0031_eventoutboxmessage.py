@@ -0,0 +1,63 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:49
+
+import django.utils.timezone
+import djchoices.choices
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("variable_income_assets", "0030_assetreadmodel_quantity_bought_total_bought"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventOutboxMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("handler", models.CharField(max_length=100)),
+                ("event_type", models.CharField(max_length=100)),
+                ("payload", models.BinaryField()),
+                ("asset_pk", models.PositiveBigIntegerField(blank=True, null=True)),
+                (
+                    "state",
+                    models.CharField(
+                        default="PENDING",
+                        max_length=10,
+                        validators=[
+                            djchoices.choices.ChoicesValidator(
+                                {
+                                    "DEAD": "Descartado",
+                                    "DONE": "Processado",
+                                    "PENDING": "Pendente",
+                                    "PROCESSING": "Processando",
+                                }
+                            )
+                        ],
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("available_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["state", "available_at"], name="variable_in_state_24f4f7_idx"
+                    ),
+                    models.Index(
+                        fields=["asset_pk", "state"], name="variable_in_asset_p_3aeb19_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.3 on 2026-10-17 04:10
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Case, DecimalField, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+
+def backfill_current_totals(apps, schema_editor):
+    # Same semantics as `AssetReadModelQuerySet.update_current_totals`
+    AssetReadModel = apps.get_model("variable_income_assets", "AssetReadModel")
+    AssetMetaData = apps.get_model("variable_income_assets", "AssetMetaData")
+    ConversionRate = apps.get_model("variable_income_assets", "ConversionRate")
+
+    dollar_conversion_rate = (
+        ConversionRate.objects.filter(from_currency="USD", to_currency="BRL")
+        .values_list("value", flat=True)
+        .first()
+    ) or Decimal()
+    current_price = Coalesce(
+        Subquery(
+            AssetMetaData.objects.filter(pk=OuterRef("metadata_id")).values("current_price")[:1]
+        ),
+        Value(Decimal()),
+        output_field=DecimalField(),
+    )
+    current_total = Case(
+        When(
+            currency="USD",
+            then=current_price * F("quantity_balance") * Value(dollar_conversion_rate),
+        ),
+        default=current_price * F("quantity_balance"),
+        output_field=DecimalField(),
+    )
+    AssetReadModel.objects.update(
+        normalized_current_total=current_total,
+        normalized_roi=Case(
+            When(
+                Q(quantity_balance__gt=0) | Q(normalized_closed_roi=0),
+                then=(
+                    current_total
+                    - (
+                        F("normalized_total_bought")
+                        - F("normalized_credited_incomes")
+                        - F("normalized_total_sold")
+                    )
+                ),
+            ),
+            default=F("normalized_closed_roi"),
+            output_field=DecimalField(),
+        ),
+    )
+
+
+def reverse_noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("variable_income_assets", "0031_eventoutboxmessage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assetreadmodel",
+            name="normalized_current_total",
+            field=models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=20),
+        ),
+        migrations.AddField(
+            model_name="assetreadmodel",
+            name="normalized_roi",
+            field=models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=20),
+        ),
+        migrations.AddIndex(
+            model_name="assetreadmodel",
+            index=models.Index(
+                fields=["user_id", "normalized_roi"], name="variable_in_user_id_e7567e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assetreadmodel",
+            index=models.Index(
+                fields=["user_id", "normalized_current_total"],
+                name="variable_in_user_id_e0c682_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_current_totals, reverse_noop),
+    ]
@@ -1,3 +1,4 @@
+from .outbox import EventOutboxMessage
 from .read import AssetReadModel, AssetsTotalInvestedSnapshot
 from .write import (
     Asset,
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from functools import cached_property
 from typing import TYPE_CHECKING
 
-from django.db.models import Case, F, Q, Sum, Value, When
+from django.db.models import Case, F, OuterRef, Q, Subquery, Sum, Value, When
 from django.db.models.expressions import CombinedExpression
 from django.db.models.functions import Coalesce, Greatest
 
@@ -48,6 +49,10 @@ class GenericQuerySetExpressions(_GenericQueryHelperIntializer):
         super().__init__(prefix=prefix)
         self.filters = GenericQuerySetFilters(prefix=prefix)
 
+    @cached_property
+    def dollar_conversion_rate(self) -> Decimal:
+        return get_dollar_conversion_rate()
+
     @property
     def normalized_incomes_total(self) -> CombinedExpression:
         return F(f"{self.prefix}amount") * F(f"{self.prefix}current_currency_conversion_rate")
@@ -154,7 +159,7 @@ class GenericQuerySetExpressions(_GenericQueryHelperIntializer):
                 * self.get_quantity()
                 * Coalesce(
                     F(f"{self.prefix}current_currency_conversion_rate"),
-                    get_dollar_conversion_rate(),
+                    self.dollar_conversion_rate,
                 )
             ),
             filter=Q(self.filters.bought, extra_filters),
@@ -231,22 +236,31 @@ class GenericQuerySetExpressions(_GenericQueryHelperIntializer):
             else self.get_normalized_total_bought(_extra_filters, price_field=price_field)
         )
 
-    def get_current_avg_price(
-        self, extra_filters: Q | None = None, price_field: str = "price"
-    ) -> Coalesce:
-        extra_filters = extra_filters if extra_filters is not None else Q()
-        denominator = (
-            self.get_quantity_bought(extra_filters=extra_filters)
-            - self.closed_operations_quantity_bought
+    def get_current_quantity_bought(self, extra_filters: Q | None = None) -> CombinedExpression:
+        return self.get_quantity_bought(extra_filters=extra_filters) - (
+            self.closed_operations_quantity_bought
         )
+
+    def get_current_total_bought(
+        self, extra_filters: Q | None = None, price_field: str = "price"
+    ) -> CombinedExpression:
         closed_ops_bought = (
             self.closed_operations_irpf_total_bought
             if price_field != "price"
             else self.closed_operations_total_bought
         )
+        return self.get_total_bought(extra_filters, price_field=price_field) - closed_ops_bought
+
+    def get_current_avg_price(
+        self, extra_filters: Q | None = None, price_field: str = "price"
+    ) -> Coalesce:
+        extra_filters = extra_filters if extra_filters is not None else Q()
         return Coalesce(
-            (self.get_total_bought(extra_filters, price_field=price_field) - closed_ops_bought)
-            / Greatest(denominator, Value(Decimal("1.0"))),
+            self.get_current_total_bought(extra_filters, price_field=price_field)
+            / Greatest(
+                self.get_current_quantity_bought(extra_filters=extra_filters),
+                Value(Decimal("1.0")),
+            ),
             Decimal(),
         )
 
@@ -277,3 +291,58 @@ class GenericQuerySetExpressions(_GenericQueryHelperIntializer):
             ),
             default=Decimal("1.0"),
         )
+
+
+class PreAggregatedQuerySetExpressions(GenericQuerySetExpressions):
+    """Aggregates the closed operations in a subquery grouped by asset instead of joining them
+    alongside the transactions.
+
+    The join multiplies the transactions by the closed operations of the asset (and vice-versa),
+    which is why the closed operations are summed with `distinct=True` above. That drops the
+    closed operations with the same values and doesn't prevent the transactions totals from
+    being multiplied when an asset has been closed more than once.
+    """
+
+    def _closed_operations_sum(self, expression: Expression) -> Coalesce:
+        from ..write import AssetClosedOperation  # avoid circular ImportError
+
+        return Coalesce(
+            Subquery(
+                AssetClosedOperation.objects.filter(asset_id=OuterRef(f"{self._inverse_prefix}pk"))
+                .values("asset_id")  # group by as we can't aggregate directly
+                .annotate(total=Sum(expression))
+                .values("total")
+            ),
+            Decimal(),
+        )
+
+    @property
+    def closed_operations_normalized_total_sold(self) -> Coalesce:
+        return self._closed_operations_sum(F("normalized_total_sold"))
+
+    @property
+    def closed_operations_total_bought(self) -> Coalesce:
+        return self._closed_operations_sum(F("total_bought"))
+
+    @property
+    def closed_operations_irpf_total_bought(self) -> Coalesce:
+        return self._closed_operations_sum(F("irpf_total_bought"))
+
+    @property
+    def closed_operations_quantity_bought(self) -> Coalesce:
+        return self._closed_operations_sum(F("quantity_bought"))
+
+    @property
+    def normalized_closed_roi(self) -> Coalesce:
+        return self._closed_operations_sum(
+            F("normalized_total_sold")
+            - (F("normalized_total_bought") - F("normalized_credited_incomes"))
+        )
+
+    def get_closed_operations_normalized_total_bought(
+        self, extra_filters: Q | None = None, for_irpf: bool = False
+    ) -> Coalesce:
+        # `extra_filters` target the transactions, which aren't part of the subquery
+        return self._closed_operations_sum(
+            F("irpf_normalized_total_bought" if for_irpf else "normalized_total_bought")
+        )
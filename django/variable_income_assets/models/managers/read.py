@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from functools import cached_property
 from typing import TYPE_CHECKING, Self
 
 from django.db import models
@@ -41,18 +42,26 @@ class _Expressions:
         metadata_repository: AbstractAssetMetaDataRepository,
         dollar_conversion_rate: Decimal | None = None,
     ) -> None:
-        self.dollar_conversion_rate = (
-            models.Value(dollar_conversion_rate)
-            if dollar_conversion_rate is not None
-            else models.Value(get_dollar_conversion_rate())
-        )
+        self._dollar_conversion_rate = dollar_conversion_rate
         self.metadata_repository = metadata_repository
         self.filters = _Filters()
 
+    @cached_property
+    def dollar_conversion_rate(self) -> models.Value:
+        # resolved lazily as a new instance is created for every queryset clone, most of which
+        # don't need the rate at all
+        return models.Value(
+            self._dollar_conversion_rate
+            if self._dollar_conversion_rate is not None
+            else get_dollar_conversion_rate()
+        )
+
+    # `normalized_current_total` and `normalized_roi` are persisted by
+    # `AssetReadModelQuerySet.update_current_totals`, so they are built to be used in an `UPDATE`
     @property
     def normalized_current_total(self) -> models.Case:
         return self.get_dollar_conversion_expression(
-            expression=self.metadata_repository.get_current_price_annotation(source="read")
+            expression=self.metadata_repository.get_current_price_annotation(source="read_update")
             * models.F("quantity_balance")
         )
 
@@ -167,33 +176,34 @@ class AssetReadModelQuerySet(models.QuerySet):
     def cryptos(self) -> Self:  # pragma: no cover
         return self.filter(type=AssetTypes.crypto)
 
-    def annotate_normalized_current_total(self) -> Self:
-        return self.annotate(normalized_current_total=self.expressions.normalized_current_total)
-
     def annotate_normalized_total_invested(self) -> Self:
         return self.annotate(normalized_total_invested=self.expressions.normalized_total_invested)
 
-    def annotate_normalized_roi(self) -> Self:
-        return self.annotate(normalized_roi=self.expressions.normalized_roi)
-
     def annotate_roi_percentage(self) -> Self:
         return self.annotate(roi_percentage=self.expressions.roi_percentage)
 
     def annotate_for_serializer(self) -> Self:
-        return (
-            self.annotate_normalized_total_invested()
-            .annotate_normalized_roi()
-            .annotate_roi_percentage()
+        return self.annotate_normalized_total_invested().annotate_roi_percentage()
+
+    def update_current_totals(self) -> int:
+        """Persist the `normalized_current_total` and `normalized_roi` of the matching rows in a
+        single statement.
+
+        Should be used whenever the current price of the assets, the dollar conversion rate or
+        the aggregated fields of the read models change.
+
+        Returns:
+            int: The number of updated rows.
+        """
+        return self.update(
+            normalized_current_total=self.expressions.normalized_current_total,
+            normalized_roi=self.expressions.normalized_roi,
         )
 
     def aggregate_normalized_current_total(self) -> dict[str, Decimal]:
-        return self.annotate_normalized_current_total().aggregate(
-            total=models.Sum("normalized_current_total", default=Decimal())
-        )
+        return self.aggregate(total=models.Sum("normalized_current_total", default=Decimal()))
 
     def indicators(self, *, include_yield: bool | None = False) -> dict[str, Decimal]:
-        qs = self.annotate_normalized_current_total().annotate_normalized_roi()
-
         aggregations: dict[str, models.Expression] = {
             "ROI_opened": models.Sum(
                 "normalized_roi",
@@ -215,11 +225,11 @@ class AssetReadModelQuerySet(models.QuerySet):
                 Decimal(),
             )
 
-        return qs.aggregate(**aggregations)
+        return self.aggregate(**aggregations)
 
     def total_invested_report(self, group_by: AssetsReportsAggregations, current: bool) -> Self:
         if current:
-            qs = self.alias(normalized_total=self.expressions.normalized_current_total)
+            qs = self.alias(normalized_total=models.F("normalized_current_total"))
         else:
             qs = self.alias(normalized_total=self.expressions.normalized_total_invested)
 
@@ -243,20 +253,7 @@ class AssetReadModelQuerySet(models.QuerySet):
         group_by: AssetsReportsAggregations = AssetsReportsAggregations.type,
     ) -> Self:
         f = "metadata__sector" if group_by == AssetsReportsAggregations.sector else group_by
-        qs = (
-            self.alias(
-                normalized_roi=models.Case(
-                    models.When(
-                        self.expressions.filters.opened,
-                        then=self.expressions.normalized_roi,
-                    ),
-                    default=models.F("normalized_closed_roi"),
-                )
-            )
-            .values(f)
-            .annotate(total=models.Sum("normalized_roi"))
-            .order_by("-total")
-        )
+        qs = self.values(f).annotate(total=models.Sum("normalized_roi")).order_by("-total")
         if opened and not closed:
             qs = qs.opened()
         if closed and not opened:
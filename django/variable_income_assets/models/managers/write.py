@@ -4,6 +4,7 @@ from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING, Literal, Self
 
+from django.conf import settings
 from django.db.models import Case, CharField, Count, F, OuterRef, Q, QuerySet, Subquery, Sum, Value
 from django.db.models.functions import Coalesce, Concat, Greatest, TruncMonth, TruncYear
 from django.utils import timezone
@@ -11,7 +12,7 @@ from django.utils import timezone
 from shared.managers_utils import GenericDateFilters
 
 from ...choices import AssetTypes, PassiveIncomeEventTypes, PassiveIncomeTypes, TransactionActions
-from .expressions import GenericQuerySetExpressions
+from .expressions import GenericQuerySetExpressions, PreAggregatedQuerySetExpressions
 
 if TYPE_CHECKING:  # pragma: no cover
     from datetime import date
@@ -20,6 +21,9 @@ if TYPE_CHECKING:  # pragma: no cover
 
 
 AggregatePeriod = Literal["month", "year"]
+# `join`: the transactions and the closed operations are joined and aggregated together
+# `pre_aggregated`: the closed operations are aggregated in their own subquery
+Aggregation = Literal["join", "pre_aggregated"]
 
 
 class AssetQuerySet(QuerySet):
@@ -27,6 +31,21 @@ class AssetQuerySet(QuerySet):
         super().__init__(*args, **kwargs)
         self.expressions = GenericQuerySetExpressions(prefix="transactions")
 
+    def _clone(self) -> Self:
+        clone = super()._clone()
+        clone.expressions = self.expressions
+        return clone
+
+    def with_aggregation(self, aggregation: Aggregation | None = None) -> Self:
+        aggregation = aggregation or settings.ASSETS_AGGREGATION
+        qs = self._chain()
+        qs.expressions = (
+            PreAggregatedQuerySetExpressions(prefix="transactions")
+            if aggregation == "pre_aggregated"
+            else GenericQuerySetExpressions(prefix="transactions")
+        )
+        return qs
+
     @staticmethod
     def _get_passive_incomes_qs_w_normalized_amount() -> PassiveIncomeQuerySet:
         from ..write import PassiveIncome  # avoid circular ImportError
@@ -79,6 +98,12 @@ class AssetQuerySet(QuerySet):
             closed_operations_normalized_total_bought=self.expressions.get_closed_operations_normalized_total_bought(),
         )
 
+    def annotate_current_totals_bought(self) -> Self:
+        return self.annotate(
+            current_quantity_bought=self.expressions.get_current_quantity_bought(),
+            current_total_bought=self.expressions.get_current_total_bought(),
+        )
+
     def annotate_current_normalized_total_sold(self) -> Self:
         return self.annotate(
             normalized_total_sold=self.expressions.get_current_normalized_total_sold()
@@ -145,13 +170,17 @@ class AssetQuerySet(QuerySet):
             )
         return qs
 
-    def annotate_read_fields(self, is_held_in_self_custody: bool = False) -> Self:
+    def annotate_read_fields(
+        self, is_held_in_self_custody: bool = False, aggregation: Aggregation | None = None
+    ) -> Self:
+        qs = self.with_aggregation(aggregation)
         if is_held_in_self_custody:
-            return self._annotate_read_fields_for_is_held_in_self_custody()
+            return qs._annotate_read_fields_for_is_held_in_self_custody()
         return (
-            self.annotate_for_domain()
+            qs.annotate_for_domain()
             .annotate_current_normalized_avg_price()
             .annotate_normalized_total_bought()
+            .annotate_current_totals_bought()
             .annotate_current_normalized_total_sold()
             .annotate_normalized_closed_roi()
             .annotate_current_credited_incomes()
@@ -168,16 +197,20 @@ class AssetQuerySet(QuerySet):
                 #
                 credited_incomes=Value(Decimal()),
                 normalized_credited_incomes=Value(Decimal()),
+                # not used as these assets are always fully re-aggregated
+                current_quantity_bought=Value(Decimal()),
+                current_total_bought=Value(Decimal()),
             )
             .annotate_normalized_closed_roi()
             .annotate(quantity_balance=self.expressions.get_quantity_balance_held_in_self_custody())
         )
 
-    def annotate_for_simulation(self) -> Self:
+    def annotate_for_simulation(self, aggregation: Aggregation | None = None) -> Self:
         from ...adapters import DjangoSQLAssetMetaDataRepository
 
         return (
-            self.annotate_for_domain()
+            self.with_aggregation(aggregation)
+            .annotate_for_domain()
             .annotate_current_normalized_avg_price()
             .annotate_normalized_total_bought()
             .annotate_current_normalized_total_sold()
@@ -0,0 +1,33 @@
+from django.db import models
+from django.utils import timezone
+
+from ..choices import EventOutboxStates
+
+
+class EventOutboxMessage(models.Model):
+    # `handler` is the name of a function at `service_layer.handlers`
+    handler = models.CharField(max_length=100)
+    event_type = models.CharField(max_length=100)
+    # the pickled event
+    payload = models.BinaryField()
+    asset_pk = models.PositiveBigIntegerField(null=True, blank=True)
+    state = models.CharField(
+        max_length=10, validators=[EventOutboxStates.validator], default=EventOutboxStates.pending
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["state", "available_at"]),
+            models.Index(fields=["asset_pk", "state"]),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"<EventOutboxMessage ({self.event_type} | {self.handler} | {self.state})>"
+
+    __repr__ = __str__
@@ -8,7 +8,6 @@ from django.utils.functional import cached_property
 
 from shared.models_utils import serializable_today_function
 
-from ..adapters.key_value_store import get_dollar_conversion_rate
 from ..choices import AssetObjectives, AssetTypes, Currencies, LiquidityTypes
 from .managers import AssetReadModelQuerySet, AssetsTotalInvestedSnapshotQuerySet
 from .write import AssetMetaData
@@ -34,6 +33,10 @@ class AssetReadModel(models.Model):
     )
     maturity_date = models.DateField(null=True, blank=True)
     quantity_balance = models.DecimalField(decimal_places=8, max_digits=15, default=Decimal())
+    # `quantity_bought` and `total_bought` don't consider the closed operations and are
+    # persisted so `avg_price` and `normalized_avg_price` can be incrementally updated
+    quantity_bought = models.DecimalField(decimal_places=8, max_digits=15, default=Decimal())
+    total_bought = models.DecimalField(decimal_places=8, max_digits=20, default=Decimal())
     avg_price = models.DecimalField(decimal_places=8, max_digits=15, default=Decimal())
     normalized_avg_price = models.DecimalField(decimal_places=8, max_digits=15, default=Decimal())
     normalized_total_bought = models.DecimalField(
@@ -45,6 +48,12 @@ class AssetReadModel(models.Model):
     normalized_credited_incomes = models.DecimalField(
         decimal_places=4, max_digits=20, default=Decimal()
     )
+    # depend on the current price of the asset and are kept up to date by
+    # `AssetReadModelQuerySet.update_current_totals`
+    normalized_current_total = models.DecimalField(
+        decimal_places=4, max_digits=20, default=Decimal()
+    )
+    normalized_roi = models.DecimalField(decimal_places=4, max_digits=20, default=Decimal())
     updated_at = models.DateTimeField(auto_now=True)
     metadata = models.ForeignKey(
         to=AssetMetaData,
@@ -63,6 +72,9 @@ class AssetReadModel(models.Model):
             # Composite with user_id since queries always filter by user + status
             models.Index(fields=["user_id", "quantity_balance"]),
             models.Index(fields=["user_id", "normalized_closed_roi"]),
+            # sorting of the list endpoint and the current totals of the reports
+            models.Index(fields=["user_id", "normalized_roi"]),
+            models.Index(fields=["user_id", "normalized_current_total"]),
         ]
 
     def __str__(self) -> str:  # pragma: no cover
@@ -76,20 +88,6 @@ class AssetReadModel(models.Model):
         # a um metadata
         return bool(self.metadata.asset_id)
 
-    @cached_property
-    def normalized_roi(self) -> Decimal:
-        current_price = (
-            self.metadata.current_price
-            if self.currency == Currencies.real
-            else self.metadata.current_price * get_dollar_conversion_rate()
-        )
-
-        return (current_price * self.quantity_balance) - (
-            self.normalized_total_bought
-            - self.normalized_credited_incomes
-            - self.normalized_total_sold
-        )
-
     @cached_property
     def adjusted_avg_price(self) -> Decimal:
         try:
@@ -16,9 +16,9 @@ from django.contrib.auth import get_user_model
 from django.db.models import F
 from django.utils import timezone
 
-from .adapters.key_value_store import get_dollar_conversion_rate
+from .adapters.key_value_store import bump_portfolio_summary_version, get_dollar_conversion_rate
 from .choices import AssetTypes, Currencies, PassiveIncomeTypes, TransactionActions
-from .models import Asset, AssetClosedOperation, AssetMetaData, Transaction
+from .models import Asset, AssetClosedOperation, AssetMetaData, AssetReadModel, Transaction
 from .service_layer.tasks import upsert_asset_read_model
 
 if TYPE_CHECKING:
@@ -655,10 +655,12 @@ def group_or_split_asset_transactions(
 
 
 def update_asset_metadata_current_price(code: str, price: Decimal) -> None:
-    return AssetMetaData.objects.filter(code=code).update(
+    AssetMetaData.objects.filter(code=code).update(
         current_price=price,
         current_price_updated_at=timezone.now(),
     )
+    AssetReadModel.objects.filter(metadata__code=code).update_current_totals()
+    bump_portfolio_summary_version()
 
 
 def generate_fire_returns_ts(
@@ -1,5 +1,6 @@
 from decimal import ROUND_HALF_UP, Decimal, DecimalException
 
+from django.conf import settings
 from django.core.validators import FileExtensionValidator
 from django.utils import timezone
 
@@ -655,7 +656,6 @@ class AssetOperationPeriodSerializer(serializers.Serializer):
 
 
 B3_IMPORT_OPERATIONS = ("negociacoes", "renda_fixa", "tesouro", "proventos")
-B3_MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10 MB
 
 
 class B3ImportSerializer(serializers.Serializer):
@@ -704,8 +704,11 @@ class B3ImportSerializer(serializers.Serializer):
         ):
             # Extension is validated by FileExtensionValidator on the field; content is
             # validated by openpyxl downstream. Here we only cap the size before reading.
-            if file is not None and file.size > B3_MAX_UPLOAD_BYTES:
-                raise serializers.ValidationError({field_name: "Arquivo muito grande (máx. 10 MB)"})
+            max_size = settings.B3_IMPORT_MAX_UPLOAD_SIZE_IN_BYTES
+            if file is not None and file.size > max_size:
+                raise serializers.ValidationError(
+                    {field_name: f"Arquivo muito grande (máx. {max_size // (1024 * 1024)} MB)"}
+                )
 
         errors: dict = {}
         if "negociacoes" in ops and negociacao is None:
@@ -1,4 +1,5 @@
 from datetime import date
+from decimal import Decimal
 from uuid import uuid4
 
 from django.utils import timezone
@@ -11,6 +12,8 @@ from tasks.models import TaskHistory
 from ..choices import AssetTypes
 from ..domain import commands, events
 from ..domain.exceptions import AssetCodeTypeCurrencyAlreadyExistsException
+from ..domain.models import Asset as AssetDomainModel
+from ..domain.models import AssetReadModelDelta
 from ..models import Transaction
 from .tasks import (
     create_asset_closed_operation,
@@ -21,10 +24,25 @@ from .tasks import (
 from .unit_of_work import AbstractUnitOfWork
 
 
+def _get_read_model_delta(
+    asset: AssetDomainModel, delta: AssetReadModelDelta
+) -> AssetReadModelDelta | None:
+    # An `AssetClosedOperation` changes every aggregated field and the
+    # self custody assets are aggregated differently (`avg_price = bought - sold`)
+    # so in both cases we let the read model be fully re-aggregated
+    if asset.is_held_in_self_custody or any(
+        isinstance(e, events.AssetOperationClosed) for e in asset.events
+    ):
+        return None
+    return delta
+
+
 def create_transactions(cmd: commands.CreateTransactions, uow: AbstractUnitOfWork) -> None:
     with uow:
+        delta = AssetReadModelDelta()
         for dto in cmd.asset._transactions:
             uow.assets.transactions.add(dto=dto)
+            delta += AssetReadModelDelta.from_transaction(dto)
 
         if cmd.dispatch_event:
             cmd.asset.events.append(
@@ -34,6 +52,45 @@ def create_transactions(cmd: commands.CreateTransactions, uow: AbstractUnitOfWor
                     quantity_diff=dto.quantity,
                     fixed_br_asset=cmd.asset.is_fixed_br,
                     is_held_in_self_custody=cmd.asset.is_held_in_self_custody,
+                    read_model_delta=_get_read_model_delta(cmd.asset, delta),
+                )
+            )
+
+        uow.assets.seen.add(cmd.asset)
+        uow.commit()
+
+
+def bulk_create_transactions(cmd: commands.BulkCreateTransactions, uow: AbstractUnitOfWork) -> None:
+    with uow:
+        dtos = cmd.asset._transactions
+        # `create_asset_closed_operation` aggregates every transaction since the last closed
+        # operation so the transactions that come after a closing one can only be inserted
+        # after the `AssetClosedOperation` is created
+        start = 0
+        for index in cmd.asset._closing_transactions_indexes:
+            uow.assets.transactions.add_many(dtos[start : index + 1])
+            create_asset_closed_operation(asset_pk=uow.asset_pk)
+            start = index + 1
+        uow.assets.transactions.add_many(dtos[start:])
+
+        delta = AssetReadModelDelta()
+        for dto in dtos:
+            delta += AssetReadModelDelta.from_transaction(dto)
+
+        cmd.asset.events = [
+            e for e in cmd.asset.events if not isinstance(e, events.AssetOperationClosed)
+        ]
+        if dtos:
+            cmd.asset.events.append(
+                events.TransactionsCreated(
+                    asset_pk=uow.asset_pk,
+                    operation_date=dtos[-1].operation_date,
+                    quantity_diff=sum(
+                        (-dto.quantity if dto.is_sale else dto.quantity for dto in dtos),
+                        Decimal(),
+                    ),
+                    fixed_br_asset=cmd.asset.is_fixed_br,
+                    read_model_delta=(None if cmd.asset._closing_transactions_indexes else delta),
                 )
             )
 
@@ -44,6 +101,9 @@ def create_transactions(cmd: commands.CreateTransactions, uow: AbstractUnitOfWor
 def update_transaction(cmd: commands.UpdateTransaction, uow: AbstractUnitOfWork) -> Transaction:
     with uow:
         dto = cmd.asset._transactions[0]
+        delta = AssetReadModelDelta.from_transaction(dto) - AssetReadModelDelta.from_transaction(
+            cmd.transaction
+        )
         uow.assets.transactions.update(dto=dto, entity=cmd.transaction)
         cmd.asset.events.append(
             events.TransactionUpdated(
@@ -55,6 +115,7 @@ def update_transaction(cmd: commands.UpdateTransaction, uow: AbstractUnitOfWork)
                     else dto.quantity - cmd.transaction.quantity
                 ),
                 is_held_in_self_custody=cmd.asset.is_held_in_self_custody,
+                read_model_delta=_get_read_model_delta(cmd.asset, delta),
             )
         )
         uow.assets.seen.add(cmd.asset)
@@ -70,6 +131,9 @@ def delete_transaction(cmd: commands.DeleteTransaction, uow: AbstractUnitOfWork)
                 operation_date=cmd.transaction.operation_date,
                 quantity_diff=0 if cmd.asset.is_held_in_self_custody else -cmd.transaction.quantity,
                 is_held_in_self_custody=cmd.asset.is_held_in_self_custody,
+                read_model_delta=_get_read_model_delta(
+                    cmd.asset, -AssetReadModelDelta.from_transaction(cmd.transaction)
+                ),
             )
         )
         uow.assets.seen.add(cmd.asset)
@@ -117,6 +181,7 @@ def upsert_read_model(
         asset_id=event.asset_pk,
         is_aggregate_upsert=is_aggregate_upsert,
         is_held_in_self_custody=is_held_in_self_custody,
+        delta=getattr(event, "read_model_delta", None),
     )
 
 
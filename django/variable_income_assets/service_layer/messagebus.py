@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import replace
 from typing import Any
 
+from django.conf import settings
+from django.db import transaction as djtransaction
+
+from ..adapters.key_value_store import dollar_conversion_rate_scope
 from ..domain import commands, events
 from . import handlers
 from .unit_of_work import AbstractUnitOfWork
@@ -39,8 +46,36 @@ EVENT_HANDLERS: dict[type[events.Event], list[MessageCallable]] = {
     events.AssetOperationClosed: [handlers.create_asset_operation_closed_record],
 }
 
+
+def _merge_read_model_events(
+    previous: events.RelatedAssetEvent, event: events.RelatedAssetEvent
+) -> events.RelatedAssetEvent:
+    # `new_asset` events upsert all fields so they take precedence
+    merged = previous if getattr(previous, "new_asset", False) else event
+    previous_delta = getattr(previous, "read_model_delta", None)
+    delta = getattr(event, "read_model_delta", None)
+    return replace(
+        merged,
+        read_model_delta=(
+            previous_delta + delta if previous_delta is not None and delta is not None else None
+        ),
+        is_held_in_self_custody=(
+            getattr(previous, "is_held_in_self_custody", False)
+            or getattr(event, "is_held_in_self_custody", False)
+        ),
+    )
+
+
+# Handlers whose outcome only depends on the current state of the asset, meaning that
+# executing them once after the last event has the same effect as executing them for every
+# event. Maps the handler to the function that merges two of its events
+COALESCIBLE_EVENT_HANDLERS: dict[MessageCallable, Callable[[Any, Any], Any]] = {
+    handlers.upsert_read_model: _merge_read_model_events,
+}
+
 COMMAND_HANDLERS: dict[type[commands.Command], MessageCallable] = {
     commands.CreateTransactions: handlers.create_transactions,
+    commands.BulkCreateTransactions: handlers.bulk_create_transactions,
     commands.UpdateTransaction: handlers.update_transaction,
     commands.DeleteTransaction: handlers.delete_transaction,
     commands.CreateAsset: handlers.create_asset,
@@ -54,8 +89,57 @@ COMMAND_HANDLERS: dict[type[commands.Command], MessageCallable] = {
 # region: handlers
 
 
+_coalesced = threading.local()
+
+
+@contextmanager
+def coalesce() -> Iterator[None]:
+    """Defer the `COALESCIBLE_EVENT_HANDLERS` until the block exits.
+
+    The events of these handlers are merged per (handler, asset_pk) so, for instance,
+    an import that touches the same asset several times upserts its read model only once.
+    Every `handle` call is wrapped by this context so it only has to be used explicitly to
+    coalesce the events of several `handle` calls. Nested blocks are merged into the
+    outermost one.
+    """
+    with _outbox_transaction():
+        if getattr(_coalesced, "events", None) is not None:
+            yield
+            return
+
+        _coalesced.events = {}
+        try:
+            yield
+            # the deferred handlers may emit (coalescible) events as well
+            while _coalesced.events:
+                pending, _coalesced.events = _coalesced.events, {}
+                for (handler, _), (event, uow) in pending.items():
+                    queue: list[Message] = []
+                    _handle_message(
+                        handler=handler, message=event, queue=queue, uow=uow, sync=event.sync
+                    )
+                    _handle_queue(queue=queue, uow=uow)
+        finally:
+            _coalesced.events = None
+
+
+def _outbox_transaction() -> AbstractContextManager:
+    # the outbox messages are persisted in the same transaction as the changes that emitted
+    # them, otherwise a crash in between would lose the events. Nested blocks are savepoints
+    # so a failed `handle` call doesn't roll back the others
+    if settings.INVESTMENTS_EVENTS_BACKEND == "outbox" and (
+        djtransaction.get_autocommit() or djtransaction.get_connection().in_atomic_block
+    ):
+        return djtransaction.atomic()
+    return nullcontext()
+
+
 def handle(message: Message, uow: AbstractUnitOfWork) -> None:
-    queue = [message]
+    with dollar_conversion_rate_scope(), coalesce():
+        _handle_queue(queue=[message], uow=uow)
+
+
+def _handle_queue(queue: list[Message], uow: AbstractUnitOfWork) -> None:
     while queue:
         message = queue.pop(0)
         if isinstance(message, events.Event):
@@ -67,6 +151,8 @@ def handle(message: Message, uow: AbstractUnitOfWork) -> None:
 
 def handle_event(event: events.Event, queue: list[Message], uow: AbstractUnitOfWork) -> None:
     for handler in EVENT_HANDLERS[event.__class__]:
+        if _maybe_coalesce(handler=handler, event=event, uow=uow):
+            continue
         _handle_message(handler=handler, message=event, queue=queue, uow=uow, sync=event.sync)
 
 
@@ -82,6 +168,22 @@ def handle_command(
     )
 
 
+def _maybe_coalesce(handler: MessageCallable, event: events.Event, uow: AbstractUnitOfWork) -> bool:
+    merge = COALESCIBLE_EVENT_HANDLERS.get(handler)
+    buffer = getattr(_coalesced, "events", None)
+    # `AssetEvent`s upsert different fields so they are always handled right away
+    if merge is None or buffer is None or not isinstance(event, events.RelatedAssetEvent):
+        return False
+
+    key = (handler, event.asset_pk)
+    if key in buffer:
+        previous, _ = buffer.pop(key)
+        # re-inserting keeps the handlers executed in the order of the last event
+        event = merge(previous, event)
+    buffer[key] = (event, uow)
+    return True
+
+
 def _handle_message(
     handler: MessageCallable,
     message: Message,
@@ -97,9 +199,14 @@ def _handle_message(
     # TODO: log error
 
 
-# TODO: implement queue or whatever
 def _dispatch_async(handler: MessageCallable, message: Message, uow: AbstractUnitOfWork) -> None:
-    handler(message, uow)
+    if settings.INVESTMENTS_EVENTS_BACKEND == "outbox":
+        from . import outbox  # avoid circular import error
+
+        # executed by `manage.py run_event_worker`
+        outbox.enqueue(handler=handler, event=message)
+    else:
+        handler(message, uow)
 
 
 # endregion: handlers
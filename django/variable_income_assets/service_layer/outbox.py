@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import logging
+import pickle  # nosec
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction as djtransaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from ..choices import EventOutboxStates
+from ..models import EventOutboxMessage
+from . import handlers, messagebus
+from .unit_of_work import DjangoUnitOfWork
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from django.db.models import QuerySet
+
+    from ..domain.events import Event
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCK_TIMEOUT = timedelta(minutes=5)
+
+
+def enqueue(handler: Callable, event: Event) -> EventOutboxMessage:
+    asset_pk = getattr(event, "asset_pk", None)
+    available_at = timezone.now()
+    merge = messagebus.COALESCIBLE_EVENT_HANDLERS.get(handler)
+    window = settings.INVESTMENTS_EVENTS_COALESCE_WINDOW_IN_SECONDS
+    if merge is not None and window and asset_pk is not None:
+        available_at += timedelta(seconds=window)
+        message = _coalesce(handler=handler, event=event, merge=merge, available_at=available_at)
+        if message is not None:
+            return message
+
+    return EventOutboxMessage.objects.create(
+        handler=handler.__name__,
+        event_type=event.__class__.__name__,
+        payload=pickle.dumps(event),
+        asset_pk=asset_pk,
+        available_at=available_at,
+    )
+
+
+def _coalesce(
+    handler: Callable,
+    event: Event,
+    merge: Callable[[Event, Event], Event],
+    available_at: datetime,
+) -> EventOutboxMessage | None:
+    # only the last message of the asset can be merged, otherwise the handlers wouldn't be
+    # executed in the same order as the events were emitted
+    last = EventOutboxMessage.objects.filter(asset_pk=event.asset_pk).order_by("-pk").first()
+    if (
+        last is None
+        or last.handler != handler.__name__
+        or last.state != EventOutboxStates.pending
+        or last.attempts
+    ):
+        return None
+
+    merged = merge(pickle.loads(last.payload), event)  # nosec
+    # the message may have been claimed in the meantime
+    if EventOutboxMessage.objects.filter(pk=last.pk, state=EventOutboxStates.pending).update(
+        payload=pickle.dumps(merged),
+        event_type=merged.__class__.__name__,
+        available_at=available_at,
+    ):
+        return last
+    return None
+
+
+def _get_claimable_messages(limit: int, lock_timeout: timedelta) -> list[EventOutboxMessage]:
+    now = timezone.now()
+    # a message can only be processed after all the previous messages of the same asset
+    # have been processed (or discarded) so the handlers are executed in the same order as
+    # the events were emitted
+    previous_unfinished = EventOutboxMessage.objects.filter(
+        asset_pk=OuterRef("asset_pk"),
+        pk__lt=OuterRef("pk"),
+        state__in=(EventOutboxStates.pending, EventOutboxStates.processing),
+    )
+    return list(
+        EventOutboxMessage.objects.filter(
+            Q(state=EventOutboxStates.pending, available_at__lte=now)
+            # the worker that claimed these messages probably died
+            | Q(state=EventOutboxStates.processing, locked_at__lt=now - lock_timeout)
+        )
+        .filter(~Exists(previous_unfinished))
+        .order_by("pk")[:limit]
+    )
+
+
+def claim(limit: int, lock_timeout: timedelta = DEFAULT_LOCK_TIMEOUT) -> list[EventOutboxMessage]:
+    claimed: list[EventOutboxMessage] = []
+    for message in _get_claimable_messages(limit=limit, lock_timeout=lock_timeout):
+        locked_at = timezone.now()
+        # optimistic lock: another worker may have claimed the message in the meantime
+        if EventOutboxMessage.objects.filter(
+            pk=message.pk, state=message.state, locked_at=message.locked_at
+        ).update(state=EventOutboxStates.processing, locked_at=locked_at):
+            message.state, message.locked_at = EventOutboxStates.processing, locked_at
+            claimed.append(message)
+    return claimed
+
+
+class _MessageReclaimedError(Exception):
+    """The message was reclaimed by another worker (see `claim`) while being processed."""
+
+
+def _get_locked_message(message: EventOutboxMessage) -> QuerySet[EventOutboxMessage]:
+    return EventOutboxMessage.objects.filter(
+        pk=message.pk, state=EventOutboxStates.processing, locked_at=message.locked_at
+    )
+
+
+def process(message: EventOutboxMessage, max_attempts: int | None = None) -> bool:
+    max_attempts = max_attempts or settings.INVESTMENTS_EVENTS_MAX_ATTEMPTS
+    message.attempts += 1
+    try:
+        with djtransaction.atomic():
+            getattr(handlers, message.handler)(
+                pickle.loads(message.payload),  # nosec
+                DjangoUnitOfWork(asset_pk=message.asset_pk),
+            )
+            # marked as done in the same transaction as the handler, otherwise a crash in
+            # between (or a reclaim) would execute it twice, e.g. applying a read model delta
+            # twice
+            message.state = EventOutboxStates.done
+            message.processed_at = timezone.now()
+            if not _get_locked_message(message).update(
+                attempts=message.attempts, state=message.state, processed_at=message.processed_at
+            ):
+                raise _MessageReclaimedError
+    except _MessageReclaimedError:
+        logger.warning("%s was reclaimed by another worker", message)
+        return False
+    except Exception as e:
+        logger.exception("Failed to process %s", message)
+        message.last_error = repr(e)
+        if message.attempts >= max_attempts:
+            message.state = EventOutboxStates.dead
+        else:
+            message.state = EventOutboxStates.pending
+            message.available_at = timezone.now() + timedelta(seconds=2**message.attempts)
+        _get_locked_message(message).update(
+            attempts=message.attempts,
+            last_error=message.last_error,
+            state=message.state,
+            available_at=message.available_at,
+        )
+        return False
+    return True
+
+
+def _process_in_thread(message: EventOutboxMessage, max_attempts: int | None = None) -> bool:
+    try:
+        return process(message, max_attempts=max_attempts)
+    finally:
+        # Django opens one connection per thread
+        connection.close()
+
+
+def purge(retention: timedelta | None = None) -> int:
+    """Delete the messages processed longer than `retention` ago. Defaults to
+    `settings.INVESTMENTS_EVENTS_RETENTION_IN_HOURS`."""
+    if retention is None:
+        retention = timedelta(hours=settings.INVESTMENTS_EVENTS_RETENTION_IN_HOURS)
+    deleted, _ = EventOutboxMessage.objects.filter(
+        state=EventOutboxStates.done, processed_at__lt=timezone.now() - retention
+    ).delete()
+    return deleted
+
+
+def process_pending(
+    batch_size: int = 100,
+    concurrency: int = 1,
+    max_attempts: int | None = None,
+    lock_timeout: timedelta = DEFAULT_LOCK_TIMEOUT,
+) -> int:
+    """Claim and process a batch of pending `EventOutboxMessage`s.
+
+    Args:
+        batch_size (int): Max number of messages to be claimed. Defaults to 100;
+        concurrency (int): Number of threads processing the messages. As only the oldest
+            unfinished message of each asset can be claimed, the messages of a given asset are
+            never processed concurrently. Defaults to 1;
+        max_attempts (Optional[int]): Number of attempts before a message is dead lettered.
+            Defaults to `settings.INVESTMENTS_EVENTS_MAX_ATTEMPTS`;
+        lock_timeout (timedelta): Time after which a message claimed by another worker is
+            considered abandoned and can be claimed again. Defaults to 5 minutes.
+
+    Returns:
+        int: The number of processed messages.
+    """
+    messages = claim(limit=batch_size, lock_timeout=lock_timeout)
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda m: _process_in_thread(m, max_attempts), messages))
+    else:
+        for message in messages:
+            process(message, max_attempts=max_attempts)
+    # the processed messages are only kept for a while, for debugging purposes
+    purge()
+    return len(messages)
@@ -1,6 +1,6 @@
 from .asset_closed_operation import create as create_asset_closed_operation
 from .asset_metadata import maybe_create_asset_metadata
-from .cqrs import upsert_asset_read_model
+from .cqrs import bulk_upsert_assets_read_model, upsert_asset_read_model
 from .total_invested_snapshots import (
     create_total_invested_snapshot_for_all_users,
 )
@@ -1,13 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import partial
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction as djtransaction
+from django.db.models import Q
 from django.utils import timezone
 
 from ...adapters import DjangoSQLAssetMetaDataRepository
+from ...adapters.key_value_store import bump_portfolio_summary_version, get_cached_quote
 from ...domain.models import Asset as AssetDomainModel
 
+# fetches the prices of the metadata created with `ASSET_METADATA_FETCH_PRICE_IN_BACKGROUND`
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="asset-metadata")
+
 
 def maybe_create_asset_metadata(asset: AssetDomainModel, **defaults) -> None:
     _maybe_create_asset_metadata(asset=asset, **defaults)
 
 
+def _get_quote_updated_at(
+    code: str, asset_type: str, currency: str, price: Decimal
+) -> datetime | None:
+    # the fetched prices are cached, so a price isn't stamped as fresh if it's a stale quote or
+    # 0 (e.g. the API call failed)
+    cached = get_cached_quote(code=code, asset_type=asset_type, currency=currency)
+    return cached[1] if cached is not None and cached[0] == price else None
+
+
 def _maybe_create_asset_metadata(asset: AssetDomainModel, **defaults) -> None:
     from ...integrations.helpers import fetch_asset_current_price, fetch_asset_sector
 
@@ -20,16 +42,85 @@ def _maybe_create_asset_metadata(asset: AssetDomainModel, **defaults) -> None:
         currency=asset.currency,
         asset_id=asset.id if asset.is_held_in_self_custody else None,
     )
-    if not repository.exists():
-        repository.create(
-            sector=defaults.get(
-                "sector", fetch_asset_sector(code=asset.code, asset_type=asset.type)
-            ),
-            current_price=defaults.get(
-                "current_price",
-                fetch_asset_current_price(
-                    code=asset.code, asset_type=asset.type, currency=asset.currency
-                ),
-            ),
-            current_price_updated_at=defaults.get("current_price_updated_at", timezone.now()),
+    if repository.exists():
+        return
+
+    refresh_in_background = False
+    if "current_price" in defaults:
+        current_price = defaults["current_price"]
+        current_price_updated_at = timezone.now()
+    elif settings.ASSET_METADATA_FETCH_PRICE_IN_BACKGROUND:
+        # the request doesn't wait for the third party API: the metadata is created with the
+        # last known price (if any) and updated once the price is fetched
+        cached = get_cached_quote(code=asset.code, asset_type=asset.type, currency=asset.currency)
+        current_price, current_price_updated_at = (
+            cached if cached is not None else (Decimal(), None)
         )
+        refresh_in_background = cached is None or cached[1] <= timezone.now() - timedelta(
+            seconds=settings.ASSET_QUOTES_MAX_AGE_IN_SECONDS
+        )
+    else:
+        current_price = fetch_asset_current_price(
+            code=asset.code, asset_type=asset.type, currency=asset.currency
+        )
+        current_price_updated_at = _get_quote_updated_at(
+            code=asset.code, asset_type=asset.type, currency=asset.currency, price=current_price
+        )
+    if asset.is_held_in_self_custody:
+        # not a quote, the price of the assets held in self custody is kept by their users
+        current_price_updated_at = timezone.now()
+
+    metadata = repository.create(
+        sector=(
+            defaults["sector"]
+            if "sector" in defaults
+            else fetch_asset_sector(code=asset.code, asset_type=asset.type)
+        ),
+        current_price=current_price,
+        current_price_updated_at=defaults.get("current_price_updated_at", current_price_updated_at),
+    )
+    if refresh_in_background and not asset.is_held_in_self_custody:
+        djtransaction.on_commit(
+            partial(
+                _executor.submit,
+                _refresh_asset_metadata_current_price_in_thread,
+                metadata_pk=metadata.pk,
+                code=asset.code,
+                asset_type=asset.type,
+                currency=asset.currency,
+            )
+        )
+
+
+def refresh_asset_metadata_current_price(
+    metadata_pk: int, code: str, asset_type: str, currency: str
+) -> None:
+    from ...integrations.helpers import fetch_asset_current_price
+    from ...models import AssetMetaData, AssetReadModel
+
+    current_price = fetch_asset_current_price(code=code, asset_type=asset_type, currency=currency)
+    current_price_updated_at = _get_quote_updated_at(
+        code=code, asset_type=asset_type, currency=currency, price=current_price
+    )
+    if not current_price or current_price_updated_at is None:
+        return
+
+    # a newer price may have been stored in the meantime (e.g. by a B3 import)
+    if (
+        AssetMetaData.objects.filter(pk=metadata_pk)
+        .filter(
+            Q(current_price_updated_at__isnull=True)
+            | Q(current_price_updated_at__lt=current_price_updated_at)
+        )
+        .update(current_price=current_price, current_price_updated_at=current_price_updated_at)
+    ):
+        AssetReadModel.objects.filter(metadata_id=metadata_pk).update_current_totals()
+        bump_portfolio_summary_version()
+
+
+def _refresh_asset_metadata_current_price_in_thread(**kwargs) -> None:
+    try:
+        refresh_asset_metadata_current_price(**kwargs)
+    finally:
+        # Django opens one connection per thread
+        connection.close()
@@ -1,9 +1,85 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
 from ...adapters import DjangoSQLAssetMetaDataRepository
-from ...models import Asset, AssetReadModel
+from ...adapters.key_value_store import bump_portfolio_summary_version
+from ...models import Asset, AssetMetaData, AssetReadModel
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from ...domain.models import AssetReadModelDelta
+
+
+_READ_MODEL_AGGREGATED_FIELDS_MAP = {
+    "quantity_balance": "quantity_balance",
+    "quantity_bought": "current_quantity_bought",
+    "total_bought": "current_total_bought",
+    "avg_price": "avg_price",
+    "normalized_avg_price": "normalized_avg_price",
+    "normalized_total_bought": "normalized_total_bought",
+    "normalized_total_sold": "normalized_total_sold",
+    "normalized_closed_roi": "normalized_closed_roi",
+    "credited_incomes": "credited_incomes",
+    "normalized_credited_incomes": "normalized_credited_incomes",
+}
+_READ_MODEL_WRITE_FIELDS = (
+    "user_id",
+    "code",
+    "description",
+    "type",
+    "objective",
+    "currency",
+    "liquidity_type",
+    "maturity_date",
+)
+
+
+def _apply_asset_read_model_delta(asset_id: int, delta: AssetReadModelDelta) -> bool:
+    # All the `SET` expressions are evaluated against the row values prior to the `UPDATE`
+    # so the averages can be derived from the updated totals in the same statement
+    quantity_bought = Greatest(
+        F("quantity_bought") + Value(delta.quantity_bought), Value(Decimal("1.0"))
+    )
+    return bool(
+        AssetReadModel.objects.filter(write_model_pk=asset_id).update(
+            quantity_balance=F("quantity_balance") + Value(delta.quantity_balance),
+            quantity_bought=F("quantity_bought") + Value(delta.quantity_bought),
+            total_bought=F("total_bought") + Value(delta.total_bought),
+            normalized_total_bought=(
+                F("normalized_total_bought") + Value(delta.normalized_total_bought)
+            ),
+            normalized_total_sold=F("normalized_total_sold") + Value(delta.normalized_total_sold),
+            credited_incomes=F("credited_incomes") + Value(delta.credited_incomes),
+            normalized_credited_incomes=(
+                F("normalized_credited_incomes") + Value(delta.normalized_credited_incomes)
+            ),
+            avg_price=(
+                (F("total_bought") + Value(delta.total_bought))
+                * Value(Decimal("1.0"))
+                / quantity_bought
+            ),
+            normalized_avg_price=(
+                (F("normalized_total_bought") + Value(delta.normalized_total_bought))
+                * Value(Decimal("1.0"))
+                / quantity_bought
+            ),
+            updated_at=timezone.now(),
+        )
+    )
 
 
 def upsert_asset_read_model(
-    asset_id: int, is_aggregate_upsert: bool | None = None, is_held_in_self_custody: bool = False
+    asset_id: int,
+    is_aggregate_upsert: bool | None = None,
+    is_held_in_self_custody: bool = False,
+    delta: AssetReadModelDelta | None = None,
 ) -> None:
     """Upsert the respective `AssetReadModel` of a given `Asset` (write model).
 
@@ -19,7 +95,24 @@ def upsert_asset_read_model(
             Defaults to `None`.
         is_held_in_self_custody (bool): é um ativo custodiado pelo banco emissor?
             (ou seja, aplica-se apenas para renda fixa e  nao pode ser sincronizado pela b3)
+        delta (Optional[AssetReadModelDelta]): The change caused by the write operation on the
+            aggregated fields. Only considered if `is_aggregate_upsert=True`. If given, the
+            `AssetReadModel` is incrementally updated in a single statement instead of
+            re-aggregating the whole history of the asset. The full re-aggregation is still
+            used if the read model doesn't exist yet and by the `sync_assets_cqrs` command
+            (which should be used to reconcile both models from time to time).
     """
+    if (
+        is_aggregate_upsert is True
+        and delta is not None
+        and _apply_asset_read_model_delta(asset_id=asset_id, delta=delta)
+    ):
+        AssetReadModel.objects.filter(write_model_pk=asset_id).update_current_totals()
+        bump_portfolio_summary_version(
+            user_id=Asset.objects.values_list("user_id", flat=True).get(pk=asset_id)
+        )
+        return
+
     if is_aggregate_upsert is True:
         asset = Asset.objects.annotate_read_fields(is_held_in_self_custody).get(pk=asset_id)
 
@@ -28,6 +121,8 @@ def upsert_asset_read_model(
             defaults={
                 "currency": asset.currency,
                 "quantity_balance": asset.quantity_balance,
+                "quantity_bought": asset.current_quantity_bought,
+                "total_bought": asset.current_total_bought,
                 "avg_price": asset.avg_price,
                 "normalized_avg_price": asset.normalized_avg_price,
                 "normalized_total_bought": asset.normalized_total_bought,
@@ -37,6 +132,8 @@ def upsert_asset_read_model(
                 "normalized_credited_incomes": asset.normalized_credited_incomes,
             },
         )
+        AssetReadModel.objects.filter(write_model_pk=asset.pk).update_current_totals()
+        bump_portfolio_summary_version(user_id=asset.user_id)
     elif is_aggregate_upsert is False:
         asset = Asset.objects.only(
             "pk", "user_id", "code", "type", "objective", "liquidity_type", "maturity_date"
@@ -58,6 +155,8 @@ def upsert_asset_read_model(
                 "metadata_id": metadata.pk,
             },
         )
+        AssetReadModel.objects.filter(write_model_pk=asset.pk).update_current_totals()
+        bump_portfolio_summary_version(user_id=asset.user_id)
     elif is_aggregate_upsert is None:
         asset: Asset = Asset.objects.annotate_read_fields(is_held_in_self_custody).get(pk=asset_id)
         metadata = DjangoSQLAssetMetaDataRepository(
@@ -80,6 +179,8 @@ def upsert_asset_read_model(
                 "liquidity_type": asset.liquidity_type,
                 "maturity_date": asset.maturity_date,
                 "quantity_balance": asset.quantity_balance,
+                "quantity_bought": asset.current_quantity_bought,
+                "total_bought": asset.current_total_bought,
                 "avg_price": asset.avg_price,
                 "normalized_avg_price": asset.normalized_avg_price,
                 "normalized_total_bought": asset.normalized_total_bought,
@@ -89,3 +190,72 @@ def upsert_asset_read_model(
                 "normalized_credited_incomes": asset.normalized_credited_incomes,
             },
         )
+        AssetReadModel.objects.filter(write_model_pk=asset.pk).update_current_totals()
+        bump_portfolio_summary_version(user_id=asset.user_id)
+
+
+def _build_asset_read_models(
+    user_ids: Iterable[int], is_held_in_self_custody: bool
+) -> list[AssetReadModel]:
+    if is_held_in_self_custody:
+        metadata_subquery = AssetMetaData.objects.filter(asset_id=OuterRef("pk"))
+    else:
+        metadata_subquery = AssetMetaData.objects.filter(
+            code=OuterRef("code"), type=OuterRef("type"), currency=OuterRef("currency")
+        )
+    qs = (
+        Asset.objects.filter(user_id__in=user_ids, metadata__isnull=not is_held_in_self_custody)
+        .annotate_read_fields(is_held_in_self_custody)
+        .annotate(metadata_pk=Subquery(metadata_subquery.values("pk")[:1]))
+        .values(
+            "pk",
+            "metadata_pk",
+            *_READ_MODEL_WRITE_FIELDS,
+            *_READ_MODEL_AGGREGATED_FIELDS_MAP.values(),
+        )
+    )
+    return [
+        AssetReadModel(
+            write_model_pk=asset["pk"],
+            metadata_id=asset["metadata_pk"],
+            **{f: asset[f] for f in _READ_MODEL_WRITE_FIELDS},
+            **{f: asset[a] for f, a in _READ_MODEL_AGGREGATED_FIELDS_MAP.items()},
+        )
+        for asset in qs
+    ]
+
+
+def bulk_upsert_assets_read_model(user_ids: Iterable[int], batch_size: int = 500) -> int:
+    """Upsert every `AssetReadModel` of the given users.
+
+    Set-based version of `upsert_asset_read_model` (with `is_aggregate_upsert=None`): the read
+    fields of all the assets are computed with one query per custody type and persisted
+    with `INSERT ... ON CONFLICT (write_model_pk) DO UPDATE` statements.
+
+    Args:
+        user_ids (Iterable[int]): The users whose assets will be upserted;
+        batch_size (int): Max number of rows per `INSERT` statement. Defaults to 500.
+
+    Returns:
+        int: The number of upserted read models.
+    """
+    user_ids = list(user_ids)
+    read_models = _build_asset_read_models(
+        user_ids, is_held_in_self_custody=False
+    ) + _build_asset_read_models(user_ids, is_held_in_self_custody=True)
+    AssetReadModel.objects.bulk_create(
+        read_models,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=("write_model_pk",),
+        update_fields=(
+            "metadata_id",
+            "updated_at",
+            *_READ_MODEL_WRITE_FIELDS,
+            *_READ_MODEL_AGGREGATED_FIELDS_MAP,
+        ),
+    )
+    AssetReadModel.objects.filter(user_id__in=user_ids).update_current_totals()
+    for user_id in user_ids:
+        bump_portfolio_summary_version(user_id=user_id)
+    return len(read_models)
@@ -10,6 +10,7 @@ from dateutil import relativedelta
 from shared.exceptions import NotFirstDayOfMonthException
 
 from ...adapters import DjangoSQLAssetTotalInvestedSnapshotRepository
+from ...adapters.key_value_store import dollar_conversion_rate_scope
 from ...models import Asset, AssetReadModel, AssetsTotalInvestedSnapshot
 
 if TYPE_CHECKING:
@@ -24,10 +25,12 @@ def create_total_invested_snapshot_for_all_users():
     if operation_date.day != 1:
         raise NotFirstDayOfMonthException
 
-    for user_id in UserModel.objects.filter_investments_module_active().values_list(
-        "pk", flat=True
-    ):
-        _create_assets_total_invested_snapshot(user_id=user_id, operation_date=operation_date)
+    # every snapshot of the month is computed with the same rate
+    with dollar_conversion_rate_scope():
+        for user_id in UserModel.objects.filter_investments_module_active().values_list(
+            "pk", flat=True
+        ):
+            _create_assets_total_invested_snapshot(user_id=user_id, operation_date=operation_date)
 
 
 def _create_assets_total_invested_snapshot(user_id: int, operation_date: date):
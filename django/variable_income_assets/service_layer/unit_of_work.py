@@ -51,25 +51,30 @@ class DjangoUnitOfWork(AbstractUnitOfWork):
         # because that would break atomicity.
         self._inside_atomic_block = djtransaction.get_autocommit() is False
 
+    def _manages_transaction(self) -> bool:
+        # the instance may also be used inside an `atomic()` block opened after its creation
+        # (e.g. by `messagebus.handle` when the events are persisted in the outbox)
+        return not self._inside_atomic_block and not djtransaction.get_connection().in_atomic_block
+
     def __enter__(self) -> Self:
         self.assets = AssetRepository(
             transactions_repository=TransactionRepository(asset_pk=self.asset_pk),
             incomes_repository=PassiveIncomeRepository(asset_pk=self.asset_pk),
             user_id=self.user_id,
         )
-        if not self._inside_atomic_block:
+        if self._manages_transaction():
             djtransaction.set_autocommit(False)
         return super().__enter__()
 
     def __exit__(self, *args):
         super().__exit__(*args)
-        if not self._inside_atomic_block:
+        if self._manages_transaction():
             djtransaction.set_autocommit(True)
 
     def commit(self) -> None:
-        if not self._inside_atomic_block:
+        if self._manages_transaction():
             djtransaction.commit()
 
     def rollback(self) -> None:
-        if not self._inside_atomic_block:
+        if self._manages_transaction():
             djtransaction.rollback()
@@ -5,11 +5,14 @@ import pytest
 
 from config.key_value_store import MemoryBackend
 from variable_income_assets.adapters.key_value_store import (
+    dollar_conversion_rate_scope,
     get_dollar_conversion_rate,
     update_dollar_conversion_rate,
 )
 from variable_income_assets.choices import Currencies
+from variable_income_assets.models import AssetReadModel
 from variable_income_assets.models.write import ConversionRate
+from variable_income_assets.service_layer.tasks import upsert_asset_read_model
 
 pytestmark = pytest.mark.django_db
 
@@ -126,3 +129,85 @@ class TestUpdateDollarConversionRate:
             from_currency=Currencies.dollar, to_currency=Currencies.real
         )
         assert rate.value == api_value
+
+
+class TestDollarConversionRateScope:
+    def test__looks_up_the_rate_once(self):
+        # GIVEN
+        with patch(
+            "variable_income_assets.adapters.key_value_store.key_value_backend"
+        ) as mock_backend:
+            mock_backend.get.return_value = Decimal("5.50")
+
+            # WHEN
+            with dollar_conversion_rate_scope():
+                results = [get_dollar_conversion_rate() for _ in range(3)]
+                with dollar_conversion_rate_scope():
+                    results.append(get_dollar_conversion_rate())
+
+            # THEN
+            assert results == [Decimal("5.50")] * 4
+            assert mock_backend.get.call_count == 1
+
+            # WHEN
+            get_dollar_conversion_rate()
+
+            # THEN
+            assert mock_backend.get.call_count == 2
+
+    def test__update_replaces_the_snapshot(self):
+        # GIVEN
+        ConversionRate.objects.create(
+            from_currency=Currencies.dollar, to_currency=Currencies.real, value=Decimal("5.00")
+        )
+
+        # WHEN
+        with dollar_conversion_rate_scope():
+            before = get_dollar_conversion_rate()
+            update_dollar_conversion_rate(value=Decimal("6.00"))
+            after = get_dollar_conversion_rate()
+
+        # THEN
+        assert before == Decimal("5.00")
+        assert after == Decimal("6.00")
+
+    def test__querysets_share_the_snapshot(self):
+        # GIVEN
+        with patch(
+            "variable_income_assets.adapters.key_value_store.key_value_backend"
+        ) as mock_backend:
+            mock_backend.get.return_value = Decimal("5.50")
+
+            # WHEN
+            with dollar_conversion_rate_scope():
+                for _ in range(5):
+                    AssetReadModel.objects.all().update_current_totals()
+
+            # THEN
+            assert mock_backend.get.call_count == 1
+
+    def test__queryset_clones_do_not_look_up_the_rate(self):
+        # GIVEN
+        with patch(
+            "variable_income_assets.adapters.key_value_store.key_value_backend"
+        ) as mock_backend:
+            # WHEN
+            list(AssetReadModel.objects.filter(user_id=1).opened().order_by("pk"))
+
+            # THEN
+            assert mock_backend.get.call_count == 0
+
+
+@pytest.mark.usefixtures("stock_usa_transaction", "stock_usa_asset_metadata")
+def test__update_dollar_conversion_rate__update_read_models_current_totals(stock_usa_asset):
+    # GIVEN
+    update_dollar_conversion_rate(value=Decimal("5"))
+    upsert_asset_read_model(asset_id=stock_usa_asset.pk)
+
+    # WHEN
+    update_dollar_conversion_rate(value=Decimal("6"))
+
+    # THEN
+    read_model = AssetReadModel.objects.get(write_model_pk=stock_usa_asset.pk)
+    assert read_model.normalized_current_total == 21 * 50 * Decimal("6")
+    assert read_model.normalized_roi == 21 * 50 * Decimal("6") - 10 * 50 * 5
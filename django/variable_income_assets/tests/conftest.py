@@ -8,6 +8,7 @@ from django.template.defaultfilters import slugify
 from django.utils import timezone
 
 import factory
+import freezegun
 import pytest
 from dateutil.relativedelta import relativedelta
 from factory.django import DjangoModelFactory
@@ -53,6 +54,9 @@ from ..models import (
 )
 from ..service_layer.tasks import create_asset_closed_operation, upsert_asset_read_model
 
+# `freeze_time` mustn't freeze the clock of the event loop of `http_pool`
+freezegun.configure(extend_ignore_list=["variable_income_assets.integrations.clients.pool"])
+
 
 class AssetFactory(DjangoModelFactory):
     class Meta:
@@ -73,6 +77,12 @@ class AssetReadModelFactory(DjangoModelFactory):
     class Meta:
         model = AssetReadModel
 
+    @factory.post_generation
+    def current_totals(obj: AssetReadModel, create: bool, *_, **__):
+        if create:
+            AssetReadModel.objects.filter(pk=obj.pk).update_current_totals()
+            obj.refresh_from_db(fields=("normalized_current_total", "normalized_roi"))
+
 
 class TransactionFactory(DjangoModelFactory):
     operation_date = timezone.localdate() - timedelta(days=2)
@@ -106,6 +116,14 @@ def _update_dollar_conversion_rate(db):
     update_dollar_conversion_rate(Decimal("5.0"))
 
 
+@pytest.fixture(autouse=True)
+def _isolate_key_value_store(settings, request):
+    # the key value store outlives the tests so a price cached by one of them mustn't be
+    # used by the others
+    settings.ASSET_QUOTES_KEY_PREFIX = f"ASSET_QUOTE:{request.node.nodeid}"
+    settings.PORTFOLIO_SUMMARY_KEY_PREFIX = f"PORTFOLIO_SUMMARY:{request.node.nodeid}"
+
+
 @pytest.fixture
 def sync_assets_read_model():
     # TODO: evaluate
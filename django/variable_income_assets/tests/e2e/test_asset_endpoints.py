@@ -18,11 +18,21 @@ from rest_framework.status import (
     HTTP_404_NOT_FOUND,
 )
 
+from config.key_value_store import key_value_backend
 from config.settings.base import BASE_API_URL
 from shared.tests import convert_and_quantitize, skip_if_sqlite
 
-from ...choices import AssetObjectives, AssetSectors, AssetTypes, Currencies, LiquidityTypes
+from ...adapters.key_value_store import bump_portfolio_summary_version
+from ...choices import (
+    AssetObjectives,
+    AssetSectors,
+    AssetTypes,
+    Currencies,
+    LiquidityTypes,
+    TransactionActions,
+)
 from ...models import Asset, AssetMetaData, AssetReadModel, PassiveIncome, Transaction
+from ...service_layer.tasks import upsert_asset_read_model
 from ..shared import (
     get_avg_price_bute_force,
     get_closed_operations_totals,
@@ -689,6 +699,65 @@ def test__indicators__include_yield(client):
     assert response.json()["total_diff_percentage"] > 0
 
 
+@pytest.mark.usefixtures("indicators_data", "sync_assets_read_model")
+def test__indicators__cached_until_the_version_is_bumped(client, user, mocker):
+    # GIVEN
+    mocker.patch.object(key_value_backend, "is_shared", True)
+    total = client.get(f"{URL}/indicators").json()["total"]
+    AssetMetaData.objects.update(current_price=F("current_price") * 2)
+    AssetReadModel.objects.update_current_totals()
+
+    # WHEN
+    cached_total = client.get(f"{URL}/indicators").json()["total"]
+    bump_portfolio_summary_version()
+    updated_total = client.get(f"{URL}/indicators").json()["total"]
+
+    # THEN
+    assert cached_total == total
+    assert updated_total == convert_and_quantitize(
+        sum(get_current_total_invested_brute_force(asset) for asset in Asset.objects.opened())
+    )
+    assert updated_total != total
+
+
+@pytest.mark.usefixtures("indicators_data", "sync_assets_read_model")
+def test__indicators__not_cached_if_the_key_value_store_is_not_shared(client, user):
+    # GIVEN
+    total = client.get(f"{URL}/indicators").json()["total"]
+    AssetMetaData.objects.update(current_price=F("current_price") * 2)
+    AssetReadModel.objects.update_current_totals()
+
+    # WHEN
+    response = client.get(f"{URL}/indicators")
+
+    # THEN
+    assert response.json()["total"] != total
+
+
+@pytest.mark.usefixtures("indicators_data", "sync_assets_read_model")
+def test__indicators__read_model_upsert_invalidates_cache(client, user, mocker):
+    # GIVEN
+    mocker.patch.object(key_value_backend, "is_shared", True)
+    client.get(f"{URL}/indicators")
+    asset = Asset.objects.opened().filter(user=user).first()
+    Transaction.objects.create(
+        asset=asset,
+        action=TransactionActions.buy,
+        price=10,
+        quantity=10,
+        operation_date=timezone.localdate(),
+    )
+
+    # WHEN
+    upsert_asset_read_model(asset_id=asset.pk, is_aggregate_upsert=True)
+    response = client.get(f"{URL}/indicators")
+
+    # THEN
+    assert response.json()["total"] == convert_and_quantitize(
+        sum(get_current_total_invested_brute_force(asset) for asset in Asset.objects.opened())
+    )
+
+
 @pytest.mark.usefixtures("indicators_data", "sync_assets_read_model")
 def test__growth__with_months(client, assets_total_invested_snapshot_factory):
     # GIVEN
@@ -1,4 +1,5 @@
 from datetime import datetime
+from decimal import Decimal
 from statistics import fmean
 
 from django.conf import settings
@@ -21,6 +22,7 @@ from config.settings.base import BASE_API_URL
 from shared.tests import convert_and_quantitize, skip_if_sqlite
 
 from ...choices import AssetTypes, Currencies, PassiveIncomeEventTypes, PassiveIncomeTypes
+from ...domain.models import AssetReadModelDelta
 from ...models import Asset, PassiveIncome
 from ...models.managers import PassiveIncomeQuerySet
 from ..conftest import PassiveIncomeFactory
@@ -64,6 +66,9 @@ def test__create__stock(client, data, stock_asset, mocker):
         "asset_id": stock_asset.pk,
         "is_aggregate_upsert": True,
         "is_held_in_self_custody": False,
+        "delta": AssetReadModelDelta(
+            credited_incomes=Decimal("100"), normalized_credited_incomes=Decimal("100")
+        ),
     }
 
     assert response.status_code == HTTP_201_CREATED
@@ -94,6 +99,9 @@ def test__create__stock_usa(client, stock_usa_asset, mocker):
         "asset_id": stock_usa_asset.pk,
         "is_aggregate_upsert": True,
         "is_held_in_self_custody": False,
+        "delta": AssetReadModelDelta(
+            credited_incomes=Decimal("100"), normalized_credited_incomes=Decimal("500")
+        ),
     }
 
     assert response.status_code == HTTP_201_CREATED
@@ -247,6 +255,9 @@ def test__update(client, simple_income, mocker):
         "asset_id": simple_income.asset_id,
         "is_aggregate_upsert": True,
         "is_held_in_self_custody": False,
+        "delta": AssetReadModelDelta(
+            credited_incomes=Decimal("1"), normalized_credited_incomes=Decimal("1")
+        ),
     }
 
     assert response.status_code == HTTP_200_OK
@@ -274,6 +285,9 @@ def test__update__w_asset_pk(client, simple_income, mocker):
         "asset_id": simple_income.asset_id,
         "is_aggregate_upsert": True,
         "is_held_in_self_custody": False,
+        "delta": AssetReadModelDelta(
+            credited_incomes=Decimal("1"), normalized_credited_incomes=Decimal("1")
+        ),
     }
 
     assert response.status_code == HTTP_200_OK
@@ -480,6 +494,9 @@ def test__delete(client, simple_income, mocker):
         "asset_id": simple_income.asset_id,
         "is_aggregate_upsert": True,
         "is_held_in_self_custody": False,
+        "delta": AssetReadModelDelta(
+            credited_incomes=Decimal("-200"), normalized_credited_incomes=Decimal("-200")
+        ),
     }
 
     assert response.status_code == HTTP_204_NO_CONTENT
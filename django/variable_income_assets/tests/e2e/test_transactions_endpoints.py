@@ -21,6 +21,7 @@ from shared.tests import convert_and_quantitize, skip_if_sqlite
 from tasks.models import TaskHistory
 
 from ...choices import AssetTypes, Currencies, TransactionActions
+from ...domain.models import AssetReadModelDelta
 from ...models import Asset, AssetClosedOperation, AssetReadModel, Transaction
 from ..conftest import TransactionFactory
 
@@ -50,6 +51,12 @@ def test__create__buy(client, stock_asset, mocker):
         "asset_id": stock_asset.pk,
         "is_aggregate_upsert": True,
         "is_held_in_self_custody": False,
+        "delta": AssetReadModelDelta(
+            quantity_balance=Decimal("100"),
+            quantity_bought=Decimal("100"),
+            total_bought=Decimal("1000"),
+            normalized_total_bought=Decimal("1000"),
+        ),
     }
 
     assert response.status_code == HTTP_201_CREATED
@@ -77,6 +84,7 @@ def test__create__buy__asset_held_in_self_custody(client, fixed_asset_held_in_se
         "asset_id": fixed_asset_held_in_self_custody.pk,
         "is_aggregate_upsert": True,
         "is_held_in_self_custody": True,
+        "delta": None,
     }
 
     assert response.status_code == HTTP_201_CREATED
@@ -409,6 +417,9 @@ def test__update(client, buy_transaction, mocker):
         "asset_id": buy_transaction.asset_id,
         "is_aggregate_upsert": True,
         "is_held_in_self_custody": False,
+        "delta": AssetReadModelDelta(
+            total_bought=Decimal("50"), normalized_total_bought=Decimal("50")
+        ),
     }
 
     assert response.status_code == HTTP_200_OK
@@ -952,6 +963,12 @@ def test__delete(client, buy_transaction, mocker):
         "asset_id": buy_transaction.asset_id,
         "is_aggregate_upsert": True,
         "is_held_in_self_custody": False,
+        "delta": AssetReadModelDelta(
+            quantity_balance=Decimal("-50"),
+            quantity_bought=Decimal("-50"),
+            total_bought=Decimal("-500"),
+            normalized_total_bought=Decimal("-500"),
+        ),
     }
 
     assert response.status_code == HTTP_204_NO_CONTENT
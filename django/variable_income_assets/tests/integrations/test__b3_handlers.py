@@ -14,6 +14,7 @@ from ...choices import (
     LiquidityTypes,
     PassiveIncomeEventTypes,
     PassiveIncomeTypes,
+    TransactionActions,
 )
 from ...integrations.b3.handlers import (
     B3ImportError,
@@ -22,7 +23,14 @@ from ...integrations.b3.handlers import (
     import_b3_proventos,
     import_b3_renda_fixa_positions,
 )
-from ...models import Asset, AssetMetaData, AssetReadModel, PassiveIncome, Transaction
+from ...models import (
+    Asset,
+    AssetClosedOperation,
+    AssetMetaData,
+    AssetReadModel,
+    PassiveIncome,
+    Transaction,
+)
 from ..conftest import AssetFactory, AssetMetaDataFactory
 
 pytestmark = pytest.mark.django_db
@@ -177,6 +185,33 @@ def test_existing_asset_stale_price_is_updated(tmp_path, user, fixed_br_asset):
     assert metadata.current_price == Decimal("1100")
 
 
+def test_existing_asset_stale_price_updates_the_read_model_totals(
+    tmp_path, user, fixed_br_asset
+):
+    Transaction.objects.create(
+        asset=fixed_br_asset,
+        action=TransactionActions.buy,
+        price=Decimal("1000"),
+        quantity=Decimal("2"),
+        operation_date=WORKBOOK_DT.date() - timedelta(days=30),
+    )
+    from ...management.commands.sync_assets_cqrs import Command as Sync
+
+    Sync().handle(user_ids=[user.id])
+    posicao_path = _build_posicao(tmp_path, [_cdb_position_row()])
+    movimentacao_path = _build_movimentacao(tmp_path, [])
+
+    import_b3_fixed_income_positions(
+        user_id=user.id,
+        dry_run=False,
+        posicao_path=posicao_path,
+        movimentacao_path=movimentacao_path,
+    )
+
+    read_model = AssetReadModel.objects.get(write_model_pk=fixed_br_asset.pk)
+    assert read_model.normalized_current_total == Decimal("2200")
+
+
 def test_existing_asset_fresh_price_is_skipped(tmp_path, user, fixed_br_asset):
     metadata = AssetMetaData.objects.get(code="CDB426DGCVL")
     metadata.current_price_updated_at = timezone.make_aware(WORKBOOK_DT + timedelta(hours=1))
@@ -695,6 +730,74 @@ def test_negociacoes_oversell_is_reported_not_aborted(tmp_path, user):
     ).exists()
 
 
+
+def test_negociacoes_self_custody_asset_is_reported_not_aborted(
+    tmp_path, user, fixed_asset_held_in_self_custody
+):
+    # The running balance of the self custody assets isn't based on the quantities so
+    # their transactions can't be bulk-imported
+    code = fixed_asset_held_in_self_custody.code
+    negociacao_path = _build_negociacao(
+        tmp_path,
+        [_neg_row(date="01/04/2026", action="Compra", code=code, qty=10, price=20)],
+    )
+
+    report = import_b3_negociacoes(
+        user_id=user.id, dry_run=False, negociacao_path=negociacao_path
+    )
+
+    errors = [a for a in report["actions"] if a["action"] == "error"]
+    assert len(errors) == 1
+    assert "importadas em lote" in errors[0]["reason"]
+    assert not Transaction.objects.filter(asset=fixed_asset_held_in_self_custody).exists()
+
+
+def test_negociacoes_bulk_import_closes_and_reopens_operations(
+    tmp_path, user, django_assert_max_num_queries
+):
+    # The whole history of an asset is validated against its running balance and
+    # inserted in bulk: the closed operation must be created between the closing
+    # sell and the next buy, and the read model refreshed once with the final state.
+    asset = AssetFactory(
+        code="BBAS3", type=AssetTypes.stock, currency=Currencies.real,
+        objective=AssetObjectives.growth, user=user,
+    )
+    AssetMetaDataFactory(
+        code="BBAS3", type=AssetTypes.stock, currency=Currencies.real,
+        current_price=Decimal("21.71"), current_price_updated_at=timezone.now(),
+    )
+    from ...management.commands.sync_assets_cqrs import Command as Sync
+
+    Sync().handle(user_ids=[user.id])
+
+    rows = [
+        _neg_row(date="12/03/2026", action="Venda", code="BBAS3", qty=50, price=30),
+        _neg_row(date="10/03/2026", action="Compra", code="BBAS3", qty=10, price=30),
+        _neg_row(date="05/03/2026", action="Venda", code="BBAS3", qty=100, price=25),
+    ] + [
+        _neg_row(date="01/03/2026", action="Compra", code="BBAS3", qty=1, price=20 + i)
+        for i in range(100)
+    ]
+    negociacao_path = _build_negociacao(tmp_path, rows)
+
+    with django_assert_max_num_queries(30):
+        report = import_b3_negociacoes(
+            user_id=user.id, dry_run=False, negociacao_path=negociacao_path
+        )
+
+    created = [a for a in report["actions"] if a["action"] == "transaction_created"]
+    errors = [a for a in report["actions"] if a["action"] == "error"]
+    assert len(created) == 102
+    assert len(errors) == 1
+    assert errors[0]["transaction"]["operation_date"] == "2026-03-12"
+    assert Transaction.objects.filter(asset=asset).count() == 102
+    assert AssetClosedOperation.objects.filter(
+        asset=asset, quantity_bought=100, total_bought=sum(20 + i for i in range(100))
+    ).exists()
+    read_model = AssetReadModel.objects.get(write_model_pk=asset.pk)
+    assert read_model.quantity_balance == 10
+    assert read_model.avg_price == 30
+
 PROVENTOS_HEADER = [
     "Produto",
     "Pagamento",
@@ -130,6 +130,22 @@ def test_serializer_rejects_non_xlsx_extension():
     assert "negociacao" in serializer.errors
 
 
+
+def test_serializer_rejects_upload_above_size_ceiling(settings):
+    from variable_income_assets.serializers import B3ImportSerializer
+
+    settings.B3_IMPORT_MAX_UPLOAD_SIZE_IN_BYTES = 10
+
+    serializer = B3ImportSerializer(
+        data={
+            "operations": ["negociacoes"],
+            "dry_run": True,
+            "negociacao": _xlsx_upload("negociacao.xlsx"),
+        }
+    )
+    assert not serializer.is_valid()
+    assert "muito grande" in str(serializer.errors["negociacao"])
+
 def test_serializer_valid_negociacoes():
     from variable_income_assets.serializers import B3ImportSerializer
 
@@ -251,6 +267,38 @@ def test_service_bad_file_raises_operation_error(tmp_path, user):
     assert exc.value.operation == "tesouro"
 
 
+
+def test_service_opens_each_workbook_once(tmp_path, user, sync_assets_read_model, mocker):
+    from variable_income_assets.integrations.b3 import _workbook
+    from variable_income_assets.integrations.b3.import_service import run_b3_import
+
+    # GIVEN
+    open_workbook_spy = mocker.spy(_workbook, "open_workbook")
+    posicao = _upload_from_path(
+        _build_posicao(tmp_path, [_cdb_position_row()]), "posicao-2026-04-29-12-00-00.xlsx"
+    )
+    movimentacao = _upload_from_path(
+        _build_movimentacao(tmp_path, [_cdb_movimentacao_row()]), "movimentacao.xlsx"
+    )
+    kwargs = {
+        "user_id": user.id,
+        "operations": ["renda_fixa", "tesouro"],
+        "workbook_dt": timezone.make_aware(WORKBOOK_DT),
+        "negociacao_file": None,
+        "posicao_file": posicao,
+        "movimentacao_file": movimentacao,
+    }
+
+    # WHEN
+    with _workbook.WorkbookCache() as cache:
+        run_b3_import(dry_run=True, workbook_cache=cache, **kwargs)
+        result = run_b3_import(dry_run=False, workbook_cache=cache, **kwargs)
+
+    # THEN
+    assert open_workbook_spy.call_count == 2  # posicao + movimentacao
+    assert result["reports"]["renda_fixa"]["actions"][0]["action"] == "created"
+    assert Asset.objects.filter(user=user, code="CDB426DGCVL").exists()
+
 # --- Task 6: POST /assets/b3_import endpoint -----------------------------------
 
 
@@ -0,0 +1,127 @@
+import re
+import time
+from urllib.parse import unquote
+
+import pytest
+from aioresponses import CallbackResult, aioresponses
+from asgiref.sync import async_to_sync
+
+from ...integrations.clients import BrApiClient, RateLimits, TwelveDataClient, http_pool
+from ...integrations.clients.pool import TokenBucket
+
+
+def test__twelve_data__get_prices__chunks_symbols(settings):
+    # GIVEN
+    settings.TWELVE_DATA_CREDITS_PER_MINUTE = 100
+    codes = [f"STOCK{i}" for i in range(10)]
+
+    def callback(url, **_):
+        symbols = unquote(url.query["symbol"]).split(",")
+        return CallbackResult(payload={s: {"price": str(i)} for i, s in enumerate(symbols)})
+
+    async def get_prices():
+        async with TwelveDataClient() as c:
+            return await c.get_prices(codes=codes)
+
+    # WHEN
+    with aioresponses() as aiohttp_mock:
+        aiohttp_mock.get(
+            re.compile(r"^https://api\.twelvedata\.com/price.*"), callback=callback, repeat=True
+        )
+        result = async_to_sync(get_prices)()
+
+    # THEN
+    assert sorted(result) == sorted(codes)
+    assert len([c for c in aiohttp_mock.requests.values() for _ in c]) == 2
+
+
+def test__brapi__get_b3_prices__batches_quotes_and_caches_valid_codes(settings):
+    # GIVEN
+    settings.BRAPI_QUOTE_BATCH_SIZE = 2
+    settings.BRAPI_VALID_CODES_KEY = "test__brapi__get_b3_prices"
+    available = {"PETR4": ["PETR4"], "VALE3": ["VALE3"], "VVAR3": ["VIIA3"], "XPTO3": []}
+
+    def available_callback(url, **_):
+        return CallbackResult(payload={"stocks": available[url.query["search"]]})
+
+    def quote_callback(url, **_):
+        symbols = unquote(url.path.split("/")[-1]).split(",")
+        return CallbackResult(
+            payload={"results": [{"symbol": s, "regularMarketPrice": 10} for s in symbols]}
+        )
+
+    async def get_prices():
+        async with BrApiClient() as c:
+            return await c.get_b3_prices(codes=list(available))
+
+    # WHEN
+    with aioresponses() as aiohttp_mock:
+        aiohttp_mock.get(
+            re.compile(r"^https://brapi\.dev/api/available.*"),
+            callback=available_callback,
+            repeat=True,
+        )
+        aiohttp_mock.get(
+            re.compile(r"^https://brapi\.dev/api/quote/.*"), callback=quote_callback, repeat=True
+        )
+        result = async_to_sync(get_prices)()
+        async_to_sync(get_prices)()
+
+    # THEN
+    assert result == {"PETR4": 10, "VALE3": 10, "VVAR3": 10}
+    requests = [str(url) for (_, url), calls in aiohttp_mock.requests.items() for _ in calls]
+    assert len([url for url in requests if "/available" in url]) == 4  # only on the first call
+    assert len([url for url in requests if "/quote/" in url]) == 4  # 2 batches per call
+
+
+def test__http_pool__retries_retryable_responses():
+    # GIVEN
+    url = "https://example.com/retry"
+    limits = RateLimits(requests=10, per_seconds=1, max_retries=2, backoff_in_seconds=0)
+
+    async def request():
+        response = await http_pool.request("test_retry", limits, "GET", url)
+        return response.status, await response.json()
+
+    # WHEN
+    with aioresponses() as aiohttp_mock:
+        aiohttp_mock.get(url, status=429)
+        aiohttp_mock.get(url, status=503)
+        aiohttp_mock.get(url, payload={"ok": True})
+        status, payload = async_to_sync(request)()
+
+    # THEN
+    assert status == 200
+    assert payload == {"ok": True}
+
+
+def test__http_pool__raises_after_max_retries():
+    # GIVEN
+    url = "https://example.com/fail"
+    limits = RateLimits(requests=10, per_seconds=1, max_retries=1, backoff_in_seconds=0)
+
+    async def request():
+        response = await http_pool.request("test_fail", limits, "GET", url)
+        response.raise_for_status()
+
+    # WHEN
+    with aioresponses() as aiohttp_mock:
+        aiohttp_mock.get(url, status=500, repeat=True)
+        with pytest.raises(Exception, match="500"):
+            async_to_sync(request)()
+
+
+def test__token_bucket__waits_for_refill():
+    # GIVEN
+    async def acquire():
+        bucket = TokenBucket(capacity=2, per_seconds=0.2)
+        for _ in range(3):
+            await bucket.acquire()
+
+    start = time.monotonic()
+
+    # WHEN
+    async_to_sync(acquire)()
+
+    # THEN
+    assert time.monotonic() - start >= 0.09
@@ -6,6 +6,7 @@ from tasks.choices import TaskStates
 from tasks.constants import ERROR_DISPLAY_TEXT
 from tasks.models import TaskHistory
 
+from ...adapters.key_value_store import get_cached_quote
 from ...choices import AssetSectors, AssetTypes, Currencies
 from ...integrations.binance.enums import FiatPaymentTransactionType
 from ...integrations.binance.handlers import sync_binance_transactions
@@ -72,6 +73,9 @@ def test__update_prices(
     stock_asset_metadata.refresh_from_db()
     assert stock_asset_metadata.current_price == 78
     assert stock_asset_metadata.current_price_updated_at is not None
+    assert get_cached_quote(
+        code=stock_asset_metadata.code, asset_type=AssetTypes.stock, currency=Currencies.real
+    ) == (78, stock_asset_metadata.current_price_updated_at)
 
     assert (
         AssetReadModel.objects.get(
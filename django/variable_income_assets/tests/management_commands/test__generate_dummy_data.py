@@ -5,6 +5,7 @@ from io import StringIO
 from django.contrib.auth import get_user_model
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db.models import F
 
 import pytest
 
@@ -266,6 +267,28 @@ class TestGenerateDummyDataCommand:
             assert closed_op.quantity_bought > 0
             assert closed_op.normalized_total_sold > 0
 
+    def test__should_pad_transactions_of_open_positions(self):
+        """Command with --transactions should add buy transactions up to the given total."""
+        call_command(
+            "generate_dummy_data",
+            from_date="2024-01-01",
+            total="100000",
+            email="demo@example.com",
+            password="testpass123",
+            transactions=500,
+        )
+
+        user = UserModel.objects.get(email="demo@example.com")
+        assert Transaction.objects.filter(asset__user=user).count() == 500
+        # closed positions aren't touched
+        assert not Transaction.objects.filter(
+            asset__user=user,
+            asset__closed_operations__isnull=False,
+            operation_date__gt=F("asset__closed_operations__operation_datetime__date"),
+        ).exists()
+        for read_model in AssetReadModel.objects.filter(user_id=user.pk):
+            assert read_model.quantity_balance >= 0
+
     def test__should_create_assets_of_multiple_types(self):
         """Command should create assets of different types."""
         call_command(
@@ -0,0 +1,178 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+import pytest
+
+from ...adapters.key_value_store import cache_quotes, get_cached_quote
+from ...choices import AssetSectors, AssetTypes, Currencies
+from ...integrations.helpers import fetch_asset_current_price
+from ...models import AssetMetaData
+from ...service_layer.tasks import maybe_create_asset_metadata
+from ...service_layer.tasks.asset_metadata import refresh_asset_metadata_current_price
+
+pytestmark = pytest.mark.django_db
+
+GET_B3_PRICES_PATH = "variable_income_assets.integrations.helpers.get_b3_prices"
+
+
+def test__fetch_asset_current_price__use_fresh_cached_quote(mocker):
+    # GIVEN
+    cache_quotes({("PETR4", AssetTypes.stock, Currencies.real): Decimal("38.5")})
+    get_b3_prices_mock = mocker.patch(GET_B3_PRICES_PATH)
+
+    # WHEN
+    price = fetch_asset_current_price(
+        code="PETR4", asset_type=AssetTypes.stock, currency=Currencies.real
+    )
+
+    # THEN
+    assert price == Decimal("38.5")
+    assert get_b3_prices_mock.call_count == 0
+
+
+def test__fetch_asset_current_price__stale_cached_quote(mocker, settings):
+    # GIVEN
+    cache_quotes(
+        {("PETR4", AssetTypes.stock, Currencies.real): Decimal("38.5")},
+        updated_at=timezone.now() - timedelta(seconds=settings.ASSET_QUOTES_MAX_AGE_IN_SECONDS + 1),
+    )
+    mocker.patch(GET_B3_PRICES_PATH, return_value={"PETR4": 40})
+
+    # WHEN
+    price = fetch_asset_current_price(
+        code="PETR4", asset_type=AssetTypes.stock, currency=Currencies.real
+    )
+
+    # THEN
+    assert price == 40
+    assert get_cached_quote("PETR4", AssetTypes.stock, Currencies.real)[0] == 40
+
+
+def test__fetch_asset_current_price__fallback_to_last_known_quote(mocker):
+    # GIVEN
+    cache_quotes(
+        {("PETR4", AssetTypes.stock, Currencies.real): Decimal("38.5")},
+        updated_at=timezone.now() - timedelta(days=1),
+    )
+    mocker.patch(GET_B3_PRICES_PATH, side_effect=Exception)
+
+    # WHEN
+    price = fetch_asset_current_price(
+        code="PETR4", asset_type=AssetTypes.stock, currency=Currencies.real
+    )
+
+    # THEN
+    assert price == Decimal("38.5")
+
+
+def test__maybe_create_asset_metadata__fetch_price_in_background(
+    stock_asset, settings, mocker, django_capture_on_commit_callbacks
+):
+    # GIVEN
+    settings.ASSET_METADATA_FETCH_PRICE_IN_BACKGROUND = True
+    quote_updated_at = timezone.now() - timedelta(days=1)
+    cache_quotes(
+        {(stock_asset.code, stock_asset.type, stock_asset.currency): Decimal("10")},
+        updated_at=quote_updated_at,
+    )
+    get_b3_prices_mock = mocker.patch(
+        GET_B3_PRICES_PATH, return_value={stock_asset.code: Decimal("12")}
+    )
+
+    # WHEN
+    with django_capture_on_commit_callbacks() as callbacks:
+        maybe_create_asset_metadata(stock_asset.to_domain())
+
+    # THEN
+    metadata = AssetMetaData.objects.get(code=stock_asset.code, type=stock_asset.type)
+    assert metadata.current_price == Decimal("10")
+    # the price is as stale as the cached quote
+    assert metadata.current_price_updated_at == quote_updated_at
+    assert get_b3_prices_mock.call_count == 0
+    assert len(callbacks) == 1
+
+    # WHEN
+    refresh_asset_metadata_current_price(
+        metadata_pk=metadata.pk,
+        code=stock_asset.code,
+        asset_type=stock_asset.type,
+        currency=stock_asset.currency,
+    )
+
+    # THEN
+    metadata.refresh_from_db()
+    assert metadata.current_price == Decimal("12")
+    assert metadata.current_price_updated_at > quote_updated_at
+
+
+def test__maybe_create_asset_metadata__fetch_price_in_background__wo_cached_quote(
+    stock_asset, settings, mocker, django_capture_on_commit_callbacks
+):
+    # GIVEN
+    settings.ASSET_METADATA_FETCH_PRICE_IN_BACKGROUND = True
+    mocker.patch(GET_B3_PRICES_PATH, side_effect=Exception)
+
+    # WHEN
+    with django_capture_on_commit_callbacks(execute=False):
+        maybe_create_asset_metadata(stock_asset.to_domain())
+    metadata = AssetMetaData.objects.get(code=stock_asset.code, type=stock_asset.type)
+    refresh_asset_metadata_current_price(
+        metadata_pk=metadata.pk,
+        code=stock_asset.code,
+        asset_type=stock_asset.type,
+        currency=stock_asset.currency,
+    )
+
+    # THEN
+    metadata.refresh_from_db()
+    assert metadata.current_price == 0
+    assert metadata.current_price_updated_at is None
+
+
+def test__maybe_create_asset_metadata__stale_quote_fallback(stock_asset, mocker):
+    # GIVEN
+    quote_updated_at = timezone.now() - timedelta(days=1)
+    cache_quotes(
+        {(stock_asset.code, stock_asset.type, stock_asset.currency): Decimal("10")},
+        updated_at=quote_updated_at,
+    )
+    mocker.patch(GET_B3_PRICES_PATH, side_effect=Exception)
+
+    # WHEN
+    maybe_create_asset_metadata(stock_asset.to_domain(), sector=AssetSectors.finance)
+
+    # THEN
+    metadata = AssetMetaData.objects.get(code=stock_asset.code, type=stock_asset.type)
+    assert metadata.current_price == Decimal("10")
+    assert metadata.current_price_updated_at == quote_updated_at
+
+
+def test__refresh_asset_metadata_current_price__keep_newer_price(stock_asset, mocker):
+    # GIVEN
+    cache_quotes(
+        {(stock_asset.code, stock_asset.type, stock_asset.currency): Decimal("10")},
+        updated_at=timezone.now() - timedelta(days=1),
+    )
+    mocker.patch(GET_B3_PRICES_PATH, side_effect=Exception)
+    # e.g. updated by a B3 import in the meantime
+    metadata = AssetMetaData.objects.create(
+        code=stock_asset.code,
+        type=stock_asset.type,
+        currency=stock_asset.currency,
+        current_price=Decimal("12"),
+        current_price_updated_at=timezone.now(),
+    )
+
+    # WHEN
+    refresh_asset_metadata_current_price(
+        metadata_pk=metadata.pk,
+        code=stock_asset.code,
+        asset_type=stock_asset.type,
+        currency=stock_asset.currency,
+    )
+
+    # THEN
+    metadata.refresh_from_db()
+    assert metadata.current_price == Decimal("12")
@@ -1,7 +1,11 @@
 import pytest
 
-from ...models import AssetReadModel
-from ...service_layer.tasks import upsert_asset_read_model
+from config.settings.base import BASE_API_URL
+from shared.tests import convert_and_quantitize
+
+from ...choices import PassiveIncomeEventTypes, PassiveIncomeTypes, TransactionActions
+from ...models import Asset, AssetReadModel
+from ...service_layer.tasks import bulk_upsert_assets_read_model, upsert_asset_read_model
 
 pytestmark = pytest.mark.django_db
 
@@ -35,3 +39,128 @@ def test__should_set_values_to_zero_if_asset_has_been_closed(stock_usa_asset, re
         .count()
         == 1
     )
+
+
+READ_MODEL_AGGREGATED_FIELDS = (
+    "quantity_balance",
+    "quantity_bought",
+    "total_bought",
+    "avg_price",
+    "normalized_avg_price",
+    "normalized_total_bought",
+    "normalized_total_sold",
+    "normalized_closed_roi",
+    "credited_incomes",
+    "normalized_credited_incomes",
+)
+
+
+def _get_read_model_values(asset_pk: int) -> dict[str, float]:
+    return {
+        k: convert_and_quantitize(v)
+        for k, v in AssetReadModel.objects.filter(write_model_pk=asset_pk)
+        .values(*READ_MODEL_AGGREGATED_FIELDS)
+        .get()
+        .items()
+    }
+
+
+@pytest.mark.usefixtures("stock_usa_transaction", "stock_usa_asset_metadata")
+def test__delta_upsert__should_be_equivalent_to_full_upsert(client, stock_usa_asset, request):
+    # GIVEN
+    request.getfixturevalue("sync_assets_read_model")
+    base_data = {"asset_pk": stock_usa_asset.pk, "current_currency_conversion_rate": 5.5}
+
+    # WHEN
+    client.post(
+        f"/{BASE_API_URL}transactions",
+        data={
+            **base_data,
+            "action": TransactionActions.buy,
+            "price": 12.33,
+            "quantity": 3,
+            "operation_date": "12/12/2022",
+        },
+    )
+    response = client.post(
+        f"/{BASE_API_URL}transactions",
+        data={
+            **base_data,
+            "action": TransactionActions.sell,
+            "price": 15,
+            "quantity": 20,
+            "operation_date": "13/12/2022",
+        },
+    )
+    client.put(
+        f"/{BASE_API_URL}transactions/{response.json()['id']}",
+        data={
+            **base_data,
+            "action": TransactionActions.sell,
+            "price": 17,
+            "quantity": 10,
+            "operation_date": "13/12/2022",
+        },
+    )
+    response = client.post(
+        f"/{BASE_API_URL}incomes",
+        data={
+            **base_data,
+            "type": PassiveIncomeTypes.dividend,
+            "event_type": PassiveIncomeEventTypes.credited,
+            "amount": 100,
+            "operation_date": "14/12/2022",
+        },
+    )
+    client.delete(f"/{BASE_API_URL}incomes/{response.json()['id']}")
+    client.post(
+        f"/{BASE_API_URL}incomes",
+        data={
+            **base_data,
+            "type": PassiveIncomeTypes.dividend,
+            "event_type": PassiveIncomeEventTypes.credited,
+            "amount": 21,
+            "operation_date": "14/12/2022",
+        },
+    )
+    incremental = _get_read_model_values(stock_usa_asset.pk)
+    upsert_asset_read_model(asset_id=stock_usa_asset.pk, is_aggregate_upsert=True)
+
+    # THEN
+    assert incremental == _get_read_model_values(stock_usa_asset.pk)
+    assert incremental["quantity_balance"] == 43
+
+
+@pytest.mark.usefixtures(
+    "stock_usa_transaction",
+    "stock_usa_sell_transaction",
+    "stock_usa_asset_metadata",
+    "stock_usa_asset_closed_operation",
+    "buy_transaction",
+    "stock_asset_metadata",
+    "simple_income",
+    "buy_transaction_from_fixed_asset_held_in_self_custody",
+)
+def test__bulk_upsert__should_be_equivalent_to_upsert(user):
+    # GIVEN
+    asset_pks = list(Asset.objects.filter(user=user).values_list("pk", flat=True))
+    for asset in Asset.objects.filter(pk__in=asset_pks):
+        upsert_asset_read_model(
+            asset_id=asset.pk, is_held_in_self_custody=asset.is_held_in_self_custody
+        )
+    expected = {pk: _get_read_model_values(pk) for pk in asset_pks}
+    expected_metadata = dict(AssetReadModel.objects.values_list("write_model_pk", "metadata_id"))
+    AssetReadModel.objects.update(
+        quantity_balance=0, normalized_total_bought=0, metadata_id=None, code=""
+    )
+
+    # WHEN
+    result = bulk_upsert_assets_read_model(user_ids=[user.pk], batch_size=1)
+
+    # THEN
+    assert result == len(asset_pks) > 1
+    assert {pk: _get_read_model_values(pk) for pk in asset_pks} == expected
+    assert dict(AssetReadModel.objects.values_list("write_model_pk", "metadata_id")) == (
+        expected_metadata
+    )
+    assert not AssetReadModel.objects.filter(code="").exists()
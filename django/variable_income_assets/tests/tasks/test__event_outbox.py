@@ -0,0 +1,174 @@
+from datetime import timedelta
+
+from django.db import DatabaseError
+from django.utils import timezone
+
+import pytest
+
+from config.settings.base import BASE_API_URL
+
+from ...choices import EventOutboxStates, TransactionActions
+from ...domain import events
+from ...models import Asset, EventOutboxMessage, Transaction
+from ...service_layer import handlers
+from ...service_layer.outbox import claim, enqueue, process, process_pending
+
+pytestmark = pytest.mark.django_db
+
+
+def test__should_enqueue_async_event_handlers_if_outbox_backend(
+    client, stock_asset, mocker, settings
+):
+    # GIVEN
+    settings.INVESTMENTS_EVENTS_BACKEND = "outbox"
+    mocked_task = mocker.patch(
+        "variable_income_assets.service_layer.handlers.upsert_asset_read_model"
+    )
+
+    # WHEN
+    response = client.post(
+        f"/{BASE_API_URL}transactions",
+        data={
+            "action": TransactionActions.buy,
+            "price": 10,
+            "quantity": 100,
+            "asset_pk": stock_asset.pk,
+            "operation_date": "12/12/2022",
+        },
+    )
+
+    # THEN
+    assert response.status_code == 201
+    assert Transaction.objects.filter(asset=stock_asset).count() == 1
+    assert mocked_task.call_count == 0
+    assert EventOutboxMessage.objects.filter(
+        handler="upsert_read_model",
+        event_type="TransactionsCreated",
+        asset_pk=stock_asset.pk,
+        state=EventOutboxStates.pending,
+    ).exists()
+
+    # WHEN
+    processed = process_pending()
+
+    # THEN
+    assert processed == 1
+    assert mocked_task.call_count == 1
+    assert mocked_task.call_args.kwargs["asset_id"] == stock_asset.pk
+    assert EventOutboxMessage.objects.get().state == EventOutboxStates.done
+
+
+def test__claim__should_preserve_order_per_asset():
+    # GIVEN
+    first = enqueue(handlers.upsert_read_model, events.TransactionsCreated(asset_pk=1))
+    enqueue(handlers.upsert_read_model, events.TransactionUpdated(asset_pk=1))
+    other_asset = enqueue(handlers.upsert_read_model, events.TransactionsCreated(asset_pk=2))
+
+    # WHEN
+    claimed = claim(limit=10)
+
+    # THEN
+    assert [m.pk for m in claimed] == [first.pk, other_asset.pk]
+    assert claim(limit=10) == []
+
+
+def test__process_pending__should_retry_and_then_dead_letter(mocker):
+    # GIVEN
+    mocker.patch(
+        "variable_income_assets.service_layer.handlers.upsert_asset_read_model",
+        side_effect=Exception("boom"),
+    )
+    message = enqueue(handlers.upsert_read_model, events.TransactionsCreated(asset_pk=1))
+    blocked = enqueue(handlers.upsert_read_model, events.TransactionDeleted(asset_pk=1))
+
+    # WHEN
+    process_pending(max_attempts=2)
+
+    # THEN
+    message.refresh_from_db()
+    assert message.state == EventOutboxStates.pending
+    assert message.attempts == 1
+    assert message.last_error == "Exception('boom')"
+
+    # WHEN
+    EventOutboxMessage.objects.filter(pk=message.pk).update(available_at=message.created_at)
+    process_pending(max_attempts=2)
+
+    # THEN
+    message.refresh_from_db()
+    assert message.state == EventOutboxStates.dead
+    assert message.attempts == 2
+    # dead letters don't block the next messages of the asset
+    assert [m.pk for m in claim(limit=10)] == [blocked.pk]
+
+
+def test__process_pending__should_purge_the_old_processed_messages(mocker, settings):
+    # GIVEN
+    settings.INVESTMENTS_EVENTS_RETENTION_IN_HOURS = 1
+    mocker.patch("variable_income_assets.service_layer.handlers.upsert_asset_read_model")
+    old = enqueue(handlers.upsert_read_model, events.TransactionsCreated(asset_pk=1))
+    recent = enqueue(handlers.upsert_read_model, events.TransactionsCreated(asset_pk=2))
+    dead = enqueue(handlers.upsert_read_model, events.TransactionsCreated(asset_pk=3))
+    EventOutboxMessage.objects.filter(pk=old.pk).update(
+        state=EventOutboxStates.done, processed_at=timezone.now() - timedelta(hours=2)
+    )
+    EventOutboxMessage.objects.filter(pk=recent.pk).update(
+        state=EventOutboxStates.done, processed_at=timezone.now() - timedelta(minutes=30)
+    )
+    EventOutboxMessage.objects.filter(pk=dead.pk).update(
+        state=EventOutboxStates.dead, processed_at=timezone.now() - timedelta(hours=2)
+    )
+
+    # WHEN
+    process_pending()
+
+    # THEN
+    assert set(EventOutboxMessage.objects.values_list("pk", flat=True)) == {recent.pk, dead.pk}
+
+
+def test__process__should_roll_back_the_handler_if_the_message_was_reclaimed(stock_asset, mocker):
+    # GIVEN
+    mocker.patch(
+        "variable_income_assets.service_layer.handlers.upsert_asset_read_model",
+        side_effect=lambda *_, **__: Asset.objects.filter(pk=stock_asset.pk).update(
+            description="handled"
+        ),
+    )
+    enqueue(handlers.upsert_read_model, events.TransactionsCreated(asset_pk=stock_asset.pk))
+    (message,) = claim(limit=1)
+    # e.g. the lock timed out and another worker claimed the message
+    EventOutboxMessage.objects.filter(pk=message.pk).update(locked_at=timezone.now())
+
+    # WHEN
+    processed = process(message)
+
+    # THEN
+    assert not processed
+    stock_asset.refresh_from_db()
+    assert stock_asset.description != "handled"
+    assert EventOutboxMessage.objects.get().state == EventOutboxStates.processing
+
+
+@pytest.mark.django_db(transaction=True)
+def test__enqueue__should_be_rolled_back_with_the_changes_that_emitted_the_event(
+    client, stock_asset, mocker, settings
+):
+    # GIVEN
+    settings.INVESTMENTS_EVENTS_BACKEND = "outbox"
+    mocker.patch.object(EventOutboxMessage.objects, "create", side_effect=DatabaseError)
+
+    # WHEN
+    with pytest.raises(DatabaseError):
+        client.post(
+            f"/{BASE_API_URL}transactions",
+            data={
+                "action": TransactionActions.buy,
+                "price": 10,
+                "quantity": 100,
+                "asset_pk": stock_asset.pk,
+                "operation_date": "12/12/2022",
+            },
+        )
+
+    # THEN
+    assert not Transaction.objects.filter(asset=stock_asset).exists()
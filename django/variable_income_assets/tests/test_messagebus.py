@@ -0,0 +1,122 @@
+import pickle  # nosec
+from decimal import Decimal
+
+import pytest
+
+from ..domain import events
+from ..domain.models import AssetReadModelDelta
+from ..models import EventOutboxMessage
+from ..service_layer import handlers, messagebus
+from ..service_layer.outbox import enqueue
+from ..service_layer.unit_of_work import DjangoUnitOfWork
+
+pytestmark = pytest.mark.django_db
+
+
+def _handle(event: events.Event) -> None:
+    with DjangoUnitOfWork(asset_pk=event.asset_pk) as uow:
+        messagebus.handle(message=event, uow=uow)
+
+
+def test__coalesce__should_upsert_read_model_once_per_asset(mocker):
+    # GIVEN
+    mocked_task = mocker.patch(
+        "variable_income_assets.service_layer.handlers.upsert_asset_read_model"
+    )
+    delta = AssetReadModelDelta(quantity_balance=Decimal("10"), total_bought=Decimal("100"))
+
+    # WHEN
+    with messagebus.coalesce():
+        for _ in range(3):
+            _handle(events.TransactionsCreated(asset_pk=1, read_model_delta=delta))
+        _handle(events.PassiveIncomeCreated(asset_pk=2, read_model_delta=delta))
+
+        # THEN
+        assert mocked_task.call_count == 0
+
+    # THEN
+    assert [c.kwargs for c in mocked_task.call_args_list] == [
+        {
+            "asset_id": 1,
+            "is_aggregate_upsert": True,
+            "is_held_in_self_custody": False,
+            "delta": delta + delta + delta,
+        },
+        {
+            "asset_id": 2,
+            "is_aggregate_upsert": True,
+            "is_held_in_self_custody": False,
+            "delta": delta,
+        },
+    ]
+
+
+def test__coalesce__should_fully_upsert_if_any_event_has_no_delta(mocker):
+    # GIVEN
+    mocked_task = mocker.patch(
+        "variable_income_assets.service_layer.handlers.upsert_asset_read_model"
+    )
+    delta = AssetReadModelDelta(quantity_balance=Decimal("10"))
+
+    # WHEN
+    with messagebus.coalesce():
+        _handle(events.TransactionsCreated(asset_pk=1, new_asset=True, read_model_delta=delta))
+        _handle(events.TransactionUpdated(asset_pk=1, read_model_delta=None))
+        _handle(events.TransactionDeleted(asset_pk=1, read_model_delta=delta))
+
+    # THEN
+    assert mocked_task.call_count == 1
+    assert mocked_task.call_args.kwargs == {
+        "asset_id": 1,
+        "is_aggregate_upsert": None,
+        "is_held_in_self_custody": False,
+        "delta": None,
+    }
+
+
+def test__coalesce__should_keep_is_held_in_self_custody_of_merged_events(mocker):
+    # GIVEN
+    mocked_task = mocker.patch(
+        "variable_income_assets.service_layer.handlers.upsert_asset_read_model"
+    )
+    delta = AssetReadModelDelta(quantity_balance=Decimal("10"))
+
+    # WHEN
+    with messagebus.coalesce():
+        _handle(
+            events.TransactionsCreated(
+                asset_pk=1, is_held_in_self_custody=True, read_model_delta=delta
+            )
+        )
+        _handle(events.PassiveIncomeCreated(asset_pk=1, read_model_delta=delta))
+
+    # THEN
+    assert mocked_task.call_count == 1
+    assert mocked_task.call_args.kwargs == {
+        "asset_id": 1,
+        "is_aggregate_upsert": True,
+        "is_held_in_self_custody": True,
+        "delta": delta + delta,
+    }
+
+
+def test__outbox__should_coalesce_pending_events_within_window(settings):
+    # GIVEN
+    settings.INVESTMENTS_EVENTS_COALESCE_WINDOW_IN_SECONDS = 10
+    delta = AssetReadModelDelta(quantity_balance=Decimal("10"))
+
+    # WHEN
+    for _ in range(2):
+        enqueue(
+            handlers.upsert_read_model,
+            events.TransactionsCreated(asset_pk=1, read_model_delta=delta),
+        )
+    enqueue(handlers.create_asset_operation_closed_record, events.AssetOperationClosed(asset_pk=1))
+    enqueue(
+        handlers.upsert_read_model, events.TransactionsCreated(asset_pk=1, read_model_delta=delta)
+    )
+
+    # THEN
+    assert EventOutboxMessage.objects.count() == 3
+    first = EventOutboxMessage.objects.order_by("pk").first()
+    assert pickle.loads(first.payload).read_model_delta == delta + delta
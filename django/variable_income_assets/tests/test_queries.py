@@ -1,3 +1,4 @@
+from datetime import timedelta
 from decimal import Decimal
 
 from django.db.models import Q
@@ -9,6 +10,7 @@ from shared.tests import convert_and_quantitize, skip_if_sqlite
 
 from ..choices import PassiveIncomeTypes, TransactionActions
 from ..models import Asset, Transaction
+from .conftest import AssetClosedOperationFactory, TransactionFactory
 from .shared import (
     get_avg_price_bute_force,
     get_total_credited_incomes_brute_force,
@@ -71,6 +73,81 @@ def test__asset__credited_incomes_at_given_year(stock_usa_asset, incomes_type):
     ) == convert_and_quantitize(asset["normalized_credited_incomes_total"])
 
 
+READ_FIELDS = (
+    "quantity_balance",
+    "avg_price",
+    "normalized_avg_price",
+    "normalized_total_bought",
+    "total_bought",
+    "current_quantity_bought",
+    "current_total_bought",
+    "normalized_total_sold",
+    "normalized_closed_roi",
+    "normalized_credited_incomes",
+    "credited_incomes",
+)
+
+
+@pytest.mark.usefixtures("stock_asset_closed_operation", "buy_transaction")
+def test__asset__read_fields__aggregations_are_equivalent(stock_asset):
+    # GIVEN
+    qs = Asset.objects.filter(pk=stock_asset.pk)
+
+    # WHEN
+    joined = qs.annotate_read_fields(aggregation="join").values(*READ_FIELDS).get()
+    pre_aggregated = (
+        qs.annotate_read_fields(aggregation="pre_aggregated").values(*READ_FIELDS).get()
+    )
+
+    # THEN
+    assert {k: convert_and_quantitize(v) for k, v in joined.items()} == {
+        k: convert_and_quantitize(v) for k, v in pre_aggregated.items()
+    }
+
+
+def test__asset__read_fields__pre_aggregated__closed_twice_w_same_values(stock_asset):
+    # GIVEN
+    for days in (20, 10):
+        TransactionFactory(
+            asset=stock_asset,
+            action=TransactionActions.buy,
+            price=10,
+            quantity=50,
+            operation_date=timezone.localdate() - timedelta(days=days + 1),
+        )
+        TransactionFactory(
+            asset=stock_asset,
+            action=TransactionActions.sell,
+            price=20,
+            quantity=50,
+            operation_date=timezone.localdate() - timedelta(days=days),
+        )
+        AssetClosedOperationFactory(
+            normalized_total_bought=500,
+            total_bought=500,
+            quantity_bought=50,
+            normalized_total_sold=1000,
+            operation_datetime=timezone.localtime() - timedelta(days=days),
+            asset=stock_asset,
+        )
+    TransactionFactory(asset=stock_asset, action=TransactionActions.buy, price=12, quantity=10)
+
+    # WHEN
+    asset = (
+        Asset.objects.annotate_read_fields(aggregation="pre_aggregated")
+        .values(*READ_FIELDS)
+        .get(pk=stock_asset.pk)
+    )
+
+    # THEN
+    assert asset["quantity_balance"] == 10
+    assert asset["avg_price"] == 12
+    assert asset["normalized_total_bought"] == 120
+    assert asset["current_quantity_bought"] == 10
+    assert asset["normalized_total_sold"] == 0
+    assert asset["normalized_closed_roi"] == 1000
+
+
 @pytest.mark.skip(
     "Skip while bug is not fixed, i.e. `using_dollar_as` must not persist "
     "the dollar value for new calls to manager"
@@ -33,8 +33,13 @@ from shared.utils import (
 from variable_income_assets.models.managers.write import AssetClosedOperationQuerySet
 
 from . import choices, filters, serializers
-from .adapters.key_value_store import get_dollar_conversion_rate
+from .adapters.key_value_store import (
+    bump_portfolio_summary_version,
+    get_dollar_conversion_rate,
+    get_or_set_portfolio_summary,
+)
 from .domain import events
+from .domain.models import AssetReadModelDelta
 from .integrations.b3.import_service import B3ImportOperationError, run_b3_import
 from .models import (
     Asset,
@@ -118,13 +123,17 @@ class AssetViewSet(
     def perform_destroy(self, instance: Asset) -> None:
         AssetReadModel.objects.filter(write_model_pk=instance.pk).delete()
         super().perform_destroy(instance)
+        bump_portfolio_summary_version(user_id=instance.user_id)
 
     @action(methods=("GET",), detail=False)
     def indicators(self, request: Request) -> Response:
         filterset = filters.AssetIndicatorsFilterSet(data=request.query_params)
         filterset.is_valid()
-        qs = self.get_queryset().indicators(
-            include_yield=filterset.form.cleaned_data.get("include_yield")
+        include_yield = bool(filterset.form.cleaned_data.get("include_yield"))
+        qs = get_or_set_portfolio_summary(
+            user_id=request.user.id,
+            name=f"indicators:{include_yield}",
+            compute=lambda: self.get_queryset().indicators(include_yield=include_yield),
         )
         last_snapshot = (
             AssetsTotalInvestedSnapshot.objects.last_total_for_user(self.request.user.id) or 1
@@ -178,7 +187,11 @@ class AssetViewSet(
         today = timezone.localdate()
         target_date = today - relativedelta(months=months or 0, years=years or 0)
 
-        current_total = self.get_queryset().aggregate_normalized_current_total()["total"]
+        current_total = get_or_set_portfolio_summary(
+            user_id=request.user.id,
+            name="current_total",
+            compute=lambda: self.get_queryset().aggregate_normalized_current_total()["total"],
+        )
 
         # Falls back to earliest available snapshot if no data exists for the target period
         historical_snapshot = AssetsTotalInvestedSnapshot.objects.latest_before_or_earliest(
@@ -272,6 +285,8 @@ class AssetViewSet(
             current_price=serializer.validated_data["current_price"],
             current_price_updated_at=timezone.now(),
         )
+        AssetReadModel.objects.filter(write_model_pk=serializer.instance.id).update_current_totals()
+        bump_portfolio_summary_version(user_id=request.user.id)
         return Response(status=HTTP_204_NO_CONTENT)
 
     @action(methods=("GET",), detail=False, url_path="emergency-fund-total")
@@ -370,25 +385,42 @@ class PassiveIncomeViewSet(ModelViewSet):
         )
 
     def perform_create(self, serializer: serializers.PassiveIncomeSerializer) -> None:
-        super().perform_create(serializer)
-        with DjangoUnitOfWork(asset_pk=serializer.instance.asset_id) as uow:
-            messagebus.handle(
-                message=events.PassiveIncomeCreated(asset_pk=serializer.instance.asset_id), uow=uow
-            )
+        # the income and the events it emits (e.g. persisted in the outbox) are saved together
+        with djtransaction.atomic():
+            super().perform_create(serializer)
+            with DjangoUnitOfWork(asset_pk=serializer.instance.asset_id) as uow:
+                messagebus.handle(
+                    message=events.PassiveIncomeCreated(
+                        asset_pk=serializer.instance.asset_id,
+                        read_model_delta=AssetReadModelDelta.from_income(serializer.instance),
+                    ),
+                    uow=uow,
+                )
 
     def perform_update(self, serializer: serializers.PassiveIncomeSerializer) -> None:
-        super().perform_update(serializer)
-        with DjangoUnitOfWork(asset_pk=serializer.instance.asset_id) as uow:
-            messagebus.handle(
-                message=events.PassiveIncomeUpdated(asset_pk=serializer.instance.asset_id), uow=uow
-            )
+        previous = AssetReadModelDelta.from_income(serializer.instance)
+        with djtransaction.atomic():
+            super().perform_update(serializer)
+            delta = AssetReadModelDelta.from_income(serializer.instance) - previous
+            with DjangoUnitOfWork(asset_pk=serializer.instance.asset_id) as uow:
+                messagebus.handle(
+                    message=events.PassiveIncomeUpdated(
+                        asset_pk=serializer.instance.asset_id, read_model_delta=delta
+                    ),
+                    uow=uow,
+                )
 
     def perform_destroy(self, instance: PassiveIncome):
-        super().perform_destroy(instance)
-        with DjangoUnitOfWork(asset_pk=instance.asset_id) as uow:
-            messagebus.handle(
-                message=events.PassiveIncomeDeleted(asset_pk=instance.asset_id), uow=uow
-            )
+        with djtransaction.atomic():
+            super().perform_destroy(instance)
+            with DjangoUnitOfWork(asset_pk=instance.asset_id) as uow:
+                messagebus.handle(
+                    message=events.PassiveIncomeDeleted(
+                        asset_pk=instance.asset_id,
+                        read_model_delta=-AssetReadModelDelta.from_income(instance),
+                    ),
+                    uow=uow,
+                )
 
     # TODO: consider using same endpoint to return both sums
     @action(methods=("GET",), detail=False)
@@ -25,7 +25,7 @@ const DeleteExpenseDialog = ({
   expense: Expense & { type: string };
   open: boolean;
   onClose: () => void;
-  onSuccess: (id: number) => Promise<void>;
+  onSuccess: (id: number | string) => Promise<void>;
 }) => {
   const [
     performActionsOnFutureFixedEntities,
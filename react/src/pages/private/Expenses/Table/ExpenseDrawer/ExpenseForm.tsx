@@ -103,7 +103,7 @@ const createExpenseMutation = async (data: yup.Asserts<typeof schema>) => {
 };
 
 const editExpenseMutation = async (
-  id: number,
+  id: number | string,
   data: yup.Asserts<typeof schema>,
 ) => {
   const {
@@ -208,7 +208,7 @@ const ExpenseForm = ({
     useInvalidateExpenseQueries(queryClient);
 
   const updateCachedData = useCallback(
-    (data: yup.Asserts<typeof schema> & { id: number }) => {
+    (data: yup.Asserts<typeof schema> & { id: number | string }) => {
       const { category, source, created_at, bank_account_description, ...rest } = data;
       const expensesData = queryClient.getQueriesData({
         queryKey: [EXPENSES_QUERY_KEY],
@@ -98,7 +98,7 @@ const useOnExpenseDeleteSuccess = () => {
   const { invalidate: invalidateExpensesQueries } =
     useInvalidateExpenseQueries(queryClient);
 
-  const removeExpenseFromCachedData = (expenseId: number) => {
+  const removeExpenseFromCachedData = (expenseId: number | string) => {
     const expensesData = queryClient.getQueriesData({
       queryKey: [EXPENSES_QUERY_KEY],
       type: "active",
@@ -117,7 +117,7 @@ const useOnExpenseDeleteSuccess = () => {
     });
   };
   return {
-    onDeleteSuccess: async (expenseId: number) => {
+    onDeleteSuccess: async (expenseId: number | string) => {
       await invalidateExpensesQueries({ invalidateTableQuery: false });
       removeExpenseFromCachedData(expenseId);
     },
@@ -139,7 +139,7 @@ export const createExpense = async (data: ExpenseWrite): Promise<Expense> => {
 };
 
 export const deleteExpense = async (
-  id: number,
+  id: number | string,
   performActionsOnFutureFixedEntities?: boolean
 ) =>
   (
@@ -155,7 +155,7 @@ export const editExpense = async ({
   id,
   data,
 }: {
-  id: number;
+  id: number | string;
   data: ExpenseWrite;
 }): Promise<Expense> => {
   const { created_at, performActionsOnFutureFixedEntities, ...rest } = data;
@@ -25,7 +25,7 @@ const DeleteRevenueDialog = ({
   revenue: Revenue & { type: string };
   open: boolean;
   onClose: () => void;
-  onSuccess: (id: number) => Promise<void>;
+  onSuccess: (id: number | string) => Promise<void>;
 }) => {
   const [
     performActionsOnFutureFixedEntities,
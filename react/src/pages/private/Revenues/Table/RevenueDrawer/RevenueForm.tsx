@@ -75,7 +75,7 @@ const createRevenueMutation = async (data: yup.Asserts<typeof schema>) => {
 };
 
 const editRevenueMutation = async (
-  id: number,
+  id: number | string,
   data: yup.Asserts<typeof schema>,
 ) => {
   const { isFixed, category, bank_account_description, ...rest } = data;
@@ -158,7 +158,7 @@ const RevenueForm = ({
     useInvalidateRevenuesQueries(queryClient);
 
   const updateCachedData = useCallback(
-    (data: yup.Asserts<typeof schema> & { id: number }) => {
+    (data: yup.Asserts<typeof schema> & { id: number | string }) => {
       const { created_at, category, bank_account_description, ...rest } = data;
       const revenuesData = queryClient.getQueriesData({
         queryKey: [REVENUES_QUERY_KEY],
@@ -85,7 +85,7 @@ const useOnRevenueDeleteSuccess = () => {
   const { invalidate: invalidateRevenuesQueries } =
     useInvalidateRevenuesQueries(queryClient);
 
-  const removeRevenueFromCachedData = (RevenueId: number) => {
+  const removeRevenueFromCachedData = (RevenueId: number | string) => {
     const revenuesData = queryClient.getQueriesData({
       queryKey: [REVENUES_QUERY_KEY],
       type: "active",
@@ -104,7 +104,7 @@ const useOnRevenueDeleteSuccess = () => {
     });
   };
   return {
-    onDeleteSuccess: async (RevenueId: number) => {
+    onDeleteSuccess: async (RevenueId: number | string) => {
       await invalidateRevenuesQueries({ invalidateTableQuery: false });
       removeRevenueFromCachedData(RevenueId);
     },
@@ -56,7 +56,7 @@ export const editRevenue = async ({
   id,
   data,
 }: {
-  id: number;
+  id: number | string;
   data: RevenueWrite;
 }): Promise<Revenue> => {
   const { created_at, performActionsOnFutureFixedEntities, ...rest } = data;
@@ -78,7 +78,7 @@ export const editRevenue = async ({
 };
 
 export const deleteRevenue = async (
-  id: number,
+  id: number | string,
   performActionsOnFutureFixedEntities?: boolean
 ) =>
   (
@@ -1,7 +1,8 @@
 import { RawDateString } from "../../../types";
 
 export type Revenue = {
-  id: number;
+  // the future occurrences of the fixed entities have string ids
+  id: number | string;
   value: number;
   description: string;
   created_at: RawDateString;